@@ -14,12 +14,12 @@
 # limitations under the License.
 
 import copy
-import eventlet
 import traceback
 import uuid
 import datetime
 
 from jsonschema import exceptions as json_schema_exc
+from oslo_config import cfg
 
 from st2common.runners.base import ActionRunner
 from st2common import log as logging
@@ -38,6 +38,7 @@ from st2common.persistence.execution import ActionExecution
 from st2common.persistence.liveaction import LiveAction
 from st2common.services import action as action_service
 from st2common.services import keyvalues as kv_service
+from st2common.services import liveaction_watcher
 from st2common.util import action_db as action_db_util
 from st2common.util import isotime
 from st2common.util import date as date_utils
@@ -713,7 +714,8 @@ class ActionChainRunner(ActionRunner):
 
     def _run_action(self, liveaction, wait_for_completion=True, sleep_delay=1.0):
         """
-        :param sleep_delay: Number of seconds to wait during "is completed" polls.
+        :param sleep_delay: Number of seconds to wait during "is completed" polls when completion
+                            notifications are disabled.
         :type sleep_delay: ``float``
         """
         try:
@@ -723,17 +725,15 @@ class ActionChainRunner(ActionRunner):
             LOG.exception('Failed to schedule liveaction.')
             raise e
 
-        while (wait_for_completion and liveaction.status not in (
-                action_constants.LIVEACTION_COMPLETED_STATES +
-                [action_constants.LIVEACTION_STATUS_PAUSED])):
-            eventlet.sleep(sleep_delay)
-            liveaction = action_db_util.get_liveaction_by_id(liveaction.id)
+        if wait_for_completion:
+            liveaction = self._wait_for_completion(liveaction, sleep_delay=sleep_delay)
 
         return liveaction
 
     def _resume_action(self, liveaction, wait_for_completion=True, sleep_delay=1.0):
         """
-        :param sleep_delay: Number of seconds to wait during "is completed" polls.
+        :param sleep_delay: Number of seconds to wait during "is completed" polls when completion
+                            notifications are disabled.
         :type sleep_delay: ``float``
         """
         try:
@@ -744,14 +744,19 @@ class ActionChainRunner(ActionRunner):
             LOG.exception('Failed to schedule liveaction.')
             raise e
 
-        while (wait_for_completion and liveaction.status not in (
-                action_constants.LIVEACTION_COMPLETED_STATES +
-                [action_constants.LIVEACTION_STATUS_PAUSED])):
-            eventlet.sleep(sleep_delay)
-            liveaction = action_db_util.get_liveaction_by_id(liveaction.id)
+        if wait_for_completion:
+            liveaction = self._wait_for_completion(liveaction, sleep_delay=sleep_delay)
 
         return liveaction
 
+    def _wait_for_completion(self, liveaction, sleep_delay=1.0):
+        if cfg.CONF.actionrunner.completion_notifications:
+            return liveaction_watcher.wait_for_completion(
+                liveaction, watcher=liveaction_watcher.get_watcher(),
+                poll_interval=cfg.CONF.actionrunner.completion_poll_interval)
+
+        return liveaction_watcher.wait_for_completion(liveaction, poll_interval=sleep_delay)
+
     def _build_liveaction_object(self, action_node, resolved_params, parent_context):
         liveaction = LiveActionDB(action=action_node.ref)
 
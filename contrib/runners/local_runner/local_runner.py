@@ -34,7 +34,7 @@ from st2common.util.misc import strip_shell_chars
 from st2common.util.green import shell
 from st2common.util.shell import kill_process
 from st2common.util import jsonify
-from st2common.services.action import store_execution_output_data
+from st2common.services.action import ExecutionOutputWriter
 from st2common.runners.utils import make_read_and_store_stream_func
 
 __all__ = [
@@ -145,9 +145,10 @@ class LocalShellRunner(ActionRunner, ShellRunnerMixin):
         stdout = StringIO()
         stderr = StringIO()
 
-        store_execution_stdout_line = functools.partial(store_execution_output_data,
+        output_writer = ExecutionOutputWriter(execution_db=self.execution, action_db=self.action)
+        store_execution_stdout_line = functools.partial(output_writer.store_data,
                                                         output_type='stdout')
-        store_execution_stderr_line = functools.partial(store_execution_output_data,
+        store_execution_stderr_line = functools.partial(output_writer.store_data,
                                                         output_type='stderr')
 
         read_and_store_stdout = make_read_and_store_stream_func(execution_db=self.execution,
@@ -164,19 +165,17 @@ class LocalShellRunner(ActionRunner, ShellRunnerMixin):
         # Ideally os.killpg should have done the trick but for some reason that failed.
         # Note: pkill will set the returncode to 143 so we don't need to explicitly set
         # it to some non-zero value.
-        exit_code, stdout, stderr, timed_out = shell.run_command(cmd=args, stdin=None,
-                                                                 stdout=subprocess.PIPE,
-                                                                 stderr=subprocess.PIPE,
-                                                                 shell=True,
-                                                                 cwd=self._cwd,
-                                                                 env=env,
-                                                                 timeout=self._timeout,
-                                                                 preexec_func=os.setsid,
-                                                                 kill_func=kill_process,
-                                                           read_stdout_func=read_and_store_stdout,
-                                                           read_stderr_func=read_and_store_stderr,
-                                                           read_stdout_buffer=stdout,
-                                                           read_stderr_buffer=stderr)
+        try:
+            exit_code, stdout, stderr, timed_out = shell.run_command(
+                cmd=args, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True,
+                cwd=self._cwd, env=env, timeout=self._timeout, preexec_func=os.setsid,
+                kill_func=kill_process, read_stdout_func=read_and_store_stdout,
+                read_stderr_func=read_and_store_stderr, read_stdout_buffer=stdout,
+                read_stderr_buffer=stderr)
+        finally:
+            # Make sure all the buffered output is stored before the execution is marked as
+            # completed
+            output_writer.close()
 
         error = None
 
@@ -23,6 +23,7 @@ from StringIO import StringIO
 from subprocess import list2cmdline
 
 from eventlet.green import subprocess
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.runners.base import ActionRunner
@@ -42,7 +43,8 @@ from st2common.util.sandboxing import get_sandbox_python_path
 from st2common.util.sandboxing import get_sandbox_python_binary_path
 from st2common.util.sandboxing import get_sandbox_virtualenv_path
 from st2common.runners import python_action_wrapper
-from st2common.services.action import store_execution_output_data
+from st2common.runners.python_action_worker_pool import get_worker_pool
+from st2common.services.action import ExecutionOutputWriter
 from st2common.runners.utils import make_read_and_store_stream_func
 
 LOG = logging.getLogger(__name__)
@@ -161,22 +163,26 @@ class PythonRunner(ActionRunner):
         env['PYTHONPATH'] = get_sandbox_python_path(inherit_from_parent=True,
                                                     inherit_parent_virtualenv=True)
 
+        # Environment variables which are specific to this action execution
+        action_env = {}
+
         # Include user provided environment variables (if any)
         user_env_vars = self._get_env_vars()
-        env.update(user_env_vars)
+        action_env.update(user_env_vars)
 
         # Include common st2 environment variables
         st2_env_vars = self._get_common_action_env_variables()
-        env.update(st2_env_vars)
+        action_env.update(st2_env_vars)
         datastore_env_vars = self._get_datastore_access_env_vars()
-        env.update(datastore_env_vars)
+        action_env.update(datastore_env_vars)
 
         stdout = StringIO()
         stderr = StringIO()
 
-        store_execution_stdout_line = functools.partial(store_execution_output_data,
+        output_writer = ExecutionOutputWriter(execution_db=self.execution, action_db=self.action)
+        store_execution_stdout_line = functools.partial(output_writer.store_data,
                                                         output_type='stdout')
-        store_execution_stderr_line = functools.partial(store_execution_output_data,
+        store_execution_stderr_line = functools.partial(output_writer.store_data,
                                                         output_type='stderr')
 
         read_and_store_stdout = make_read_and_store_stream_func(execution_db=self.execution,
@@ -184,17 +190,47 @@ class PythonRunner(ActionRunner):
         read_and_store_stderr = make_read_and_store_stream_func(execution_db=self.execution,
             action_db=self.action, store_data_func=store_execution_stderr_line)
 
-        command_string = list2cmdline(args)
-        LOG.debug('Running command: PATH=%s PYTHONPATH=%s %s' % (env['PATH'], env['PYTHONPATH'],
-                                                                 command_string))
-        exit_code, stdout, stderr, timed_out = run_command(cmd=args, stdout=subprocess.PIPE,
-                                                           stderr=subprocess.PIPE, shell=False,
-                                                           env=env,
-                                                           timeout=self._timeout,
-                                                           read_stdout_func=read_and_store_stdout,
-                                                           read_stderr_func=read_and_store_stderr,
-                                                           read_stdout_buffer=stdout,
-                                                           read_stderr_buffer=stderr)
+        worker_pool = None
+        worker = None
+
+        if cfg.CONF.actionrunner.python_runner_use_worker_pool:
+            worker_pool = get_worker_pool()
+            worker = worker_pool.acquire(python_path=python_path, pack=pack,
+                                         entry_point=self.entry_point, env=env,
+                                         parent_args=sys.argv[1:])
+
+        try:
+            if worker:
+                LOG.debug('Running action inside a worker process (pid=%s)' % (worker.pid))
+                exit_code, stdout, stderr, timed_out = worker.run(
+                    file_path=self.entry_point, parameters=action_parameters,
+                    config=self._config, user=user, log_level=self._log_level, env=action_env,
+                    timeout=self._timeout, stdout_buffer=stdout, stderr_buffer=stderr,
+                    store_stdout_func=functools.partial(store_execution_stdout_line,
+                                                        execution_db=self.execution,
+                                                        action_db=self.action),
+                    store_stderr_func=functools.partial(store_execution_stderr_line,
+                                                        execution_db=self.execution,
+                                                        action_db=self.action))
+            else:
+                env = dict(env, **action_env)
+
+                command_string = list2cmdline(args)
+                LOG.debug('Running command: PATH=%s PYTHONPATH=%s %s' %
+                          (env['PATH'], env['PYTHONPATH'], command_string))
+                exit_code, stdout, stderr, timed_out = run_command(
+                    cmd=args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=False,
+                    env=env, timeout=self._timeout, read_stdout_func=read_and_store_stdout,
+                    read_stderr_func=read_and_store_stderr, read_stdout_buffer=stdout,
+                    read_stderr_buffer=stderr)
+        finally:
+            if worker:
+                worker_pool.release(worker)
+
+            # Make sure all the buffered output is stored before the execution is marked as
+            # completed
+            output_writer.close()
+
         LOG.debug('Returning values: %s, %s, %s, %s' % (exit_code, stdout, stderr, timed_out))
         LOG.debug('Returning.')
         return self._get_output_values(exit_code, stdout, stderr, timed_out)
@@ -216,12 +252,14 @@ class PythonRunner(ActionRunner):
             # TODO: Mark as failed instead
             raise ValueError(stderr)
 
-        if ACTION_OUTPUT_RESULT_DELIMITER in stdout:
-            split = stdout.split(ACTION_OUTPUT_RESULT_DELIMITER)
-            assert len(split) == 3
+        split = stdout.split(ACTION_OUTPUT_RESULT_DELIMITER)
+
+        if len(split) == 3:
             action_result = split[1].strip()
             stdout = split[0] + split[2]
         else:
+            # Note: Result is incomplete if the action has been killed while writing it
+            assert len(split) == 1 or timed_out
             action_result = None
 
         # Parse the serialized action result object
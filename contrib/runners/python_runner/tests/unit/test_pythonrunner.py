@@ -22,6 +22,7 @@ from oslo_config import cfg
 import python_runner
 from st2actions.container.base import RunnerContainer
 from st2common.runners.python_action_wrapper import PythonActionWrapper
+from st2common.runners.python_action_worker_pool import PythonActionWorkerPool
 from st2common.runners.base_action import Action
 from st2common.runners.utils import get_action_class_instance
 from st2common.services import config as config_service
@@ -380,6 +381,100 @@ class PythonRunnerTestCase(RunnerTestCase, CleanDbTestCase):
         self.assertEqual(output_dbs[1].data, mock_stderr[1])
         self.assertEqual(output_dbs[2].data, mock_stderr[2])
 
+    @mock.patch('st2common.util.green.shell.subprocess.Popen')
+    @mock.patch('st2common.util.green.shell.eventlet.spawn')
+    def test_action_stdout_and_stderr_is_stored_in_the_db_buffered(self, mock_spawn, mock_popen):
+        # Feature is enabled and output is buffered
+        cfg.CONF.set_override(name='stream_output', group='actionrunner', override=True)
+        cfg.CONF.set_override(name='stream_output_buffer_size', group='actionrunner',
+                              override=65536)
+        cfg.CONF.set_override(name='stream_output_flush_interval', group='actionrunner',
+                              override=60)
+
+        values = {'delimiter': ACTION_OUTPUT_RESULT_DELIMITER}
+
+        # Note: We need to mock spawn function so we can test everything in single event loop
+        # iteration
+        mock_spawn.side_effect = blocking_eventlet_spawn
+
+        mock_stdout = [
+            'pre result line 1\n',
+            'pre result line 2\n',
+            '%(delimiter)sTrue%(delimiter)s' % values,
+            'post result line 1'
+        ]
+        mock_stderr = [
+            'stderr line 1\n',
+            'stderr line 2\n',
+            'stderr line 3\n'
+        ]
+
+        mock_process = mock.Mock()
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
+        mock_process.stdout.closed = False
+        mock_process.stderr.closed = False
+        mock_process.stdout.readline = make_mock_stream_readline(mock_process.stdout, mock_stdout,
+                                                                 stop_counter=4)
+        mock_process.stderr.readline = make_mock_stream_readline(mock_process.stderr, mock_stderr,
+                                                                 stop_counter=3)
+
+        runner = self._get_mock_runner_obj()
+        runner.entry_point = PASCAL_ROW_ACTION_PATH
+        runner.pre_run()
+        (_, output, _) = runner.run({'row_index': 4})
+
+        self.assertEqual(output['stdout'],
+                         'pre result line 1\npre result line 2\npost result line 1')
+        self.assertEqual(output['stderr'], 'stderr line 1\nstderr line 2\nstderr line 3\n')
+
+        # All the lines are stored as a single chunk per output type once the action finishes
+        output_dbs = ActionExecutionOutput.query(output_type='stdout')
+        self.assertEqual(len(output_dbs), 1)
+        self.assertEqual(output_dbs[0].runner_ref, 'python-script')
+        self.assertEqual(output_dbs[0].data, mock_stdout[0] + mock_stdout[1] + mock_stdout[3])
+
+        output_dbs = ActionExecutionOutput.query(output_type='stderr')
+        self.assertEqual(len(output_dbs), 1)
+        self.assertEqual(output_dbs[0].data, ''.join(mock_stderr))
+
+        cfg.CONF.set_override(name='stream_output_buffer_size', group='actionrunner', override=0)
+
+    def test_action_is_ran_inside_a_worker_process_when_worker_pool_is_enabled(self):
+        worker_pool = PythonActionWorkerPool(size=1)
+        cfg.CONF.set_override(name='python_runner_use_worker_pool', group='actionrunner',
+                              override=True)
+
+        try:
+            with mock.patch('python_runner.get_worker_pool', mock.Mock(return_value=worker_pool)):
+                runner = self._get_mock_runner_obj()
+                runner.entry_point = PASCAL_ROW_ACTION_PATH
+                runner.pre_run()
+                (status, output, _) = runner.run({'row_index': 4})
+                self.assertEqual(status, LIVEACTION_STATUS_SUCCEEDED)
+                self.assertEqual(output['result'], [1, 4, 6, 4, 1])
+                self.assertTrue('test info log message' in output['stderr'])
+
+                runner = self._get_mock_runner_obj()
+                runner.entry_point = PASCAL_ROW_ACTION_PATH
+                runner.pre_run()
+                (status, output, _) = runner.run({'row_index': 'a'})
+                self.assertEqual(status, LIVEACTION_STATUS_FAILED)
+                self.assertEqual(output['result'], "This is suppose to fail don't worry!!")
+
+                runner = self._get_mock_runner_obj()
+                runner.runner_parameters = {python_runner.RUNNER_TIMEOUT: 0}
+                runner.entry_point = PASCAL_ROW_ACTION_PATH
+                runner.pre_run()
+                (status, output, _) = runner.run({'row_index': 4})
+                self.assertEqual(status, LIVEACTION_STATUS_TIMED_OUT)
+                self.assertEqual(output['error'], 'Action failed to complete in 0 seconds')
+                self.assertEqual(output['exit_code'], -9)
+        finally:
+            cfg.CONF.set_override(name='python_runner_use_worker_pool', group='actionrunner',
+                                  override=False)
+            worker_pool.shutdown()
+
     @mock.patch('st2common.util.green.shell.subprocess.Popen')
     def test_stdout_interception_and_parsing(self, mock_popen):
         values = {'delimiter': ACTION_OUTPUT_RESULT_DELIMITER}
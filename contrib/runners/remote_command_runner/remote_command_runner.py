@@ -40,7 +40,13 @@ class ParamikoRemoteCommandRunner(BaseParallelSSHRunner):
         remote_action = self._get_remote_action(action_parameters)
 
         LOG.debug('Executing remote command action.', extra={'_action_params': remote_action})
-        result = self._run(remote_action)
+        try:
+            result = self._run(remote_action)
+        finally:
+            # Make sure all the buffered output is stored before the execution is marked as
+            # completed
+            self._close_output_writer()
+
         LOG.debug('Executed remote_action.', extra={'_result': result})
         status = self._get_result_status(result, cfg.CONF.ssh_runner.allow_partial_failure)
 
@@ -24,6 +24,7 @@ from st2common import log as logging
 from st2common.runners.paramiko_ssh_runner import RUNNER_REMOTE_DIR
 from st2common.runners.paramiko_ssh_runner import BaseParallelSSHRunner
 from st2common.models.system.paramiko_script_action import ParamikoRemoteScriptAction
+from st2common.util.file_system import get_content_hash
 
 __all__ = [
     'get_runner',
@@ -33,6 +34,9 @@ __all__ = [
 
 LOG = logging.getLogger(__name__)
 
+# Name of the directory (inside the remote dir) which contains cached scripts and libs
+REMOTE_SCRIPT_CACHE_DIR = '.st2-script-cache'
+
 
 def get_runner():
     return ParamikoRemoteScriptRunner(str(uuid.uuid4()))
@@ -43,7 +47,13 @@ class ParamikoRemoteScriptRunner(BaseParallelSSHRunner):
         remote_action = self._get_remote_action(action_parameters)
 
         LOG.debug('Executing remote action.', extra={'_action_params': remote_action})
-        result = self._run(remote_action)
+        try:
+            result = self._run(remote_action)
+        finally:
+            # Make sure all the buffered output is stored before the execution is marked as
+            # completed
+            self._close_output_writer()
+
         LOG.debug('Executed remote action.', extra={'_result': result})
         status = self._get_result_status(result, cfg.CONF.ssh_runner.allow_partial_failure)
 
@@ -63,6 +73,11 @@ class ParamikoRemoteScriptRunner(BaseParallelSSHRunner):
 
         try:
             exec_results = self._run_script_on_remote_host(remote_action)
+
+            if self._use_script_cache():
+                # Cached scripts are re-used by the other executions
+                return exec_results
+
             try:
                 remote_dir = remote_action.get_remote_base_dir()
                 LOG.debug('Deleting remote execution dir.', extra={'_remote_dir': remote_dir})
@@ -81,6 +96,9 @@ class ParamikoRemoteScriptRunner(BaseParallelSSHRunner):
             return exec_results
 
     def _copy_artifacts(self, remote_action):
+        if self._use_script_cache():
+            return self._copy_artifacts_to_cache(remote_action)
+
         # First create remote execution directory.
         remote_dir = remote_action.get_remote_base_dir()
         LOG.debug('Creating remote execution dir.', extra={'_path': remote_dir})
@@ -109,6 +127,24 @@ class ParamikoRemoteScriptRunner(BaseParallelSSHRunner):
         result = mkdir_result or put_result_1 or put_result_2
         return result
 
+    def _copy_artifacts_to_cache(self, remote_action):
+        files = [
+            {'local_path': remote_action.get_local_script_abs_path(), 'mode': 0744}
+        ]
+
+        local_libs_path = remote_action.get_local_libs_path_abs()
+        if local_libs_path and os.path.exists(local_libs_path):
+            files.append({'local_path': local_libs_path, 'mirror_local_mode': True})
+
+        remote_dir = remote_action.get_remote_base_dir()
+        LOG.debug('Copying script and libs to remote cache dir.', extra={'_path': remote_dir})
+        max_entries = cfg.CONF.ssh_runner.remote_script_cache_max_entries
+        # Directories used by the running actions must never be evicted
+        min_age = max(cfg.CONF.ssh_runner.remote_script_cache_eviction_grace_period,
+                      remote_action.get_timeout() or 0)
+        return self._parallel_ssh_client.put_cached(files=files, remote_path=remote_dir,
+                                                    max_entries=max_entries, min_age=min_age)
+
     def _run_script_on_remote_host(self, remote_action):
         command = remote_action.get_full_command_string()
         LOG.info('Command to run: %s', command)
@@ -130,7 +166,19 @@ class ParamikoRemoteScriptRunner(BaseParallelSSHRunner):
         env_vars = self._get_env_vars()
         remote_dir = self.runner_parameters.get(RUNNER_REMOTE_DIR,
                                                 cfg.CONF.ssh_runner.remote_dir)
-        remote_dir = os.path.join(remote_dir, self.liveaction_id)
+
+        if self._use_script_cache():
+            # Script and libs are stored in a directory named after the hash of their content
+            # so they are only uploaded once
+            paths = [script_local_path_abs]
+            if self.libs_dir_path and os.path.exists(self.libs_dir_path):
+                paths.append(self.libs_dir_path)
+
+            remote_dir = os.path.join(remote_dir, REMOTE_SCRIPT_CACHE_DIR,
+                                      get_content_hash(paths=paths))
+        else:
+            remote_dir = os.path.join(remote_dir, self.liveaction_id)
+
         return ParamikoRemoteScriptAction(self.action_name,
                                           str(self.liveaction_id),
                                           script_local_path_abs,
@@ -149,6 +197,10 @@ class ParamikoRemoteScriptRunner(BaseParallelSSHRunner):
                                           timeout=self._timeout,
                                           cwd=self._cwd)
 
+    @staticmethod
+    def _use_script_cache():
+        return cfg.CONF.ssh_runner.use_remote_script_cache
+
     @staticmethod
     def _generate_error_results(error, tb):
         error_dict = {
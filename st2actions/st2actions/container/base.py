@@ -49,13 +49,13 @@ __all__ = [
 class RunnerContainer(object):
 
     def dispatch(self, liveaction_db):
-        action_db = get_action_by_ref(liveaction_db.action)
+        action_db = get_action_by_ref(liveaction_db.action, use_cache=True)
         if not action_db:
             raise Exception('Action %s not found in DB.' % (liveaction_db.action))
 
         liveaction_db.context['pack'] = action_db.pack
 
-        runnertype_db = get_runnertype_by_name(action_db.runner_type['name'])
+        runnertype_db = get_runnertype_by_name(action_db.runner_type['name'], use_cache=True)
 
         extra = {'liveaction_db': liveaction_db, 'runnertype_db': runnertype_db}
         LOG.info('Dispatching Action to a runner', extra=extra)
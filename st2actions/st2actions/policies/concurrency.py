@@ -79,6 +79,9 @@ class ConcurrencyApplicator(BaseConcurrencyApplicator):
                       '"%s" cannot be applied. %s', self._policy_ref, target)
             return target
 
+        if self._use_slots():
+            return self._schedule(target)
+
         # Acquire a distributed lock before querying the database to make sure that only one
         # scheduler is scheduling execution for this action. Even if the coordination service
         # is not configured, the fake driver using zake or the file driver can still acquire
@@ -103,6 +106,10 @@ class ConcurrencyApplicator(BaseConcurrencyApplicator):
     def apply_after(self, target):
         target = super(ConcurrencyApplicator, self).apply_after(target=target)
 
+        if self._use_slots():
+            self._release(target)
+            return target
+
         # Acquire a distributed lock before querying the database to make sure that only one
         # scheduler is scheduling execution for this action. Even if the coordination service
         # is not configured, the fake driver using zake or the file driver can still acquire
@@ -101,6 +101,9 @@ class ConcurrencyByAttributeApplicator(BaseConcurrencyApplicator):
                       '"%s" cannot be applied. %s', self._policy_ref, target)
             return target
 
+        if self._use_slots():
+            return self._schedule(target)
+
         # Warn users that the coordination service is not configured.
         if not coordination.configured():
             LOG.warn('Coordination service is not configured. Policy enforcement is best effort.')
@@ -127,6 +130,10 @@ class ConcurrencyByAttributeApplicator(BaseConcurrencyApplicator):
                 requests[0], action_constants.LIVEACTION_STATUS_REQUESTED, publish=True)
 
     def apply_after(self, target):
+        if self._use_slots():
+            self._release(target)
+            return target
+
         # Warn users that the coordination service is not configured.
         if not coordination.configured():
             LOG.warn('Coordination service is not configured. Policy enforcement is best effort.')
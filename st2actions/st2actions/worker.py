@@ -25,6 +25,7 @@ from st2common.exceptions.actionrunner import ActionRunnerException
 from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.models.db.liveaction import LiveActionDB
 from st2common.persistence.execution import ActionExecution
+from st2common.runners.python_action_worker_pool import shutdown_worker_pool
 from st2common.services import executions
 from st2common.transport.consumers import MessageHandler
 from st2common.transport.consumers import ActionsQueueConsumer
@@ -132,6 +133,9 @@ class ActionExecutionDispatcher(MessageHandler):
             except:
                 LOG.exception('Failed to abandon liveaction %s.', liveaction_id)
 
+        # Terminate the Python runner worker processes
+        shutdown_worker_pool()
+
     def _run_action(self, liveaction_db):
         # stamp liveaction with process_info
         runner_info = system_info.get_process_info()
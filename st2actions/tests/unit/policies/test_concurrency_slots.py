@@ -0,0 +1,167 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import mock
+from oslo_config import cfg
+
+from st2actions.policies.concurrency import ConcurrencyApplicator
+from st2actions.policies.concurrency_by_attr import ConcurrencyByAttributeApplicator
+from st2common.constants import action as action_constants
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.persistence.liveaction import LiveAction
+from st2common.persistence.policy import ConcurrencyQueue
+from st2common.persistence.policy import ConcurrencySlots
+from st2common.services import action as action_service
+from st2tests.base import CleanDbTestCase
+
+__all__ = [
+    'ConcurrencySlotsTestCase'
+]
+
+
+def mock_update_status(liveaction, new_status, result=None, publish=True):
+    liveaction.status = new_status
+    return LiveAction.add_or_update(liveaction, publish=False)
+
+
+@mock.patch.object(action_service, 'update_status', mock.MagicMock(side_effect=mock_update_status))
+class ConcurrencySlotsTestCase(CleanDbTestCase):
+    def setUp(self):
+        super(ConcurrencySlotsTestCase, self).setUp()
+
+        cfg.CONF.set_override(name='use_concurrency_slots', override=True, group='scheduler')
+        self.addCleanup(cfg.CONF.clear_override, name='use_concurrency_slots', group='scheduler')
+
+        self.policy = ConcurrencyApplicator(policy_ref='wolfpack.action-1.concurrency',
+                                            policy_type='action.concurrency', threshold=2)
+
+    def _request(self, action='wolfpack.action-1', parameters=None):
+        liveaction_db = LiveActionDB(action=action, parameters=parameters or {},
+                                     status=action_constants.LIVEACTION_STATUS_REQUESTED)
+        return LiveAction.add_or_update(liveaction_db, publish=False)
+
+    def _complete(self, policy, liveaction_db):
+        liveaction_db = mock_update_status(liveaction_db,
+                                           action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        policy.apply_after(liveaction_db)
+
+    def _get_status(self, liveaction_db):
+        return LiveAction.get_by_id(str(liveaction_db.id)).status
+
+    def test_executions_are_delayed_and_promoted_in_order(self):
+        with mock.patch.object(LiveAction, 'count') as count:
+            liveaction_dbs = [self.policy.apply_before(self._request()) for _ in range(4)]
+
+            # Scheduling decisions don't count the executions in the database
+            self.assertFalse(count.called)
+
+        self.assertEqual([liveaction_db.status for liveaction_db in liveaction_dbs],
+                         ['scheduled', 'scheduled', 'delayed', 'delayed'])
+
+        key = self.policy._get_slots_key(liveaction_dbs[0])
+        self.assertEqual(ConcurrencySlots.get(key=key).slots_used, 2)
+        self.assertEqual(sorted(ConcurrencyQueue.get_liveaction_ids(key=key)),
+                         sorted([str(liveaction_dbs[2].id), str(liveaction_dbs[3].id)]))
+
+        # Released slot is handed to the oldest delayed execution
+        self._complete(self.policy, liveaction_dbs[0])
+        self.assertEqual(self._get_status(liveaction_dbs[2]), 'requested')
+        self.assertEqual(self._get_status(liveaction_dbs[3]), 'delayed')
+        action_service.update_status.assert_called_with(mock.ANY, 'requested', publish=True)
+
+        # New execution can't take the slot of the promoted one
+        self.assertEqual(self.policy.apply_before(self._request()).status, 'delayed')
+
+        liveaction_db = LiveAction.get_by_id(str(liveaction_dbs[2].id))
+        self.assertEqual(self.policy.apply_before(liveaction_db).status, 'scheduled')
+        self.assertEqual(ConcurrencySlots.get(key=key).slots_used, 2)
+
+    def test_canceled_delayed_execution_is_skipped(self):
+        liveaction_dbs = [self.policy.apply_before(self._request()) for _ in range(4)]
+
+        liveaction_dbs[2] = mock_update_status(liveaction_dbs[2],
+                                               action_constants.LIVEACTION_STATUS_CANCELED)
+        self.policy.apply_after(liveaction_dbs[2])
+
+        self._complete(self.policy, liveaction_dbs[0])
+        self.assertEqual(self._get_status(liveaction_dbs[3]), 'requested')
+
+        key = self.policy._get_slots_key(liveaction_dbs[0])
+        self.assertEqual(ConcurrencyQueue.get_liveaction_ids(key=key), [])
+        self.assertEqual(sorted(ConcurrencySlots.get(key=key).holders),
+                         sorted([str(liveaction_dbs[1].id), str(liveaction_dbs[3].id)]))
+
+    def test_slots_are_reconciled_with_executions(self):
+        liveaction_dbs = [self.policy.apply_before(self._request()) for _ in range(3)]
+        self.assertEqual(liveaction_dbs[2].status, 'delayed')
+
+        # Execution completes without releasing the slot
+        mock_update_status(liveaction_dbs[0], action_constants.LIVEACTION_STATUS_ABANDONED)
+
+        # Execution delayed before the slots have been created is added to the queue
+        key = self.policy._get_slots_key(liveaction_dbs[0])
+        ConcurrencyQueue.remove(key=key, liveaction_ids=[str(liveaction_dbs[2].id)])
+
+        liveaction_db = self.policy.apply_before(self._request())
+        self.assertEqual(liveaction_db.status, 'delayed')
+        self.assertEqual(self._get_status(liveaction_dbs[2]), 'requested')
+
+        slots_db = ConcurrencySlots.get(key=key)
+        self.assertEqual(slots_db.slots_used, 2)
+        self.assertEqual(sorted(slots_db.holders),
+                         sorted([str(liveaction_dbs[1].id), str(liveaction_dbs[2].id)]))
+        self.assertEqual(ConcurrencyQueue.get_liveaction_ids(key=key), [str(liveaction_db.id)])
+
+    def test_reconciliation_keeps_promoted_delayed_executions(self):
+        liveaction_dbs = [self.policy.apply_before(self._request()) for _ in range(3)]
+        key = self.policy._get_slots_key(liveaction_dbs[0])
+
+        # Slot is released, but the delayed execution is only handed the slot (its status is
+        # updated afterwards) when the slots are reconciled
+        mock_update_status(liveaction_dbs[0], action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        ConcurrencySlots.release(key=key, holder=str(liveaction_dbs[0].id))
+        self.assertTrue(ConcurrencySlots.reserve(key=key, threshold=2))
+        self.assertEqual(ConcurrencyQueue.pop(key=key), str(liveaction_dbs[2].id))
+        self.assertTrue(ConcurrencySlots.assign(key=key, holder=str(liveaction_dbs[2].id)))
+
+        self.assertTrue(self.policy._reconcile(target=liveaction_dbs[0], key=key))
+
+        slots_db = ConcurrencySlots.get(key=key)
+        self.assertEqual(slots_db.slots_used, 2)
+        self.assertEqual(sorted(slots_db.holders),
+                         sorted([str(liveaction_dbs[1].id), str(liveaction_dbs[2].id)]))
+        self.assertEqual(ConcurrencyQueue.get_liveaction_ids(key=key), [])
+
+    def test_over_threshold_cancel_executions(self):
+        policy = ConcurrencyApplicator(policy_ref='wolfpack.action-2.concurrency.cancel',
+                                       policy_type='action.concurrency', threshold=1,
+                                       action='cancel')
+
+        self.assertEqual(policy.apply_before(self._request()).status, 'scheduled')
+        self.assertEqual(policy.apply_before(self._request()).status, 'canceling')
+        action_service.update_status.assert_called_with(mock.ANY, 'canceling', publish=True)
+
+    def test_slots_by_attribute(self):
+        policy = ConcurrencyByAttributeApplicator(policy_ref='wolfpack.action-1.concurrency.attr',
+                                                  policy_type='action.concurrency.attr',
+                                                  threshold=1, attributes=['actionstr'])
+
+        liveaction1_db = policy.apply_before(self._request(parameters={'actionstr': 'foo'}))
+        liveaction2_db = policy.apply_before(self._request(parameters={'actionstr': 'foo'}))
+        liveaction3_db = policy.apply_before(self._request(parameters={'actionstr': 'bar'}))
+        self.assertEqual([liveaction1_db.status, liveaction2_db.status, liveaction3_db.status],
+                         ['scheduled', 'delayed', 'scheduled'])
+
+        self._complete(policy, liveaction1_db)
+        self.assertEqual(self._get_status(liveaction2_db), 'requested')
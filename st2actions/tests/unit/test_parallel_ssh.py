@@ -15,6 +15,10 @@
 
 import json
 import os
+import shutil
+import subprocess
+import tempfile
+import time
 
 from mock import (patch, Mock, MagicMock)
 import unittest2
@@ -180,6 +184,147 @@ class ParallelSSHTests(unittest2.TestCase):
             client._hosts_client[hostname].put.assert_called_with('/local/stuff', '/remote/stuff',
                                                                   **expected_kwargs)
 
+    @patch('paramiko.SSHClient', Mock)
+    @patch.object(os.path, 'exists', MagicMock(return_value=True))
+    @patch.object(os.path, 'isdir', MagicMock(side_effect=lambda path: path == '/local/lib'))
+    @patch.object(ParamikoSSHClient, '_is_key_file_needs_passphrase',
+                  MagicMock(return_value=False))
+    def test_put_cached(self):
+        hosts = ['localhost', '127.0.0.1']
+        client = ParallelSSHClient(hosts=hosts,
+                                   user='ubuntu',
+                                   pkey_file='~/.ssh/id_rsa',
+                                   connect=True)
+
+        for ssh_client in client._hosts_client.values():
+            ssh_client.put = MagicMock(return_value={})
+            ssh_client.put_dir = MagicMock(return_value=[])
+
+        # Files are already cached on "localhost"
+        client._hosts_client['localhost'].run = MagicMock(return_value=('', '', 0))
+        client._hosts_client['127.0.0.1'].run = MagicMock(
+            side_effect=lambda cmd: ('', '', 1 if cmd.startswith('test -d') else 0))
+
+        files = [
+            {'local_path': '/local/script.sh', 'mode': 0744},
+            {'local_path': '/local/lib', 'mirror_local_mode': True}
+        ]
+        results = client.put_cached(files=files, remote_path='/tmp/cache/abcd', max_entries=5,
+                                    min_age=3600)
+        self.assertEqual(results, {'localhost': {'cached': True}, '127.0.0.1': {'cached': False}})
+
+        cached_client = client._hosts_client['localhost']
+        self.assertEqual(cached_client.run.call_count, 1)
+        check_command = cached_client.run.call_args[0][0]
+        self.assertTrue(check_command.startswith('test -d /tmp/cache && test ! -L /tmp/cache && '
+                                                 'test -O /tmp/cache'))
+        self.assertTrue('test -O /tmp/cache/abcd' in check_command)
+        self.assertTrue(check_command.endswith('test -f /tmp/cache/abcd/.st2-complete && '
+                                               'touch /tmp/cache/abcd'))
+        self.assertFalse(cached_client.put.called)
+
+        uploaded_client = client._hosts_client['127.0.0.1']
+        self.assertEqual(uploaded_client.run.call_count, 3)
+        mkdir_command = uploaded_client.run.call_args_list[1][0][0]
+        self.assertTrue(mkdir_command.startswith('mkdir -p -m 700 /tmp/cache && '))
+        temp_path = uploaded_client.put_dir.call_args[0][1]
+        self.assertTrue(temp_path.startswith('/tmp/cache/abcd.'))
+        uploaded_client.put_dir.assert_called_with('/local/lib', temp_path,
+                                                   mirror_local_mode=True)
+        uploaded_client.put.assert_called_with('/local/script.sh', temp_path + '/script.sh',
+                                               mode=0744, mirror_local_mode=False)
+
+        finalize_command = uploaded_client.run.call_args[0][0]
+        self.assertTrue('mv -T %s /tmp/cache/abcd' % (temp_path) in finalize_command)
+        self.assertTrue('cd /tmp/cache && for entry in $(ls -1t' in finalize_command)
+        self.assertTrue('tail -n +6' in finalize_command)
+        # Only entries which haven't been used for longer than min_age are evicted
+        self.assertFalse('xargs rm' in finalize_command)
+        self.assertEqual(finalize_command.count('-mmin +60 -exec rm -rf {} \\;'), 2)
+        # Eviction failures don't fail the upload
+        self.assertTrue(finalize_command.endswith('|| true; }'))
+
+    @patch('paramiko.SSHClient', Mock)
+    @patch.object(ParamikoSSHClient, '_is_key_file_needs_passphrase',
+                  MagicMock(return_value=False))
+    def test_put_cached_only_reuses_private_directories(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        script_path = os.path.join(temp_dir, 'script.sh')
+        with open(script_path, 'w') as fp:
+            fp.write('echo 1')
+
+        client = ParallelSSHClient(hosts=['localhost'], user='ubuntu', pkey_file='~/.ssh/id_rsa',
+                                   connect=True)
+
+        # Commands are run on the local host
+        def run(cmd):
+            process = subprocess.Popen(['bash', '-c', cmd], stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+            stdout, stderr = process.communicate()
+            return stdout, stderr, process.returncode
+
+        ssh_client = client._hosts_client['localhost']
+        ssh_client.run = MagicMock(side_effect=run)
+        ssh_client.put = MagicMock(side_effect=lambda local_path, path, **kwargs:
+                                   shutil.copy(local_path, path))
+
+        cache_path = os.path.join(temp_dir, 'remote', '.st2-script-cache')
+        remote_path = os.path.join(cache_path, 'abcd')
+        entry_script_path = os.path.join(remote_path, 'script.sh')
+
+        def put_cached():
+            results = client.put_cached(files=[{'local_path': script_path}],
+                                        remote_path=remote_path)
+            return results['localhost'].get('cached', None)
+
+        self.assertEqual(put_cached(), False)
+        self.assertEqual(os.stat(cache_path).st_mode & 0777, 0700)
+        self.assertEqual(sorted(os.listdir(remote_path)), ['.st2-complete', 'script.sh'])
+        self.assertEqual(put_cached(), True)
+
+        # Entries which can be modified by other users are replaced
+        os.chmod(remote_path, 0777)
+        with open(entry_script_path, 'w') as fp:
+            fp.write('echo planted')
+        self.assertEqual(put_cached(), False)
+        self.assertEqual(open(entry_script_path).read(), 'echo 1')
+        self.assertEqual(os.stat(remote_path).st_mode & 0777, 0700)
+
+        os.chmod(cache_path, 0777)
+        self.assertEqual(put_cached(), False)
+        self.assertEqual(os.stat(cache_path).st_mode & 0777, 0700)
+
+        # Incomplete entries are replaced instead of being used
+        os.remove(os.path.join(remote_path, '.st2-complete'))
+        os.remove(entry_script_path)
+        self.assertEqual(put_cached(), False)
+        self.assertEqual(sorted(os.listdir(remote_path)), ['.st2-complete', 'script.sh'])
+        self.assertEqual(os.listdir(cache_path), ['abcd'])
+
+    def test_cache_eviction_command(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+
+        # Old entries, a recently used entry over the limit and a stale unfinished upload
+        for index, name in enumerate(['a', 'b', 'c', 'c.1234']):
+            os.mkdir(os.path.join(temp_dir, name))
+            mtime = time.time() - 7200 + index
+            os.utime(os.path.join(temp_dir, name), (mtime, mtime))
+        os.mkdir(os.path.join(temp_dir, 'd'))
+        os.mkdir(os.path.join(temp_dir, 'd.5678'))
+
+        command = ParallelSSHClient._get_cache_eviction_command(cache_path=temp_dir,
+                                                                max_entries=1, min_age=3600)
+        self.assertEqual(subprocess.call(['bash', '-c', command]), 0)
+        self.assertEqual(sorted(os.listdir(temp_dir)), ['d', 'd.5678'])
+
+        # Entries which are still in use are kept
+        command = ParallelSSHClient._get_cache_eviction_command(cache_path=temp_dir,
+                                                                max_entries=0, min_age=3600)
+        self.assertEqual(subprocess.call(['bash', '-c', command]), 0)
+        self.assertEqual(sorted(os.listdir(temp_dir)), ['d', 'd.5678'])
+
     @patch('paramiko.SSHClient', Mock)
     @patch.object(ParamikoSSHClient, 'delete_file', MagicMock(return_value={}))
     @patch.object(ParamikoSSHClient, '_is_key_file_needs_passphrase',
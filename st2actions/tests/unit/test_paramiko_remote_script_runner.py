@@ -13,8 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import shutil
+import tempfile
+
 import bson
 from mock import patch, Mock, MagicMock
+from oslo_config import cfg
 import unittest2
 
 # XXX: There is an import dependency. Config needs to setup
@@ -28,6 +33,8 @@ from st2common.runners.parallel_ssh import ParallelSSHClient
 from st2common.exceptions.ssh import NoHostsConnectedToException
 from st2common.models.system.paramiko_script_action import ParamikoRemoteScriptAction
 from st2common.constants.action import LIVEACTION_STATUS_FAILED
+from st2common.constants.action import LIVEACTION_STATUS_SUCCEEDED
+from st2common.util.file_system import get_content_hash
 from st2tests.fixturesloader import FixturesLoader
 
 __all__ = [
@@ -101,3 +108,48 @@ class ParamikoScriptRunnerTestCase(unittest2.TestCase):
         self.assertEqual(result['failed'], True)
         self.assertEqual(result['succeeded'], False)
         self.assertTrue('Failed copying content to remote boxes' in result['error'])
+
+    def test_script_cache(self):
+        cfg.CONF.set_override(name='use_remote_script_cache', override=True, group='ssh_runner')
+        self.addCleanup(cfg.CONF.clear_override, name='use_remote_script_cache',
+                        group='ssh_runner')
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        script_path = os.path.join(temp_dir, 'script.sh')
+        with open(script_path, 'w') as fp:
+            fp.write('echo 1')
+
+        paramiko_runner = ParamikoRemoteScriptRunner('runner_1')
+        paramiko_runner.runner_parameters = {
+            'username': 'test_user',
+            'hosts': '127.0.0.1'
+        }
+        paramiko_runner.action = ACTION_1
+        paramiko_runner.liveaction_id = 'foo'
+        paramiko_runner.entry_point = script_path
+        paramiko_runner.context = {}
+        paramiko_runner._hosts = ['127.0.0.1']
+        paramiko_runner._cwd = '/tmp'
+        paramiko_runner._parallel_ssh_client = Mock()
+        paramiko_runner._parallel_ssh_client.put_cached.return_value = {
+            '127.0.0.1': {'cached': True}
+        }
+        paramiko_runner._parallel_ssh_client.run.return_value = {
+            '127.0.0.1': {'succeeded': True, 'failed': False, 'return_code': 0}
+        }
+
+        status, _, _ = paramiko_runner.run(action_parameters={})
+        self.assertEqual(status, LIVEACTION_STATUS_SUCCEEDED)
+
+        # Script is stored in a directory named after the hash of its content and the directory
+        # is not removed after the execution
+        cache_dir = os.path.join('/tmp/.st2-script-cache', get_content_hash(paths=[script_path]))
+        paramiko_runner._parallel_ssh_client.put_cached.assert_called_once_with(
+            files=[{'local_path': script_path, 'mode': 0744}], remote_path=cache_dir,
+            max_entries=20, min_age=86400)
+        self.assertFalse(paramiko_runner._parallel_ssh_client.mkdir.called)
+        self.assertFalse(paramiko_runner._parallel_ssh_client.delete_dir.called)
+
+        command = paramiko_runner._parallel_ssh_client.run.call_args[0][0]
+        self.assertTrue(command.endswith('cd /tmp && %s/script.sh' % (cache_dir)))
@@ -65,6 +65,7 @@ class ParamikoSSHRunnerTestCase(unittest2.TestCase):
             'bastion_host': None,
             'raise_on_any_error': False,
             'connect': True,
+            'connection_pool': None,
             'handle_stdout_line_func': mock.ANY,
             'handle_stderr_line_func': mock.ANY
         }
@@ -91,6 +92,7 @@ class ParamikoSSHRunnerTestCase(unittest2.TestCase):
             'bastion_host': None,
             'raise_on_any_error': False,
             'connect': True,
+            'connection_pool': None,
             'handle_stdout_line_func': mock.ANY,
             'handle_stderr_line_func': mock.ANY
         }
@@ -119,6 +121,7 @@ class ParamikoSSHRunnerTestCase(unittest2.TestCase):
             'bastion_host': None,
             'raise_on_any_error': False,
             'connect': True,
+            'connection_pool': None,
             'handle_stdout_line_func': mock.ANY,
             'handle_stderr_line_func': mock.ANY
         }
@@ -145,6 +148,7 @@ class ParamikoSSHRunnerTestCase(unittest2.TestCase):
             'bastion_host': None,
             'raise_on_any_error': False,
             'connect': True,
+            'connection_pool': None,
             'handle_stdout_line_func': mock.ANY,
             'handle_stderr_line_func': mock.ANY
         }
@@ -173,6 +177,7 @@ class ParamikoSSHRunnerTestCase(unittest2.TestCase):
             'bastion_host': None,
             'raise_on_any_error': False,
             'connect': True,
+            'connection_pool': None,
             'handle_stdout_line_func': mock.ANY,
             'handle_stderr_line_func': mock.ANY
         }
@@ -197,6 +202,7 @@ class ParamikoSSHRunnerTestCase(unittest2.TestCase):
             'bastion_host': None,
             'raise_on_any_error': False,
             'connect': True,
+            'connection_pool': None,
             'handle_stdout_line_func': mock.ANY,
             'handle_stderr_line_func': mock.ANY
         }
@@ -224,6 +230,7 @@ class ParamikoSSHRunnerTestCase(unittest2.TestCase):
             'bastion_host': None,
             'raise_on_any_error': False,
             'connect': True,
+            'connection_pool': None,
             'handle_stdout_line_func': mock.ANY,
             'handle_stderr_line_func': mock.ANY
         }
@@ -0,0 +1,247 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+import threading
+import time
+
+import eventlet
+import paramiko
+import unittest2
+from oslo_config import cfg
+
+from st2common.runners.parallel_ssh import ParallelSSHClient
+from st2common.runners.paramiko_ssh import ParamikoSSHClient
+from st2common.runners.ssh_connection_pool import SSHConnectionPool
+from st2common.runners.ssh_connection_pool import SSHConnectionPoolTimeoutError
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+USERS = {
+    'stanley': 'secret',
+    'joe': 'secret2'
+}
+
+
+class FakeSSHServerInterface(paramiko.ServerInterface):
+    """
+    Server which accepts password authentication and echoes the executed commands.
+    """
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_auth_password(self, username, password):
+        if USERS.get(username, None) == password:
+            return paramiko.AUTH_SUCCESSFUL
+
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind == 'session':
+            return paramiko.OPEN_SUCCEEDED
+
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        def respond():
+            # Give the transport a chance to acknowledge the request first
+            time.sleep(0.05)
+            channel.sendall('ran: %s\n' % (command))
+            channel.send_exit_status(0)
+            channel.close()
+
+        thread = threading.Thread(target=respond)
+        thread.daemon = True
+        thread.start()
+        return True
+
+
+class FakeSSHServer(object):
+    """
+    Local SSH server stand-in which keeps track of the number of accepted connections.
+    """
+
+    def __init__(self, host_key):
+        self.host_key = host_key
+        self.accepted_connections = 0
+        self.transports = []
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(('127.0.0.1', 0))
+        self._socket.listen(10)
+        self.port = self._socket.getsockname()[1]
+
+        self._thread = threading.Thread(target=self._accept)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _accept(self):
+        while True:
+            try:
+                client_socket, _ = self._socket.accept()
+            except socket.error:
+                break
+
+            self.accepted_connections += 1
+
+            transport = paramiko.Transport(client_socket)
+            transport.add_server_key(self.host_key)
+            transport.start_server(server=FakeSSHServerInterface())
+            self.transports.append(transport)
+
+    def close(self):
+        for transport in self.transports:
+            transport.close()
+
+        self._socket.close()
+
+
+class SSHConnectionPoolTestCase(unittest2.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(SSHConnectionPoolTestCase, cls).setUpClass()
+        cls.host_key = paramiko.RSAKey.generate(1024)
+
+    def setUp(self):
+        super(SSHConnectionPoolTestCase, self).setUp()
+        cfg.CONF.set_override(name='use_ssh_config', override=False, group='ssh_runner')
+
+        self.server = FakeSSHServer(host_key=self.host_key)
+        self.pool = SSHConnectionPool(max_connections_per_host=2, max_sessions=2,
+                                      idle_timeout=60, keepalive_interval=30)
+
+    def tearDown(self):
+        super(SSHConnectionPoolTestCase, self).tearDown()
+        self.pool.close()
+        self.server.close()
+
+    def _get_client(self, username='stanley'):
+        return ParamikoSSHClient(hostname='127.0.0.1', port=self.server.port, username=username,
+                                 password=USERS[username], connection_pool=self.pool)
+
+    def test_connection_is_reused_across_clients(self):
+        for index in range(3):
+            client = self._get_client()
+            client.connect()
+            stdout, _, exit_code = client.run('echo %s' % (index))
+            client.close()
+
+            self.assertEqual(stdout, 'ran: echo %s' % (index))
+            self.assertEqual(exit_code, 0)
+
+        self.assertEqual(self.server.accepted_connections, 1)
+        self.assertEqual(self.pool.get_stats(), {'hosts': 1, 'connections': 1, 'leases': 0})
+
+    def test_channels_are_multiplexed_over_shared_connection(self):
+        client1 = self._get_client()
+        client2 = self._get_client()
+        client1.connect()
+        client2.connect()
+
+        self.assertEqual(client1.client, client2.client)
+        self.assertEqual(client1.run('cmd1')[0], 'ran: cmd1')
+        self.assertEqual(client2.run('cmd2')[0], 'ran: cmd2')
+        self.assertEqual(self.pool.get_stats()['leases'], 2)
+
+        # Connection is fully used, new connection is established
+        client3 = self._get_client()
+        client3.connect()
+        self.assertNotEqual(client3.client, client1.client)
+        self.assertEqual(self.server.accepted_connections, 2)
+
+        for client in [client1, client2, client3]:
+            client.close()
+
+        self.assertEqual(self.pool.get_stats(), {'hosts': 1, 'connections': 2, 'leases': 0})
+
+    def test_connections_are_not_shared_between_different_credentials(self):
+        client1 = self._get_client(username='stanley')
+        client1.connect()
+        client1.close()
+
+        client2 = self._get_client(username='joe')
+        client2.connect()
+        self.assertEqual(client2.run('whoami')[0], 'ran: whoami')
+        client2.close()
+
+        self.assertEqual(self.server.accepted_connections, 2)
+
+    def test_per_host_limit(self):
+        self.pool.max_connections_per_host = 1
+        self.pool.max_sessions = 1
+        self.pool.acquire_timeout = 0.3
+
+        client1 = self._get_client()
+        client1.connect()
+
+        client2 = self._get_client()
+        self.assertRaises(SSHConnectionPoolTimeoutError, client2.connect)
+
+        # Unused connection which has been established with different credentials is closed to
+        # make room for the new one
+        client1.close()
+        client3 = self._get_client(username='joe')
+        client3.connect()
+        self.assertEqual(self.pool.get_stats(), {'hosts': 1, 'connections': 1, 'leases': 1})
+        self.assertFalse(client1.client.get_transport())
+        client3.close()
+
+    def test_idle_and_inactive_connections_are_evicted(self):
+        client = self._get_client()
+        client.connect()
+        client.client.get_transport().close()
+        client.close()
+
+        # Connection which is not active anymore is not returned to the pool
+        self.assertEqual(self.pool.get_stats()['connections'], 0)
+
+        self.pool.idle_timeout = 0
+        client = self._get_client()
+        client.connect()
+        client.close()
+        self.pool.reap()
+
+        self.assertEqual(self.pool.get_stats()['connections'], 0)
+        self.assertEqual(self.server.accepted_connections, 2)
+
+    def test_reaper_closes_idle_connections(self):
+        self.pool.idle_timeout = 0
+        self.pool.start_reaper()
+
+        client = self._get_client()
+        client.connect()
+        client.close()
+        self.assertEqual(self.pool.get_stats()['connections'], 1)
+
+        # Idle connection is closed even if no other connection is acquired
+        eventlet.sleep(1.5)
+        self.assertEqual(self.pool.get_stats()['connections'], 0)
+        self.assertFalse(client.client.get_transport())
+
+    def test_parallel_ssh_client_uses_pool(self):
+        hosts = ['127.0.0.1:%s' % (self.server.port)]
+
+        for _ in range(2):
+            client = ParallelSSHClient(hosts=hosts, user='stanley', password='secret',
+                                       connection_pool=self.pool)
+            results = client.run('uname')
+            client.close()
+
+            self.assertEqual(results['127.0.0.1']['stdout'], 'ran: uname')
+            self.assertTrue(results['127.0.0.1']['succeeded'])
+
+        self.assertEqual(self.server.accepted_connections, 1)
@@ -18,6 +18,7 @@ from oslo_config import cfg
 from st2api import config as st2api_config
 from st2common import log as logging
 from st2common.middleware.streaming import StreamingMiddleware
+from st2common.middleware.compression import GzipMiddleware
 from st2common.middleware.error_handling import ErrorHandlingMiddleware
 from st2common.middleware.cors import CorsMiddleware
 from st2common.middleware.request_id import RequestIDMiddleware
@@ -58,19 +59,24 @@ def setup_app(config={}):
 
     router = Router(debug=cfg.CONF.api.debug, auth=cfg.CONF.auth.enable)
 
-    spec = spec_loader.load_spec('st2common', 'openapi.yaml.j2')
+    spec = spec_loader.load_compiled_spec('st2common', 'openapi.yaml.j2',
+                                          cache_dir=cfg.CONF.api.spec_cache_dir)
     transforms = {
         '^/api/v1/': ['/', '/v1/'],
         '^/api/v1/executions': ['/actionexecutions', '/v1/actionexecutions'],
         '^/api/exp/': ['/exp/']
     }
-    router.add_spec(spec, transforms=transforms)
+    router.add_spec(spec, transforms=transforms, validate_spec=False)
 
     app = router.as_wsgi
 
     # Order is important. Check middleware for detailed explanation.
     app = StreamingMiddleware(app, path_whitelist=['/v1/executions/*/output*'])
     app = ErrorHandlingMiddleware(app)
+
+    if cfg.CONF.api.gzip:
+        app = GzipMiddleware(app, min_size=cfg.CONF.api.gzip_min_size)
+
     app = CorsMiddleware(app)
     app = LoggingMiddleware(app, router)
     app = RequestIDMiddleware(app)
@@ -69,6 +69,10 @@ def _register_app_opts():
                    help='location of the logging.conf file'),
         cfg.IntOpt('max_page_size', default=100,
                    help=('Maximum limit (page size) argument which can be specified by the user '
-                         'in a query string.'))
+                         'in a query string.')),
+        cfg.BoolOpt('gzip', default=True,
+                    help='True to gzip compress JSON responses if the client accepts it.'),
+        cfg.IntOpt('gzip_min_size', default=1024,
+                   help='Minimum size (in bytes) of the response body which is compressed.')
     ]
     CONF.register_opts(logging_opts, group='api')
@@ -16,9 +16,13 @@
 # pylint: disable=no-member
 
 import abc
+import base64
 import copy
+import datetime
+import json
 
 from oslo_config import cfg
+from mongoengine import Q
 from mongoengine import ValidationError
 import six
 from six.moves import http_client
@@ -27,7 +31,9 @@ from st2common import log as logging
 from st2common.models.system.common import ResourceReference
 from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.rbac import utils as rbac_utils
+from st2common.util import isotime
 from st2common.util import schema as util_schema
+from st2common.util.misc import get_field_value
 from st2common.router import abort
 from st2common.router import Response
 
@@ -52,6 +58,20 @@ def split_id_value(value):
     return split
 
 
+def encode_cursor(data):
+    """
+    Encode pagination cursor data as an opaque URL safe string.
+    """
+    return base64.urlsafe_b64encode(json.dumps(data, sort_keys=True))
+
+
+def decode_cursor(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(str(cursor)))
+    except Exception:
+        raise ValueError('Invalid cursor "%s"' % (cursor))
+
+
 DEFAULT_FILTER_TRANSFORM_FUNCTIONS = {
     # Support for filtering on multiple ids when a commona delimited string is provided
     # (e.g. ?id=1,2,3)
@@ -104,6 +124,15 @@ class ResourceController(object):
     # A list of attributes which can be specified using ?exclude_attributes filter
     valid_exclude_attributes = []
 
+    # True if the controller returns X-Next-Cursor header which can be used to retrieve the next
+    # page using ?cursor query parameter
+    cursor_pagination = False
+
+    # True to encode and write the items returned by "_get_all" one by one instead of building the
+    # whole response body in memory. Only suitable for controllers which don't post-process the
+    # returned response
+    stream_results = False
+
     # Method responsible for retrieving an instance of the corresponding model DB object
     # Note: This method should throw StackStormDBObjectNotFoundError if the corresponding DB
     # object doesn't exist
@@ -119,10 +148,17 @@ class ResourceController(object):
         self.get_one_db_method = self._get_by_name_or_id
 
     def _get_all(self, exclude_fields=None, sort=None, offset=0, limit=None, query_options=None,
-                 from_model_kwargs=None, raw_filters=None):
+                 from_model_kwargs=None, raw_filters=None, cursor=None, include_total=None):
         """
         :param exclude_fields: A list of object fields to exclude.
         :type exclude_fields: ``list``
+
+        :param cursor: Opaque cursor returned in the X-Next-Cursor header of the previous page.
+        :type cursor: ``str``
+
+        :param include_total: True to include X-Total-Count header. Defaults to True for the
+                              first page and to False for the pages retrieved using a cursor.
+        :type include_total: ``bool``
         """
         raw_filters = copy.deepcopy(raw_filters) or {}
 
@@ -183,6 +219,36 @@ class ResourceController(object):
                 filters['__'.join(v.split('.'))] = filter_value
 
         instances = self.access.query(exclude_fields=exclude_fields, **filters)
+        all_instances = instances
+
+        seek_field = self._get_seek_field(filters=filters)
+        seek_value = None
+        seek_ids = []
+        seek_cursor_data = None
+
+        if cursor:
+            if offset:
+                raise ValueError('Offset and cursor are mutually exclusive')
+
+            cursor_data = decode_cursor(cursor)
+
+            if cursor_data.get('sort', None) != filters['order_by']:
+                raise ValueError('Cursor "%s" doesn\'t match the requested sort order' % (cursor))
+
+            if 'value' in cursor_data and cursor_data.get('field', None) == seek_field:
+                seek_value = self._get_seek_value(cursor_data=cursor_data)
+                seek_ids = cursor_data.get('ids', [])
+                seek_cursor_data = dict([(key, value) for key, value in six.iteritems(cursor_data)
+                                         if key in ['field', 'value', 'type', 'ids']])
+                instances = instances.filter(self._get_seek_filters(field=seek_field,
+                                                                    sort=filters['order_by'],
+                                                                    value=seek_value,
+                                                                    ids=seek_ids))
+
+            # Offset is relative to the seek filters (if any)
+            offset = int(cursor_data.get('offset', 0))
+            eop = offset + int(limit) if limit else None
+
         if limit == 1:
             # Perform the filtering on the DB side
             instances = instances.limit(limit)
@@ -190,18 +256,118 @@ class ResourceController(object):
         from_model_kwargs = from_model_kwargs or {}
         from_model_kwargs.update(self.from_model_kwargs)
 
-        result = []
-        for instance in instances[offset:eop]:
-            item = self.model.from_model(instance, **from_model_kwargs)
-            result.append(item)
+        db_instances = instances[offset:eop]
+
+        if self.cursor_pagination and limit:
+            # Cursor for the next page depends on the returned items so they need to be retrieved
+            # before the response is written
+            db_instances = list(db_instances)
+
+            # Keep track of the ids of all the items which share the last value of the primary
+            # sort field (including the ones from the previous pages) so the next page can skip
+            # them
+            for instance in db_instances:
+                if not seek_field:
+                    break
+
+                value = get_field_value(instance, seek_field)
+
+                if value != seek_value:
+                    seek_value = value
+                    seek_ids = []
+
+                seek_ids.append(str(instance.id))
+
+        items = (self.model.from_model(instance, **from_model_kwargs)
+                 for instance in db_instances)
+
+        if self.stream_results:
+            resp = Response(json_iter=items)
+        else:
+            resp = Response(json=list(items))
+
+        if include_total is None:
+            include_total = not cursor
+
+        if include_total:
+            resp.headers['X-Total-Count'] = str(all_instances.count())
 
-        resp = Response(json=result)
-        resp.headers['X-Total-Count'] = str(instances.count())
         if limit:
             resp.headers['X-Limit'] = str(limit)
 
+        if self.cursor_pagination and limit and len(db_instances) == int(limit):
+            if seek_field and seek_value is not None:
+                cursor_data = self._get_seek_cursor_data(field=seek_field, value=seek_value,
+                                                         ids=seek_ids)
+            else:
+                # Items without a value of the primary sort field can't be used to seek, skip them
+                # using an offset while keeping the seek filters of the current page
+                cursor_data = dict(seek_cursor_data or {})
+                cursor_data['offset'] = offset + len(db_instances)
+
+            cursor_data['sort'] = filters['order_by']
+            resp.headers['X-Next-Cursor'] = encode_cursor(cursor_data)
+
         return resp
 
+    def _get_seek_field(self, filters):
+        """
+        Return name of the primary sort field which can be used for keyset pagination or None if
+        the results can only be paginated using an offset.
+        """
+        if not self.cursor_pagination or not filters.get('order_by', None):
+            return None
+
+        field = filters['order_by'][0].lstrip('-+')
+
+        # Datetime range filters can change the sort direction on the DB side
+        range_filter = filters.get('__'.join(field.split('.')), None)
+        if isinstance(range_filter, six.string_types) and '..' in range_filter:
+            return None
+
+        return field
+
+    def _get_seek_cursor_data(self, field, value, ids):
+        if isinstance(value, datetime.datetime):
+            value = isotime.format(value, usec=True, offset=True)
+            value_type = 'datetime'
+        else:
+            value_type = None
+
+        return {
+            'field': field,
+            'value': value,
+            'type': value_type,
+            'ids': ids
+        }
+
+    def _get_seek_value(self, cursor_data):
+        value = cursor_data['value']
+
+        if cursor_data.get('type', None) == 'datetime':
+            value = isotime.parse(value)
+
+        return value
+
+    def _get_seek_filters(self, field, sort, value, ids):
+        """
+        Return filters which seek past the items returned on the previous pages.
+
+        Items are skipped using the primary sort field index. Items which share the last value of
+        the primary sort field are skipped by id so ties between pages are handled correctly.
+
+        :rtype: :class:`mongoengine.Q`
+        """
+        db_field = '__'.join(field.split('.'))
+
+        if sort[0].startswith('-'):
+            # Items without a value are returned last in the descending order
+            query = Q(**{'%s__lte' % (db_field): value}) | Q(**{db_field: None})
+        else:
+            query = Q(**{'%s__gte' % (db_field): value})
+
+        return query & Q(id__nin=ids)
+
     def _get_one_by_id(self, id, requester_user, permission_type, exclude_fields=None,
                        from_model_kwargs=None):
         """
@@ -494,6 +494,8 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
     query_options = {
         'sort': ['-start_timestamp', 'action.ref']
     }
+    cursor_pagination = True
+    stream_results = True
     supported_filters = SUPPORTED_EXECUTIONS_FILTERS
     filter_transform_functions = {
         'timestamp_gt': lambda value: isotime.parse(value=value),
@@ -501,12 +503,13 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
     }
 
     def get_all(self, requester_user, exclude_attributes=None, sort=None, offset=0, limit=None,
-                show_secrets=False, **raw_filters):
+                show_secrets=False, cursor=None, include_total=None, **raw_filters):
         """
         List all executions.
 
         Handles requests:
             GET /executions[?exclude_attributes=result,trigger_instance]
+            GET /executions[?cursor=<value of X-Next-Cursor header>]
 
         :param exclude_attributes: Comma delimited string of attributes to exclude from the object.
         :type exclude_attributes: ``str``
@@ -535,7 +538,9 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
                                            offset=offset,
                                            limit=limit,
                                            query_options=query_options,
-                                           raw_filters=raw_filters)
+                                           raw_filters=raw_filters,
+                                           cursor=cursor,
+                                           include_total=include_total)
 
     def get_one(self, id, requester_user, exclude_attributes=None, show_secrets=False):
         """
@@ -705,7 +710,8 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
                                              mask_secrets=from_model_kwargs['mask_secrets'])
 
     def _get_action_executions(self, exclude_fields=None, sort=None, offset=0, limit=None,
-                               query_options=None, raw_filters=None, from_model_kwargs=None):
+                               query_options=None, raw_filters=None, from_model_kwargs=None,
+                               cursor=None, include_total=None):
         """
         :param exclude_fields: A list of object fields to exclude.
         :type exclude_fields: ``list``
@@ -723,7 +729,9 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
                                                                 offset=offset,
                                                                 limit=limit,
                                                                 query_options=query_options,
-                                                                raw_filters=raw_filters)
+                                                                raw_filters=raw_filters,
+                                                                cursor=cursor,
+                                                                include_total=include_total)
 
 
 action_executions_controller = ActionExecutionsController()
@@ -37,7 +37,10 @@ class TracesController(ResourceController):
         'sort': ['-start_timestamp', 'trace_tag']
     }
 
-    def get_all(self, sort=None, offset=0, limit=None, **raw_filters):
+    cursor_pagination = True
+
+    def get_all(self, sort=None, offset=0, limit=None, cursor=None, include_total=None,
+                **raw_filters):
         # Use a custom sort order when filtering on a timestamp so we return a correct result as
         # expected by the user
         query_options = None
@@ -49,7 +52,9 @@ class TracesController(ResourceController):
                              offset=offset,
                              limit=limit,
                              query_options=query_options,
-                             raw_filters=raw_filters)
+                             raw_filters=raw_filters,
+                             cursor=cursor,
+                             include_total=include_total)
 
     def get_one(self, id, requester_user):
         return self._get_one_by_id(id,
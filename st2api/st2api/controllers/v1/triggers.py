@@ -373,6 +373,9 @@ class TriggerInstanceController(TriggerInstanceControllerMixin, resource.Resourc
         'sort': ['-occurrence_time', 'trigger']
     }
 
+    cursor_pagination = True
+    stream_results = True
+
     def __init__(self):
         super(TriggerInstanceController, self).__init__()
 
@@ -385,7 +388,8 @@ class TriggerInstanceController(TriggerInstanceControllerMixin, resource.Resourc
         """
         return self._get_one_by_id(instance_id, permission_type=None, requester_user=None)
 
-    def get_all(self, sort=None, offset=0, limit=None, **raw_filters):
+    def get_all(self, sort=None, offset=0, limit=None, cursor=None, include_total=None,
+                **raw_filters):
         """
             List all triggerinstances.
 
@@ -395,10 +399,13 @@ class TriggerInstanceController(TriggerInstanceControllerMixin, resource.Resourc
         trigger_instances = self._get_trigger_instances(sort=sort,
                                                         offset=offset,
                                                         limit=limit,
-                                                        raw_filters=raw_filters)
+                                                        raw_filters=raw_filters,
+                                                        cursor=cursor,
+                                                        include_total=include_total)
         return trigger_instances
 
-    def _get_trigger_instances(self, sort=None, offset=0, limit=None, raw_filters=None):
+    def _get_trigger_instances(self, sort=None, offset=0, limit=None, raw_filters=None,
+                               cursor=None, include_total=None):
         if limit is None:
             limit = self.default_limit
 
@@ -408,7 +415,9 @@ class TriggerInstanceController(TriggerInstanceControllerMixin, resource.Resourc
         return super(TriggerInstanceController, self)._get_all(sort=sort,
                                                                offset=offset,
                                                                limit=limit,
-                                                               raw_filters=raw_filters)
+                                                               raw_filters=raw_filters,
+                                                               cursor=cursor,
+                                                               include_total=include_total)
 
 
 triggertype_controller = TriggerTypeController()
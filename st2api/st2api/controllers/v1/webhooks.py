@@ -130,12 +130,24 @@ class WebhooksController(object):
         if hook == 'st2' or hook == 'st2/':
             trigger = body.get('trigger', None)
             payload = body.get('payload', None)
+            payloads = body.get('payloads', None)
 
             if not trigger:
                 msg = 'Trigger not specified.'
                 return abort(http_client.BAD_REQUEST, msg)
 
-            self._trigger_dispatcher.dispatch(trigger, payload=payload, trace_context=trace_context)
+            if payloads is not None:
+                # Batch form, dispatch a trigger instance for each of the payloads
+                if (not isinstance(payloads, list) or
+                        not all([isinstance(item, dict) for item in payloads])):
+                    msg = '"payloads" attribute must be a list of objects.'
+                    return abort(http_client.BAD_REQUEST, msg)
+
+                self._trigger_dispatcher.dispatch_many(trigger, payloads=payloads,
+                                                       trace_context=trace_context)
+            else:
+                self._trigger_dispatcher.dispatch(trigger, payload=payload,
+                                                  trace_context=trace_context)
         else:
             if not self._is_valid_hook(hook):
                 self._log_request('Invalid hook.', headers, body)
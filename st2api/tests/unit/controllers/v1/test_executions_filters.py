@@ -219,6 +219,69 @@ class TestActionExecutionFilters(FunctionalTest):
             retrieved += ids
         self.assertListEqual(sorted(retrieved), sorted(self.refs.keys()))
 
+    def test_cursor_pagination(self):
+        retrieved = []
+        page_size = 30
+        url = '/v1/executions?limit=%s' % (page_size)
+        response = self.app.get(url)
+
+        while True:
+            self.assertEqual(response.status_int, 200)
+            self.assertEqual(response.headers['X-Limit'], str(page_size))
+            retrieved += [item['id'] for item in response.json]
+
+            if 'X-Next-Cursor' not in response.headers:
+                break
+
+            self.assertEqual(len(response.json), page_size)
+            response = self.app.get('%s&cursor=%s' % (url, response.headers['X-Next-Cursor']))
+
+            # Total count is only included in the first page by default
+            self.assertNotIn('X-Total-Count', response.headers)
+
+        self.assertEqual(len(retrieved), self.num_records)
+        self.assertListEqual(sorted(retrieved), sorted(self.refs.keys()))
+
+        # Items are returned in the default (descending start_timestamp) order
+        timestamps = [self.refs[id_].start_timestamp for id_ in retrieved]
+        self.assertListEqual(timestamps, sorted(timestamps, reverse=True))
+
+    def test_cursor_pagination_sort_field_without_value(self):
+        # Executions which haven't been triggered by a rule don't have a value of the sort field
+        # and are paginated using an offset relative to the filters of the previous page
+        for sort in ['rule', '-rule']:
+            retrieved = []
+            page_size = 7
+            url = '/v1/executions?limit=%s&sort=%s' % (page_size, sort)
+            response = self.app.get(url)
+
+            for _ in range(self.num_records):
+                self.assertEqual(response.status_int, 200)
+                retrieved += [item['id'] for item in response.json]
+
+                if 'X-Next-Cursor' not in response.headers:
+                    break
+
+                response = self.app.get('%s&cursor=%s' % (url, response.headers['X-Next-Cursor']))
+
+            self.assertNotIn('X-Next-Cursor', response.headers)
+            self.assertEqual(len(retrieved), self.num_records)
+            self.assertListEqual(sorted(retrieved), sorted(self.refs.keys()))
+
+    def test_cursor_pagination_invalid_cursor(self):
+        response = self.app.get('/v1/executions?limit=10&cursor=invalid', expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
+        response = self.app.get('/v1/executions?limit=10')
+        cursor = response.headers['X-Next-Cursor']
+        response = self.app.get('/v1/executions?limit=10&sort=action&cursor=%s' % (cursor),
+                                expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
+        response = self.app.get('/v1/executions?limit=10&offset=10&cursor=%s' % (cursor),
+                                expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
     def test_ui_history_query(self):
         # In this test we only care about making sure this exact query works. This query is used
         # by the webui for the history page so it is special and breaking this is bad.
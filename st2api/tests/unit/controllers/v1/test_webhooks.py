@@ -118,6 +118,21 @@ class TestWebhooksController(FunctionalTest):
         self.assertTrue('Trigger not specified.' in post_resp)
         self.assertEqual(post_resp.status_int, http_client.BAD_REQUEST)
 
+    @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
+        return_value=True))
+    @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch_many')
+    def test_st2_webhook_batch(self, dispatch_many_mock):
+        body = {'trigger': 'git.pr-merged', 'payloads': [{'value_str': 'a'}, {'value_str': 'b'}]}
+        post_resp = self.__do_post('st2', body)
+        self.assertEqual(post_resp.status_int, http_client.ACCEPTED)
+        self.assertEqual(dispatch_many_mock.call_count, 1)
+        self.assertEqual(dispatch_many_mock.call_args[1]['payloads'], body['payloads'])
+
+        body = {'trigger': 'git.pr-merged', 'payloads': {'value_str': 'a'}}
+        post_resp = self.__do_post('st2', body, expect_errors=True)
+        self.assertTrue('"payloads" attribute must be a list of objects.' in post_resp)
+        self.assertEqual(post_resp.status_int, http_client.BAD_REQUEST)
+
     @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
         return_value=True))
     @mock.patch.object(WebhooksController, '_is_valid_hook', mock.MagicMock(
@@ -57,11 +57,12 @@ def setup_app(config={}):
 
     router = Router(debug=cfg.CONF.auth.debug)
 
-    spec = spec_loader.load_spec('st2common', 'openapi.yaml.j2')
+    spec = spec_loader.load_compiled_spec('st2common', 'openapi.yaml.j2',
+                                          cache_dir=cfg.CONF.api.spec_cache_dir)
     transforms = {
         '^/auth/v1/': ['/', '/v1/']
     }
-    router.add_spec(spec, transforms=transforms)
+    router.add_spec(spec, transforms=transforms, validate_spec=False)
 
     app = router.as_wsgi
 
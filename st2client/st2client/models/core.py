@@ -289,6 +289,30 @@ class ResourceManager(object):
         else:
             return (instances, None)
 
+    @add_auth_token_to_kwargs_from_env
+    def query_iter(self, **kwargs):
+        """
+        Iterate over all the instances which match the provided query, retrieving one page
+        (``limit`` instances) at a time.
+
+        Pages are retrieved using the cursor returned in the X-Next-Cursor response header. For
+        endpoints which don't support cursor based pagination, only the first page is returned.
+        """
+        kwargs['include_total'] = False
+
+        while True:
+            instances, response = self._query_details(**kwargs)
+
+            for instance in instances:
+                yield instance
+
+            cursor = response.headers.get('X-Next-Cursor', None) if response else None
+
+            if not cursor or not instances:
+                break
+
+            kwargs['cursor'] = cursor
+
     @add_auth_token_to_kwargs_from_env
     def get_by_name(self, name, **kwargs):
         instances = self.query(name=name, **kwargs)
@@ -127,6 +127,26 @@ class TestResourceManager(unittest2.TestCase):
         expected = json.loads(json.dumps([base.RESOURCES[0]]))
         self.assertEqual(actual, expected)
 
+    @mock.patch.object(
+        httpclient.HTTPClient, 'get',
+        mock.MagicMock(side_effect=[
+            base.FakeResponse(json.dumps([base.RESOURCES[0]]), 200, 'OK',
+                              {'X-Next-Cursor': 'cursor1'}),
+            base.FakeResponse(json.dumps([base.RESOURCES[1]]), 200, 'OK', {})
+        ]))
+    def test_resource_query_iter(self):
+        mgr = models.ResourceManager(base.FakeResource, base.FAKE_ENDPOINT)
+        resources = mgr.query_iter(name='abc', limit=1)
+        actual = [resource.serialize() for resource in resources]
+        expected = json.loads(json.dumps(base.RESOURCES))
+        self.assertEqual(actual, expected)
+
+        calls = httpclient.HTTPClient.get.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertNotIn('cursor=', calls[0][0][0])
+        self.assertIn('include_total=False', calls[0][0][0])
+        self.assertIn('cursor=cursor1', calls[1][0][0])
+
     @mock.patch.object(
         httpclient.HTTPClient, 'get',
         mock.MagicMock(return_value=base.FakeResponse('', 404, 'NOT FOUND',
@@ -32,6 +32,7 @@ from st2common.script_setup import setup as common_setup
 from st2common.script_setup import teardown as common_teardown
 from st2common.constants.exit_codes import SUCCESS_EXIT_CODE
 from st2common.constants.exit_codes import FAILURE_EXIT_CODE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
 from st2common.garbage_collection.executions import purge_executions
 
 LOG = logging.getLogger(__name__)
@@ -58,6 +59,15 @@ def _register_cli_opts():
                     help='Purge all models irrespective of their ``status``.' +
                     'By default, only executions in completed states such as "succeeeded" ' +
                     ', "failed", "canceled" and "timed_out" are deleted.'),
+        cfg.IntOpt('batch-size', default=DEFAULT_PURGE_BATCH_SIZE,
+                   help='Number of executions and liveactions to delete in a single batch.'),
+        cfg.FloatOpt('rate-limit', default=0,
+                     help='Maximum number of executions and liveactions to delete per second. ' +
+                     '0 means no limit.'),
+        cfg.StrOpt('checkpoint-file', default=None,
+                   help='Path to the file where the purge progress is stored. If the purge is ' +
+                   'interrupted, running it again with the same arguments resumes it from ' +
+                   'the last stored checkpoint.'),
     ]
     _do_register_cli_opts(cli_opts)
 
@@ -70,6 +80,9 @@ def main():
     timestamp = cfg.CONF.timestamp
     action_ref = cfg.CONF.action_ref
     purge_incomplete = cfg.CONF.purge_incomplete
+    batch_size = cfg.CONF.batch_size
+    rate_limit = cfg.CONF.rate_limit
+    checkpoint_file = cfg.CONF.checkpoint_file
 
     if not timestamp:
         LOG.error('Please supply a timestamp for purging models. Aborting.')
@@ -80,7 +93,8 @@ def main():
 
     try:
         purge_executions(logger=LOG, timestamp=timestamp, action_ref=action_ref,
-                         purge_incomplete=purge_incomplete)
+                         purge_incomplete=purge_incomplete, batch_size=batch_size,
+                         rate_limit=rate_limit, checkpoint_file=checkpoint_file)
     except Exception as e:
         LOG.exception(str(e))
         return FAILURE_EXIT_CODE
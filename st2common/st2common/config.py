@@ -81,7 +81,14 @@ def register_opts(ignore_errors=False):
         cfg.BoolOpt('validate_trigger_payload', default=False,
                     help=('True to validate payload for non-system trigger types when dispatching'
                           'a trigger inside the sensor. By default, only payload for system '
-                          'triggers is validated.'))
+                          'triggers is validated.')),
+        cfg.BoolOpt('cache_trigger_type_schemas', default=True,
+                    help='Cache compiled trigger type payload and parameters schema validators. '
+                         'Cached validators are invalidated when the trigger type changes.'),
+        cfg.BoolOpt('cache_action_metadata', default=True,
+                    help='Cache action and runner type metadata which is used when scheduling, '
+                         'running and serializing executions. Cached metadata is invalidated '
+                         'when the action or the runner type changes.')
     ]
     do_register_opts(system_opts, 'system', ignore_errors)
 
@@ -155,7 +162,17 @@ def register_opts(ignore_errors=False):
         cfg.IntOpt('connection_retries', default=10,
                    help='How many times should we retry connection before failing.'),
         cfg.IntOpt('connection_retry_wait', default=10000,
-                   help='How long should we wait between connection retries.')
+                   help='How long should we wait between connection retries.'),
+        cfg.StrOpt('serializer', default='pickle',
+                   help='Serializer used for messages published on the message bus (pickle, '
+                        'st2-json, st2-msgpack). Consumers accept all the serializers so it\'s '
+                        'safe to switch it once all the nodes in a cluster have been upgraded.'),
+        cfg.IntOpt('publisher_pool_size', default=10,
+                   help='Maximum number of connections (each with a long-lived channel) used by '
+                        'a publisher.'),
+        cfg.BoolOpt('publisher_confirms', default=False,
+                    help='True to wait for the messaging server to confirm each published '
+                         'message.')
     ]
     do_register_opts(messaging_opts, 'messaging', ignore_errors)
 
@@ -190,7 +207,15 @@ def register_opts(ignore_errors=False):
         cfg.ListOpt('allow_origin', default=['http://127.0.0.1:3000'],
                     help='List of origins allowed for api, auth and stream'),
         cfg.BoolOpt('mask_secrets', default=True,
-                    help='True to mask secrets in the API responses')
+                    help='True to mask secrets in the API responses'),
+        cfg.IntOpt('response_validation_sample_rate', default=100,
+                   help=('Percentage of API responses which are validated against the OpenAPI '
+                         'spec. 0 disables response validation and 100 validates all the '
+                         'responses.')),
+        cfg.StrOpt('spec_cache_dir', default='/opt/stackstorm/cache/openapi',
+                   help=('Directory where the rendered and validated OpenAPI spec is cached so '
+                         'it doesn\'t need to be compiled on each API, auth and stream service '
+                         'start up. Empty value disables the cache.'))
     ]
     do_register_opts(api_opts, 'api', ignore_errors)
 
@@ -201,7 +226,13 @@ def register_opts(ignore_errors=False):
         cfg.StrOpt('encryption_key_path', default='',
                    help='Location of the symmetric encryption key for encrypting values in ' +
                         'kvstore. This key should be in JSON and should\'ve been ' +
-                        'generated using keyczar.')
+                        'generated using keyczar.'),
+        cfg.BoolOpt('enable_cache', default=False,
+                    help='Cache datastore values which are referenced in templates. Cached values '
+                         'are invalidated asynchronously when the key changes so a template '
+                         'rendered right after a key has been set can still use the old value.'),
+        cfg.IntOpt('cache_ttl', default=60,
+                   help='Maximum number of seconds a datastore value is cached for.')
     ]
     do_register_opts(keyvalue_opts, group='keyvalue')
 
@@ -213,7 +244,15 @@ def register_opts(ignore_errors=False):
         cfg.IntOpt('token_ttl', default=(24 * 60 * 60), help='Access token ttl in seconds.'),
         # This TTL is used for tokens which belong to StackStorm services
         cfg.IntOpt('service_token_ttl', default=(24 * 60 * 60),
-                   help='Service token ttl in seconds.')
+                   help='Service token ttl in seconds.'),
+        cfg.BoolOpt('enable_cache', default=True,
+                    help='True to cache validated tokens, API keys, users and resolved RBAC '
+                         'permissions used to authenticate and authorize API requests.'),
+        cfg.IntOpt('cache_ttl', default=60,
+                   help='Number of seconds after which a cached token, API key, user or RBAC '
+                        'permission expires. Items are also invalidated as soon as they change.'),
+        cfg.IntOpt('cache_max_size', default=10000,
+                   help='Maximum number of items in each of the auth caches.')
     ]
     do_register_opts(auth_opts, 'auth', ignore_errors)
 
@@ -232,7 +271,33 @@ def register_opts(ignore_errors=False):
                     help='List of virtualenv options to be passsed to "virtualenv" command that ' +
                          'creates pack virtualenv.'),
         cfg.BoolOpt('stream_output', default=False, help='True to store and stream action output '
-                                                         '(stdout and stderr) in real-time.')
+                                                         '(stdout and stderr) in real-time.'),
+        cfg.IntOpt('stream_output_buffer_size', default=65536,
+                   help='Maximum number of bytes of action output which are buffered and stored '
+                        'as a single chunk. 0 means each line is stored separately.'),
+        cfg.FloatOpt('stream_output_flush_interval', default=0.25,
+                     help='Maximum number of seconds action output is buffered for before it\'s '
+                          'stored and published.'),
+        cfg.BoolOpt('python_runner_use_worker_pool', default=False,
+                    help='True to run Python runner actions inside a pool of long running worker '
+                         'processes instead of starting a new process for each execution. Note: '
+                         'Module level state of the action modules is preserved between runs.'),
+        cfg.IntOpt('python_runner_worker_pool_size', default=4,
+                   help='Maximum number of Python runner worker processes per pack virtual '
+                        'environment.'),
+        cfg.IntOpt('python_runner_worker_max_runs', default=100,
+                   help='Number of executions after which a Python runner worker process is '
+                        'recycled. 0 means no limit.'),
+        cfg.IntOpt('python_runner_worker_max_memory', default=256,
+                   help='Peak memory usage (in MB) of a Python runner worker process after which '
+                        'the process is recycled. 0 means no limit.'),
+        cfg.BoolOpt('completion_notifications', default=True,
+                    help='True for action chains to be notified about child execution completion '
+                         'over the message bus instead of polling the database.'),
+        cfg.FloatOpt('completion_poll_interval', default=10.0,
+                     help='Number of seconds between database polls for child execution status '
+                          'when completion notifications are enabled. Polling is only used as '
+                          'a fallback in case a notification is missed.')
     ]
     do_register_opts(action_runner_opts, group='actionrunner')
 
@@ -259,8 +324,37 @@ def register_opts(ignore_errors=False):
                     help='Use the .ssh/config file. Useful to override ports etc.'),
         cfg.StrOpt('ssh_config_file_path',
                    default='~/.ssh/config',
-                   help='Path to the ssh config file.')
-
+                   help='Path to the ssh config file.'),
+        cfg.BoolOpt('use_connection_pool', default=False,
+                    help='Reuse authenticated SSH connections across remote actions executed by '
+                         'this action runner. Note: Pool limits the number of concurrent remote '
+                         'actions per host and credentials to connection_pool_max_per_host * '
+                         'connection_pool_max_sessions.'),
+        cfg.IntOpt('connection_pool_max_per_host', default=2,
+                   help='Maximum number of pooled SSH connections to a single host.'),
+        cfg.IntOpt('connection_pool_max_sessions', default=4,
+                   help='Maximum number of remote actions which share a single pooled SSH '
+                        'connection at the same time.'),
+        cfg.IntOpt('connection_pool_idle_timeout', default=60,
+                   help='How long (in seconds) to keep an unused pooled SSH connection open.'),
+        cfg.IntOpt('connection_pool_keepalive_interval', default=30,
+                   help='How often (in seconds) to send keepalive messages over pooled SSH '
+                        'connections. 0 to disable.'),
+        cfg.IntOpt('connection_pool_acquire_timeout', default=0,
+                   help='How long (in seconds) a remote action waits for a pooled SSH connection '
+                        'when all the connections to the host are fully used. 0 to wait without '
+                        'a limit.'),
+        cfg.BoolOpt('use_remote_script_cache', default=False,
+                    help='Upload scripts and pack libs used by remote script actions to a '
+                         'directory named after the hash of their content and re-use it in the '
+                         'subsequent executions instead of uploading them for every execution.'),
+        cfg.IntOpt('remote_script_cache_max_entries', default=20,
+                   help='Maximum number of cached script directories to keep on each remote '
+                        'host.'),
+        cfg.IntOpt('remote_script_cache_eviction_grace_period', default=86400,
+                   help='How long (in seconds) since the last use to keep the cached script '
+                        'directories over the maximum number of entries and the unfinished '
+                        'uploads. Action timeout is used instead if it\'s longer.')
     ]
     do_register_opts(ssh_runner_opts, group='ssh_runner')
 
@@ -284,6 +378,18 @@ def register_opts(ignore_errors=False):
     ]
     do_register_opts(coord_opts, 'coordination', ignore_errors)
 
+    # Concurrency policy options
+    concurrency_policy_opts = [
+        cfg.BoolOpt('use_concurrency_slots', default=False,
+                    help='True to keep track of the slots used by the concurrency policies in the '
+                         'database instead of counting scheduled and running executions under '
+                         'the coordination lock.'),
+        cfg.IntOpt('concurrency_slots_reconcile_interval', default=60,
+                   help='How often (in seconds) the concurrency policy slots are reconciled with '
+                        'the executions in the database.')
+    ]
+    do_register_opts(concurrency_policy_opts, 'scheduler', ignore_errors)
+
     # Mistral options
     mistral_opts = [
         cfg.StrOpt('v2_base_url', default='http://127.0.0.1:8989/v2', help='v2 API root endpoint.'),
@@ -17,7 +17,8 @@ __all__ = [
     'DEFAULT_COLLECTION_INTERVAL',
     'DEFAULT_SLEEP_DELAY',
     'MINIMUM_TTL_DAYS',
-    'MINIMUM_TTL_DAYS_EXECUTION_OUTPUT'
+    'MINIMUM_TTL_DAYS_EXECUTION_OUTPUT',
+    'DEFAULT_PURGE_BATCH_SIZE'
 ]
 
 
@@ -32,3 +33,6 @@ MINIMUM_TTL_DAYS = 7
 
 # Minimum TTL in days for action execution output objects.
 MINIMUM_TTL_DAYS_EXECUTION_OUTPUT = 1
+
+# Default number of objects which are deleted in a single batch when purging executions
+DEFAULT_PURGE_BATCH_SIZE = 1000
@@ -18,14 +18,21 @@ Module with utility functions for purging old action executions and
 corresponding live action objects.
 """
 
+import os
 import copy
+import json
+import time
 
+import eventlet
+from bson.objectid import ObjectId
 from mongoengine.errors import InvalidQueryError
 
 from st2common.constants import action as action_constants
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
 from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.execution import ActionExecution
 from st2common.persistence.execution import ActionExecutionOutput
+from st2common.services import execution_filters
 
 __all__ = [
     'purge_executions',
@@ -37,11 +44,19 @@ DONE_STATES = [action_constants.LIVEACTION_STATUS_SUCCEEDED,
                action_constants.LIVEACTION_STATUS_TIMED_OUT,
                action_constants.LIVEACTION_STATUS_CANCELED]
 
+PHASE_EXECUTIONS = 'executions'
+PHASE_LIVEACTIONS = 'liveactions'
 
-def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False):
+
+def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False,
+                     batch_size=DEFAULT_PURGE_BATCH_SIZE, rate_limit=0, checkpoint_file=None):
     """
     Purge action executions and corresponding live action, execution output objects.
 
+    Objects are deleted in batches of ``batch_size`` objects. Each batch is retrieved using a
+    range query on the object id which only returns the ids so memory usage doesn't depend on the
+    number of objects which are deleted.
+
     :param timestamp: Exections older than this timestamp will be deleted.
     :type timestamp: ``datetime.datetime
 
@@ -50,12 +65,30 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
 
     :param purge_incomplete: True to also delete executions which are not in a done state.
     :type purge_incomplete: ``bool``
+
+    :param batch_size: Number of executions / live actions to delete in a single batch.
+    :type batch_size: ``int``
+
+    :param rate_limit: Maximum number of executions / live actions to delete per second. 0 means
+                       no limit.
+    :type rate_limit: ``float``
+
+    :param checkpoint_file: Optional path to the file where the progress is stored after each
+                            batch. If a checkpoint for the same purge parameters exists, purge
+                            resumes from it.
+    :type checkpoint_file: ``str``
+
+    :return: Number of deleted objects per object type.
+    :rtype: ``dict``
     """
     if not timestamp:
         raise ValueError('Specify a valid timestamp to purge.')
 
-    logger.info('Purging executions older than timestamp: %s' %
-                timestamp.strftime('%Y-%m-%dT%H:%M:%S.%fZ'))
+    if batch_size < 1:
+        raise ValueError('Batch size needs to be greater than 0.')
+
+    timestamp_str = timestamp.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    logger.info('Purging executions older than timestamp: %s' % (timestamp_str))
 
     filters = {}
 
@@ -74,63 +107,237 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
     if action_ref:
         liveaction_filters['action'] = action_ref
 
-    to_delete_execution_dbs = []
-
-    # 1. Delete ActionExecutionDB objects
-    try:
-        # Note: We call list() on the query set object because it's lazyily evaluated otherwise
-        to_delete_execution_dbs = list(ActionExecution.query(**exec_filters))
-        deleted_count = ActionExecution.delete_by_query(**exec_filters)
-    except InvalidQueryError as e:
-        msg = ('Bad query (%s) used to delete execution instances: %s'
-               'Please contact support.' % (exec_filters, str(e)))
-        raise InvalidQueryError(msg)
-    except:
-        logger.exception('Deletion of execution models failed for query with filters: %s.',
-                         exec_filters)
-    else:
-        logger.info('Deleted %s action execution objects' % (deleted_count))
+    checkpoint_key = {
+        'timestamp': timestamp_str,
+        'action_ref': action_ref or None,
+        'purge_incomplete': purge_incomplete
+    }
+    checkpoint = _load_checkpoint(logger=logger, checkpoint_file=checkpoint_file,
+                                  key=checkpoint_key)
+    stats = checkpoint['stats']
+
+    def on_batch_deleted(phase, last_id):
+        checkpoint['phase'] = phase
+        checkpoint['last_id'] = str(last_id)
+        _save_checkpoint(checkpoint_file=checkpoint_file, checkpoint=checkpoint)
+
+    rate_limiter = _RateLimiter(rate_limit=rate_limit)
+
+    # 1. Delete ActionExecutionDB objects and corresponding ActionExecutionOutputDB objects
+    if checkpoint['phase'] == PHASE_EXECUTIONS:
+        def delete_executions_batch(execution_ids):
+            # Note: Output objects are deleted first so they are not left behind if the purge is
+            # interrupted
+            output_filters = {'execution_id__in': [str(execution_id) for execution_id in
+                                                   execution_ids]}
+            stats['execution_output'] += _delete_by_query(model=ActionExecutionOutput,
+                                                          filters=output_filters,
+                                                          name='execution output')
+            stats['executions'] += _delete_by_query(model=ActionExecution,
+                                                    filters={'id__in': execution_ids},
+                                                    name='execution')
+
+            logger.info('Purge progress: deleted %s action execution and %s execution output '
+                        'objects (%.2f executions/s)' %
+                        (stats['executions'], stats['execution_output'],
+                         rate_limiter.get_rate(stats['executions'])))
+
+        try:
+            _purge_in_batches(model=ActionExecution, filters=exec_filters, batch_size=batch_size,
+                              last_id=checkpoint['last_id'], delete_func=delete_executions_batch,
+                              rate_limiter=rate_limiter,
+                              on_batch_deleted=lambda last_id: on_batch_deleted(PHASE_EXECUTIONS,
+                                                                                last_id))
+        except InvalidQueryError:
+            raise
+        except Exception:
+            # Note: KeyboardInterrupt is propagated so an interrupted purge can be resumed from
+            # the checkpoint
+            logger.exception('Deletion of execution models failed for query with filters: %s.',
+                             exec_filters)
+        else:
+            logger.info('Deleted %s action execution objects' % (stats['executions']))
+            logger.info('Deleted %s execution output objects' % (stats['execution_output']))
+
+        # Remove execution filter values which are not used by any of the remaining executions
+        try:
+            removed_count = execution_filters.prune_filter_values()
+        except Exception:
+            logger.exception('Failed to prune execution filter values.')
+        else:
+            logger.info('Removed %s unused execution filter values' % (removed_count))
+
+        checkpoint['phase'] = PHASE_LIVEACTIONS
+        checkpoint['last_id'] = None
 
     # 2. Delete LiveActionDB objects
-    try:
-        deleted_count = LiveAction.delete_by_query(**liveaction_filters)
-    except InvalidQueryError as e:
-        msg = ('Bad query (%s) used to delete liveaction instances: %s'
-               'Please contact support.' % (liveaction_filters, str(e)))
-        raise InvalidQueryError(msg)
-    except:
-        logger.exception('Deletion of liveaction models failed for query with filters: %s.',
-                         liveaction_filters)
-    else:
-        logger.info('Deleted %s liveaction objects' % (deleted_count))
+    rate_limiter = _RateLimiter(rate_limit=rate_limit)
+
+    def delete_liveactions_batch(liveaction_ids):
+        stats['liveactions'] += _delete_by_query(model=LiveAction,
+                                                 filters={'id__in': liveaction_ids},
+                                                 name='liveaction')
 
-    # 3. Delete ActionExecutionOutputDB objects
-    to_delete_exection_ids = [str(execution_db.id) for execution_db in to_delete_execution_dbs]
-    output_dbs_filters = {}
-    output_dbs_filters['execution_id'] = {'$in': to_delete_exection_ids}
+        logger.info('Purge progress: deleted %s liveaction objects (%.2f liveactions/s)' %
+                    (stats['liveactions'], rate_limiter.get_rate(stats['liveactions'])))
 
     try:
-        deleted_count = ActionExecutionOutput.delete_by_query(**output_dbs_filters)
-    except InvalidQueryError as e:
-        msg = ('Bad query (%s) used to delete execution output instances: %s'
-               'Please contact support.' % (output_dbs_filters, str(e)))
-        raise InvalidQueryError(msg)
-    except:
-        logger.exception('Deletion of execution output models failed for query with filters: %s.',
-                         output_dbs_filters)
+        _purge_in_batches(model=LiveAction, filters=liveaction_filters, batch_size=batch_size,
+                          last_id=checkpoint['last_id'], delete_func=delete_liveactions_batch,
+                          rate_limiter=rate_limiter,
+                          on_batch_deleted=lambda last_id: on_batch_deleted(PHASE_LIVEACTIONS,
+                                                                            last_id))
+    except InvalidQueryError:
+        raise
+    except Exception:
+        logger.exception('Deletion of liveaction models failed for query with filters: %s.',
+                         liveaction_filters)
     else:
-        logger.info('Deleted %s execution output objects' % (deleted_count))
+        logger.info('Deleted %s liveaction objects' % (stats['liveactions']))
 
-    zombie_execution_instances = len(ActionExecution.query(**exec_filters))
-    zombie_liveaction_instances = len(LiveAction.query(**liveaction_filters))
+    zombie_execution_instances = ActionExecution.count(**exec_filters)
+    zombie_liveaction_instances = LiveAction.count(**liveaction_filters)
 
     if (zombie_execution_instances > 0) or (zombie_liveaction_instances > 0):
         logger.error('Zombie execution instances left: %d.', zombie_execution_instances)
         logger.error('Zombie liveaction instances left: %s.', zombie_liveaction_instances)
 
+    # Purge has completed, next purge needs to start from the beginning
+    _remove_checkpoint(checkpoint_file=checkpoint_file, key=checkpoint_key)
+
     # Print stats
     logger.info('All execution models older than timestamp %s were deleted.', timestamp)
 
+    return stats
+
+
+class _RateLimiter(object):
+    """
+    Class which sleeps between the batches so the number of deleted objects per second doesn't
+    exceed the rate limit.
+    """
+
+    def __init__(self, rate_limit=0):
+        self._rate_limit = rate_limit
+        self._start = time.time()
+
+    def get_rate(self, count):
+        duration = time.time() - self._start
+        return (count / duration) if duration > 0 else 0.0
+
+    def throttle(self, count):
+        if not self._rate_limit:
+            return
+
+        duration = time.time() - self._start
+        expected_duration = (float(count) / self._rate_limit)
+
+        if expected_duration > duration:
+            eventlet.sleep(expected_duration - duration)
+
+
+def _purge_in_batches(model, filters, batch_size, last_id, delete_func, rate_limiter,
+                      on_batch_deleted):
+    """
+    Retrieve ids of the objects which match the filters in batches (ordered by id) and call
+    delete function for each batch.
+    """
+    last_id = ObjectId(last_id) if last_id else None
+    count = 0
+
+    while True:
+        batch_filters = copy.copy(filters)
+
+        if last_id:
+            batch_filters['id__gt'] = last_id
+
+        try:
+            ids = list(model.query(order_by=['id'], limit=batch_size,
+                                   **batch_filters).scalar('id'))
+        except InvalidQueryError as e:
+            msg = ('Bad query (%s) used to retrieve %s instances: %s'
+                   'Please contact support.' % (batch_filters, model.__name__, str(e)))
+            raise InvalidQueryError(msg)
+
+        if not ids:
+            break
+
+        delete_func(ids)
+
+        last_id = ids[-1]
+        count += len(ids)
+        on_batch_deleted(last_id)
+
+        if len(ids) < batch_size:
+            break
+
+        rate_limiter.throttle(count=count)
+
+
+def _delete_by_query(model, filters, name):
+    try:
+        return model.delete_by_query(**filters)
+    except InvalidQueryError as e:
+        msg = ('Bad query (%s) used to delete %s instances: %s'
+               'Please contact support.' % (filters, name, str(e)))
+        raise InvalidQueryError(msg)
+
+
+def _load_checkpoint(logger, checkpoint_file, key):
+    checkpoint = {
+        'key': key,
+        'phase': PHASE_EXECUTIONS,
+        'last_id': None,
+        'stats': {
+            'executions': 0,
+            'liveactions': 0,
+            'execution_output': 0
+        }
+    }
+
+    existing_checkpoint = _read_checkpoint(checkpoint_file=checkpoint_file)
+
+    if not existing_checkpoint:
+        return checkpoint
+
+    if existing_checkpoint.get('key', None) != key:
+        logger.info('Ignoring checkpoint "%s" which was created using different purge parameters' %
+                    (checkpoint_file))
+        return checkpoint
+
+    logger.info('Resuming purge from checkpoint "%s" (phase=%s, last_id=%s)' %
+                (checkpoint_file, existing_checkpoint['phase'], existing_checkpoint['last_id']))
+    return existing_checkpoint
+
+
+def _read_checkpoint(checkpoint_file):
+    if not checkpoint_file or not os.path.isfile(checkpoint_file):
+        return None
+
+    with open(checkpoint_file, 'r') as fp:
+        return json.load(fp)
+
+
+def _save_checkpoint(checkpoint_file, checkpoint):
+    if not checkpoint_file:
+        return
+
+    # Write to a temporary file first so the checkpoint is not corrupted if the process is killed
+    # while writing it
+    temporary_file = '%s.tmp' % (checkpoint_file)
+
+    with open(temporary_file, 'w') as fp:
+        json.dump(checkpoint, fp)
+
+    os.rename(temporary_file, checkpoint_file)
+
+
+def _remove_checkpoint(checkpoint_file, key):
+    checkpoint = _read_checkpoint(checkpoint_file=checkpoint_file)
+
+    if checkpoint and checkpoint.get('key', None) == key:
+        os.unlink(checkpoint_file)
+
 
 def purge_execution_output_objects(logger, timestamp, action_ref=None):
     """
@@ -0,0 +1,143 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import zlib
+
+from webob.headers import ResponseHeaders
+
+__all__ = [
+    'GzipMiddleware'
+]
+
+# Content types of the responses which are compressed. Event streams and plain text execution
+# output are written incrementally so they are never compressed.
+COMPRESSIBLE_CONTENT_TYPES = [
+    'application/json'
+]
+
+# zlib window bits value which results in a gzip header and trailer being written
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class GzipMiddleware(object):
+    """
+    Compresses response bodies using gzip if the client accepts it.
+
+    Responses which are already fully rendered are compressed as a whole and only if they are
+    larger than ``min_size`` bytes. Streamed responses are compressed as they are being written.
+    """
+
+    def __init__(self, app, min_size=1024, compression_level=6):
+        self.app = app
+        self.min_size = min_size
+        self.compression_level = compression_level
+
+    def __call__(self, environ, start_response):
+        if not self._accepts_gzip(environ.get('HTTP_ACCEPT_ENCODING', '')):
+            return self.app(environ, start_response)
+
+        # Note: start_response is called by webob response before it returns the app iter so
+        # status and headers can be modified after the body is available
+        response = {}
+
+        def custom_start_response(status, headers, exc_info=None):
+            response['status'] = status
+            response['headers'] = headers
+            response['exc_info'] = exc_info
+
+        app_iter = self.app(environ, custom_start_response)
+
+        status = response['status']
+        headers = ResponseHeaders(response['headers'])
+        exc_info = response['exc_info']
+
+        if not self._is_compressible(status=status, headers=headers):
+            start_response(status, headers.items(), exc_info)
+            return app_iter
+
+        if 'Vary' in headers:
+            headers['Vary'] = headers['Vary'] + ', Accept-Encoding'
+        else:
+            headers['Vary'] = 'Accept-Encoding'
+
+        if isinstance(app_iter, list):
+            body = b''.join(app_iter)
+
+            if len(body) < self.min_size:
+                start_response(status, headers.items(), exc_info)
+                return [body]
+
+            compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, GZIP_WBITS)
+            body = compressor.compress(body) + compressor.flush()
+
+            headers['Content-Encoding'] = 'gzip'
+            headers['Content-Length'] = str(len(body))
+            start_response(status, headers.items(), exc_info)
+            return [body]
+
+        headers['Content-Encoding'] = 'gzip'
+        headers.pop('Content-Length', None)
+        start_response(status, headers.items(), exc_info)
+        return self._compress_iter(app_iter)
+
+    def _compress_iter(self, app_iter):
+        compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, GZIP_WBITS)
+
+        try:
+            for chunk in app_iter:
+                data = compressor.compress(chunk)
+
+                if data:
+                    yield data
+
+            yield compressor.flush()
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+    def _is_compressible(self, status, headers):
+        status_code = int(status.split(' ')[0])
+
+        if status_code < 200 or status_code in [204, 304]:
+            return False
+
+        if headers.get('Content-Encoding', None):
+            return False
+
+        content_type = headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in COMPRESSIBLE_CONTENT_TYPES:
+            return False
+
+        content_length = headers.get('Content-Length', None)
+        if content_length is not None and int(content_length) < self.min_size:
+            return False
+
+        return True
+
+    @staticmethod
+    def _accepts_gzip(accept_encoding):
+        for value in accept_encoding.split(','):
+            parts = [part.strip() for part in value.split(';')]
+
+            if parts[0].lower() not in ['gzip', '*']:
+                continue
+
+            for param in parts[1:]:
+                if param.replace(' ', '') in ['q=0', 'q=0.0', 'q=0.00', 'q=0.000']:
+                    return False
+
+            return True
+
+        return False
@@ -69,7 +69,7 @@ class CorsMiddleware(object):
             request_headers_allowed = ['Content-Type', 'Authorization', HEADER_ATTRIBUTE_NAME,
                                        HEADER_API_KEY_ATTRIBUTE_NAME, REQUEST_ID_HEADER]
             response_headers_allowed = ['Content-Type', 'X-Limit', 'X-Total-Count',
-                                        REQUEST_ID_HEADER]
+                                        'X-Next-Cursor', REQUEST_ID_HEADER]
 
             headers['Access-Control-Allow-Origin'] = origin_allowed
             headers['Access-Control-Allow-Methods'] = ','.join(methods_allowed)
@@ -332,6 +332,24 @@ class MongoDBAccess(object):
         instance = self.model.objects.insert(instance)
         return self._undo_dict_field_escape(instance)
 
+    def insert_many(self, instances):
+        """
+        Insert multiple new instances using a single bulk insert.
+        """
+        if not instances:
+            return []
+
+        # Note: Bulk insert doesn't validate the documents like save() does
+        for instance in instances:
+            instance.validate()
+
+        ids = self.model.objects.insert(instances, load_bulk=False)
+
+        for instance, instance_id in zip(instances, ids):
+            instance.id = instance_id
+
+        return instances
+
     def add_or_update(self, instance):
         instance.save()
         return self._undo_dict_field_escape(instance)
@@ -339,6 +357,17 @@ class MongoDBAccess(object):
     def update(self, instance, **kwargs):
         return instance.update(**kwargs)
 
+    def update_many(self, ids, **kwargs):
+        """
+        Update objects with the provided ids using a single query and return number of updated
+        objects.
+        """
+        qs = self.model.objects(id__in=ids)
+        count = qs.update(**kwargs)
+        log_query_and_profile_data_for_queryset(queryset=qs)
+
+        return count
+
     def delete(self, instance):
         return instance.delete()
 
@@ -27,7 +27,8 @@ from st2common.constants.types import ResourceType
 
 __all__ = [
     'ActionExecutionDB',
-    'ActionExecutionOutputDB'
+    'ActionExecutionOutputDB',
+    'ActionExecutionFilterValueDB'
 ]
 
 
@@ -157,4 +158,26 @@ class ActionExecutionOutputDB(stormbase.StormFoundationDB):
     }
 
 
-MODELS = [ActionExecutionDB, ActionExecutionOutputDB]
+class ActionExecutionFilterValueDB(stormbase.StormFoundationDB):
+    """
+    Distinct value of an execution filter (e.g. action reference or status).
+
+    Those values are maintained incrementally as executions are created and purged and are used to
+    populate the execution filters in the UI without running a distinct query over the whole
+    executions collection.
+
+    Attribute:
+        name: Filter name (e.g. action).
+        value: Distinct value of the corresponding execution attribute.
+    """
+    name = me.StringField(required=True)
+    value = me.DynamicField()
+
+    meta = {
+        'indexes': [
+            {'fields': ['name', 'value'], 'unique': True}
+        ]
+    }
+
+
+MODELS = [ActionExecutionDB, ActionExecutionOutputDB, ActionExecutionFilterValueDB]
@@ -23,7 +23,6 @@ from st2common.models.db import stormbase
 from st2common.models.db.notification import NotificationSchema
 from st2common.fields import ComplexDateTimeField
 from st2common.util import date as date_utils
-from st2common.util.secrets import get_secret_parameters
 from st2common.util.secrets import mask_secret_parameters
 
 __all__ = [
@@ -85,16 +84,10 @@ class LiveActionDB(stormbase.StormFoundationDB):
         result = copy.deepcopy(value)
         execution_parameters = value['parameters']
 
-        # TODO: This results into two DB looks, we should cache action and runner type object
-        # for each liveaction...
-        #
-        #       ,-'"-.
-        # .    f .--. \
-        # .\._,\._',' j_
-        #  7______""-'__`,
-        parameters = action_db.get_action_parameters_specs(action_ref=self.action)
-
-        secret_parameters = get_secret_parameters(parameters=parameters)
+        # Note: Secret parameter names are cached per action so this doesn't result in DB
+        # lookups on each serialization
+        secret_parameters = action_db.get_action_secret_parameters(action_ref=self.action,
+                                                                   use_cache=True)
         result['parameters'] = mask_secret_parameters(parameters=execution_parameters,
                                                       secret_parameters=secret_parameters)
         return result
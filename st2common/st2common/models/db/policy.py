@@ -20,11 +20,14 @@ from st2common.constants import pack as pack_constants
 from st2common.models.db import stormbase
 from st2common.models.system import common as common_models
 from st2common.constants.types import ResourceType
+from st2common.fields import ComplexDateTimeField
 
 
 __all__ = ['PolicyTypeReference',
            'PolicyTypeDB',
-           'PolicyDB']
+           'PolicyDB',
+           'ConcurrencySlotsDB',
+           'ConcurrencyQueueItemDB']
 
 LOG = logging.getLogger(__name__)
 
@@ -196,4 +199,49 @@ class PolicyDB(stormbase.StormFoundationDB, stormbase.ContentPackResourceMixin,
                                                                        name=self.name)
 
 
-MODELS = [PolicyTypeDB, PolicyDB]
+class ConcurrencySlotsDB(stormbase.StormFoundationDB):
+    """
+    Slots accounting for a concurrency policy.
+
+    Document is updated atomically by the schedulers so the decision whether an execution can be
+    scheduled doesn't require counting the scheduled and running executions.
+
+    Attribute:
+        key: Unique key of the slots (policy type, action and values of the policy attributes).
+        policy_ref: Reference of the policy the slots belong to.
+        slots_used: Number of used slots.
+        holders: IDs of the live actions which hold a slot.
+        version: Incremented on each change and used to detect concurrent changes during the
+                 reconciliation.
+        reconciled_at: Timestamp of the last reconciliation with the live actions in the database.
+    """
+    key = me.StringField(required=True, unique=True)
+    policy_ref = me.StringField()
+    slots_used = me.IntField(default=0)
+    holders = me.ListField(me.StringField())
+    version = me.IntField(default=0)
+    reconciled_at = me.FloatField(default=0)
+
+
+class ConcurrencyQueueItemDB(stormbase.StormFoundationDB):
+    """
+    Live action which has been delayed by a concurrency policy and waits for a free slot.
+
+    Attribute:
+        key: Key of the slots the live action is waiting for.
+        liveaction_id: ID of the delayed live action.
+        start_timestamp: Start timestamp of the live action which determines the queue order.
+    """
+    key = me.StringField(required=True)
+    liveaction_id = me.StringField(required=True)
+    start_timestamp = ComplexDateTimeField()
+
+    meta = {
+        'indexes': [
+            {'fields': ['key', 'liveaction_id'], 'unique': True},
+            {'fields': ['key', 'start_timestamp']}
+        ]
+    }
+
+
+MODELS = [PolicyTypeDB, PolicyDB, ConcurrencySlotsDB, ConcurrencyQueueItemDB]
@@ -16,10 +16,13 @@
 import re
 import fnmatch
 
+import six
+
 from st2common.util import date as date_utils
 
 __all__ = [
     'get_operator',
+    'get_compiled_operator',
     'get_allowed_operators'
 ]
 
@@ -35,6 +38,46 @@ def get_operator(op):
     else:
         raise Exception('Invalid operator: ' + op)
 
+
+def get_compiled_operator(op, criteria_pattern):
+    """
+    Return operator function specialized for the provided static criteria pattern.
+
+    For regular expression based operators the pattern is compiled once and the returned function
+    re-uses the compiled expression on each call (the passed in criteria_pattern is ignored). For
+    all the other operators this returns the same function as ``get_operator``.
+
+    :param op: Operator name.
+    :type op: ``str``
+
+    :param criteria_pattern: Static (already rendered) criteria pattern.
+    :type criteria_pattern: ``object``
+
+    :rtype: ``callable``
+    """
+    op_func = get_operator(op)
+
+    compile_spec = compiled_regex_operators.get(op.lower(), None)
+    if not compile_spec or not isinstance(criteria_pattern, six.string_types):
+        return op_func
+
+    flags, method_name = compile_spec
+
+    try:
+        regex = re.compile(criteria_pattern, flags)
+    except re.error:
+        # Invalid pattern, error will be thrown by the regular operator function when it's used
+        return op_func
+
+    regex_func = getattr(regex, method_name)
+
+    def compiled_op_func(value, criteria_pattern=None):
+        # check for a match and not for details of the match.
+        return regex_func(value) is not None
+
+    return compiled_op_func
+
+
 # Operation implementations
 
 
@@ -267,3 +310,11 @@ operators = {
     NINSIDE_LONG: ninside,
     NINSIDE_SHORT: ninside
 }
+
+# Maps regular expression operators to (flags, method) which is used to build a function with a
+# pre-compiled expression
+compiled_regex_operators = {
+    MATCH_REGEX: (re.DOTALL, 'match'),
+    REGEX: (0, 'search'),
+    IREGEX: (re.IGNORECASE, 'search')
+}
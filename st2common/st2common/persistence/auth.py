@@ -19,11 +19,14 @@ from st2common.exceptions.auth import (TokenNotFoundError, ApiKeyNotFoundError,
 from st2common.models.db import MongoDBAccess
 from st2common.models.db.auth import UserDB, TokenDB, ApiKeyDB
 from st2common.persistence.base import Access
+from st2common.transport import auth as auth_transport
+from st2common.transport import utils as transport_utils
 from st2common.util import hash as hash_utils
 
 
 class User(Access):
     impl = MongoDBAccess(UserDB)
+    publisher = None
 
     @classmethod
     def get(cls, username):
@@ -47,6 +50,14 @@ class User(Access):
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = auth_transport.AuthCUDPublisher(
+                urls=transport_utils.get_messaging_urls(),
+                resource_type=auth_transport.USER_RESOURCE_TYPE)
+        return cls.publisher
+
     @classmethod
     def _get_by_object(cls, object):
         # For User name is unique.
@@ -56,11 +67,36 @@ class User(Access):
 
 class Token(Access):
     impl = MongoDBAccess(TokenDB)
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = auth_transport.AuthCUDPublisher(
+                urls=transport_utils.get_messaging_urls(),
+                resource_type=auth_transport.TOKEN_RESOURCE_TYPE)
+        return cls.publisher
+
+    @classmethod
+    def publish_create(cls, model_object):
+        # Tokens are immutable and only delete events are needed to invalidate cached tokens.
+        # Token strings are never published on the message bus.
+        pass
+
+    @classmethod
+    def publish_update(cls, model_object):
+        pass
+
+    @classmethod
+    def publish_delete(cls, model_object):
+        publisher = cls._get_publisher()
+        if publisher:
+            publisher.publish_delete({'token_hash': hash_utils.hash(model_object.token)})
+
     @classmethod
     def add_or_update(cls, model_object, publish=True):
         if not getattr(model_object, 'user', None):
@@ -83,11 +119,20 @@ class Token(Access):
 
 class ApiKey(Access):
     impl = MongoDBAccess(ApiKeyDB)
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = auth_transport.AuthCUDPublisher(
+                urls=transport_utils.get_messaging_urls(),
+                resource_type=auth_transport.API_KEY_RESOURCE_TYPE)
+        return cls.publisher
+
     @classmethod
     def get(cls, value):
         # DB does not contain key but the key_hash.
@@ -161,6 +161,34 @@ class Access(object):
 
         return model_object
 
+    @classmethod
+    def insert_many(cls, model_objects, publish=True, dispatch_trigger=True):
+        """
+        Insert multiple new objects using a single bulk insert.
+        """
+        for model_object in model_objects:
+            if model_object.id:
+                raise ValueError('id for object %s was unexpected.' % model_object)
+
+        model_objects = cls._get_impl().insert_many(model_objects)
+
+        for model_object in model_objects:
+            # Publish internal event on the message bus
+            if publish:
+                try:
+                    cls.publish_create(model_object)
+                except:
+                    LOG.exception('Publish failed.')
+
+            # Dispatch trigger
+            if dispatch_trigger:
+                try:
+                    cls.dispatch_create_trigger(model_object)
+                except:
+                    LOG.exception('Trigger dispatch failed.')
+
+        return model_objects
+
     @classmethod
     def add_or_update(cls, model_object, publish=True, dispatch_trigger=True,
                       log_not_unique_error_as_debug=False):
@@ -17,12 +17,14 @@ from st2common import transport
 from st2common.models.db import MongoDBAccess
 from st2common.models.db.execution import ActionExecutionDB
 from st2common.models.db.execution import ActionExecutionOutputDB
+from st2common.models.db.execution import ActionExecutionFilterValueDB
 from st2common.persistence.base import Access
 from st2common.transport import utils as transport_utils
 
 __all__ = [
     'ActionExecution',
     'ActionExecutionOutput',
+    'ActionExecutionFilterValue'
 ]
 
 
@@ -63,3 +65,24 @@ class ActionExecutionOutput(Access):
     @classmethod
     def delete_by_query(cls, **query):
         return cls._get_impl().delete_by_query(**query)
+
+
+class ActionExecutionFilterValue(Access):
+    impl = MongoDBAccess(ActionExecutionFilterValueDB)
+
+    @classmethod
+    def _get_impl(cls):
+        return cls.impl
+
+    @classmethod
+    def add_value(cls, name, value):
+        """
+        Store the provided filter value if it's not stored yet.
+        """
+        model = cls._get_impl().model
+        model.objects(name=name, value=value).update_one(upsert=True, set__name=name,
+                                                         set__value=value)
+
+    @classmethod
+    def delete_by_query(cls, **query):
+        return cls._get_impl().delete_by_query(**query)
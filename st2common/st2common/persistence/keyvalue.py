@@ -22,6 +22,8 @@ from st2common.models.api.keyvalue import KeyValuePairAPI
 from st2common.models.db.keyvalue import keyvaluepair_access
 from st2common.models.system.common import ResourceReference
 from st2common.persistence.base import Access
+from st2common.transport import keyvalue as keyvalue_transport
+from st2common.transport import utils as transport_utils
 
 LOG = logging.getLogger(__name__)
 
@@ -113,6 +115,13 @@ class KeyValuePair(Access):
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = keyvalue_transport.KeyValuePairCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
     @classmethod
     def _get_by_object(cls, object):
         # For KeyValuePair name is unique.
@@ -13,8 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
 from st2common.models.db import MongoDBAccess
 from st2common.models.db.policy import PolicyTypeReference, PolicyTypeDB, PolicyDB
+from st2common.models.db.policy import ConcurrencySlotsDB, ConcurrencyQueueItemDB
 from st2common.persistence.base import Access, ContentPackResource
 
 
@@ -48,3 +51,138 @@ class Policy(ContentPackResource):
     @classmethod
     def _get_impl(cls):
         return cls.impl
+
+
+class ConcurrencySlots(Access):
+    """
+    Atomic operations on the concurrency policy slots.
+    """
+    impl = MongoDBAccess(ConcurrencySlotsDB)
+
+    @classmethod
+    def _get_impl(cls):
+        return cls.impl
+
+    @classmethod
+    def _get_slots(cls, key, **query):
+        return cls._get_impl().model.objects(key=key, **query)
+
+    @classmethod
+    def create(cls, key, policy_ref):
+        """
+        Create slots for the provided key if they don't exist yet.
+        """
+        cls._get_slots(key).update_one(upsert=True, set_on_insert__policy_ref=policy_ref,
+                                       set_on_insert__slots_used=0, set_on_insert__holders=[],
+                                       set_on_insert__version=0, set_on_insert__reconciled_at=0)
+
+    @classmethod
+    def acquire(cls, key, holder, threshold):
+        """
+        Acquire a slot for the provided holder if less than threshold slots are used.
+
+        :rtype: ``bool``
+        """
+        return bool(cls._get_slots(key, slots_used__lt=threshold, holders__nin=[holder])
+                    .update_one(inc__slots_used=1, push__holders=holder, inc__version=1))
+
+    @classmethod
+    def reserve(cls, key, threshold):
+        """
+        Reserve a slot which is not assigned to a holder yet.
+
+        :rtype: ``bool``
+        """
+        return bool(cls._get_slots(key, slots_used__lt=threshold)
+                    .update_one(inc__slots_used=1, inc__version=1))
+
+    @classmethod
+    def unreserve(cls, key):
+        cls._get_slots(key).update_one(dec__slots_used=1, inc__version=1)
+
+    @classmethod
+    def assign(cls, key, holder):
+        """
+        Assign a reserved slot to the provided holder.
+
+        :return: False if the holder already holds a slot.
+        :rtype: ``bool``
+        """
+        return bool(cls._get_slots(key, holders__nin=[holder])
+                    .update_one(push__holders=holder, inc__version=1))
+
+    @classmethod
+    def release(cls, key, holder):
+        """
+        Release a slot held by the provided holder.
+
+        :return: False if the holder doesn't hold a slot.
+        :rtype: ``bool``
+        """
+        return bool(cls._get_slots(key, holders=holder)
+                    .update_one(dec__slots_used=1, pull__holders=holder, inc__version=1))
+
+    @classmethod
+    def is_holder(cls, key, holder):
+        return bool(cls._get_slots(key, holders=holder).count())
+
+    @classmethod
+    def claim_reconciliation(cls, key, interval):
+        """
+        Claim the reconciliation of the provided slots if they haven't been reconciled in the last
+        interval seconds so only one process reconciles them.
+
+        :rtype: ``bool``
+        """
+        now = time.time()
+        return bool(cls._get_slots(key, reconciled_at__lte=(now - interval))
+                    .update_one(set__reconciled_at=now))
+
+    @classmethod
+    def reset(cls, key, version, holders):
+        """
+        Replace the holders if the slots haven't changed since the provided version.
+
+        :rtype: ``bool``
+        """
+        return bool(cls._get_slots(key, version=version)
+                    .update_one(set__holders=holders, set__slots_used=len(holders),
+                                inc__version=1))
+
+
+class ConcurrencyQueue(Access):
+    """
+    Ordered queue of the live actions which have been delayed by a concurrency policy.
+    """
+    impl = MongoDBAccess(ConcurrencyQueueItemDB)
+
+    @classmethod
+    def _get_impl(cls):
+        return cls.impl
+
+    @classmethod
+    def push(cls, key, liveaction_id, start_timestamp):
+        model = cls._get_impl().model
+        model.objects(key=key, liveaction_id=liveaction_id).update_one(
+            upsert=True, set_on_insert__start_timestamp=start_timestamp)
+
+    @classmethod
+    def pop(cls, key):
+        """
+        Remove and return ID of the oldest live action in the queue.
+
+        :rtype: ``str``
+        """
+        model = cls._get_impl().model
+        item = model.objects(key=key).order_by('start_timestamp').modify(remove=True)
+        return item.liveaction_id if item else None
+
+    @classmethod
+    def remove(cls, key, liveaction_ids):
+        model = cls._get_impl().model
+        return model.objects(key=key, liveaction_id__in=liveaction_ids).delete()
+
+    @classmethod
+    def get_liveaction_ids(cls, key):
+        model = cls._get_impl().model
+        return model.objects(key=key).distinct('liveaction_id')
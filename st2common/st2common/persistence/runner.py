@@ -15,15 +15,25 @@
 
 from st2common.persistence import base as persistence
 from st2common.models.db.runner import runnertype_access
+from st2common.transport import action as action_transport
+from st2common.transport import utils as transport_utils
 
 
 class RunnerType(persistence.Access):
     impl = runnertype_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = action_transport.RunnerTypeCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
     @classmethod
     def _get_by_object(cls, object):
         # For RunnerType name is unique.
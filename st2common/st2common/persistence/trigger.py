@@ -25,11 +25,19 @@ LOG = logging.getLogger(__name__)
 
 class TriggerType(ContentPackResource):
     impl = triggertype_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.reactor.TriggerTypeCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
 
 class Trigger(ContentPackResource):
     impl = trigger_access
@@ -89,3 +97,19 @@ class TriggerInstance(Access):
     @classmethod
     def delete_by_query(cls, **query):
         return cls._get_impl().delete_by_query(**query)
+
+    @classmethod
+    def update_status_many(cls, instances, status):
+        """
+        Update status of multiple trigger instances using a single query.
+        """
+        if not instances:
+            return instances
+
+        cls._get_impl().update_many(ids=[instance.id for instance in instances],
+                                    set__status=status)
+
+        for instance in instances:
+            instance.status = status
+
+        return instances
@@ -13,23 +13,65 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
+
+from oslo_config import cfg
+
 from st2common.constants import action as action_constants
+from st2common import log as logging
+from st2common.persistence import action as action_access
+from st2common.persistence.policy import ConcurrencyQueue
+from st2common.persistence.policy import ConcurrencySlots
 from st2common.policies import base
+from st2common.services import action as action_service
 from st2common.services import coordination
 
 __all__ = [
     'BaseConcurrencyApplicator'
 ]
 
+LOG = logging.getLogger(__name__)
+
+# Statuses of the live actions which hold a concurrency slot
+SLOT_HOLDER_STATES = [
+    action_constants.LIVEACTION_STATUS_SCHEDULED,
+    action_constants.LIVEACTION_STATUS_RUNNING
+]
+
+# Statuses of the live actions which have been handed a slot, but haven't been scheduled yet
+# (delayed executions which have been promoted, but whose status hasn't been updated yet, are
+# still delayed)
+SLOT_PENDING_STATES = [
+    action_constants.LIVEACTION_STATUS_REQUESTED,
+    action_constants.LIVEACTION_STATUS_DELAYED
+]
+
 
 class BaseConcurrencyApplicator(base.ResourcePolicyApplicator):
+    """
+    Base class for the concurrency policies.
+
+    If ``scheduler.use_concurrency_slots`` is enabled, concurrency is enforced using slots which
+    are stored in the database:
+
+    - Execution is scheduled if it manages to atomically acquire one of the ``threshold`` slots.
+    - Otherwise it's delayed and added to an ordered queue (or canceled).
+    - Slot is released once the execution completes and handed to the oldest delayed execution.
+    - Slots are periodically reconciled with the scheduled and running executions in the database
+      so slots which are never released (e.g. because a process died) are recovered.
+    """
+
     def __init__(self, policy_ref, policy_type, threshold=0, action='delay'):
         super(BaseConcurrencyApplicator, self).__init__(policy_ref=policy_ref,
                                                         policy_type=policy_type)
         self.threshold = threshold
         self.policy_action = action
 
-        self.coordinator = coordination.get_coordinator()
+    @property
+    def coordinator(self):
+        # Coordination service is only used when the slots are not used
+        return coordination.get_coordinator()
 
     def _get_status_for_policy_action(self, action):
         if action == 'delay':
@@ -38,3 +80,171 @@ class BaseConcurrencyApplicator(base.ResourcePolicyApplicator):
             status = action_constants.LIVEACTION_STATUS_CANCELING
 
         return status
+
+    def _use_slots(self):
+        return cfg.CONF.scheduler.use_concurrency_slots
+
+    def _get_filters(self, target):
+        """
+        Return query filters for the live actions which are subject to the same slots as the
+        provided target.
+        """
+        return {'action': target.action}
+
+    def _get_slots_key(self, target):
+        filters = self._get_filters(target)
+        filters.pop('status', None)
+
+        filters_hash = hashlib.sha1(json.dumps(filters, sort_keys=True)).hexdigest()
+        return '%s:%s:%s' % (self._policy_type, target.action, filters_hash)
+
+    def _schedule(self, target):
+        """
+        Schedule, delay or cancel the target depending on whether a slot can be acquired.
+        """
+        key = self._get_slots_key(target)
+        holder = str(target.id)
+
+        acquired = ConcurrencySlots.acquire(key=key, holder=holder, threshold=self.threshold)
+
+        # Execution which has been promoted from the queue already holds a slot
+        if not acquired and ConcurrencySlots.is_holder(key=key, holder=holder):
+            acquired = True
+
+        if not acquired:
+            ConcurrencySlots.create(key=key, policy_ref=self._policy_ref)
+
+            if self._reconcile(target=target, key=key):
+                # Slots freed by the reconciliation are handed to the delayed executions first
+                self._promote(key=key)
+                acquired = ConcurrencySlots.acquire(key=key, holder=holder,
+                                                    threshold=self.threshold)
+
+        if acquired:
+            LOG.debug('Slot for %s acquired. Threshold of %s is not reached. Action execution '
+                      'will be scheduled.', target.action, self._policy_ref)
+            status = action_constants.LIVEACTION_STATUS_SCHEDULED
+            return action_service.update_status(target, status, publish=False)
+
+        action = 'delayed' if self.policy_action == 'delay' else 'canceled'
+        LOG.debug('There are no free slots for %s. Threshold of %s is reached. Action execution '
+                  'will be %s.', target.action, self._policy_ref, action)
+        status = self._get_status_for_policy_action(action=self.policy_action)
+
+        # Publish status for cancellation so the appropriate runner can cancel the execution.
+        # Other statuses are not published because they will be picked up by the worker(s) to be
+        # processed again, leading to duplicate action executions.
+        publish = (status == action_constants.LIVEACTION_STATUS_CANCELING)
+        target = action_service.update_status(target, status, publish=publish)
+
+        if status == action_constants.LIVEACTION_STATUS_DELAYED:
+            # Status is updated before the execution is added to the queue so an execution which
+            # is promoted from the queue is always in the delayed status
+            ConcurrencyQueue.push(key=key, liveaction_id=holder,
+                                  start_timestamp=target.start_timestamp)
+
+            # Slot could have been released in the mean time
+            self._promote(key=key)
+
+        return target
+
+    def _release(self, target):
+        """
+        Release the slot held by the target and promote the oldest delayed execution.
+        """
+        key = self._get_slots_key(target)
+        liveaction_id = str(target.id)
+
+        if not ConcurrencySlots.release(key=key, holder=liveaction_id):
+            # Execution has been canceled while it was delayed
+            ConcurrencyQueue.remove(key=key, liveaction_ids=[liveaction_id])
+
+        self._reconcile(target=target, key=key)
+        self._promote(key=key)
+
+    def _promote(self, key):
+        """
+        Request the oldest delayed executions while there are free slots.
+        """
+        while ConcurrencySlots.reserve(key=key, threshold=self.threshold):
+            liveaction_id = ConcurrencyQueue.pop(key=key)
+
+            if not liveaction_id:
+                ConcurrencySlots.unreserve(key=key)
+                return
+
+            if not ConcurrencySlots.assign(key=key, holder=liveaction_id):
+                ConcurrencySlots.unreserve(key=key)
+                continue
+
+            liveaction_db = action_access.LiveAction.get(id=liveaction_id)
+
+            if not liveaction_db or \
+                    liveaction_db.status != action_constants.LIVEACTION_STATUS_DELAYED:
+                # Execution is not delayed anymore (e.g. it has been canceled)
+                ConcurrencySlots.release(key=key, holder=liveaction_id)
+                continue
+
+            LOG.debug('Slot for %s has been handed to delayed execution %s.',
+                      liveaction_db.action, liveaction_id)
+            action_service.update_status(liveaction_db,
+                                         action_constants.LIVEACTION_STATUS_REQUESTED,
+                                         publish=True)
+
+    def _reconcile(self, target, key):
+        """
+        Reconcile slots and the queue with the live actions in the database if they haven't been
+        reconciled in the last ``scheduler.concurrency_slots_reconcile_interval`` seconds.
+
+        :return: True if the slots have been reconciled.
+        :rtype: ``bool``
+        """
+        interval = cfg.CONF.scheduler.concurrency_slots_reconcile_interval
+
+        if not ConcurrencySlots.claim_reconciliation(key=key, interval=interval):
+            return False
+
+        filters = self._get_filters(target)
+        filters.pop('status', None)
+
+        slots_db = ConcurrencySlots.get(key=key)
+        liveaction_dbs = action_access.LiveAction.query(status__in=SLOT_HOLDER_STATES,
+                                                        **filters).only('id')
+        holders = [str(liveaction_db.id) for liveaction_db in liveaction_dbs]
+
+        # Executions which have acquired a slot, but haven't been scheduled yet
+        if slots_db.holders:
+            liveaction_dbs = action_access.LiveAction.query(id__in=slots_db.holders,
+                                                            status__in=SLOT_PENDING_STATES)
+            holders.extend([str(liveaction_db.id) for liveaction_db in liveaction_dbs.only('id')])
+
+        if not ConcurrencySlots.reset(key=key, version=slots_db.version, holders=holders):
+            LOG.debug('Slots for %s have changed during the reconciliation.', self._policy_ref)
+            return False
+
+        # Add delayed executions which are missing from the queue (e.g. executions which have been
+        # delayed before the slots have been created) and remove the ones which are not delayed
+        # anymore
+        queued_ids = set(ConcurrencyQueue.get_liveaction_ids(key=key))
+        liveaction_dbs = action_access.LiveAction.query(
+            status=action_constants.LIVEACTION_STATUS_DELAYED, **filters).only(
+                'id', 'start_timestamp')
+        delayed_ids = set()
+
+        for liveaction_db in liveaction_dbs:
+            if str(liveaction_db.id) in holders:
+                # Execution has already been promoted from the queue
+                continue
+
+            delayed_ids.add(str(liveaction_db.id))
+
+            if str(liveaction_db.id) not in queued_ids:
+                ConcurrencyQueue.push(key=key, liveaction_id=str(liveaction_db.id),
+                                      start_timestamp=liveaction_db.start_timestamp)
+
+        if queued_ids - delayed_ids:
+            ConcurrencyQueue.remove(key=key, liveaction_ids=list(queued_ids - delayed_ids))
+
+        LOG.debug('Slots for %s have been reconciled. %s slots are used and %s executions are '
+                  'delayed.', self._policy_ref, len(holders), len(delayed_ids))
+        return True
@@ -15,9 +15,12 @@
 
 import copy
 import functools
+import itertools
+import random
 import re
 import six
 import sys
+import time
 import traceback
 
 from flex.core import validate
@@ -32,10 +35,11 @@ from webob.compat import url_unquote
 from st2common.exceptions import rbac as rbac_exc
 from st2common.exceptions import auth as auth_exc
 from st2common import log as logging
-from st2common.persistence.auth import User
+from st2common.services import auth_cache
 from st2common.rbac import resolvers
 from st2common.util import date as date_utils
 from st2common.util.jsonify import json_encode
+from st2common.util.jsonify import json_encode_iter
 from st2common.util.http import parse_content_type_header
 
 
@@ -117,6 +121,8 @@ class NotFoundException(Exception):
 class Response(webob.Response):
     def __init__(self, body=None, status=None, headerlist=None, app_iter=None, content_type=None,
                  *args, **kwargs):
+        streamed = False
+
         # Do some sanity checking, and turn json_body into an actual body
         if app_iter is None and body is None and ('json_body' in kwargs or 'json' in kwargs):
             if 'json_body' in kwargs:
@@ -125,12 +131,36 @@ class Response(webob.Response):
                 json_body = kwargs.pop('json')
             body = json_encode(json_body).encode('UTF-8')
 
+            if content_type is None:
+                content_type = 'application/json'
+        elif app_iter is None and body is None and 'json_iter' in kwargs:
+            # Items are encoded one by one while the response body is being written. First item
+            # is retrieved right away so the errors raised by the database query still result in
+            # an error response.
+            json_iter = iter(kwargs.pop('json_iter'))
+            first_items = list(itertools.islice(json_iter, 1))
+            app_iter = self._get_json_app_iter(itertools.chain(first_items, json_iter))
+            streamed = True
+
             if content_type is None:
                 content_type = 'application/json'
 
         super(Response, self).__init__(body, status, headerlist, app_iter, content_type,
                                        *args, **kwargs)
 
+        self.streamed = streamed
+
+    @staticmethod
+    def _get_json_app_iter(json_iter):
+        try:
+            for chunk in json_encode_iter(json_iter):
+                yield chunk.encode('UTF-8')
+        except Exception:
+            # Status and headers could have already been sent so the connection is aborted to
+            # signal the client that the body is incomplete
+            LOG.exception('Failed to write streamed response body, aborting the connection.')
+            raise
+
     def _json_body__get(self):
         return super(Response, self)._json_body__get()
 
@@ -154,14 +184,33 @@ class Router(object):
         self.spec_resolver = None
         self.routes = routes.Mapper()
 
-    def add_spec(self, spec, transforms):
+        # operationId -> (validator, resolved schema) for the request body
+        self._body_validators = {}
+
+        # (operationId, response spec name) -> validator for the response body
+        self._response_validators = {}
+
+        # operationId -> validation time statistics
+        self._validation_stats = {}
+
+    def add_spec(self, spec, transforms, validate_spec=True):
+        """
+        :param validate_spec: False to skip validation of a spec which has already been validated
+                              (e.g. spec returned by ``spec_loader.load_compiled_spec``).
+        :type validate_spec: ``bool``
+        """
         info = spec.get('info', {})
         LOG.debug('Adding API: %s %s', info.get('title', 'untitled'), info.get('version', '0.0.0'))
 
+        start_time = time.time()
+
         self.spec = spec
         self.spec_resolver = jsonschema.RefResolver('', self.spec)
 
-        validate(copy.deepcopy(self.spec))
+        if validate_spec:
+            validate(copy.deepcopy(self.spec))
+
+        self._compile_validators()
 
         for filter in transforms:
             for (path, methods) in six.iteritems(spec['paths']):
@@ -188,6 +237,88 @@ class Router(object):
         for route in sorted(self.routes.matchlist, key=lambda r: r.routepath):
             LOG.debug('Route registered: %+6s %s', route.conditions['method'][0], route.routepath)
 
+        LOG.info('Added API spec with %s routes in %.3fs.', len(self.routes.matchlist),
+                 time.time() - start_time)
+
+    def get_validation_stats(self):
+        """
+        Return request and response validation time statistics for each operation.
+
+        :rtype: ``dict``
+        """
+        result = {}
+
+        for (operation_id, stats) in six.iteritems(self._validation_stats):
+            result[operation_id] = {}
+
+            for (name, item) in six.iteritems(stats):
+                result[operation_id][name] = dict(item)
+                result[operation_id][name]['time_avg'] = (item['time_total'] / item['count']
+                                                         if item['count'] else 0.0)
+
+        return result
+
+    def _compile_validators(self):
+        """
+        Build request and response body validators for all the endpoints in the spec so they are
+        not re-created and their top level references are not resolved again on each request.
+        """
+        self._body_validators = {}
+        self._response_validators = {}
+
+        for methods in six.itervalues(self.spec['paths']):
+            for endpoint in six.itervalues(methods):
+                operation_id = endpoint['operationId']
+
+                for param in endpoint.get('parameters', []) + endpoint.get('x-parameters', []):
+                    if param['in'] != 'body':
+                        continue
+
+                    schema = self._resolve_schema(param['schema'])
+                    validator = CustomValidator(schema, resolver=self.spec_resolver)
+                    self._body_validators[operation_id] = (validator, schema)
+
+                for (status_code, response_spec) in six.iteritems(endpoint.get('responses', {})):
+                    if 'schema' not in response_spec:
+                        continue
+
+                    schema = self._resolve_schema(response_spec['schema'])
+                    validator = CustomValidator(schema, resolver=self.spec_resolver)
+                    self._response_validators[(operation_id, str(status_code))] = validator
+
+    def _resolve_schema(self, schema):
+        ref = schema.get('$ref', None)
+
+        if not ref:
+            return schema
+
+        with self.spec_resolver.resolving(ref) as resolved:
+            return resolved
+
+    def _validate(self, operation_id, name, validator, instance):
+        start_time = time.time()
+
+        try:
+            validator.validate(instance)
+        finally:
+            duration = time.time() - start_time
+
+            stats = self._validation_stats.setdefault(operation_id, {})
+            item = stats.setdefault(name, {'count': 0, 'time_total': 0.0, 'time_max': 0.0})
+            item['count'] += 1
+            item['time_total'] += duration
+            item['time_max'] = max(item['time_max'], duration)
+
+    def _should_validate_response(self):
+        sample_rate = cfg.CONF.api.response_validation_sample_rate
+
+        if sample_rate <= 0:
+            return False
+        elif sample_rate >= 100:
+            return True
+
+        return random.random() * 100 < sample_rate
+
     def match(self, req):
         path = url_unquote(req.path)
         LOG.debug("Match path: %s", path)
@@ -257,7 +388,7 @@ class Router(object):
                             auth_func = op_resolver(definition['x-operationId'])
                             auth_resp = auth_func(token)
 
-                            context['user'] = User.get_by_name(auth_resp.user)
+                            context['user'] = auth_cache.get_user_by_name(auth_resp.user)
 
                             if 'x-set-cookie' in definition:
                                 max_age = auth_resp.expiry - date_utils.get_datetime_utc_now()
@@ -299,7 +430,8 @@ class Router(object):
                 permission_type = endpoint.get('x-permissions', None)
                 if permission_type:
                     resolver = resolvers.get_resolver_for_permission_type(permission_type)
-                    has_permission = resolver.user_has_permission(user_db, permission_type)
+                    has_permission = auth_cache.user_has_permission(resolver, user_db,
+                                                                    permission_type)
 
                     if not has_permission:
                         raise rbac_exc.ResourceTypeAccessDeniedError(user_db,
@@ -332,7 +464,7 @@ class Router(object):
                 if req.body:
                     content_type = req.headers.get('Content-Type', 'application/json')
                     content_type = parse_content_type_header(content_type=content_type)[0]
-                    schema = param['schema']
+                    validator, schema = self._body_validators[endpoint['operationId']]
 
                     try:
                         if content_type == 'application/json':
@@ -349,7 +481,8 @@ class Router(object):
                         raise exc.HTTPBadRequest(detail=detail)
 
                     try:
-                        CustomValidator(schema, resolver=self.spec_resolver).validate(data)
+                        self._validate(operation_id=endpoint['operationId'], name='request',
+                                       validator=validator, instance=data)
                     except (jsonschema.ValidationError, ValueError) as e:
                         raise exc.HTTPBadRequest(detail=e.message,
                                                  comment=traceback.format_exc())
@@ -361,11 +494,6 @@ class Router(object):
                             def __init__(self, **entries):
                                 self.__dict__.update(entries)
 
-                        ref = schema.get('$ref', None)
-                        if ref:
-                            with self.spec_resolver.resolving(ref) as resolved:
-                                schema = resolved
-
                         if 'x-api-model' in schema:
                             Model = op_resolver(schema['x-api-model'])
                             instance = Model(**data)
@@ -457,17 +585,23 @@ class Router(object):
 
         response_spec = response_spec or default_response_spec
 
-        if response_spec and 'schema' in response_spec:
+        # Validating a streamed response would require the whole body to be buffered
+        if getattr(resp, 'streamed', False):
+            LOG.debug('Skipping validation of streamed response for endpoint "%s"' %
+                      (endpoint['operationId']))
+        elif response_spec and 'schema' in response_spec and self._should_validate_response():
             LOG.debug('Using response spec "%s" for endpoint %s and status code %s' %
                      (response_spec_name, endpoint['operationId'], resp.status_code))
 
+            validator = self._response_validators[(endpoint['operationId'], response_spec_name)]
+
             try:
-                validator = CustomValidator(response_spec['schema'], resolver=self.spec_resolver)
-                validator.validate(resp.json)
+                self._validate(operation_id=endpoint['operationId'], name='response',
+                               validator=validator, instance=resp.json)
             except (jsonschema.ValidationError, ValueError):
                 LOG.exception('Response validation failed.')
                 resp.headers.add('Warning', '199 OpenAPI "Response validation failed"')
-        else:
+        elif not response_spec or 'schema' not in response_spec:
             LOG.debug('No response spec found for endpoint "%s"' % (endpoint['operationId']))
 
         if cookie_token:
@@ -14,9 +14,12 @@
 # limitations under the License.
 
 import json
+import math
 import re
 import os
+import posixpath
 import traceback
+import uuid
 
 import eventlet
 from paramiko.ssh_exception import SSHException
@@ -28,6 +31,7 @@ from st2common import log as logging
 from st2common.exceptions.ssh import NoHostsConnectedToException
 import st2common.util.jsonify as jsonify
 from st2common.util import ip_utils
+from st2common.util.shell import quote_unix
 
 LOG = logging.getLogger(__name__)
 
@@ -36,9 +40,13 @@ class ParallelSSHClient(object):
     KEYS_TO_TRANSFORM = ['stdout', 'stderr']
     CONNECT_ERROR = 'Cannot connect to host.'
 
+    # Name of the file which marks a fully uploaded cache directory
+    CACHE_MARKER_FILE = '.st2-complete'
+
     def __init__(self, hosts, user=None, password=None, pkey_file=None, pkey_material=None, port=22,
                  bastion_host=None, concurrency=10, raise_on_any_error=False, connect=True,
-                 passphrase=None, handle_stdout_line_func=None, handle_stderr_line_func=None):
+                 passphrase=None, handle_stdout_line_func=None, handle_stderr_line_func=None,
+                 connection_pool=None):
         """
         :param handle_stdout_line_func: Callback function which is called dynamically each time a
                                         new stdout line is received.
@@ -47,6 +55,10 @@ class ParallelSSHClient(object):
         :param handle_stderr_line_func: Callback function which is called dynamically each time a
                                         new stderr line is received.
         :type handle_stderr_line_func: ``func``
+
+        :param connection_pool: Optional pool of SSH connections to reuse. Connections are
+                                returned to the pool when the client is closed.
+        :type connection_pool: :class:`SSHConnectionPool`
         """
         self._ssh_user = user
 
@@ -61,6 +73,7 @@ class ParallelSSHClient(object):
         self._passphrase = passphrase
         self._handle_stdout_line_func = handle_stdout_line_func
         self._handle_stderr_line_func = handle_stderr_line_func
+        self._connection_pool = connection_pool
 
         if not hosts:
             raise Exception('Need an non-empty list of hosts to talk to.')
@@ -161,6 +174,55 @@ class ParallelSSHClient(object):
 
         return self._execute_in_pool(self._put_files, **options)
 
+    def put_cached(self, files, remote_path, max_entries=None, min_age=None):
+        """
+        Copy files and dirs to a content addressed cache directory on remote hosts.
+
+        The upload is skipped on the hosts where ``remote_path`` has already been fully uploaded.
+        Files are first uploaded to a temporary directory which is then renamed so concurrent
+        uploads of the same content never expose a partial directory.
+
+        Parent directory of ``remote_path`` is created with mode 0700 and a cached directory is
+        only re-used if both directories are owned by the SSH user and are not writable by other
+        users so nobody else can plant content which would then be executed.
+
+        Note: ``remote_path`` must be named after the hash of the uploaded content, all the
+        entries in the parent directory are treated as cache entries.
+
+        :param files: List of files and dirs to copy. Each item is a dict with ``local_path``,
+                      ``mode`` and ``mirror_local_mode`` keys. Items are copied to the root of the
+                      cache directory.
+        :type files: ``list`` of ``dict``
+
+        :param remote_path: Path to the remote cache directory. Must be shlex quoted.
+        :type remote_path: ``str``
+
+        :param max_entries: Optional Number of the most recently used cache directories to keep
+                            in the parent directory after a new entry has been uploaded.
+        :type max_entries: ``int``
+
+        :param min_age: Number of seconds since the last use after which the cache directories
+                        over ``max_entries`` and stale temporary upload directories are removed.
+                        Must be longer than the timeout of the actions which use the cache so a
+                        directory is never removed while it's in use.
+        :type min_age: ``int``
+
+        :rtype: ``dict`` of ``str`` to ``dict``
+        """
+
+        for item in files:
+            if not os.path.exists(item['local_path']):
+                raise Exception('Local path %s does not exist.' % item['local_path'])
+
+        options = {
+            'files': files,
+            'remote_path': remote_path,
+            'max_entries': max_entries,
+            'min_age': min_age
+        }
+
+        return self._execute_in_pool(self._put_cached, **options)
+
     def mkdir(self, path):
         """
         Create a directory on remote hosts.
@@ -253,7 +315,8 @@ class ParallelSSHClient(object):
                                    key_material=self._ssh_key_material,
                                    passphrase=self._passphrase,
                                    handle_stdout_line_func=self._handle_stdout_line_func,
-                                   handle_stderr_line_func=self._handle_stderr_line_func)
+                                   handle_stderr_line_func=self._handle_stderr_line_func,
+                                   connection_pool=self._connection_pool)
         try:
             client.connect()
         except SSHException as ex:
@@ -309,6 +372,112 @@ class ParallelSSHClient(object):
             LOG.exception(error)
             results[host] = self._generate_error_result(exc=ex, message=error)
 
+    def _put_cached(self, host, results, files, remote_path, max_entries=None, min_age=None):
+        try:
+            client = self._hosts_client[host]
+            cache_path = posixpath.dirname(remote_path)
+            entry_check = self._get_cache_entry_check(remote_path)
+
+            # Touching the directory updates the modification time which is used for eviction
+            command = '%s && %s && touch %s' % (self._get_private_dir_check(cache_path),
+                                                entry_check, quote_unix(remote_path))
+            _, _, exit_code = client.run(command)
+
+            if exit_code == 0:
+                LOG.debug('Files are already cached on host: %s' % host)
+                results[host] = {'cached': True}
+                return
+
+            LOG.debug('Copying files to cache dir on host: %s' % host)
+            temp_path = '%s.%s' % (remote_path, uuid.uuid4().hex)
+            command = 'mkdir -p -m 700 %s && %s && chmod 700 %s && mkdir -m 700 %s' % (
+                quote_unix(cache_path), self._get_owned_dir_check(cache_path),
+                quote_unix(cache_path), quote_unix(temp_path))
+            _, stderr, exit_code = client.run(command)
+
+            if exit_code != 0:
+                raise Exception('Failed to create cache dir %s, it needs to be owned by the SSH '
+                                'user: %s' % (cache_path, stderr))
+
+            for item in files:
+                local_path = item['local_path']
+
+                if os.path.isdir(local_path):
+                    client.put_dir(local_path, temp_path,
+                                   mirror_local_mode=item.get('mirror_local_mode', False))
+                else:
+                    path = posixpath.join(temp_path, os.path.basename(local_path))
+                    client.put(local_path, path, mode=item.get('mode', None),
+                               mirror_local_mode=item.get('mirror_local_mode', False))
+
+            # Rename fails if a non-empty directory already exists. It's either a directory
+            # uploaded concurrently by another execution or a stale / foreign directory which is
+            # replaced.
+            commands = [
+                'touch %s' % (quote_unix(posixpath.join(temp_path, self.CACHE_MARKER_FILE))),
+                'if mv -T {temp} {path} 2>/dev/null; then :; elif {check}; then rm -rf {temp}; '
+                'else rm -rf {path} && mv -T {temp} {path}; fi'.format(
+                    temp=quote_unix(temp_path), path=quote_unix(remote_path), check=entry_check)
+            ]
+
+            if max_entries:
+                commands.append(self._get_cache_eviction_command(
+                    cache_path=cache_path, max_entries=max_entries, min_age=min_age))
+
+            _, stderr, exit_code = client.run(' && '.join(commands))
+
+            if exit_code != 0:
+                raise Exception('Failed to finalize cache dir %s: %s' % (remote_path, stderr))
+
+            results[host] = {'cached': False}
+        except Exception as ex:
+            error = 'Failed sending file(s) to cache dir %s on host %s' % (remote_path, host)
+            LOG.exception(error)
+            results[host] = self._generate_error_result(exc=ex, message=error)
+
+    @staticmethod
+    def _get_owned_dir_check(path):
+        """
+        Return a condition which is true if path is a directory (not a symlink) owned by the SSH
+        user.
+        """
+        return 'test -d {path} && test ! -L {path} && test -O {path}'.format(
+            path=quote_unix(path))
+
+    @classmethod
+    def _get_private_dir_check(cls, path):
+        """
+        Return a condition which is true if path is a directory owned by the SSH user which is not
+        writable by the group and other users.
+        """
+        return '%s && test -z "$(find %s -maxdepth 0 -perm /022)"' % (
+            cls._get_owned_dir_check(path), quote_unix(path))
+
+    @classmethod
+    def _get_cache_entry_check(cls, path):
+        """
+        Return a condition which is true if path is a fully uploaded cache directory which can be
+        safely re-used.
+        """
+        return '%s && test -f %s' % (cls._get_private_dir_check(path),
+                                     quote_unix(posixpath.join(path, cls.CACHE_MARKER_FILE)))
+
+    @staticmethod
+    def _get_cache_eviction_command(cache_path, max_entries, min_age=None):
+        """
+        Return a command which removes the least recently used cache directories over max_entries
+        and the temporary upload directories (they contain a dot) which haven't been used in the
+        last min_age seconds. Eviction is best effort and never fails the command.
+        """
+        min_age_minutes = int(math.ceil((min_age or 0) / 60.0))
+        find_args = '-maxdepth 0 -mmin +%s -exec rm -rf {} \\;' % (min_age_minutes)
+
+        command = ('cd %s && for entry in $(ls -1t | grep -v "\\." | tail -n +%s); do '
+                   'find "$entry" %s; done && for entry in $(ls -1 | grep "\\."); do '
+                   'find "$entry" %s; done' % (quote_unix(cache_path), max_entries + 1,
+                                               find_args, find_args))
+        return '{ (%s) || true; }' % (command)
+
     def _mkdir(self, host, path, results):
         try:
             result = self._hosts_client[host].mkdir(path)
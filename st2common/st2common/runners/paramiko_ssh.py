@@ -84,7 +84,8 @@ class ParamikoSSHClient(object):
 
     def __init__(self, hostname, port=DEFAULT_SSH_PORT, username=None, password=None,
                  bastion_host=None, key_files=None, key_material=None, timeout=None,
-                 passphrase=None, handle_stdout_line_func=None, handle_stderr_line_func=None):
+                 passphrase=None, handle_stdout_line_func=None, handle_stderr_line_func=None,
+                 connection_pool=None):
         """
         Authentication is always attempted in the following order:
 
@@ -95,6 +96,12 @@ class ParamikoSSHClient(object):
           password and key is provided)
         - Plain username/password auth, if a password was given (if password is
           provided)
+
+        :param connection_pool: Optional pool of connections. If provided, an existing
+                                authenticated connection to the same host with the same
+                                parameters is reused and the connection is returned to the pool
+                                when the client is closed.
+        :type connection_pool: :class:`SSHConnectionPool`
         """
         self.hostname = hostname
         self.port = port
@@ -107,6 +114,8 @@ class ParamikoSSHClient(object):
         self.passphrase = passphrase
         self._handle_stdout_line_func = handle_stdout_line_func
         self._handle_stderr_line_func = handle_stderr_line_func
+        self._connection_pool = connection_pool
+        self._pooled_connection = None
 
         self.ssh_config_file = os.path.expanduser(
             cfg.CONF.ssh_runner.ssh_config_file_path or
@@ -128,6 +137,12 @@ class ParamikoSSHClient(object):
                  False otherwise.
         :rtype: ``bool``
         """
+        if self._connection_pool:
+            return self._connect_pooled()
+
+        return self._connect_unpooled()
+
+    def _connect_unpooled(self):
         if self.bastion_host:
             self.logger.debug('Bastion host specified, connecting')
             self.bastion_client = self._connect(host=self.bastion_host)
@@ -141,6 +156,26 @@ class ParamikoSSHClient(object):
         self.client = self._connect(host=self.hostname, socket=self.bastion_socket)
         return True
 
+    def _connect_pooled(self):
+        """
+        Retrieve a connection from the pool, establishing a new one if needed.
+        """
+        def connect_func():
+            self._connect_unpooled()
+            return (self.client, self.bastion_client)
+
+        key = self._connection_pool.get_key(hostname=self.hostname, port=self.port,
+                                            username=self.username, password=self.password,
+                                            key_files=self.key_files,
+                                            key_material=self.key_material,
+                                            passphrase=self.passphrase,
+                                            bastion_host=self.bastion_host)
+        self._pooled_connection = self._connection_pool.acquire(key=key,
+                                                                connect_func=connect_func)
+        self.client = self._pooled_connection.client
+        self.bastion_client = self._pooled_connection.bastion_client
+        return True
+
     def put(self, local_path, remote_path, mode=None, mirror_local_mode=False):
         """
         Upload a file to the remote node.
@@ -441,6 +476,17 @@ class ParamikoSSHClient(object):
         return [stdout, stderr, status]
 
     def close(self):
+        if self._pooled_connection:
+            self.logger.debug('Returning server connection to the pool')
+
+            if self.sftp_client:
+                self.sftp_client.close()
+                self.sftp_client = None
+
+            self._connection_pool.release(self._pooled_connection)
+            self._pooled_connection = None
+            return True
+
         self.logger.debug('Closing server connection')
 
         self.client.close()
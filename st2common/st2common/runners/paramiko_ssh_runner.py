@@ -20,13 +20,14 @@ from st2common.runners.base import ShellRunnerMixin
 from st2common.runners.base import ActionRunner
 from st2common.constants.runners import REMOTE_RUNNER_PRIVATE_KEY_HEADER
 from st2common.runners.parallel_ssh import ParallelSSHClient
+from st2common.runners.ssh_connection_pool import get_connection_pool
 from st2common import log as logging
 from st2common.constants.action import LIVEACTION_STATUS_SUCCEEDED
 from st2common.constants.action import LIVEACTION_STATUS_TIMED_OUT
 from st2common.constants.action import LIVEACTION_STATUS_FAILED
 from st2common.constants.runners import REMOTE_RUNNER_DEFAULT_ACTION_TIMEOUT
 from st2common.exceptions.actionrunner import ActionRunnerPreRunError
-from st2common.services.action import store_execution_output_data
+from st2common.services.action import ExecutionOutputWriter
 
 __all__ = [
     'BaseParallelSSHRunner'
@@ -75,6 +76,7 @@ class BaseParallelSSHRunner(ActionRunner, ShellRunnerMixin):
 
         self._ssh_key_file = None
         self._parallel_ssh_client = None
+        self._output_writer = None
         self._max_concurrency = cfg.CONF.ssh_runner.max_parallel_actions
 
     def pre_run(self):
@@ -121,29 +123,29 @@ class BaseParallelSSHRunner(ActionRunner, ShellRunnerMixin):
             'concurrency': concurrency,
             'bastion_host': self._bastion_host,
             'raise_on_any_error': False,
-            'connect': True
+            'connect': True,
+            'connection_pool': get_connection_pool()
         }
 
-        def make_store_stdout_line_func(execution_db, action_db):
+        self._output_writer = ExecutionOutputWriter(execution_db=self.execution,
+                                                    action_db=self.action)
+
+        def make_store_stdout_line_func(output_writer):
             def store_stdout_line(line):
                 if cfg.CONF.actionrunner.stream_output:
-                    store_execution_output_data(execution_db=execution_db, action_db=action_db,
-                                                data=line, output_type='stdout')
+                    output_writer.write(data=line, output_type='stdout')
 
             return store_stdout_line
 
-        def make_store_stderr_line_func(execution_db, action_db):
+        def make_store_stderr_line_func(output_writer):
             def store_stderr_line(line):
                 if cfg.CONF.actionrunner.stream_output:
-                    store_execution_output_data(execution_db=execution_db, action_db=action_db,
-                                                data=line, output_type='stderr')
+                    output_writer.write(data=line, output_type='stderr')
 
             return store_stderr_line
 
-        handle_stdout_line_func = make_store_stdout_line_func(execution_db=self.execution,
-                                                              action_db=self.action)
-        handle_stderr_line_func = make_store_stderr_line_func(execution_db=self.execution,
-                                                              action_db=self.action)
+        handle_stdout_line_func = make_store_stdout_line_func(output_writer=self._output_writer)
+        handle_stderr_line_func = make_store_stderr_line_func(output_writer=self._output_writer)
 
         if len(self._hosts) == 1:
             # We only support streaming output when running action on one host. That is because
@@ -176,10 +178,20 @@ class BaseParallelSSHRunner(ActionRunner, ShellRunnerMixin):
     def post_run(self, status, result):
         super(BaseParallelSSHRunner, self).post_run(status=status, result=result)
 
+        # Flush any remaining buffered output (no-op if it has already been flushed)
+        self._close_output_writer()
+
         # Ensure we close the connection when the action execution finishes
         if self._parallel_ssh_client:
             self._parallel_ssh_client.close()
 
+    def _close_output_writer(self):
+        """
+        Store any remaining buffered action output.
+        """
+        if self._output_writer:
+            self._output_writer.close()
+
     def _is_private_key_material(self, private_key):
         return private_key and REMOTE_RUNNER_PRIVATE_KEY_HEADER in private_key.lower()
 
@@ -0,0 +1,397 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pool of long running Python runner action worker processes.
+
+Spawning a new Python process for each action execution means st2common and the action module
+need to be imported for each execution which is slow. Worker processes are started per pack
+virtual environment and kept around so subsequent action executions only pay for the action run
+itself.
+"""
+
+import os
+import json
+import uuid
+from collections import defaultdict
+
+import eventlet
+from eventlet.green import subprocess
+from oslo_config import cfg
+from six.moves import StringIO
+
+from st2common import log as logging
+from st2common.constants.action import ACTION_OUTPUT_RESULT_DELIMITER
+from st2common.runners import python_action_wrapper
+from st2common.util.green.shell import TIMEOUT_EXIT_CODE
+
+__all__ = [
+    'PythonActionWorkerProcess',
+    'PythonActionWorkerPool',
+
+    'get_worker_pool',
+    'shutdown_worker_pool'
+]
+
+LOG = logging.getLogger(__name__)
+
+WRAPPER_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(python_action_wrapper.__file__)),
+                                   'python_action_wrapper.py')
+
+
+class PythonActionWorkerProcess(object):
+    """
+    Handle for a single worker process which runs Python runner actions for a single pack.
+    """
+
+    def __init__(self, python_path, pack, env=None, parent_args=None, preload=None):
+        """
+        :param python_path: Path to the Python binary (pack virtual environment).
+        :type python_path: ``str``
+
+        :param pack: Name of the pack this worker runs actions for.
+        :type pack: ``str``
+
+        :param env: Environment for the worker process.
+        :type env: ``dict``
+
+        :param parent_args: Command line arguments passed to the parent process.
+        :type parent_args: ``list``
+
+        :param preload: Paths to the action modules which are loaded when the worker starts.
+        :type preload: ``list``
+        """
+        self.python_path = python_path
+        self.pack = pack
+        self.env = env
+        self.parent_args = parent_args or []
+
+        self.runs = 0
+        self.max_rss = 0
+        self.dead = False
+
+        self._token = '%%%%st2-worker-%s%%%%' % (uuid.uuid4().hex)
+
+        args = [
+            python_path,
+            '-u',  # unbuffered mode so streaming mode works as expected
+            WRAPPER_SCRIPT_PATH,
+            '--worker',
+            '--pack=%s' % (pack),
+            '--token=%s' % (self._token),
+            '--parent-args=%s' % (json.dumps(self.parent_args))
+        ]
+
+        if preload:
+            args.append('--preload=%s' % (json.dumps(sorted(preload))))
+
+        LOG.debug('Starting Python runner worker process for pack "%s" (python_path=%s)' %
+                  (pack, python_path))
+        self.process = subprocess.Popen(args=args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, env=env, close_fds=True)
+
+    @property
+    def key(self):
+        return (self.python_path, self.pack)
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def is_alive(self):
+        return not self.dead and self.process.poll() is None
+
+    def run(self, file_path, parameters=None, config=None, user=None, log_level='debug', env=None,
+            timeout=None, stdout_buffer=None, stderr_buffer=None, store_stdout_func=None,
+            store_stderr_func=None):
+        """
+        Run the action inside this worker and wait until it completes.
+
+        If the action doesn't complete in the provided time, worker process is killed.
+
+        :param store_stdout_func: Function which is called with each stdout line when action
+                                  output streaming is enabled.
+        :type store_stdout_func: ``callable``
+
+        :param store_stderr_func: Function which is called with each stderr line when action
+                                  output streaming is enabled.
+        :type store_stderr_func: ``callable``
+
+        :rtype: ``tuple`` (exit_code, stdout, stderr, timed_out)
+        """
+        request = {
+            'file_path': file_path,
+            'parameters': parameters or {},
+            'config': config,
+            'user': user,
+            'log_level': log_level,
+            'env': env or {}
+        }
+
+        stdout_buffer = stdout_buffer if stdout_buffer is not None else StringIO()
+        stderr_buffer = stderr_buffer if stderr_buffer is not None else StringIO()
+
+        self.runs += 1
+        self.process.stdin.write(json.dumps(request) + '\n')
+        self.process.stdin.flush()
+
+        read_stdout_thread = eventlet.spawn(self._read_stream, self.process.stdout,
+                                            stdout_buffer, store_stdout_func)
+        read_stderr_thread = eventlet.spawn(self._read_stream, self.process.stderr,
+                                            stderr_buffer, store_stderr_func)
+
+        timed_out = False
+        completed = False
+        timer = eventlet.Timeout(timeout)
+
+        try:
+            status = read_stdout_thread.wait()
+            read_stderr_thread.wait()
+            completed = True
+        except eventlet.Timeout as e:
+            if e is not timer:
+                raise
+
+            LOG.debug('Action execution timeout reached, killing worker process.')
+            timed_out = True
+            read_stdout_thread.kill()
+            read_stderr_thread.kill()
+        finally:
+            timer.cancel()
+
+            if not completed:
+                # Timeout or the calling green thread has been killed, worker is in an unknown
+                # state
+                self.kill()
+
+        if timed_out:
+            exit_code = TIMEOUT_EXIT_CODE
+        elif status is None:
+            # Worker process died before the action completed
+            self.dead = True
+            exit_code = self.process.wait()
+        else:
+            status = json.loads(status)
+            exit_code = status['exit_code']
+            self.max_rss = status.get('max_rss', 0)
+
+        return (exit_code, stdout_buffer.getvalue(), stderr_buffer.getvalue(), timed_out)
+
+    def kill(self):
+        self.dead = True
+
+        try:
+            self.process.kill()
+        except OSError:
+            # Process has already exited
+            pass
+
+        self.process.wait()
+
+        for stream in [self.process.stdin, self.process.stdout, self.process.stderr]:
+            stream.close()
+
+    def _read_stream(self, stream, buff, store_data_func):
+        """
+        Read action output from the stream until the end of output marker.
+
+        :return: Data which follows the token on the marker line or None if the stream has been
+                 closed before the marker has been read.
+        """
+        while True:
+            line = stream.readline()
+
+            if not line:
+                return None
+
+            index = line.find(self._token)
+
+            if index != -1:
+                # Action output which doesn't end with a new line is followed by the marker
+                if index > 0:
+                    self._write_data(buff, store_data_func, line[:index])
+
+                return line[index + len(self._token):].strip()
+
+            self._write_data(buff, store_data_func, line)
+
+    def _write_data(self, buff, store_data_func, data):
+        buff.write(data)
+
+        # Filter out result delimiter lines
+        if ACTION_OUTPUT_RESULT_DELIMITER in data:
+            return
+
+        if store_data_func and cfg.CONF.actionrunner.stream_output:
+            store_data_func(data=data)
+
+
+class PythonActionWorkerPool(object):
+    """
+    Bounded pool of Python runner action worker processes per pack virtual environment.
+
+    Workers are recycled after a configured number of runs or when their peak memory usage grows
+    above a configured limit. When all the workers for a particular virtual environment are busy,
+    no worker is returned and the caller is expected to run the action in a new process.
+    """
+
+    def __init__(self, size, max_runs=0, max_memory=0):
+        """
+        :param size: Maximum number of worker processes per pack virtual environment.
+        :type size: ``int``
+
+        :param max_runs: Number of runs after which a worker is recycled. 0 means no limit.
+        :type max_runs: ``int``
+
+        :param max_memory: Peak memory usage in MB after which a worker is recycled. 0 means no
+                           limit.
+        :type max_memory: ``int``
+        """
+        self._size = size
+        self._max_runs = max_runs
+        self._max_memory = max_memory
+
+        # (python_path, pack) -> list of idle workers
+        self._idle_workers = defaultdict(list)
+
+        # (python_path, pack) -> number of alive workers
+        self._workers_count = defaultdict(int)
+
+        # (python_path, pack) -> action modules which have been ran by the workers
+        self._entry_points = defaultdict(set)
+
+        self._stopped = False
+
+    def acquire(self, python_path, pack, entry_point, env=None, parent_args=None):
+        """
+        Retrieve an idle worker for the provided virtual environment, starting a new one if the
+        pool is not full yet.
+
+        :return: Worker or None if all the workers are busy or the pool has been shut down.
+        :rtype: :class:`PythonActionWorkerProcess`
+        """
+        if self._stopped:
+            return None
+
+        key = (python_path, pack)
+        self._entry_points[key].add(entry_point)
+
+        idle_workers = self._idle_workers[key]
+
+        while idle_workers:
+            worker = idle_workers.pop()
+
+            if worker.is_alive():
+                return worker
+
+            LOG.debug('Removing dead Python runner worker process (pid=%s)' % (worker.pid))
+            worker.kill()
+            self._workers_count[key] -= 1
+
+        if self._workers_count[key] >= self._size:
+            LOG.debug('All the Python runner worker processes for pack "%s" are busy' % (pack))
+            return None
+
+        return self._start_worker(python_path=python_path, pack=pack, env=env,
+                                  parent_args=parent_args)
+
+    def release(self, worker):
+        """
+        Return worker to the pool once the action has completed.
+        """
+        key = worker.key
+
+        if self._stopped:
+            worker.kill()
+            self._workers_count[key] -= 1
+            return
+
+        if not worker.is_alive() or self._should_recycle(worker=worker):
+            LOG.debug('Recycling Python runner worker process (pid=%s, runs=%s, max_rss=%s)' %
+                      (worker.pid, worker.runs, worker.max_rss))
+            worker.kill()
+            self._workers_count[key] -= 1
+
+            # Start a replacement worker right away so the next action doesn't need to wait for
+            # the start up
+            worker = self._start_worker(python_path=worker.python_path, pack=worker.pack,
+                                        env=worker.env, parent_args=worker.parent_args)
+
+        self._idle_workers[key].append(worker)
+
+    def shutdown(self):
+        """
+        Kill all the idle workers. Busy workers are killed when they are released.
+        """
+        self._stopped = True
+
+        for key, idle_workers in self._idle_workers.items():
+            for worker in idle_workers:
+                worker.kill()
+                self._workers_count[key] -= 1
+
+        self._idle_workers.clear()
+
+    def _start_worker(self, python_path, pack, env=None, parent_args=None):
+        key = (python_path, pack)
+        self._workers_count[key] += 1
+
+        try:
+            worker = PythonActionWorkerProcess(python_path=python_path, pack=pack, env=env,
+                                               parent_args=parent_args,
+                                               preload=self._entry_points[key])
+        except Exception:
+            self._workers_count[key] -= 1
+            raise
+
+        return worker
+
+    def _should_recycle(self, worker):
+        if self._max_runs and worker.runs >= self._max_runs:
+            return True
+
+        # Note: max_rss is reported in kilobytes
+        if self._max_memory and worker.max_rss >= (self._max_memory * 1024):
+            return True
+
+        return False
+
+
+_WORKER_POOL = None
+
+
+def get_worker_pool():
+    """
+    Return the worker pool for this process.
+
+    :rtype: :class:`PythonActionWorkerPool`
+    """
+    global _WORKER_POOL
+
+    if not _WORKER_POOL:
+        _WORKER_POOL = PythonActionWorkerPool(
+            size=cfg.CONF.actionrunner.python_runner_worker_pool_size,
+            max_runs=cfg.CONF.actionrunner.python_runner_worker_max_runs,
+            max_memory=cfg.CONF.actionrunner.python_runner_worker_max_memory)
+
+    return _WORKER_POOL
+
+
+def shutdown_worker_pool():
+    """
+    Kill the worker processes of this process' worker pool (if it has been created).
+    """
+    if _WORKER_POOL:
+        _WORKER_POOL.shutdown()
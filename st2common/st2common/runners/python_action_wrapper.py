@@ -31,8 +31,11 @@ if __name__ == '__main__':
 import sys
 import json
 import argparse
+import resource
 import traceback
+import logging as stdlib_logging
 
+import six
 from oslo_config import cfg
 
 from st2common import log as logging
@@ -47,6 +50,7 @@ from st2common.constants.runners import PYTHON_RUNNER_INVALID_ACTION_STATUS_EXIT
 
 __all__ = [
     'PythonActionWrapper',
+    'PythonActionWorker',
     'ActionService'
 ]
 
@@ -115,7 +119,7 @@ class ActionService(object):
 
 class PythonActionWrapper(object):
     def __init__(self, pack, file_path, config=None, parameters=None, user=None, parent_args=None,
-                 log_level='debug'):
+                 log_level='debug', parse_config=True, action_cls=None):
         """
         :param pack: Name of the pack this action belongs to.
         :type pack: ``str``
@@ -134,6 +138,14 @@ class PythonActionWrapper(object):
 
         :param parent_args: Command line arguments passed to the parent process.
         :type parse_args: ``list``
+
+        :param parse_config: True to parse the config using parent args. False if the config has
+                             already been parsed (e.g. when running inside a worker process).
+        :type parse_config: ``bool``
+
+        :param action_cls: Already loaded action class. If not provided, action class is loaded
+                           from the action module.
+        :type action_cls: ``class``
         """
 
         self._pack = pack
@@ -143,15 +155,17 @@ class PythonActionWrapper(object):
         self._user = user
         self._parent_args = parent_args or []
         self._log_level = log_level
+        self._action_cls = action_cls
 
         self._class_name = None
         self._logger = logging.getLogger('PythonActionWrapper')
 
-        try:
-            st2common_config.parse_args(args=self._parent_args)
-        except Exception as e:
-            LOG.debug('Failed to parse config using parent args (parent_args=%s): %s' %
-                      (str(self._parent_args), str(e)))
+        if parse_config:
+            try:
+                st2common_config.parse_args(args=self._parent_args)
+            except Exception as e:
+                LOG.debug('Failed to parse config using parent args (parent_args=%s): %s' %
+                          (str(self._parent_args), str(e)))
 
         # Note: We can only set a default user value if one is not provided after parsing the
         # config
@@ -204,6 +218,23 @@ class PythonActionWrapper(object):
         sys.stdout.flush()
 
     def _get_action_instance(self):
+        if not self._action_cls:
+            self._action_cls = self._get_action_class()
+
+        action_cls = self._action_cls
+
+        # Retrieve name of the action class
+        # Note - we need to either use cls.__name_ or inspect.getmro(cls)[0].__name__ to
+        # retrieve a correct name
+        self._class_name = action_cls.__name__
+
+        action_service = ActionService(action_wrapper=self)
+        action_instance = get_action_class_instance(action_cls=action_cls,
+                                                    config=self._config,
+                                                    action_service=action_service)
+        return action_instance
+
+    def _get_action_class(self):
         try:
             actions_cls = action_loader.register_plugin(Action, self._file_path)
         except Exception as e:
@@ -220,23 +251,180 @@ class PythonActionWrapper(object):
             raise Exception('File "%s" has no action class or the file doesn\'t exist.' %
                             (self._file_path))
 
-        # Retrieve name of the action class
-        # Note - we need to either use cls.__name_ or inspect.getmro(cls)[0].__name__ to
-        # retrieve a correct name
-        self._class_name = action_cls.__name__
+        return action_cls
 
-        action_service = ActionService(action_wrapper=self)
-        action_instance = get_action_class_instance(action_cls=action_cls,
-                                                    config=self._config,
-                                                    action_service=action_service)
-        return action_instance
+
+class PythonActionWorker(object):
+    """
+    Long running process which runs multiple Python runner actions for a single pack.
+
+    Worker reads action execution requests from stdin (one JSON serialized request per line) and
+    runs them one by one. Action output is written to stdout and stderr the same way as when
+    running in a short lived wrapper process. Once an action completes, worker writes a line which
+    starts with the token to stdout (followed by the exit code and peak memory usage serialized as
+    JSON) and to stderr.
+    """
+
+    def __init__(self, pack, token, parent_args=None, preload=None):
+        """
+        :param pack: Name of the pack this worker runs actions for.
+        :type pack: ``str``
+
+        :param token: Token which is used to mark the end of the action output.
+        :type token: ``str``
+
+        :param parent_args: Command line arguments passed to the parent process.
+        :type parse_args: ``list``
+
+        :param preload: Paths to the action modules which are loaded when the worker starts.
+        :type preload: ``list``
+        """
+        self._pack = pack
+        self._token = token
+        self._parent_args = parent_args or []
+        self._preload = preload or []
+
+        # Cache of loaded action classes - file path -> (mtime, action class)
+        self._action_classes = {}
+
+    def run(self):
+        try:
+            st2common_config.parse_args(args=self._parent_args)
+        except Exception as e:
+            LOG.debug('Failed to parse config using parent args (parent_args=%s): %s' %
+                      (str(self._parent_args), str(e)))
+
+        # Requests are read from a copy of the stdin file descriptor and the original one is
+        # pointed to /dev/null so actions which read from stdin can't consume the requests
+        requests = os.fdopen(os.dup(sys.stdin.fileno()), 'r')
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, sys.stdin.fileno())
+        os.close(devnull)
+
+        for file_path in self._preload:
+            try:
+                self._get_action_class(file_path=file_path)
+            except Exception as e:
+                LOG.debug('Failed to preload action "%s": %s' % (file_path, str(e)))
+
+        while True:
+            line = requests.readline()
+
+            if not line:
+                # Parent closed the pipe
+                break
+
+            request = json.loads(line)
+            exit_code = self._run_action(request=request)
+
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            status = json.dumps({'exit_code': exit_code, 'max_rss': max_rss})
+
+            sys.stdout.write('%s%s\n' % (self._token, status))
+            sys.stdout.flush()
+            sys.stderr.write('%s\n' % (self._token))
+            sys.stderr.flush()
+
+    def _run_action(self, request):
+        """
+        Run a single action and return the exit code.
+
+        :rtype: ``int``
+        """
+        file_path = request['file_path']
+
+        original_env = os.environ.copy()
+        os.environ.update(request.get('env', None) or {})
+
+        wrapper = None
+        try:
+            wrapper = PythonActionWrapper(pack=self._pack,
+                                          file_path=file_path,
+                                          config=request.get('config', None),
+                                          parameters=request.get('parameters', None),
+                                          user=request.get('user', None),
+                                          parent_args=self._parent_args,
+                                          log_level=request.get('log_level', 'debug'),
+                                          parse_config=False,
+                                          action_cls=self._get_cached_action_class(file_path))
+            wrapper.run()
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = self._get_system_exit_code(e)
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            os.environ.clear()
+            os.environ.update(original_env)
+            self._remove_action_log_handlers()
+
+        if wrapper and wrapper._action_cls and file_path not in self._action_classes:
+            self._cache_action_class(file_path=file_path, action_cls=wrapper._action_cls)
+
+        return exit_code
+
+    def _get_action_class(self, file_path):
+        action_cls = self._get_cached_action_class(file_path=file_path)
+
+        if not action_cls:
+            wrapper = PythonActionWrapper(pack=self._pack, file_path=file_path,
+                                          parse_config=False)
+            action_cls = wrapper._get_action_class()
+            self._cache_action_class(file_path=file_path, action_cls=action_cls)
+
+        return action_cls
+
+    def _get_cached_action_class(self, file_path):
+        item = self._action_classes.get(file_path, None)
+
+        if not item:
+            return None
+
+        mtime, action_cls = item
+
+        if mtime != self._get_mtime(file_path=file_path):
+            # Action module has been modified since it has been loaded
+            del self._action_classes[file_path]
+            return None
+
+        return action_cls
+
+    def _cache_action_class(self, file_path, action_cls):
+        mtime = self._get_mtime(file_path=file_path)
+
+        if mtime is not None:
+            self._action_classes[file_path] = (mtime, action_cls)
+
+    def _get_mtime(self, file_path):
+        try:
+            return os.stat(file_path).st_mtime
+        except OSError:
+            return None
+
+    def _get_system_exit_code(self, exc):
+        if exc.code is None:
+            return 0
+        elif isinstance(exc.code, int):
+            return exc.code
+
+        # Same as the Python interpreter, non-integer code is printed to stderr
+        sys.stderr.write('%s\n' % (exc.code))
+        return 1
+
+    def _remove_action_log_handlers(self):
+        # Each action instance adds a handler to the action logger so we need to remove them to
+        # avoid duplicated log messages on subsequent runs
+        for name, logger in six.iteritems(stdlib_logging.Logger.manager.loggerDict):
+            if name.startswith('st2.actions.python.') and isinstance(logger, stdlib_logging.Logger):
+                logger.handlers = []
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Python action runner process wrapper')
     parser.add_argument('--pack', required=True,
                         help='Name of the pack this action belongs to')
-    parser.add_argument('--file-path', required=True,
+    parser.add_argument('--file-path', required=False,
                         help='Path to the action module')
     parser.add_argument('--config', required=False,
                         help='Pack config serialized as JSON')
@@ -249,16 +437,39 @@ if __name__ == '__main__':
                              ' JSON')
     parser.add_argument('--log-level', required=False, default='debug',
                         help='Log level for actions')
+    parser.add_argument('--worker', required=False, action='store_true', default=False,
+                        help='Run as a long running worker which reads requests from stdin')
+    parser.add_argument('--token', required=False,
+                        help='Token which marks the end of the action output in worker mode')
+    parser.add_argument('--preload', required=False,
+                        help='Paths to the action modules which are loaded when the worker '
+                             'starts serialized as JSON')
     args = parser.parse_args()
 
+    parent_args = json.loads(args.parent_args) if args.parent_args else []
+    assert isinstance(parent_args, list)
+
+    if args.worker:
+        if not args.token:
+            parser.error('--token argument is required in worker mode')
+
+        preload = json.loads(args.preload) if args.preload else []
+        worker = PythonActionWorker(pack=args.pack,
+                                    token=args.token,
+                                    parent_args=parent_args,
+                                    preload=preload)
+        worker.run()
+        sys.exit(0)
+
+    if not args.file_path:
+        parser.error('--file-path argument is required')
+
     config = json.loads(args.config) if args.config else {}
     parameters = args.parameters
     parameters = json.loads(parameters) if parameters else {}
     user = args.user
-    parent_args = json.loads(args.parent_args) if args.parent_args else []
     log_level = args.log_level
 
-    assert isinstance(parent_args, list)
     obj = PythonActionWrapper(pack=args.pack,
                               file_path=args.file_path,
                               config=config,
@@ -0,0 +1,331 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pool of authenticated SSH connections which are shared by the remote runners.
+
+SSH allows multiple channels (command sessions, SFTP sessions) to be multiplexed over a single
+authenticated transport. Connections in the pool are keyed by all the parameters which affect the
+authentication so a connection is only ever shared by the clients which would open an identical
+connection themselves.
+"""
+
+import hashlib
+import time
+
+import eventlet
+from oslo_config import cfg
+
+from st2common import log as logging
+
+__all__ = [
+    'SSHConnectionPool',
+    'PooledSSHConnection',
+    'SSHConnectionPoolTimeoutError',
+
+    'get_connection_pool'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class SSHConnectionPoolTimeoutError(Exception):
+    """
+    Exception which is raised when a connection can't be acquired because the per-host limit has
+    been reached and no connection has been released in time.
+    """
+    pass
+
+
+class PooledSSHConnection(object):
+    """
+    Authenticated SSH connection (and optional bastion host connection) which is owned by the
+    pool.
+    """
+
+    def __init__(self, key, client, bastion_client=None):
+        self.key = key
+        self.client = client
+        self.bastion_client = bastion_client
+
+        # Number of clients which are currently using this connection
+        self.leases = 0
+        self.last_used = time.time()
+
+    @property
+    def host(self):
+        """
+        Host (hostname, port) tuple this connection is established to.
+        """
+        return (self.key[0], self.key[1])
+
+    def is_active(self):
+        transport = self.client.get_transport()
+        return bool(transport and transport.is_active())
+
+    def close(self):
+        for client in [self.client, self.bastion_client]:
+            if not client:
+                continue
+
+            try:
+                client.close()
+            except Exception:
+                LOG.exception('Failed to close pooled SSH connection to host: %s', self.host)
+
+    def __repr__(self):
+        return ('<PooledSSHConnection host=%s,username=%s,leases=%s,id=%s>' %
+                (self.host, self.key[2], self.leases, id(self)))
+
+
+class SSHConnectionPool(object):
+    """
+    Pool of SSH connections shared between the executions which are run by this action runner.
+
+    - Each connection is used by at most ``max_sessions`` clients at the same time. Each client
+      opens new channels over the shared transport.
+    - At most ``max_connections_per_host`` connections are opened to the same host. If all of them
+      are fully used, clients wait for a connection to be released (at most ``acquire_timeout``
+      seconds, 0 means without a limit).
+    - Keepalive messages are sent over idle transports and inactive connections are discarded.
+    - Connections which haven't been used for ``idle_timeout`` seconds are closed. Once the reaper
+      is started, idle connections are also closed when no new connections are acquired.
+    """
+
+    # How long to sleep while waiting for a connection to be released
+    SLEEP_DELAY = 0.1
+
+    def __init__(self, max_connections_per_host=2, max_sessions=4, idle_timeout=60,
+                 keepalive_interval=30, acquire_timeout=0):
+        self.max_connections_per_host = max_connections_per_host
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.acquire_timeout = acquire_timeout
+
+        # (hostname, port) -> list of PooledSSHConnection
+        self._connections = {}
+
+        # (hostname, port) -> number of connections which are being established
+        self._pending = {}
+
+        self._reaper_thread = None
+
+    @staticmethod
+    def get_key(hostname, port, username=None, password=None, key_files=None, key_material=None,
+                passphrase=None, bastion_host=None):
+        """
+        Return a pool key for the provided connection parameters.
+
+        Credentials are not stored in the key, only their fingerprint.
+        """
+        credentials = [password, key_files, key_material, passphrase]
+        fingerprint = hashlib.sha256(repr(credentials)).hexdigest()
+        return (hostname, port, username, fingerprint, bastion_host)
+
+    def acquire(self, key, connect_func):
+        """
+        Return a connection for the provided key, establishing a new one if there is no connection
+        which can be shared.
+
+        :param connect_func: Function which establishes a new connection and returns a
+                             (client, bastion_client) tuple.
+        :type connect_func: ``callable``
+
+        :rtype: :class:`PooledSSHConnection`
+        """
+        host = (key[0], key[1])
+        start_time = time.time()
+
+        while True:
+            self.reap()
+
+            connection = self._get_available_connection(key=key)
+
+            if connection:
+                connection.leases += 1
+                connection.last_used = time.time()
+                LOG.debug('Reusing pooled SSH connection: %s', connection)
+                return connection
+
+            if self._get_connections_count(host=host) < self.max_connections_per_host:
+                break
+
+            # Make room for the new connection by closing an unused connection to the same host
+            # which has been opened with different parameters
+            if self._remove_unused_connection(host=host):
+                continue
+
+            if self.acquire_timeout and (time.time() - start_time) > self.acquire_timeout:
+                msg = ('Timeout while waiting for a SSH connection to host %s:%s to become '
+                       'available (max %s connections per host)' %
+                       (key[0], key[1], self.max_connections_per_host))
+                raise SSHConnectionPoolTimeoutError(msg)
+
+            eventlet.sleep(self.SLEEP_DELAY)
+
+        self._pending[host] = self._pending.get(host, 0) + 1
+
+        try:
+            client, bastion_client = connect_func()
+        finally:
+            self._pending[host] -= 1
+
+            if not self._pending[host]:
+                del self._pending[host]
+
+        if self.keepalive_interval:
+            client.get_transport().set_keepalive(self.keepalive_interval)
+
+        connection = PooledSSHConnection(key=key, client=client, bastion_client=bastion_client)
+        connection.leases = 1
+        self._connections.setdefault(host, []).append(connection)
+
+        LOG.debug('Established new pooled SSH connection: %s', connection)
+        return connection
+
+    def release(self, connection, discard=False):
+        """
+        Return connection to the pool.
+
+        :param discard: True to close the connection (e.g. because it's not usable anymore).
+        :type discard: ``bool``
+        """
+        connection.leases = max(connection.leases - 1, 0)
+        connection.last_used = time.time()
+
+        if discard or not connection.is_active():
+            self._remove(connection)
+
+    def reap(self):
+        """
+        Close connections which are not active anymore and the ones which have been idle for more
+        than ``idle_timeout`` seconds.
+        """
+        now = time.time()
+
+        for connections in list(self._connections.values()):
+            for connection in list(connections):
+                if not connection.is_active():
+                    LOG.debug('Removing inactive pooled SSH connection: %s', connection)
+                    self._remove(connection)
+                elif not connection.leases and (now - connection.last_used) > self.idle_timeout:
+                    LOG.debug('Removing idle pooled SSH connection: %s', connection)
+                    self._remove(connection)
+
+    def start_reaper(self):
+        """
+        Start a green thread which periodically closes idle and inactive connections.
+        """
+        if not self._reaper_thread:
+            self._reaper_thread = eventlet.spawn(self._run_reaper)
+
+    def _run_reaper(self):
+        interval = max(min(self.idle_timeout, 60), 1)
+
+        while True:
+            eventlet.sleep(interval)
+
+            try:
+                self.reap()
+            except Exception:
+                LOG.exception('Failed to close idle pooled SSH connections.')
+
+    def close(self):
+        """
+        Close all the connections in the pool.
+        """
+        if self._reaper_thread:
+            self._reaper_thread = eventlet.kill(self._reaper_thread)
+
+        for connections in list(self._connections.values()):
+            for connection in list(connections):
+                self._remove(connection)
+
+    def get_stats(self):
+        """
+        :rtype: ``dict``
+        """
+        connections = [connection for connections in self._connections.values()
+                       for connection in connections]
+        return {
+            'hosts': len(self._connections),
+            'connections': len(connections),
+            'leases': sum([connection.leases for connection in connections])
+        }
+
+    def _get_available_connection(self, key):
+        connections = self._connections.get((key[0], key[1]), [])
+        candidates = [connection for connection in connections if connection.key == key and
+                      connection.leases < self.max_sessions]
+
+        if not candidates:
+            return None
+
+        # Prefer the least used connection so channels are spread over the connections
+        return min(candidates, key=lambda connection: connection.leases)
+
+    def _remove_unused_connection(self, host):
+        connections = [connection for connection in self._connections.get(host, [])
+                       if not connection.leases]
+
+        if not connections:
+            return False
+
+        connection = min(connections, key=lambda connection: connection.last_used)
+        LOG.debug('Removing unused pooled SSH connection: %s', connection)
+        self._remove(connection)
+        return True
+
+    def _get_connections_count(self, host):
+        return len(self._connections.get(host, [])) + self._pending.get(host, 0)
+
+    def _remove(self, connection):
+        connections = self._connections.get(connection.host, [])
+
+        if connection in connections:
+            connections.remove(connection)
+
+        if not connections:
+            self._connections.pop(connection.host, None)
+
+        connection.close()
+
+
+_CONNECTION_POOL = None
+
+
+def get_connection_pool():
+    """
+    Return the SSH connection pool for this process.
+
+    :return: Pool or None if connection pooling is disabled.
+    :rtype: :class:`SSHConnectionPool`
+    """
+    global _CONNECTION_POOL
+
+    if not cfg.CONF.ssh_runner.use_connection_pool:
+        return None
+
+    if not _CONNECTION_POOL:
+        _CONNECTION_POOL = SSHConnectionPool(
+            max_connections_per_host=cfg.CONF.ssh_runner.connection_pool_max_per_host,
+            max_sessions=cfg.CONF.ssh_runner.connection_pool_max_sessions,
+            idle_timeout=cfg.CONF.ssh_runner.connection_pool_idle_timeout,
+            keepalive_interval=cfg.CONF.ssh_runner.connection_pool_keepalive_interval,
+            acquire_timeout=cfg.CONF.ssh_runner.connection_pool_acquire_timeout)
+        _CONNECTION_POOL.start_reaper()
+
+    return _CONNECTION_POOL
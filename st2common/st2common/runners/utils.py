@@ -136,7 +136,7 @@ def invoke_post_run(liveaction_db, action_db=None):
 
     # Identify action and runner.
     if not action_db:
-        action_db = action_db_utils.get_action_by_ref(liveaction_db.action)
+        action_db = action_db_utils.get_action_by_ref(liveaction_db.action, use_cache=True)
 
     if not action_db:
         LOG.exception('Unable to invoke post run. Action %s no longer exists.',
@@ -147,7 +147,8 @@ def invoke_post_run(liveaction_db, action_db=None):
              liveaction_db.id, action_db.name, action_db.runner_type['name'])
 
     # Get an instance of the action runner.
-    runnertype_db = action_db_utils.get_runnertype_by_name(action_db.runner_type['name'])
+    runnertype_db = action_db_utils.get_runnertype_by_name(action_db.runner_type['name'],
+                                                           use_cache=True)
     runner = runners.get_runner(runnertype_db.runner_module)
 
     # Configure the action runner.
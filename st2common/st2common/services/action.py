@@ -13,7 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+import time
+
+import eventlet
 import six
+from eventlet.semaphore import Semaphore
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.constants import action as action_constants
@@ -41,6 +47,7 @@ __all__ = [
     'request_resume',
 
     'store_execution_output_data',
+    'ExecutionOutputWriter'
 ]
 
 LOG = logging.getLogger(__name__)
@@ -69,19 +76,20 @@ def create_request(liveaction):
             liveaction.context['user'] = parent_user
 
     # Validate action.
-    action_db = action_utils.get_action_by_ref(liveaction.action)
+    action_db = action_utils.get_action_by_ref(liveaction.action, use_cache=True)
     if not action_db:
         raise ValueError('Action "%s" cannot be found.' % liveaction.action)
     if not action_db.enabled:
         raise ValueError('Unable to execute. Action "%s" is disabled.' % liveaction.action)
 
-    runnertype_db = action_utils.get_runnertype_by_name(action_db.runner_type['name'])
+    runnertype_db = action_utils.get_runnertype_by_name(action_db.runner_type['name'],
+                                                        use_cache=True)
 
     if not hasattr(liveaction, 'parameters'):
         liveaction.parameters = dict()
 
     # Validate action parameters.
-    schema = util_schema.get_schema_for_action_parameters(action_db)
+    schema = util_schema.get_schema_for_action_parameters(action_db, runnertype_db=runnertype_db)
     validator = util_schema.get_validator()
     util_schema.validate(liveaction.parameters, schema, validator, use_default=True,
                          allow_default_none=True)
@@ -100,7 +108,8 @@ def create_request(liveaction):
     # execution. So we should look at liveaction.parameters['notify']
     # and not set liveaction.notify.
     if not _is_notify_empty(action_db.notify):
-        liveaction.notify = action_db.notify
+        # Action is shared by the metadata cache so its embedded documents can't be re-used
+        liveaction.notify = copy.deepcopy(action_db.notify)
 
     # Write to database and send to message queue.
     liveaction.status = action_constants.LIVEACTION_STATUS_REQUESTED
@@ -359,6 +368,132 @@ def store_execution_output_data(execution_db, action_db, data, output_type='outp
     return output_db
 
 
+class ExecutionOutputWriter(object):
+    """
+    Buffered writer for the action execution output.
+
+    Instead of storing and publishing each line separately, lines are coalesced into chunks. A
+    chunk is written when the amount of buffered data reaches ``buffer_size`` bytes or when
+    ``flush_interval`` seconds have passed since the first buffered line. All the buffered chunks
+    (one per output type) are stored using a single bulk insert and one message is published per
+    chunk.
+
+    Each chunk is stored as a regular ``ActionExecutionOutputDB`` object which means consumers
+    which concatenate the output data keep working as-is.
+
+    Note: ``close`` needs to be called once the action finishes (including when it's canceled or
+    times out) to flush the remaining data.
+    """
+
+    def __init__(self, execution_db, action_db, buffer_size=None, flush_interval=None):
+        """
+        :param buffer_size: Maximum number of buffered bytes. If not provided, value from the
+                            config is used. 0 disables buffering.
+        :type buffer_size: ``int``
+
+        :param flush_interval: Maximum number of seconds data is buffered for. If not provided,
+                               value from the config is used.
+        :type flush_interval: ``float``
+        """
+        if buffer_size is None:
+            buffer_size = cfg.CONF.actionrunner.stream_output_buffer_size
+
+        if flush_interval is None:
+            flush_interval = cfg.CONF.actionrunner.stream_output_flush_interval
+
+        self._execution_db = execution_db
+        self._action_db = action_db
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+
+        # Buffered data for each output type - output_type -> (timestamp, list of lines)
+        self._buffers = {}
+        self._buffered_size = 0
+        self._first_write_time = None
+
+        self._lock = Semaphore()
+        self._flush_timer = None
+        self._closed = False
+
+    def store_data(self, execution_db, action_db, data, output_type='output', timestamp=None):
+        """
+        Drop-in replacement for ``store_execution_output_data`` function.
+        """
+        return self.write(data=data, output_type=output_type, timestamp=timestamp)
+
+    def write(self, data, output_type='output', timestamp=None):
+        if self._buffer_size <= 0 or self._closed:
+            return store_execution_output_data(execution_db=self._execution_db,
+                                               action_db=self._action_db, data=data,
+                                               output_type=output_type, timestamp=timestamp)
+
+        if output_type not in self._buffers:
+            timestamp = timestamp or date_utils.get_datetime_utc_now()
+            self._buffers[output_type] = (timestamp, [])
+
+        if not self._first_write_time:
+            self._first_write_time = time.time()
+
+        self._buffers[output_type][1].append(data)
+        self._buffered_size += len(data)
+
+        if (self._buffered_size >= self._buffer_size or
+                (time.time() - self._first_write_time) >= self._flush_interval):
+            self.flush()
+        elif not self._flush_timer:
+            # Make sure data is flushed even if no more output is produced
+            self._flush_timer = eventlet.spawn_after(self._flush_interval, self.flush)
+
+    def flush(self):
+        """
+        Store and publish all the buffered data.
+
+        :rtype: ``list`` of :class:`ActionExecutionOutputDB`
+        """
+        with self._lock:
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+            buffers = self._buffers
+            self._buffers = {}
+            self._buffered_size = 0
+            self._first_write_time = None
+
+            if not buffers:
+                return []
+
+            execution_id = str(self._execution_db.id)
+            action_ref = self._action_db.ref
+            runner_ref = getattr(self._action_db, 'runner_type', {}).get('name', 'unknown')
+
+            output_dbs = []
+            for output_type, (timestamp, lines) in sorted(six.iteritems(buffers),
+                                                          key=lambda item: item[1][0]):
+                output_db = ActionExecutionOutputDB(execution_id=execution_id,
+                                                    action_ref=action_ref,
+                                                    runner_ref=runner_ref,
+                                                    timestamp=timestamp,
+                                                    output_type=output_type,
+                                                    data=''.join(lines))
+                output_dbs.append(output_db)
+
+            try:
+                return ActionExecutionOutput.insert_many(output_dbs, publish=True,
+                                                         dispatch_trigger=False)
+            except:
+                LOG.exception('Failed to store output for execution %s.', execution_id)
+                return []
+
+    def close(self):
+        """
+        Flush all the remaining data. Any data written after the writer has been closed is stored
+        right away.
+        """
+        self._closed = True
+        return self.flush()
+
+
 def _cleanup_liveaction(liveaction):
     try:
         LiveAction.delete(liveaction)
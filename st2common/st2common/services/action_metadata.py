@@ -0,0 +1,219 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-process cache of action and runner type metadata which is used on the execution hot path.
+
+Action and runner type database objects and the merged action parameter schemas are retrieved
+from the database on the first use and cached. Cached items are invalidated as soon as the
+corresponding action or runner type changes using the ``st2.action`` and ``st2.runnertype`` CUD
+exchanges.
+"""
+
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.models.db.runner import RunnerTypeDB
+from st2common.services.cache_watcher import CacheWatcher
+from st2common.transport import action as action_transport
+from st2common.transport import publishers
+from st2common.util import action_db as action_utils
+from st2common.util.cache import TTLCache
+from st2common.util.secrets import get_secret_parameters
+
+__all__ = [
+    'ActionMetadataCache',
+    'ActionMetadataCacheWatcher',
+
+    'get_metadata_cache'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of cached items of each type and the number of seconds after which they are
+# retrieved again even if no change event has been received
+CACHE_MAX_SIZE = 5000
+CACHE_TTL = 600
+
+# Cached value which indicates that the action doesn't exist
+NOT_FOUND = False
+
+_MISSING = object()
+
+
+class ActionMetadataCache(object):
+    """
+    Cache of action and runner type database objects and of the action parameter schemas which
+    are derived from them.
+
+    Note: Cached objects are shared by all the callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_size=CACHE_MAX_SIZE, ttl=CACHE_TTL):
+        # action ref -> ActionDB or NOT_FOUND
+        self.actions = TTLCache(max_size=max_size, ttl=ttl)
+
+        # runner type name -> RunnerTypeDB
+        self.runner_types = TTLCache(max_size=max_size, ttl=ttl)
+
+        # action ref -> (parameters schema, secret parameter names)
+        self.parameters = TTLCache(max_size=max_size, ttl=ttl)
+
+        # Incremented on each invalidation. Items which have been retrieved from the database
+        # while an invalidation took place are not cached since they could already be stale.
+        self.version = 0
+
+    def get_action(self, ref):
+        action_db = self._get(self.actions, ref,
+                              lambda: action_utils.get_action_by_ref(ref, use_cache=False) or
+                              NOT_FOUND)
+        return action_db or None
+
+    def get_runner_type(self, name):
+        """
+        Note: StackStormDBObjectNotFoundError is thrown if the runner type doesn't exist.
+        """
+        return self._get(self.runner_types, name,
+                         lambda: action_utils.get_runnertype_by_name(name, use_cache=False))
+
+    def get_parameters(self, ref):
+        """
+        Return merged runner and action parameters schema and a list of the secret parameter
+        names for the provided action.
+
+        :rtype: ``tuple`` of (``dict``, ``list``)
+        """
+        return self._get(self.parameters, ref, lambda: self._get_parameters(ref))
+
+    def invalidate_action(self, ref=None):
+        """
+        Invalidate the provided action or all the actions if no reference is provided.
+        """
+        self.version += 1
+
+        if not ref:
+            self.actions.clear()
+            self.parameters.clear()
+            return
+
+        self.actions.delete(ref)
+        self.parameters.delete(ref)
+
+    def invalidate_runner_type(self, name=None):
+        """
+        Invalidate the provided runner type or all the runner types if no name is provided.
+
+        Parameters of all the actions are also invalidated since they include runner parameters.
+        """
+        self.version += 1
+
+        if not name:
+            self.runner_types.clear()
+        else:
+            self.runner_types.delete(name)
+
+        self.parameters.clear()
+
+    def clear(self):
+        self.version += 1
+        self.actions.clear()
+        self.runner_types.clear()
+        self.parameters.clear()
+
+    def get_stats(self):
+        return {
+            'actions': self.actions.get_stats(),
+            'runner_types': self.runner_types.get_stats(),
+            'parameters': self.parameters.get_stats()
+        }
+
+    def _get(self, cache, key, func):
+        value = cache.get(key, _MISSING)
+
+        if value is not _MISSING:
+            return value
+
+        version = self.version
+        value = func()
+
+        if version == self.version:
+            cache.set(key, value)
+
+        return value
+
+    def _get_parameters(self, ref):
+        action_db = self.get_action(ref)
+
+        if not action_db:
+            return {}, []
+
+        runner_type_db = self.get_runner_type(action_db.runner_type['name'])
+
+        # Runner type parameters should be added first before the action parameters.
+        parameters = {}
+        parameters.update(runner_type_db.runner_parameters)
+        parameters.update(action_db.parameters)
+
+        return parameters, get_secret_parameters(parameters=parameters)
+
+
+class ActionMetadataCacheWatcher(CacheWatcher):
+    """
+    Watcher which listens for action and runner type CUD events on the message bus and
+    invalidates the corresponding cached items.
+    """
+
+    def __init__(self, metadata_cache, queue_suffix=None):
+        self._metadata_cache = metadata_cache
+        super(ActionMetadataCacheWatcher, self).__init__(
+            name='action metadata cache',
+            exchanges=[action_transport.ACTION_CUD_XCHG, action_transport.RUNNER_TYPE_CUD_XCHG],
+            invalidate_callback=self._invalidate, clear_callback=metadata_cache.clear,
+            queue_suffix=queue_suffix or 'metadata')
+
+    def _invalidate(self, body, routing_key):
+        # Reference of the action or name of the runner type could have changed on update
+        if isinstance(body, RunnerTypeDB):
+            name = getattr(body, 'name', None) if routing_key != publishers.UPDATE_RK else None
+            self._metadata_cache.invalidate_runner_type(name=name)
+        else:
+            ref = getattr(body, 'ref', None) if routing_key != publishers.UPDATE_RK else None
+            self._metadata_cache.invalidate_action(ref=ref)
+
+
+_METADATA_CACHE = None
+_METADATA_CACHE_WATCHER = None
+
+
+def get_metadata_cache():
+    """
+    Return the action metadata cache for this process, starting the invalidation watcher on the
+    first use.
+
+    :return: Cache or None if caching is disabled.
+    :rtype: :class:`ActionMetadataCache`
+    """
+    global _METADATA_CACHE
+    global _METADATA_CACHE_WATCHER
+
+    if not cfg.CONF.system.cache_action_metadata:
+        return None
+
+    if not _METADATA_CACHE:
+        _METADATA_CACHE = ActionMetadataCache()
+        _METADATA_CACHE_WATCHER = ActionMetadataCacheWatcher(metadata_cache=_METADATA_CACHE)
+        _METADATA_CACHE_WATCHER.start()
+
+    return _METADATA_CACHE
@@ -0,0 +1,231 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-process cache of validated tokens, API keys, users and resolved RBAC permissions which are used
+to authenticate and authorize API requests.
+
+Cached items expire after ``auth.cache_ttl`` seconds and are invalidated as soon as the
+corresponding database objects change using the ``st2.auth`` CUD exchange.
+"""
+
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.persistence.auth import Token, ApiKey, User
+from st2common.services.cache_watcher import CacheWatcher
+from st2common.transport import auth as auth_transport
+from st2common.util import hash as hash_utils
+from st2common.util.cache import TTLCache
+
+__all__ = [
+    'AuthCache',
+    'AuthCacheWatcher',
+
+    'get_token',
+    'get_api_key',
+    'get_user_by_name',
+    'user_has_permission',
+    'get_stats',
+    'get_auth_cache'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class AuthCache(object):
+    """
+    Caches of the objects which are needed to authenticate and authorize a request.
+
+    Note: Only successful lookups are cached.
+    """
+
+    def __init__(self, max_size, ttl):
+        # token hash -> TokenDB
+        self.tokens = TTLCache(max_size=max_size, ttl=ttl)
+
+        # API key hash -> ApiKeyDB
+        self.api_keys = TTLCache(max_size=max_size, ttl=ttl)
+
+        # username -> UserDB
+        self.users = TTLCache(max_size=max_size, ttl=ttl)
+
+        # (username, permission type) -> True / False
+        self.permissions = TTLCache(max_size=max_size, ttl=ttl)
+
+    def get_token(self, token_string):
+        token_hash = hash_utils.hash(token_string)
+        return self.tokens.get_or_set(token_hash, lambda: Token.get(token_string))
+
+    def get_api_key(self, api_key):
+        key_hash = hash_utils.hash(api_key)
+        return self.api_keys.get_or_set(key_hash, lambda: ApiKey.get(api_key))
+
+    def get_user_by_name(self, username):
+        return self.users.get_or_set(username, lambda: User.get_by_name(username))
+
+    def user_has_permission(self, resolver, user_db, permission_type):
+        key = (user_db.name, permission_type)
+        return self.permissions.get_or_set(
+            key, lambda: resolver.user_has_permission(user_db, permission_type))
+
+    def invalidate(self, resource_type, model_object):
+        """
+        Invalidate cached items which depend on the provided database object.
+        """
+        if resource_type == auth_transport.TOKEN_RESOURCE_TYPE:
+            # Only hash of the token string is published
+            self.tokens.delete(model_object['token_hash'])
+        elif resource_type == auth_transport.API_KEY_RESOURCE_TYPE:
+            self.api_keys.delete(model_object.key_hash)
+        elif resource_type == auth_transport.USER_RESOURCE_TYPE:
+            self.users.delete(model_object.name)
+            self._invalidate_user_permissions(username=model_object.name)
+        elif resource_type == auth_transport.USER_ROLE_ASSIGNMENT_RESOURCE_TYPE:
+            self._invalidate_user_permissions(username=model_object.user)
+        elif resource_type in [auth_transport.ROLE_RESOURCE_TYPE,
+                               auth_transport.PERMISSION_GRANT_RESOURCE_TYPE]:
+            # Role and grant changes can affect any number of users
+            self.permissions.clear()
+
+    def clear(self):
+        self.tokens.clear()
+        self.api_keys.clear()
+        self.users.clear()
+        self.permissions.clear()
+
+    def get_stats(self):
+        return {
+            'tokens': self.tokens.get_stats(),
+            'api_keys': self.api_keys.get_stats(),
+            'users': self.users.get_stats(),
+            'permissions': self.permissions.get_stats()
+        }
+
+    def _invalidate_user_permissions(self, username):
+        self.permissions.delete_matching(lambda key: key[0] == username)
+
+
+class AuthCacheWatcher(CacheWatcher):
+    """
+    Watcher which listens for authentication and RBAC model CUD events on the message bus and
+    invalidates the corresponding cache items.
+    """
+
+    def __init__(self, auth_cache, queue_suffix=None):
+        self._auth_cache = auth_cache
+        super(AuthCacheWatcher, self).__init__(
+            name='auth cache', exchanges=[auth_transport.AUTH_CUD_XCHG],
+            invalidate_callback=self._invalidate, clear_callback=auth_cache.clear,
+            queue_suffix=queue_suffix)
+
+    def _invalidate(self, body, routing_key):
+        resource_type = routing_key.rsplit('.', 1)[0]
+        self._auth_cache.invalidate(resource_type=resource_type, model_object=body)
+
+
+def get_token(token_string):
+    """
+    Retrieve TokenDB for the provided token string.
+
+    :rtype: :class:`TokenDB`
+    """
+    auth_cache = get_auth_cache()
+
+    if not auth_cache:
+        return Token.get(token_string)
+
+    return auth_cache.get_token(token_string)
+
+
+def get_api_key(api_key):
+    """
+    Retrieve ApiKeyDB for the provided API key.
+
+    :rtype: :class:`ApiKeyDB`
+    """
+    auth_cache = get_auth_cache()
+
+    if not auth_cache:
+        return ApiKey.get(api_key)
+
+    return auth_cache.get_api_key(api_key)
+
+
+def get_user_by_name(username):
+    """
+    :rtype: :class:`UserDB`
+    """
+    auth_cache = get_auth_cache()
+
+    if not auth_cache:
+        return User.get_by_name(username)
+
+    return auth_cache.get_user_by_name(username)
+
+
+def user_has_permission(resolver, user_db, permission_type):
+    """
+    Return True if the user has the provided permission type as resolved by the provided
+    permissions resolver.
+
+    :rtype: ``bool``
+    """
+    auth_cache = get_auth_cache()
+
+    if not auth_cache:
+        return resolver.user_has_permission(user_db, permission_type)
+
+    return auth_cache.user_has_permission(resolver, user_db, permission_type)
+
+
+def get_stats():
+    """
+    Return size and hit / miss counters for each of the caches.
+
+    :rtype: ``dict``
+    """
+    auth_cache = get_auth_cache()
+
+    if not auth_cache:
+        return {}
+
+    return auth_cache.get_stats()
+
+
+_AUTH_CACHE = None
+_AUTH_CACHE_WATCHER = None
+
+
+def get_auth_cache():
+    """
+    Return the auth cache for this process, starting the invalidation watcher on the first use.
+
+    :return: Cache or None if caching is disabled.
+    :rtype: :class:`AuthCache`
+    """
+    global _AUTH_CACHE
+    global _AUTH_CACHE_WATCHER
+
+    if not cfg.CONF.auth.enable_cache:
+        return None
+
+    if not _AUTH_CACHE:
+        _AUTH_CACHE = AuthCache(max_size=cfg.CONF.auth.cache_max_size,
+                                ttl=cfg.CONF.auth.cache_ttl)
+        _AUTH_CACHE_WATCHER = AuthCacheWatcher(auth_cache=_AUTH_CACHE)
+        _AUTH_CACHE_WATCHER.start()
+
+    return _AUTH_CACHE
@@ -0,0 +1,139 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import eventlet
+from kombu.mixins import ConsumerMixin
+from kombu import Connection, Queue, binding
+
+from st2common import log as logging
+from st2common.transport import utils as transport_utils
+from st2common.transport.serializers import get_accept_content
+import st2common.util.queues as queue_utils
+
+__all__ = [
+    'CacheWatcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class CacheWatcher(ConsumerMixin):
+    """
+    Watcher which listens for CUD events on the message bus and invalidates the corresponding
+    items of an in-process cache (or any other state which is derived from those events).
+
+    Each exchange is consumed using an exclusive queue named ``<exchange name>.watch.<suffix>``.
+    """
+
+    sleep_interval = 0  # sleep to co-operatively yield after processing each message
+
+    def __init__(self, name, exchanges, invalidate_callback, clear_callback=None,
+                 routing_keys=None, queue_suffix=None):
+        """
+        :param name: Name of the watched cache which is used in the log messages.
+        :type name: ``str``
+
+        :param exchanges: CUD exchanges to listen on.
+        :type exchanges: ``list`` of :class:`kombu.Exchange`
+
+        :param invalidate_callback: Function which is called with the message body and the
+                                    routing key for each event.
+        :type invalidate_callback: ``callable``
+
+        :param clear_callback: Optional function which is called each time the watcher (re-)starts
+                               consuming. Events published while the watcher wasn't connected
+                               are lost so it should clear the whole cache.
+        :type clear_callback: ``callable``
+
+        :param routing_keys: Routing keys of the events to listen for. Defaults to all the
+                             events.
+        :type routing_keys: ``list`` of ``str``
+        """
+        self._name = name
+        self._invalidate_callback = invalidate_callback
+        self._clear_callback = clear_callback
+        self._queues = [self._get_queue(exchange=exchange, routing_keys=routing_keys or ['#'],
+                                        queue_suffix=queue_suffix)
+                        for exchange in exchanges]
+
+        self.connection = None
+        self._updates_thread = None
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=self._queues,
+                         accept=get_accept_content(),
+                         callbacks=[self.process_task])]
+
+    def on_consume_ready(self, connection, channel, consumers, **kwargs):
+        super(CacheWatcher, self).on_consume_ready(connection=connection, channel=channel,
+                                                   consumers=consumers, **kwargs)
+
+        if not self._clear_callback:
+            return
+
+        try:
+            self._clear_callback()
+        except Exception:
+            LOG.exception('Failed to clear %s.', self._name)
+
+    def process_task(self, body, message):
+        routing_key = message.delivery_info.get('routing_key', '')
+
+        try:
+            self._invalidate_callback(body, routing_key)
+        except Exception as e:
+            LOG.exception('Failed to invalidate %s. Message body: %s. Exception: %s',
+                          self._name, body, str(e))
+        finally:
+            message.ack()
+
+        eventlet.sleep(self.sleep_interval)
+
+    def start(self):
+        try:
+            self.connection = Connection(transport_utils.get_messaging_urls())
+            self._updates_thread = eventlet.spawn(self.run)
+        except:
+            LOG.exception('Failed to start %s watcher.', self._name)
+            self.connection.release()
+
+    def stop(self):
+        LOG.debug('Shutting down %s watcher.', self._name)
+        try:
+            if self._updates_thread:
+                self._updates_thread = eventlet.kill(self._updates_thread)
+        finally:
+            if self.connection:
+                self.connection.release()
+
+    # Note: We sleep after we consume a message so we give a chance to other
+    # green threads to run. If we don't do that, ConsumerMixin will block on
+    # waiting for a message on the queue.
+
+    def on_consume_end(self, connection, channel):
+        super(CacheWatcher, self).on_consume_end(connection=connection, channel=channel)
+        eventlet.sleep(seconds=self.sleep_interval)
+
+    def on_iteration(self):
+        super(CacheWatcher, self).on_iteration()
+        eventlet.sleep(seconds=self.sleep_interval)
+
+    @staticmethod
+    def _get_queue(exchange, routing_keys, queue_suffix):
+        queue_name = queue_utils.get_queue_name(queue_name_base='%s.watch' % (exchange.name),
+                                                queue_name_suffix=queue_suffix or 'cache',
+                                                add_random_uuid_to_suffix=True)
+        bindings = [binding(exchange, routing_key=routing_key) for routing_key in routing_keys]
+        return Queue(queue_name, bindings=bindings, exclusive=True)
@@ -0,0 +1,191 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Index of the distinct execution filter values (actions, statuses, rules, users, etc.) which are
+displayed in the UI.
+
+The index is stored in a small collection which is updated as executions are created and updated
+and pruned when executions are purged, so the values can be retrieved without running a distinct
+query over the whole executions collection.
+"""
+
+import six
+
+from st2common import log as logging
+from st2common.persistence.execution import ActionExecution
+from st2common.persistence.execution import ActionExecutionFilterValue
+from st2common.util.cache import TTLCache
+from st2common.util.misc import get_field_value
+
+__all__ = [
+    'SUPPORTED_FILTERS',
+    'FILTERS_WITH_VALID_NULL_VALUES',
+    'IGNORE_FILTERS',
+    'INDEXED_FILTERS',
+
+    'get_filter_values',
+    'record_filter_values',
+    'rebuild_filter_values',
+    'prune_filter_values'
+]
+
+LOG = logging.getLogger(__name__)
+
+# List of supported filters and relation between filter name and execution property it represents.
+# The same list is used both in ActionExecutionController to map filter names to properties and
+# in FiltersController to generate a list of unique values for each filter for UI so user could
+# pick a filter from a drop down.
+# If filter is unique for every execution or repeats very rarely (ex. execution id or parent
+# reference) it should be also added to IGNORE_FILTERS to avoid bloating FiltersController
+# response. Failure to do so will eventually result in Chrome hanging out while opening History
+# tab of st2web.
+SUPPORTED_FILTERS = {
+    'action': 'action.ref',
+    'status': 'status',
+    'liveaction': 'liveaction.id',
+    'parent': 'parent',
+    'rule': 'rule.name',
+    'runner': 'runner.name',
+    'timestamp': 'start_timestamp',
+    'trigger': 'trigger.name',
+    'trigger_type': 'trigger_type.name',
+    'trigger_instance': 'trigger_instance.id',
+    'user': 'context.user'
+}
+
+# A list of fields for which null (None) is a valid value which we include in the list of valid
+# filters.
+FILTERS_WITH_VALID_NULL_VALUES = [
+    'parent',
+    'rule',
+    'trigger',
+    'trigger_type',
+    'trigger_instance'
+]
+
+# List of filters that are too broad to distinct by them and are very likely to represent 1 to 1
+# relation between filter and particular history record.
+IGNORE_FILTERS = ['parent', 'timestamp', 'liveaction', 'trigger_instance']
+
+# Filters for which the distinct values are stored in the index
+INDEXED_FILTERS = dict([(name, field) for name, field in six.iteritems(SUPPORTED_FILTERS)
+                        if name not in IGNORE_FILTERS])
+
+# Name of the marker item which indicates that the index has been populated with the values of the
+# executions which existed before the index was introduced
+INDEX_MARKER_NAME = '__index__'
+
+# Number of seconds after which a value which has already been stored by this process is stored
+# again. Values are pruned by the garbage collector process so this determines how long a value
+# which has been pruned, but is used again by a new execution, can be missing from the index.
+RECORDED_VALUES_TTL = 30
+
+# Values which have already been stored by this process
+_RECORDED_VALUES = TTLCache(max_size=10000, ttl=RECORDED_VALUES_TTL)
+
+
+def get_filter_values(types=None):
+    """
+    Retrieve distinct values for the provided filter types.
+
+    :param types: Filter types to retrieve the values for. Defaults to all the filters.
+    :type types: ``list``
+
+    :rtype: ``dict``
+    """
+    names = [name for name in INDEXED_FILTERS.keys() if not types or name in types]
+
+    if not ActionExecutionFilterValue.count(name=INDEX_MARKER_NAME):
+        rebuild_filter_values()
+
+    result = dict([(name, []) for name in names])
+
+    for value_db in ActionExecutionFilterValue.query(name__in=names):
+        result[value_db.name].append(value_db.value)
+
+    return result
+
+
+def record_filter_values(execution_db):
+    """
+    Store filter values of the provided execution in the index.
+
+    Note: Failures are logged and ignored so they don't affect the execution.
+    """
+    for name, field in six.iteritems(INDEXED_FILTERS):
+        value = get_field_value(execution_db, field)
+
+        if value is None and name not in FILTERS_WITH_VALID_NULL_VALUES:
+            continue
+
+        try:
+            key = (name, value)
+
+            if key in _RECORDED_VALUES:
+                continue
+
+            ActionExecutionFilterValue.add_value(name=name, value=value)
+            _RECORDED_VALUES.set(key, True)
+        except Exception:
+            LOG.exception('Failed to store value "%s" of execution filter "%s".', value, name)
+
+
+def rebuild_filter_values():
+    """
+    Populate the index using the values of all the existing executions.
+
+    Note: This function runs a distinct query for each filter over the whole executions collection
+    and it's only used to populate the index the first time.
+    """
+    LOG.info('Populating execution filter values index.')
+
+    for name, field in six.iteritems(INDEXED_FILTERS):
+        if name not in FILTERS_WITH_VALID_NULL_VALUES:
+            query = {field.replace('.', '__'): {'$ne': None}}
+        else:
+            query = {}
+
+        for value in ActionExecution.distinct(field=field, **query):
+            ActionExecutionFilterValue.add_value(name=name, value=value)
+
+    ActionExecutionFilterValue.add_value(name=INDEX_MARKER_NAME, value=None)
+
+
+def prune_filter_values():
+    """
+    Remove values which are not used by any execution anymore (e.g. after the executions have been
+    purged).
+
+    Each value is checked using an indexed query which returns at most one execution so the cost
+    only depends on the number of distinct values and not on the number of executions.
+
+    :return: Number of removed values.
+    :rtype: ``int``
+    """
+    removed_count = 0
+
+    for value_db in ActionExecutionFilterValue.query(name__in=list(INDEXED_FILTERS.keys())):
+        field = INDEXED_FILTERS[value_db.name]
+        filters = {field.replace('.', '__'): value_db.value}
+
+        if ActionExecution.query(limit=1, **filters).only('id').first():
+            continue
+
+        ActionExecutionFilterValue.delete(value_db, publish=False, dispatch_trigger=False)
+        _RECORDED_VALUES.delete((value_db.name, value_db.value))
+        removed_count += 1
+
+    return removed_count
@@ -37,7 +37,6 @@ from st2common.util import reference
 import st2common.util.action_db as action_utils
 from st2common.constants import action as action_constants
 from st2common.persistence.execution import ActionExecution
-from st2common.persistence.runner import RunnerType
 from st2common.persistence.rule import Rule
 from st2common.persistence.trigger import TriggerType, Trigger, TriggerInstance
 from st2common.models.api.action import RunnerTypeAPI, ActionAPI, LiveActionAPI
@@ -45,6 +44,7 @@ from st2common.models.api.rule import RuleAPI
 from st2common.models.api.trigger import TriggerTypeAPI, TriggerAPI, TriggerInstanceAPI
 from st2common.models.db.execution import ActionExecutionDB
 from st2common.runners import utils as runners_utils
+from st2common.services import execution_filters
 
 
 __all__ = [
@@ -98,8 +98,8 @@ def _create_execution_log_entry(status):
 
 
 def create_execution_object(liveaction, publish=True):
-    action_db = action_utils.get_action_by_ref(liveaction.action)
-    runner = RunnerType.get_by_name(action_db.runner_type['name'])
+    action_db = action_utils.get_action_by_ref(liveaction.action, use_cache=True)
+    runner = action_utils.get_runnertype_by_name(action_db.runner_type['name'], use_cache=True)
 
     attrs = {
         'action': vars(ActionAPI.from_model(action_db)),
@@ -141,6 +141,8 @@ def create_execution_object(liveaction, publish=True):
     execution.web_url = _get_web_url_for_execution(str(execution.id))
     execution = ActionExecution.add_or_update(execution, publish=publish)
 
+    execution_filters.record_filter_values(execution)
+
     if parent:
         if str(execution.id) not in parent.children:
             parent.children.append(str(execution.id))
@@ -180,6 +182,8 @@ def update_execution(liveaction_db, publish=True):
         # execution
         kw['push__log'] = _create_execution_log_entry(liveaction_db.status)
     execution = ActionExecution.update(execution, publish=publish, **kw)
+
+    execution_filters.record_filter_values(execution)
     return execution
 
 
@@ -13,8 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from st2common import log as logging
+import six
+from oslo_config import cfg
 
+from st2common import log as logging
 from st2common.constants.keyvalue import SYSTEM_SCOPE, FULL_SYSTEM_SCOPE
 from st2common.constants.keyvalue import USER_SCOPE, FULL_USER_SCOPE
 from st2common.constants.keyvalue import ALLOWED_SCOPES
@@ -22,17 +24,34 @@ from st2common.constants.keyvalue import DATASTORE_KEY_SEPARATOR
 from st2common.exceptions.keyvalue import InvalidScopeException, InvalidUserException
 from st2common.models.system.keyvalue import UserKeyReference
 from st2common.persistence.keyvalue import KeyValuePair
+from st2common.services.cache_watcher import CacheWatcher
+from st2common.transport import keyvalue as keyvalue_transport
+from st2common.util import date as date_utils
+from st2common.util.cache import TTLCache
 
 __all__ = [
     'get_kvp_for_name',
     'get_values_for_names',
+    'get_cached_value',
+    'get_cached_values',
+    'get_value_cache',
 
     'KeyValueLookup',
-    'UserKeyValueLookup'
+    'UserKeyValueLookup',
+    'KeyValuePairCache',
+    'KeyValuePairCacheWatcher'
 ]
 
 LOG = logging.getLogger(__name__)
 
+# Maximum number of cached values
+CACHE_MAX_SIZE = 10000
+
+# Value which is returned by the lookups for keys which don't exist
+MISSING_VALUE = ''
+
+_NOT_CACHED = object()
+
 
 def get_kvp_for_name(name):
     try:
@@ -65,6 +84,164 @@ def get_values_for_names(names, default_value=None):
     return result
 
 
+def get_cached_value(scope, name):
+    """
+    Retrieve value of the provided key using the process-level cache (if enabled).
+
+    :return: Value or an empty string if the key doesn't exist.
+    :rtype: ``str``
+    """
+    return get_cached_values(scope=scope, names=[name])[name]
+
+
+def get_cached_values(scope, names):
+    """
+    Retrieve values for the provided keys (multi get). Keys which are not cached are retrieved
+    using a single query.
+
+    :return: Dictionary with the values. Value is an empty string if the key doesn't exist.
+    :rtype: ``dict``
+    """
+    value_cache = get_value_cache()
+
+    if value_cache:
+        return value_cache.get_values(scope=scope, names=names)
+
+    return _get_values(scope=scope, names=names)[0]
+
+
+def _get_values(scope, names):
+    """
+    :return: (name -> value, name -> KeyValuePairDB) tuple.
+    :rtype: ``tuple``
+    """
+    names = list(set(names))
+
+    if len(names) == 1:
+        kvp_db = KeyValuePair.get_by_scope_and_name(scope=scope, name=names[0])
+        kvp_dbs = [kvp_db] if kvp_db else []
+    else:
+        kvp_dbs = KeyValuePair.query(scope=scope, name__in=names)
+
+    kvp_dbs = dict([(item.name, item) for item in kvp_dbs])
+    values = dict([(name, kvp_dbs[name].value if name in kvp_dbs else MISSING_VALUE)
+                   for name in names])
+    return values, kvp_dbs
+
+
+class KeyValuePairCache(object):
+    """
+    Process-level cache of the datastore values (including the missing ones).
+
+    Values are invalidated using the KeyValuePair CUD events. Values of the keys with an expiry
+    are never cached longer than until the key expires.
+    """
+
+    def __init__(self, max_size=CACHE_MAX_SIZE, ttl=60):
+        # (scope, name) -> value
+        self.values = TTLCache(max_size=max_size, ttl=ttl)
+
+    def get_values(self, scope, names):
+        result = {}
+        missing_names = []
+
+        for name in names:
+            value = self.values.get((scope, name), _NOT_CACHED)
+
+            if value is _NOT_CACHED:
+                missing_names.append(name)
+            else:
+                result[name] = value
+
+        if missing_names:
+            values, kvp_dbs = _get_values(scope=scope, names=missing_names)
+
+            for name, value in six.iteritems(values):
+                self._set_value(scope=scope, name=name, value=value,
+                                kvp_db=kvp_dbs.get(name, None))
+
+            result.update(values)
+
+        return result
+
+    def invalidate(self, scope=None, name=None):
+        """
+        Invalidate value of the provided key or all the values if no key is provided.
+        """
+        if not name:
+            self.values.clear()
+            return
+
+        self.values.delete((scope, name))
+
+    def clear(self):
+        self.values.clear()
+
+    def get_stats(self):
+        return self.values.get_stats()
+
+    def _set_value(self, scope, name, value, kvp_db=None):
+        ttl = None
+        expire_timestamp = getattr(kvp_db, 'expire_timestamp', None)
+
+        if expire_timestamp:
+            expire_timestamp = date_utils.convert_to_utc(expire_timestamp)
+            ttl = (expire_timestamp - date_utils.get_datetime_utc_now()).total_seconds()
+
+            if ttl <= 0:
+                # Key has expired, but it hasn't been removed from the database yet
+                return
+
+            if self.values.ttl:
+                ttl = min(ttl, self.values.ttl)
+
+        self.values.set((scope, name), value, ttl=ttl)
+
+
+class KeyValuePairCacheWatcher(CacheWatcher):
+    """
+    Watcher which listens for KeyValuePair CUD events on the message bus and invalidates the
+    corresponding cached values.
+    """
+
+    def __init__(self, value_cache, queue_suffix=None):
+        self._value_cache = value_cache
+        super(KeyValuePairCacheWatcher, self).__init__(
+            name='datastore cache', exchanges=[keyvalue_transport.KEY_VALUE_PAIR_CUD_XCHG],
+            invalidate_callback=self._invalidate, clear_callback=value_cache.clear,
+            queue_suffix=queue_suffix)
+
+    def _invalidate(self, body, routing_key):
+        self._value_cache.invalidate(scope=getattr(body, 'scope', None),
+                                     name=getattr(body, 'name', None))
+
+
+_VALUE_CACHE = None
+_VALUE_CACHE_WATCHER = None
+
+
+def get_value_cache():
+    """
+    Return the datastore value cache for this process, starting the invalidation watcher on the
+    first use.
+
+    :return: Cache or None if caching is disabled.
+    :rtype: :class:`KeyValuePairCache`
+    """
+    global _VALUE_CACHE
+    global _VALUE_CACHE_WATCHER
+
+    if not cfg.CONF.keyvalue.enable_cache:
+        return None
+
+    if not _VALUE_CACHE:
+        _VALUE_CACHE = KeyValuePairCache(ttl=cfg.CONF.keyvalue.cache_ttl)
+        _VALUE_CACHE_WATCHER = KeyValuePairCacheWatcher(value_cache=_VALUE_CACHE)
+        _VALUE_CACHE_WATCHER.start()
+
+    return _VALUE_CACHE
+
+
 class KeyValueLookup(object):
 
     def __init__(self, prefix=None, key_prefix=None, cache=None, scope=FULL_SYSTEM_SCOPE):
@@ -76,12 +253,30 @@ class KeyValueLookup(object):
 
         self._prefix = prefix
         self._key_prefix = key_prefix or ''
-        self._value_cache = cache or {}
+        self._value_cache = cache if cache is not None else {}
         self._scope = scope
 
     def __str__(self):
         return self._value_cache[self._key_prefix]
 
+    def prefetch(self, names):
+        """
+        Retrieve values for the provided keys using a single query so the subsequent lookups
+        don't need to hit the database.
+
+        :param names: Key names (without the lookup prefix).
+        :type names: ``list``
+        """
+        kvp_keys = dict([(self._get_kvp_key(key=name), name) for name in names])
+
+        if not kvp_keys:
+            return
+
+        values = get_cached_values(scope=self._scope, names=list(kvp_keys.keys()))
+
+        for kvp_key, name in six.iteritems(kvp_keys):
+            self._value_cache[name] = values[kvp_key]
+
     def __int__(self):
         return int(float(self))
 
@@ -101,13 +296,9 @@ class KeyValueLookup(object):
         else:
             key = name
 
-        if self._prefix:
-            kvp_key = DATASTORE_KEY_SEPARATOR.join([self._prefix, key])
-        else:
-            kvp_key = key
+        if key not in self._value_cache:
+            self._value_cache[key] = self._get_kv(self._get_kvp_key(key=key))
 
-        value = self._get_kv(kvp_key)
-        self._value_cache[key] = value
         # return a KeyValueLookup as response since the lookup may not be complete e.g. if
         # the lookup is for 'key_base.key_value' it is likely that the calling code, e.g. Jinja,
         # will expect to do a dictionary style lookup for key_base and key_value as subsequent
@@ -115,13 +306,18 @@ class KeyValueLookup(object):
         return KeyValueLookup(prefix=self._prefix, key_prefix=key, cache=self._value_cache,
                               scope=self._scope)
 
+    def _get_kvp_key(self, key):
+        if self._prefix:
+            return DATASTORE_KEY_SEPARATOR.join([self._prefix, key])
+
+        return key
+
     def _get_kv(self, key):
         scope = self._scope
         LOG.debug('Lookup system kv: scope: %s and key: %s', scope, key)
-        kvp = KeyValuePair.get_by_scope_and_name(scope=scope, name=key)
-        if kvp:
-            LOG.debug('Got value %s from datastore.', kvp.value)
-        return kvp.value if kvp else ''
+        value = get_cached_value(scope=scope, name=key)
+        LOG.debug('Got value %s from datastore.', value)
+        return value
 
 
 class UserKeyValueLookup(object):
@@ -135,13 +331,32 @@ class UserKeyValueLookup(object):
 
         self._prefix = prefix
         self._key_prefix = key_prefix or ''
-        self._value_cache = cache or {}
+        self._value_cache = cache if cache is not None else {}
         self._user = user
         self._scope = scope
 
     def __str__(self):
         return self._value_cache[self._key_prefix]
 
+    def prefetch(self, names):
+        """
+        Retrieve values for the provided keys of this user using a single query so the subsequent
+        lookups don't need to hit the database.
+
+        :param names: Key names (without the user and lookup prefix).
+        :type names: ``list``
+        """
+        keys = [UserKeyReference(name=name, user=self._user).ref for name in names]
+        kvp_keys = dict([(self._get_kvp_key(key=key), key) for key in keys])
+
+        if not kvp_keys:
+            return
+
+        values = get_cached_values(scope=self._scope, names=list(kvp_keys.keys()))
+
+        for kvp_key, key in six.iteritems(kvp_keys):
+            self._value_cache[key] = values[kvp_key]
+
     def __getitem__(self, key):
         return self._get(key)
 
@@ -155,13 +370,9 @@ class UserKeyValueLookup(object):
         else:
             key = UserKeyReference(name=name, user=self._user).ref
 
-        if self._prefix:
-            kvp_key = DATASTORE_KEY_SEPARATOR.join([self._prefix, key])
-        else:
-            kvp_key = key
+        if key not in self._value_cache:
+            self._value_cache[key] = self._get_kv(self._get_kvp_key(key=key))
 
-        value = self._get_kv(kvp_key)
-        self._value_cache[key] = value
         # return a KeyValueLookup as response since the lookup may not be complete e.g. if
         # the lookup is for 'key_base.key_value' it is likely that the calling code, e.g. Jinja,
         # will expect to do a dictionary style lookup for key_base and key_value as subsequent
@@ -169,10 +380,15 @@ class UserKeyValueLookup(object):
         return UserKeyValueLookup(prefix=self._prefix, user=self._user, key_prefix=key,
                                   cache=self._value_cache, scope=self._scope)
 
+    def _get_kvp_key(self, key):
+        if self._prefix:
+            return DATASTORE_KEY_SEPARATOR.join([self._prefix, key])
+
+        return key
+
     def _get_kv(self, key):
         scope = self._scope
-        kvp = KeyValuePair.get_by_scope_and_name(scope=scope, name=key)
-        return kvp.value if kvp else ''
+        return get_cached_value(scope=scope, name=key)
 
 
 def get_key_reference(scope, name, user=None):
@@ -0,0 +1,151 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import defaultdict
+
+import eventlet
+from eventlet import queue
+
+from st2common import log as logging
+from st2common.constants import action as action_constants
+from st2common.services.cache_watcher import CacheWatcher
+from st2common.transport import liveaction
+from st2common.util import action_db as action_db_util
+
+__all__ = [
+    'LiveActionWatcher',
+
+    'wait_for_completion',
+    'get_watcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+# States in which the waiting for a liveaction ends
+WAIT_END_STATES = (action_constants.LIVEACTION_COMPLETED_STATES +
+                   [action_constants.LIVEACTION_STATUS_PAUSED])
+
+
+class LiveActionWatcher(CacheWatcher):
+    """
+    Watcher which listens for LiveActionDB status updates on the message bus and wakes up the
+    green threads which are waiting for a particular liveaction to complete.
+
+    A single watcher (and a single exclusive queue) is used per process.
+    """
+
+    def __init__(self, statuses=None, queue_suffix=None):
+        """
+        :param statuses: Statuses to listen for. Defaults to completed states and paused.
+        :type statuses: ``list``
+        """
+        # liveaction id -> list of queues of the green threads waiting for the liveaction
+        self._waiters = defaultdict(list)
+
+        super(LiveActionWatcher, self).__init__(
+            name='liveaction status waiters', exchanges=[liveaction.LIVEACTION_STATUS_MGMT_XCHG],
+            invalidate_callback=self._notify_waiters, routing_keys=statuses or WAIT_END_STATES,
+            queue_suffix=queue_suffix or 'waiter')
+
+    def watch(self, liveaction_id):
+        """
+        Register interest in the status updates of the provided liveaction.
+
+        :return: Queue to which the new statuses are put.
+        :rtype: :class:`eventlet.queue.LightQueue`
+        """
+        waiter = queue.LightQueue()
+        self._waiters[str(liveaction_id)].append(waiter)
+        return waiter
+
+    def unwatch(self, liveaction_id, waiter):
+        liveaction_id = str(liveaction_id)
+        waiters = self._waiters.get(liveaction_id, [])
+
+        if waiter in waiters:
+            waiters.remove(waiter)
+
+        if not waiters:
+            self._waiters.pop(liveaction_id, None)
+
+    def _notify_waiters(self, body, routing_key):
+        liveaction_id = str(getattr(body, 'id', None))
+        status = getattr(body, 'status', None)
+
+        for waiter in self._waiters.get(liveaction_id, []):
+            waiter.put(status)
+
+
+def wait_for_completion(liveaction_db, watcher=None, poll_interval=1.0):
+    """
+    Wait until the provided liveaction reaches one of the completed states or is paused.
+
+    If a watcher is provided, the calling green thread is woken up as soon as the status update
+    is received over the message bus and the database is only polled every ``poll_interval``
+    seconds in case a status update is missed (e.g. while the watcher is (re-)connecting).
+
+    :param poll_interval: Number of seconds between database polls.
+    :type poll_interval: ``float``
+
+    :rtype: :class:`LiveActionDB`
+    """
+    if liveaction_db.status in WAIT_END_STATES:
+        return liveaction_db
+
+    liveaction_id = liveaction_db.id
+
+    if not watcher:
+        while liveaction_db.status not in WAIT_END_STATES:
+            eventlet.sleep(poll_interval)
+            liveaction_db = action_db_util.get_liveaction_by_id(liveaction_id)
+
+        return liveaction_db
+
+    waiter = watcher.watch(liveaction_id)
+
+    try:
+        # Liveaction could have completed before we started watching it
+        liveaction_db = action_db_util.get_liveaction_by_id(liveaction_id)
+
+        while liveaction_db.status not in WAIT_END_STATES:
+            try:
+                waiter.get(timeout=poll_interval)
+            except queue.Empty:
+                LOG.debug('No status update received for liveaction "%s" in %s seconds, polling '
+                          'the database.', liveaction_id, poll_interval)
+
+            liveaction_db = action_db_util.get_liveaction_by_id(liveaction_id)
+    finally:
+        watcher.unwatch(liveaction_id, waiter)
+
+    return liveaction_db
+
+
+_WATCHER = None
+
+
+def get_watcher():
+    """
+    Return the liveaction watcher for this process, starting it on the first use.
+
+    :rtype: :class:`LiveActionWatcher`
+    """
+    global _WATCHER
+
+    if not _WATCHER:
+        _WATCHER = LiveActionWatcher()
+        _WATCHER.start()
+
+    return _WATCHER
@@ -0,0 +1,68 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from st2common import log as logging
+from st2common.services.cache_watcher import CacheWatcher
+from st2common.transport import reactor, publishers
+
+__all__ = [
+    'RuleWatcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class RuleWatcher(CacheWatcher):
+    """
+    Watcher which listens for RuleDB CUD events on the message bus and calls the corresponding
+    handler.
+    """
+
+    def __init__(self, create_handler, update_handler, delete_handler, queue_suffix=None,
+                 connect_handler=None):
+        """
+        :param create_handler: Function which is called on RuleDB create event.
+        :type create_handler: ``callable``
+
+        :param update_handler: Function which is called on RuleDB update event.
+        :type update_handler: ``callable``
+
+        :param delete_handler: Function which is called on RuleDB delete event.
+        :type delete_handler: ``callable``
+
+        :param connect_handler: Optional function which is called each time the watcher
+                                (re-)starts consuming. Events published while the watcher
+                                wasn't connected are lost so this can be used to reset any
+                                state which is derived from those events.
+        :type connect_handler: ``callable``
+        """
+        self._handlers = {
+            publishers.CREATE_RK: create_handler,
+            publishers.UPDATE_RK: update_handler,
+            publishers.DELETE_RK: delete_handler
+        }
+
+        super(RuleWatcher, self).__init__(
+            name='rules', exchanges=[reactor.RULE_CUD_XCHG], invalidate_callback=self._handle,
+            clear_callback=connect_handler, queue_suffix=queue_suffix or 'rules')
+
+    def _handle(self, body, routing_key):
+        handler = self._handlers.get(routing_key, None)
+
+        if not handler:
+            LOG.debug('Skipping rule event "%s" as no handler was found.', routing_key)
+            return
+
+        handler(body)
@@ -24,6 +24,7 @@ from kombu import Connection
 from st2common import log as logging
 from st2common.transport import reactor, publishers
 from st2common.transport import utils as transport_utils
+from st2common.transport.serializers import get_accept_content
 import st2common.util.queues as queue_utils
 
 LOG = logging.getLogger(__name__)
@@ -60,7 +61,7 @@ class SensorWatcher(ConsumerMixin):
 
     def get_consumers(self, Consumer, channel):
         consumers = [Consumer(queues=[self._sensor_watcher_q],
-                              accept=['pickle'],
+                              accept=get_accept_content(),
                               callbacks=[self.process_task])]
         return consumers
 
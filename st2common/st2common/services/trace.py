@@ -36,6 +36,7 @@ __all__ = [
     'get_trace',
     'add_or_update_given_trace_context',
     'add_or_update_given_trace_db',
+    'add_or_update_given_trace_contexts_for_trigger_instances',
     'get_trace_component_for_action_execution',
     'get_trace_component_for_rule',
     'get_trace_component_for_trigger_instance'
@@ -280,6 +281,60 @@ def add_or_update_given_trace_db(trace_db, action_executions=None, rules=None,
     return Trace.add_or_update(trace_db)
 
 
+def add_or_update_given_trace_contexts_for_trigger_instances(trace_contexts, trigger_instances):
+    """
+    Bulk version of ``add_or_update_given_trace_context`` for trigger instances.
+
+    Trigger instance is added to the existing Trace if the corresponding trace_context identifies
+    one, otherwise a new Trace is started. All the new Traces are inserted using a single bulk
+    insert.
+
+    :param trace_contexts: Trace context for each of the trigger instances.
+    :type trace_contexts: ``list`` of ``dict`` or ``TraceContext``
+
+    :param trigger_instances: Trigger instances to be added to the Traces.
+    :type trigger_instances: ``list`` of ``TriggerInstanceDB``
+
+    :rtype: ``list`` of ``TraceDB``
+    """
+    if len(trace_contexts) != len(trigger_instances):
+        raise ValueError('Number of trace contexts and trigger instances must match.')
+
+    trace_dbs = []
+    new_trace_dbs = []
+    # Trace tag -> new TraceDB so multiple trigger instances with the same tag end up in a single
+    # Trace, same as when they are added one by one
+    new_trace_dbs_by_tag = {}
+
+    for trace_context, trigger_instance in zip(trace_contexts, trigger_instances):
+        component = get_trace_component_for_trigger_instance(trigger_instance)
+
+        trace_db = get_trace(trace_context=trace_context, ignore_trace_tag=True)
+        if trace_db:
+            trace_dbs.append(add_or_update_given_trace_db(trace_db=trace_db,
+                                                          trigger_instances=[component]))
+            continue
+
+        trace_context = _get_valid_trace_context(trace_context)
+
+        trace_db = new_trace_dbs_by_tag.get(trace_context.trace_tag, None)
+        if trace_db:
+            trace_db.trigger_instances.append(_to_trace_component_db(component=component))
+            continue
+
+        trace_db = TraceDB(trace_tag=trace_context.trace_tag)
+        trace_db.action_executions = []
+        trace_db.rules = []
+        trace_db.trigger_instances = [_to_trace_component_db(component=component)]
+        new_trace_dbs.append(trace_db)
+        new_trace_dbs_by_tag[trace_context.trace_tag] = trace_db
+
+    if new_trace_dbs:
+        trace_dbs.extend(Trace.insert_many(new_trace_dbs))
+
+    return trace_dbs
+
+
 def get_trace_component_for_action_execution(action_execution_db, liveaction_db):
     """
     Returns the trace_component compatible dict representation of an actionexecution.
@@ -0,0 +1,186 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Registry of compiled trigger type payload and parameters schema validators.
+
+Validators are compiled on the first use and cached per trigger type so validating a trigger
+payload doesn't require a database query and a schema compilation. Cached validators are
+invalidated as soon as the trigger type changes using the ``st2.triggertype`` CUD exchange.
+"""
+
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.constants.triggers import SYSTEM_TRIGGER_TYPES
+from st2common.services import triggers
+from st2common.services.cache_watcher import CacheWatcher
+from st2common.transport import publishers
+from st2common.transport import reactor
+from st2common.util import schema as util_schema
+from st2common.util.cache import TTLCache
+
+__all__ = [
+    'TriggerTypeSchemaRegistry',
+    'TriggerTypeSchemaWatcher',
+
+    'get_payload_validator',
+    'get_parameters_validator',
+    'get_schema_registry'
+]
+
+LOG = logging.getLogger(__name__)
+
+PAYLOAD_SCHEMA = 'payload_schema'
+PARAMETERS_SCHEMA = 'parameters_schema'
+
+# Maximum number of cached validators and the number of seconds after which they are compiled
+# again even if no change event has been received
+CACHE_MAX_SIZE = 1000
+CACHE_TTL = 600
+
+# Cached value which indicates that the trigger type doesn't exist or it doesn't define a schema
+NO_VALIDATOR = False
+
+
+class TriggerTypeSchemaRegistry(object):
+    """
+    Cache of compiled validators for trigger type schemas.
+    """
+
+    def __init__(self, max_size=CACHE_MAX_SIZE, ttl=CACHE_TTL):
+        # (trigger type ref, schema attribute name) -> SchemaValidator or NO_VALIDATOR
+        self.validators = TTLCache(max_size=max_size, ttl=ttl)
+
+    def get_validator(self, trigger_type_ref, schema_name):
+        key = (trigger_type_ref, schema_name)
+        validator = self.validators.get_or_set(
+            key, lambda: _get_validator(trigger_type_ref=trigger_type_ref,
+                                        schema_name=schema_name) or NO_VALIDATOR)
+        return validator or None
+
+    def invalidate(self, trigger_type_ref=None):
+        """
+        Invalidate validators for the provided trigger type or all the validators if no trigger
+        type is provided.
+        """
+        if not trigger_type_ref:
+            self.validators.clear()
+            return
+
+        self.validators.delete_matching(lambda key: key[0] == trigger_type_ref)
+
+    def clear(self):
+        self.validators.clear()
+
+    def get_stats(self):
+        return self.validators.get_stats()
+
+
+class TriggerTypeSchemaWatcher(CacheWatcher):
+    """
+    Watcher which listens for trigger type CUD events on the message bus and invalidates the
+    corresponding validators.
+    """
+
+    def __init__(self, schema_registry, queue_suffix=None):
+        self._schema_registry = schema_registry
+        super(TriggerTypeSchemaWatcher, self).__init__(
+            name='trigger type schema validators', exchanges=[reactor.TRIGGER_TYPE_CUD_XCHG],
+            invalidate_callback=self._invalidate, clear_callback=schema_registry.clear,
+            queue_suffix=queue_suffix or 'schemas')
+
+    def _invalidate(self, body, routing_key):
+        if routing_key == publishers.UPDATE_RK:
+            # Reference of the trigger type could have changed
+            self._schema_registry.invalidate()
+        else:
+            self._schema_registry.invalidate(trigger_type_ref=getattr(body, 'ref', None))
+
+
+def get_payload_validator(trigger_type_ref):
+    """
+    Retrieve validator for the payload of the provided trigger type.
+
+    :return: Validator or None if the trigger type doesn't exist or doesn't define a schema.
+    :rtype: :class:`st2common.util.schema.SchemaValidator`
+    """
+    return _get_cached_validator(trigger_type_ref=trigger_type_ref, schema_name=PAYLOAD_SCHEMA)
+
+
+def get_parameters_validator(trigger_type_ref):
+    """
+    Retrieve validator for the parameters of the provided trigger type.
+
+    :return: Validator or None if the trigger type doesn't exist or doesn't define a schema.
+    :rtype: :class:`st2common.util.schema.SchemaValidator`
+    """
+    return _get_cached_validator(trigger_type_ref=trigger_type_ref,
+                                 schema_name=PARAMETERS_SCHEMA)
+
+
+def _get_cached_validator(trigger_type_ref, schema_name):
+    schema_registry = get_schema_registry()
+
+    if not schema_registry:
+        return _get_validator(trigger_type_ref=trigger_type_ref, schema_name=schema_name)
+
+    return schema_registry.get_validator(trigger_type_ref=trigger_type_ref,
+                                         schema_name=schema_name)
+
+
+def _get_validator(trigger_type_ref, schema_name):
+    if trigger_type_ref in SYSTEM_TRIGGER_TYPES:
+        schema = SYSTEM_TRIGGER_TYPES[trigger_type_ref][schema_name]
+    else:
+        trigger_type_db = triggers.get_trigger_type_db(trigger_type_ref)
+
+        if not trigger_type_db:
+            # Trigger doesn't exist in the database
+            return None
+
+        schema = getattr(trigger_type_db, schema_name, {})
+
+    if not schema:
+        return None
+
+    return util_schema.SchemaValidator(schema=schema, cls=util_schema.CustomValidator,
+                                       use_default=True, allow_default_none=True)
+
+
+_SCHEMA_REGISTRY = None
+_SCHEMA_WATCHER = None
+
+
+def get_schema_registry():
+    """
+    Return the schema registry for this process, starting the invalidation watcher on the first
+    use.
+
+    :return: Registry or None if caching is disabled.
+    :rtype: :class:`TriggerTypeSchemaRegistry`
+    """
+    global _SCHEMA_REGISTRY
+    global _SCHEMA_WATCHER
+
+    if not cfg.CONF.system.cache_trigger_type_schemas:
+        return None
+
+    if not _SCHEMA_REGISTRY:
+        _SCHEMA_REGISTRY = TriggerTypeSchemaRegistry()
+        _SCHEMA_WATCHER = TriggerTypeSchemaWatcher(schema_registry=_SCHEMA_REGISTRY)
+        _SCHEMA_WATCHER.start()
+
+    return _SCHEMA_REGISTRY
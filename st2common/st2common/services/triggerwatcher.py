@@ -22,6 +22,7 @@ from st2common import log as logging
 from st2common.persistence.trigger import Trigger
 from st2common.transport import reactor, publishers
 from st2common.transport import utils as transport_utils
+from st2common.transport.serializers import get_accept_content
 import st2common.util.queues as queue_utils
 
 LOG = logging.getLogger(__name__)
@@ -72,7 +73,7 @@ class TriggerWatcher(ConsumerMixin):
 
     def get_consumers(self, Consumer, channel):
         return [Consumer(queues=[self._trigger_watch_q],
-                         accept=['pickle'],
+                         accept=get_accept_content(),
                          callbacks=[self.process_task])]
 
     def process_task(self, body, message):
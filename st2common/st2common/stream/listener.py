@@ -14,8 +14,10 @@
 # limitations under the License.
 
 import fnmatch
+from collections import defaultdict
 
 import eventlet
+import six
 
 from kombu import Connection
 from kombu.mixins import ConsumerMixin
@@ -30,9 +32,12 @@ from st2common.transport.queues import STREAM_EXECUTION_ALL_WORK_QUEUE
 from st2common.transport.queues import STREAM_EXECUTION_UPDATE_WORK_QUEUE
 from st2common.transport.queues import STREAM_LIVEACTION_WORK_QUEUE
 from st2common.transport.queues import STREAM_EXECUTION_OUTPUT_QUEUE
+from st2common.transport.serializers import get_accept_content
+from st2common.util.jsonify import json_encode
 from st2common import log as logging
 
 __all__ = [
+    'StreamEvent',
     'StreamListener',
     'ExecutionOutputListener',
 
@@ -48,11 +53,152 @@ _stream_listener = None
 _execution_output_listener = None
 
 
+class StreamEvent(tuple):
+    """
+    Event which is put into the subscriber queues.
+
+    It behaves as an (event name, body) tuple and the server-sent event frame is only encoded once
+    (on first access) and shared by all the subscribers which receive the event.
+    """
+
+    FRAME_FORMAT = 'event: %s\ndata: %s\n\n'
+
+    def __new__(cls, event, body):
+        instance = super(StreamEvent, cls).__new__(cls, (event, body))
+        instance._frame = None
+        return instance
+
+    @property
+    def event(self):
+        return self[0]
+
+    @property
+    def body(self):
+        return self[1]
+
+    @property
+    def frame(self):
+        """
+        Server-sent event frame for this event.
+
+        :rtype: ``bytes``
+        """
+        if self._frame is None:
+            # Note: gunicorn wsgi handler expect bytes, not unicode
+            self._frame = six.binary_type(self.FRAME_FORMAT % (self.event,
+                                                               json_encode(self.body,
+                                                                           indent=None)))
+
+        return self._frame
+
+
+class SubscriptionIndex(object):
+    """
+    Index of the subscriber queues and their filters which is used to find all the subscribers
+    which are interested in a particular event without evaluating filters of each subscriber.
+    """
+
+    def __init__(self):
+        # queue -> event name globs
+        self._event_filters = {}
+
+        # event name -> set of queues whose event name filter matches this event
+        self._event_matches = {}
+
+        # action ref / execution id -> set of queues which filter on it
+        self._action_ref_queues = defaultdict(set)
+        self._execution_id_queues = defaultdict(set)
+
+        # Queues which don't filter on action ref / execution id
+        self._any_action_ref_queues = set()
+        self._any_execution_id_queues = set()
+
+    def __len__(self):
+        return len(self._event_filters)
+
+    def add(self, queue, events=None, action_refs=None, execution_ids=None):
+        self._event_filters[queue] = events or []
+        self._event_matches = {}
+
+        self._add_to_index(queue, action_refs, self._action_ref_queues,
+                           self._any_action_ref_queues)
+        self._add_to_index(queue, execution_ids, self._execution_id_queues,
+                           self._any_execution_id_queues)
+
+    def remove(self, queue):
+        self._event_filters.pop(queue, None)
+        self._event_matches = {}
+
+        self._remove_from_index(queue, self._action_ref_queues, self._any_action_ref_queues)
+        self._remove_from_index(queue, self._execution_id_queues,
+                                self._any_execution_id_queues)
+
+    def match(self, event_name, action_ref=None, execution_id=None):
+        """
+        Return queues of the subscribers which should receive the provided event.
+
+        :rtype: ``set``
+        """
+        queues = self._get_event_matches(event_name=event_name)
+
+        if not queues:
+            return queues
+
+        queues = queues & (self._any_action_ref_queues |
+                           self._action_ref_queues.get(action_ref, set()))
+        queues = queues & (self._any_execution_id_queues |
+                           self._execution_id_queues.get(execution_id, set()))
+
+        return queues
+
+    def _get_event_matches(self, event_name):
+        queues = self._event_matches.get(event_name, None)
+
+        if queues is None:
+            queues = set([queue for queue, event_filters in six.iteritems(self._event_filters)
+                          if self._should_include_event(event_filters, event_name)])
+            self._event_matches[event_name] = queues
+
+        return queues
+
+    def _should_include_event(self, event_names_whitelist, event_name):
+        """
+        Return True if particular event should be included based on the event names filter.
+        """
+        if not event_names_whitelist:
+            return True
+
+        for event_name_filter_glob in event_names_whitelist:
+            if fnmatch.fnmatch(event_name, event_name_filter_glob):
+                return True
+
+        return False
+
+    @staticmethod
+    def _add_to_index(queue, values, index, any_queues):
+        if not values:
+            any_queues.add(queue)
+            return
+
+        for value in values:
+            index[value].add(queue)
+
+    @staticmethod
+    def _remove_from_index(queue, index, any_queues):
+        any_queues.discard(queue)
+
+        for value in list(index.keys()):
+            index[value].discard(queue)
+
+            if not index[value]:
+                del index[value]
+
+
 class BaseListener(ConsumerMixin):
 
     def __init__(self, connection):
         self.connection = connection
-        self.queues = []
+        self.subscriptions = SubscriptionIndex()
         self._stopped = False
 
     def get_consumers(self, consumer, channel):
@@ -74,14 +220,25 @@ class BaseListener(ConsumerMixin):
         return process
 
     def emit(self, event, body):
-        pack = (event, body)
-        for queue in self.queues:
+        # Note: Body is masked once in the processor and the event frame is encoded at most once
+        # and shared by all the subscribers
+        queues = self.subscriptions.match(event_name=event,
+                                          action_ref=self._get_action_ref_for_body(body=body),
+                                          execution_id=self._get_execution_id_for_body(body=body))
+
+        if not queues:
+            LOG.debug('Skipping event "%s", no matching subscribers' % (event))
+            return
+
+        pack = StreamEvent(event, body)
+        for queue in queues:
             queue.put(pack)
 
     def generator(self, events=None, action_refs=None, execution_ids=None):
         queue = eventlet.Queue()
         queue.put('')
-        self.queues.append(queue)
+        self.subscriptions.add(queue, events=events, action_refs=action_refs,
+                               execution_ids=execution_ids)
 
         try:
             while not self._stopped:
@@ -89,56 +246,17 @@ class BaseListener(ConsumerMixin):
                     # TODO: Move to common option
                     message = queue.get(timeout=cfg.CONF.stream.heartbeat)
 
-                    if not message:
-                        yield message
-                        continue
-
-                    event_name, body = message
-                    # TODO: We now do late filtering, but this could also be performed on the
-                    # message bus level if we modified our exchange layout and utilize routing keys
-                    # Filter on event name
-                    include_event = self._should_include_event(event_names_whitelist=events,
-                                                               event_name=event_name)
-                    if not include_event:
-                        LOG.debug('Skipping event "%s"' % (event_name))
-                        continue
-
-                    # Filter on action ref
-                    action_ref = self._get_action_ref_for_body(body=body)
-                    if action_refs and action_ref not in action_refs:
-                        LOG.debug('Skipping event "%s" with action_ref "%s"' % (event_name,
-                                                                                action_ref))
-                        continue
-
-                    # Filter on execution id
-                    execution_id = self._get_execution_id_for_body(body=body)
-                    if execution_ids and execution_id not in execution_ids:
-                        LOG.debug('Skipping event "%s" with execution_id "%s"' % (event_name,
-                                                                                  execution_id))
-                        continue
-
+                    # Note: Messages are filtered using the subscriptions index when they are
+                    # emitted
                     yield message
                 except eventlet.queue.Empty:
                     yield
         finally:
-            self.queues.remove(queue)
+            self.subscriptions.remove(queue)
 
     def shutdown(self):
         self._stopped = True
 
-    def _should_include_event(self, event_names_whitelist, event_name):
-        """
-        Return True if particular event should be included based on the event names filter.
-        """
-        if not event_names_whitelist:
-            return True
-
-        for event_name_filter_glob in event_names_whitelist:
-            if fnmatch.fnmatch(event_name, event_name_filter_glob):
-                return True
-
-        return False
-
     def _get_action_ref_for_body(self, body):
         """
         Retrieve action_ref for the provided message body.
@@ -183,19 +301,19 @@ class StreamListener(BaseListener):
     def get_consumers(self, consumer, channel):
         return [
             consumer(queues=[STREAM_ANNOUNCEMENT_WORK_QUEUE],
-                     accept=['pickle'],
+                     accept=get_accept_content(),
                      callbacks=[self.processor()]),
 
             consumer(queues=[STREAM_EXECUTION_ALL_WORK_QUEUE],
-                     accept=['pickle'],
+                     accept=get_accept_content(),
                      callbacks=[self.processor(ActionExecutionAPI)]),
 
             consumer(queues=[STREAM_LIVEACTION_WORK_QUEUE],
-                     accept=['pickle'],
+                     accept=get_accept_content(),
                      callbacks=[self.processor(LiveActionAPI)]),
 
             consumer(queues=[STREAM_EXECUTION_OUTPUT_QUEUE],
-                     accept=['pickle'],
+                     accept=get_accept_content(),
                      callbacks=[self.processor(ActionExecutionOutputAPI)])
         ]
 
@@ -210,11 +328,11 @@ class ExecutionOutputListener(BaseListener):
     def get_consumers(self, consumer, channel):
         return [
             consumer(queues=[STREAM_EXECUTION_UPDATE_WORK_QUEUE],
-                     accept=['pickle'],
+                     accept=get_accept_content(),
                      callbacks=[self.processor(ActionExecutionAPI)]),
 
             consumer(queues=[STREAM_EXECUTION_OUTPUT_QUEUE],
-                     accept=['pickle'],
+                     accept=get_accept_content(),
                      callbacks=[self.processor(ActionExecutionOutputAPI)])
         ]
 
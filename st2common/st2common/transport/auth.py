@@ -0,0 +1,67 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# All Exchanges and Queues related to authentication and RBAC.
+
+from kombu import Exchange, Queue
+
+from st2common.transport import publishers
+
+__all__ = [
+    'AuthCUDPublisher',
+
+    'get_auth_cud_queue'
+]
+
+# Exchange for CUD events of the authentication (tokens, API keys, users) and RBAC (roles, role
+# assignments, permission grants) models. Routing key is "<resource type>.<event>" (e.g.
+# "token.delete").
+AUTH_CUD_XCHG = Exchange('st2.auth', type='topic')
+
+TOKEN_RESOURCE_TYPE = 'token'
+API_KEY_RESOURCE_TYPE = 'api_key'
+USER_RESOURCE_TYPE = 'user'
+ROLE_RESOURCE_TYPE = 'role'
+USER_ROLE_ASSIGNMENT_RESOURCE_TYPE = 'user_role_assignment'
+PERMISSION_GRANT_RESOURCE_TYPE = 'permission_grant'
+
+
+class AuthCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing authentication and RBAC model CUD events.
+    """
+
+    def __init__(self, urls, resource_type):
+        super(AuthCUDPublisher, self).__init__(urls, AUTH_CUD_XCHG)
+        self._resource_type = resource_type
+
+    def publish_create(self, payload):
+        self._publisher.publish(payload, self._exchange, self._get_routing_key(
+            publishers.CREATE_RK))
+
+    def publish_update(self, payload):
+        self._publisher.publish(payload, self._exchange, self._get_routing_key(
+            publishers.UPDATE_RK))
+
+    def publish_delete(self, payload):
+        self._publisher.publish(payload, self._exchange, self._get_routing_key(
+            publishers.DELETE_RK))
+
+    def _get_routing_key(self, event):
+        return '%s.%s' % (self._resource_type, event)
+
+
+def get_auth_cud_queue(name, routing_key, exclusive=False):
+    return Queue(name, AUTH_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
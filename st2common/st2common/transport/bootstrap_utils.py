@@ -21,13 +21,18 @@ from kombu import Connection
 
 from st2common import log as logging
 from st2common.transport import utils as transport_utils
+from st2common.transport.action import ACTION_CUD_XCHG, RUNNER_TYPE_CUD_XCHG
 from st2common.transport.actionexecutionstate import ACTIONEXECUTIONSTATE_XCHG
 from st2common.transport.announcement import ANNOUNCEMENT_XCHG
+from st2common.transport.auth import AUTH_CUD_XCHG
 from st2common.transport.connection_retry_wrapper import ConnectionRetryWrapper
 from st2common.transport.execution import EXECUTION_XCHG
+from st2common.transport.keyvalue import KEY_VALUE_PAIR_CUD_XCHG
 from st2common.transport.liveaction import LIVEACTION_XCHG, LIVEACTION_STATUS_MGMT_XCHG
+from st2common.transport.reactor import RULE_CUD_XCHG
 from st2common.transport.reactor import SENSOR_CUD_XCHG
 from st2common.transport.reactor import TRIGGER_CUD_XCHG, TRIGGER_INSTANCE_XCHG
+from st2common.transport.reactor import TRIGGER_TYPE_CUD_XCHG
 from st2common.transport import reactor
 from st2common.transport.queues import ACTIONSCHEDULER_REQUEST_QUEUE
 from st2common.transport.queues import ACTIONRUNNER_WORK_QUEUE
@@ -57,8 +62,14 @@ EXCHANGES = [
     LIVEACTION_XCHG,
     LIVEACTION_STATUS_MGMT_XCHG,
     TRIGGER_CUD_XCHG,
+    TRIGGER_TYPE_CUD_XCHG,
     TRIGGER_INSTANCE_XCHG,
-    SENSOR_CUD_XCHG
+    SENSOR_CUD_XCHG,
+    RULE_CUD_XCHG,
+    AUTH_CUD_XCHG,
+    KEY_VALUE_PAIR_CUD_XCHG,
+    ACTION_CUD_XCHG,
+    RUNNER_TYPE_CUD_XCHG
 ]
 
 # List of queues which are pre-declared on service startup.
@@ -14,6 +14,8 @@
 # limitations under the License.
 
 import abc
+import time
+
 import eventlet
 import six
 
@@ -22,10 +24,12 @@ from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.util.greenpooldispatch import BufferedDispatcher
+from st2common.transport.serializers import get_accept_content
 
 __all__ = [
     'QueueConsumer',
     'StagedQueueConsumer',
+    'BatchedStagedQueueConsumer',
     'ActionsQueueConsumer',
 
     'MessageHandler',
@@ -46,7 +50,8 @@ class QueueConsumer(ConsumerMixin):
         self._dispatcher.shutdown()
 
     def get_consumers(self, Consumer, channel):
-        consumer = Consumer(queues=self._queues, accept=['pickle'], callbacks=[self.process])
+        consumer = Consumer(queues=self._queues, accept=get_accept_content(),
+                            callbacks=[self.process])
 
         # use prefetch_count=1 for fair dispatch. This way workers that finish an item get the next
         # task and the work does not get queued behind any single large item.
@@ -91,6 +96,100 @@ class StagedQueueConsumer(QueueConsumer):
             message.ack()
 
 
+class BatchedStagedQueueConsumer(StagedQueueConsumer):
+    """
+    Staged queue consumer which prefetches up to ``batch_size`` messages and hands them to the
+    handler as a single batch.
+
+    Batch is flushed when it's full or when the oldest message in the batch has been waiting for
+    more than ``flush_interval`` seconds. All the messages in a batch are acknowledged as a unit
+    after ``pre_ack_process_batch`` has been called which means the at-least-once delivery
+    semantics are the same as with ``StagedQueueConsumer``.
+    """
+
+    def __init__(self, connection, queues, handler, batch_size=100, flush_interval=0.1):
+        super(BatchedStagedQueueConsumer, self).__init__(connection=connection, queues=queues,
+                                                         handler=handler)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+
+        self._batch = []
+        self._batch_start_time = None
+
+    def run(self, *args, **kwargs):
+        # Make sure we regularly wake up so a partial batch is flushed in a timely manner
+        kwargs.setdefault('safety_interval', self._flush_interval)
+        return super(BatchedStagedQueueConsumer, self).run(*args, **kwargs)
+
+    def get_consumers(self, Consumer, channel):
+        consumer = Consumer(queues=self._queues, accept=get_accept_content(),
+                            callbacks=[self.process])
+        consumer.qos(prefetch_count=self._batch_size)
+        return [consumer]
+
+    def process(self, body, message):
+        if not self._batch:
+            self._batch_start_time = time.time()
+
+        self._batch.append((body, message))
+
+        if len(self._batch) >= self._batch_size:
+            self.flush()
+
+    def on_iteration(self):
+        if not self._batch:
+            return
+
+        if (time.time() - self._batch_start_time) >= self._flush_interval:
+            self.flush()
+
+    def on_connection_revived(self):
+        # Un-acked messages from the previous connection will be re-delivered by the broker
+        if self._batch:
+            LOG.debug('Connection revived, dropping %s pending message(s) which will be '
+                      're-delivered.', len(self._batch))
+
+        self._batch = []
+        self._batch_start_time = None
+
+    def flush(self):
+        batch = self._batch
+        self._batch = []
+        self._batch_start_time = None
+
+        if not batch:
+            return
+
+        try:
+            bodies = []
+            for body, _ in batch:
+                if not isinstance(body, self._handler.message_type):
+                    LOG.error('%s received an unexpected type "%s" for payload: %s',
+                              self.__class__.__name__, type(body), body)
+                    continue
+
+                bodies.append(body)
+
+            if bodies:
+                responses = self._handler.pre_ack_process_batch(bodies)
+                self._dispatcher.dispatch(self._process_batch, responses)
+        except:
+            LOG.exception('%s failed to process batch of %s messages.', self.__class__.__name__,
+                          len(batch))
+        finally:
+            # At this point we will always ack all the messages in the batch. Messages are
+            # delivered in order on a single channel so acking the last one acks the whole batch.
+            _, last_message = batch[-1]
+            last_message.ack(multiple=True)
+
+    def _process_batch(self, responses):
+        try:
+            self._handler.process_batch(responses)
+        except:
+            LOG.exception('%s failed to process batch of %s messages.', self.__class__.__name__,
+                          len(responses))
+
+
 class ActionsQueueConsumer(QueueConsumer):
     """
     Special Queue Consumer for action runner which uses multiple BufferedDispatcher pools:
@@ -196,3 +295,34 @@ class StagedMessageHandler(MessageHandler):
 
     def get_queue_consumer(self, connection, queues):
         return StagedQueueConsumer(connection=connection, queues=queues, handler=self)
+
+    def pre_ack_process_batch(self, messages):
+        """
+        Batch version of ``pre_ack_process`` used by ``BatchedStagedQueueConsumer``.
+
+        Default implementation simply calls ``pre_ack_process`` for each message. Handlers which
+        can do something smarter (e.g. bulk insert into the database) should override it.
+
+        :rtype: ``list``
+        """
+        responses = []
+
+        for message in messages:
+            try:
+                responses.append(self.pre_ack_process(message))
+            except:
+                LOG.exception('%s failed to pre-process message: %s', self.__class__.__name__,
+                              message)
+
+        return responses
+
+    def process_batch(self, responses):
+        """
+        Batch version of ``process`` used by ``BatchedStagedQueueConsumer``.
+        """
+        for response in responses:
+            try:
+                self.process(response)
+            except:
+                LOG.exception('%s failed to process message: %s', self.__class__.__name__,
+                              response)
@@ -14,12 +14,16 @@
 # limitations under the License.
 
 import copy
+import time
+import weakref
 
 from kombu import Connection
 from kombu.messaging import Producer
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.transport.connection_retry_wrapper import ConnectionRetryWrapper
+from st2common.transport.serializers import get_serializer
 
 ANY_RK = '*'
 CREATE_RK = 'create'
@@ -30,35 +34,112 @@ LOG = logging.getLogger(__name__)
 
 
 class PoolPublisher(object):
-    def __init__(self, urls):
-        self.pool = Connection(urls, failover_strategy='round-robin').Pool(limit=10)
+    """
+    Publisher which publishes messages using a pool of connections.
+
+    Each connection in the pool keeps a long-lived channel and a producer bound to it which are
+    reused by all the publishes which go over that connection. A pooled connection is only used
+    by a single green thread at a time so the channel and the producer are never shared between
+    concurrent publishes.
+    """
+
+    def __init__(self, urls, pool_size=None, confirm_publish=None):
+        if pool_size is None:
+            pool_size = cfg.CONF.messaging.publisher_pool_size
+
+        if confirm_publish is None:
+            confirm_publish = cfg.CONF.messaging.publisher_confirms
+
+        transport_options = {}
+
+        if confirm_publish:
+            # Each publish waits for the broker to confirm the message has been accepted
+            transport_options['confirm_publish'] = True
+
+        self.pool = Connection(urls, failover_strategy='round-robin',
+                               transport_options=transport_options).Pool(limit=pool_size)
         self.cluster_size = len(urls)
 
+        # connection -> Producer bound to the default channel of that connection
+        self._producers = weakref.WeakKeyDictionary()
+
+        self._stats = {
+            'publish_count': 0,
+            'publish_errors': 0,
+            'publish_time_total': 0.0,
+            'publish_time_max': 0.0,
+            'pool_wait_time_total': 0.0,
+            'pool_wait_time_max': 0.0
+        }
+
     def errback(self, exc, interval):
         LOG.error('Rabbitmq connection error: %s', exc.message, exc_info=False)
 
     def publish(self, payload, exchange, routing_key=''):
-        with self.pool.acquire(block=True) as connection:
-            retry_wrapper = ConnectionRetryWrapper(cluster_size=self.cluster_size, logger=LOG)
-
-            def do_publish(connection, channel):
-                # ProducerPool ends up creating it own ConnectionPool which ends up completely
-                # invalidating this ConnectionPool. Also, a ConnectionPool for producer does not
-                # really solve any problems for us so better to create a Producer for each
-                # publish.
-                producer = Producer(channel)
-                kwargs = {
-                    'body': payload,
-                    'exchange': exchange,
-                    'routing_key': routing_key,
-                    'serializer': 'pickle'
-                }
-                retry_wrapper.ensured(connection=connection,
-                                      obj=producer,
-                                      to_ensure_func=producer.publish,
-                                      **kwargs)
-
-            retry_wrapper.run(connection=connection, wrapped_callback=do_publish)
+        start_time = time.time()
+
+        try:
+            with self.pool.acquire(block=True) as connection:
+                pool_wait_time = time.time() - start_time
+                retry_wrapper = ConnectionRetryWrapper(cluster_size=self.cluster_size, logger=LOG)
+
+                def do_publish(connection, channel):
+                    # ProducerPool ends up creating it own ConnectionPool which ends up completely
+                    # invalidating this ConnectionPool so we keep a producer per pooled connection
+                    # instead.
+                    producer = self._get_producer(connection=connection, channel=channel)
+                    kwargs = {
+                        'body': payload,
+                        'exchange': exchange,
+                        'routing_key': routing_key,
+                        'serializer': get_serializer()
+                    }
+                    retry_wrapper.ensured(connection=connection,
+                                          obj=producer,
+                                          to_ensure_func=producer.publish,
+                                          **kwargs)
+
+                retry_wrapper.run(connection=connection, wrapped_callback=do_publish,
+                                  use_default_channel=True)
+        except Exception:
+            self._stats['publish_errors'] += 1
+            raise
+
+        self._record_publish(publish_time=(time.time() - start_time),
+                             pool_wait_time=pool_wait_time)
+
+    def get_stats(self):
+        """
+        Return publish latency and connection pool wait time statistics (in seconds).
+
+        :rtype: ``dict``
+        """
+        stats = copy.copy(self._stats)
+        publish_count = stats['publish_count']
+
+        stats['publish_time_avg'] = (stats['publish_time_total'] / publish_count
+                                     if publish_count else 0.0)
+        stats['pool_wait_time_avg'] = (stats['pool_wait_time_total'] / publish_count
+                                       if publish_count else 0.0)
+        return stats
+
+    def _get_producer(self, connection, channel):
+        producer = self._producers.get(connection, None)
+
+        # Channel changes when the connection is re-established
+        if not producer or producer.channel is not channel:
+            producer = Producer(channel)
+            self._producers[connection] = producer
+
+        return producer
+
+    def _record_publish(self, publish_time, pool_wait_time):
+        self._stats['publish_count'] += 1
+        self._stats['publish_time_total'] += publish_time
+        self._stats['publish_time_max'] = max(self._stats['publish_time_max'], publish_time)
+        self._stats['pool_wait_time_total'] += pool_wait_time
+        self._stats['pool_wait_time_max'] = max(self._stats['pool_wait_time_max'],
+                                                pool_wait_time)
 
 
 class SharedPoolPublishers(object):
@@ -22,13 +22,19 @@ from st2common.transport import publishers
 from st2common.transport import utils as transport_utils
 
 __all__ = [
+    'RuleCUDPublisher',
     'TriggerCUDPublisher',
+    'TriggerTypeCUDPublisher',
     'TriggerInstancePublisher',
 
     'TriggerDispatcher',
 
+    'get_trigger_instance_messages',
+
+    'get_rule_cud_queue',
     'get_sensor_cud_queue',
     'get_trigger_cud_queue',
+    'get_trigger_type_cud_queue',
     'get_trigger_instances_queue'
 ]
 
@@ -37,12 +43,21 @@ LOG = logging.getLogger(__name__)
 # Exchange for Trigger CUD events
 TRIGGER_CUD_XCHG = Exchange('st2.trigger', type='topic')
 
+# Name of the message attribute which holds the payloads of a batch of trigger instances
+BATCH_PAYLOADS_KEY = 'payloads'
+
+# Exchange for TriggerType CUD events
+TRIGGER_TYPE_CUD_XCHG = Exchange('st2.triggertype', type='topic')
+
 # Exchange for TriggerInstance events
 TRIGGER_INSTANCE_XCHG = Exchange('st2.trigger_instances_dispatch', type='topic')
 
 # Exchane for Sensor CUD events
 SENSOR_CUD_XCHG = Exchange('st2.sensor', type='topic')
 
+# Exchange for Rule CUD events
+RULE_CUD_XCHG = Exchange('st2.rule', type='topic')
+
 
 class SensorCUDPublisher(publishers.CUDPublisher):
     """
@@ -53,6 +68,15 @@ class SensorCUDPublisher(publishers.CUDPublisher):
         super(SensorCUDPublisher, self).__init__(urls, SENSOR_CUD_XCHG)
 
 
+class RuleCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing Rule model CUD events.
+    """
+
+    def __init__(self, urls):
+        super(RuleCUDPublisher, self).__init__(urls, RULE_CUD_XCHG)
+
+
 class TriggerCUDPublisher(publishers.CUDPublisher):
     """
     Publisher responsible for publishing Trigger model CUD events.
@@ -62,6 +86,15 @@ class TriggerCUDPublisher(publishers.CUDPublisher):
         super(TriggerCUDPublisher, self).__init__(urls, TRIGGER_CUD_XCHG)
 
 
+class TriggerTypeCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing TriggerType model CUD events.
+    """
+
+    def __init__(self, urls):
+        super(TriggerTypeCUDPublisher, self).__init__(urls, TRIGGER_TYPE_CUD_XCHG)
+
+
 class TriggerInstancePublisher(object):
     def __init__(self, urls):
         self._publisher = publishers.PoolPublisher(urls=urls)
@@ -76,6 +109,9 @@ class TriggerDispatcher(object):
     This trigger dispatcher dispatches trigger instances to a message queue (RabbitMQ).
     """
 
+    # Maximum number of trigger instances which are published in a single batch message
+    MAX_BATCH_SIZE = 500
+
     def __init__(self, logger=LOG):
         self._publisher = TriggerInstancePublisher(urls=transport_utils.get_messaging_urls())
         self._logger = logger
@@ -106,14 +142,74 @@ class TriggerDispatcher(object):
         self._logger.debug('Dispatching trigger (trigger=%s,payload=%s)', trigger, payload)
         self._publisher.publish_trigger(payload=payload, routing_key=routing_key)
 
+    def dispatch_many(self, trigger, payloads, trace_context=None):
+        """
+        Method which dispatches multiple instances of the same trigger.
+
+        Instead of publishing a message per trigger instance, trigger instances are published in
+        batch messages which contain up to ``MAX_BATCH_SIZE`` payloads.
+
+        :param trigger: Full name / reference of the trigger.
+        :type trigger: ``str`` or ``object``
+
+        :param payloads: Trigger payloads.
+        :type payloads: ``list`` of ``dict``
+
+        :param trace_context: Trace context to associate with all the trigger instances.
+        :type trace_context: ``TraceContext``
+        """
+        assert isinstance(payloads, (list, tuple))
+        assert all([isinstance(payload, (type(None), dict)) for payload in payloads])
+        assert isinstance(trace_context, (type(None), TraceContext))
+
+        routing_key = 'trigger_instances'
+
+        for index in range(0, len(payloads), self.MAX_BATCH_SIZE):
+            batch = list(payloads[index:index + self.MAX_BATCH_SIZE])
+            payload = {
+                'trigger': trigger,
+                BATCH_PAYLOADS_KEY: batch,
+                TRACE_CONTEXT: trace_context
+            }
+
+            self._logger.debug('Dispatching %s instances of trigger (trigger=%s)', len(batch),
+                               trigger)
+            self._publisher.publish_trigger(payload=payload, routing_key=routing_key)
+
+
+def get_trigger_instance_messages(message):
+    """
+    Return a list of trigger instance messages for the provided message which has been published
+    on the trigger instances exchange.
+
+    Batch messages published using ``TriggerDispatcher.dispatch_many`` are expanded into a message
+    per trigger instance.
+
+    :rtype: ``list`` of ``dict``
+    """
+    if BATCH_PAYLOADS_KEY not in message:
+        return [message]
+
+    return [{'trigger': message['trigger'], 'payload': payload,
+             TRACE_CONTEXT: message.get(TRACE_CONTEXT, None)}
+            for payload in message[BATCH_PAYLOADS_KEY]]
+
 
 def get_trigger_cud_queue(name, routing_key, exclusive=False):
     return Queue(name, TRIGGER_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
 
 
+def get_trigger_type_cud_queue(name, routing_key, exclusive=False):
+    return Queue(name, TRIGGER_TYPE_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
+
+
 def get_trigger_instances_queue(name, routing_key):
     return Queue(name, TRIGGER_INSTANCE_XCHG, routing_key=routing_key)
 
 
 def get_sensor_cud_queue(name, routing_key):
     return Queue(name, SENSOR_CUD_XCHG, routing_key=routing_key)
+
+
+def get_rule_cud_queue(name, routing_key, exclusive=False):
+    return Queue(name, RULE_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
@@ -0,0 +1,348 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Message bus serializers.
+
+In addition to kombu's "pickle" serializer, this module registers the following serializers with
+kombu:
+
+* ``st2-json`` - compact JSON (``application/x-st2-json`` content type)
+* ``st2-msgpack`` - msgpack (``application/x-st2-msgpack`` content type), only available if the
+  ``msgpack`` Python package is installed
+
+Database models, API models and other known objects are encoded as plain dictionaries with a type
+tag and rebuilt on the consumer side. Serializer used by the publishers is controlled using
+``messaging.serializer`` config option. Consumers accept all the available serializers and kombu
+picks the correct decoder based on the message content type which means clusters with publishers
+using different serializers can coexist.
+"""
+
+from __future__ import absolute_import
+
+import datetime
+import importlib
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+import six
+from bson.objectid import ObjectId
+from kombu.serialization import register
+from mongoengine.base import BaseDocument
+from oslo_config import cfg
+
+from st2common.models.api.base import BaseAPI
+from st2common.models.api.trace import TraceContext
+from st2common.util import date as date_utils
+
+__all__ = [
+    'PICKLE_SERIALIZER',
+    'JSON_SERIALIZER',
+    'MSGPACK_SERIALIZER',
+
+    'register_serializers',
+    'get_available_serializers',
+    'get_serializer',
+    'get_accept_content',
+
+    'encode_json',
+    'decode_json',
+    'encode_msgpack',
+    'decode_msgpack'
+]
+
+PICKLE_SERIALIZER = 'pickle'
+JSON_SERIALIZER = 'st2-json'
+MSGPACK_SERIALIZER = 'st2-msgpack'
+
+JSON_CONTENT_TYPE = 'application/x-st2-json'
+MSGPACK_CONTENT_TYPE = 'application/x-st2-msgpack'
+
+# Name of the key which holds the type tag of an encoded object.
+# Note: Dictionaries in message payloads which use this key (e.g. user provided trigger payloads)
+# are escaped and encoded as a list of items so they are never mistaken for an encoded object.
+TYPE_KEY = '__st2_type__'
+
+TYPE_DB_MODEL = 'db'
+TYPE_OBJECT = 'obj'
+TYPE_DATETIME = 'datetime'
+TYPE_OBJECT_ID = 'oid'
+TYPE_SET = 'set'
+TYPE_ESCAPED_DICT = 'dict'
+
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+# Only classes from those modules can be rebuilt on the consumer side
+ALLOWED_DB_MODEL_MODULE_PREFIX = 'st2common.models.db.'
+ALLOWED_OBJECT_MODULE_PREFIXES = [
+    'st2common.models.api.'
+]
+
+# Cache of resolved classes - class path -> class
+_CLASSES_CACHE = {}
+
+
+def _get_class_path(obj):
+    cls = obj.__class__
+    return '%s.%s' % (cls.__module__, cls.__name__)
+
+
+def _get_class(class_path, base_class, allowed_module_prefixes):
+    cls = _CLASSES_CACHE.get(class_path, None)
+
+    if cls:
+        return cls
+
+    module_name, _, class_name = class_path.rpartition('.')
+
+    if not any([module_name.startswith(prefix) for prefix in allowed_module_prefixes]):
+        raise ValueError('Refusing to decode object of class "%s"' % (class_path))
+
+    module = importlib.import_module(module_name)
+    cls = getattr(module, class_name, None)
+
+    if not cls or not isinstance(cls, type) or not issubclass(cls, base_class):
+        raise ValueError('Refusing to decode object of class "%s"' % (class_path))
+
+    _CLASSES_CACHE[class_path] = cls
+    return cls
+
+
+def _encode_value(value):
+    """
+    Encode a value which is not natively supported by the serialization format.
+
+    Note: This function is used as a "default" hook for json and msgpack so it's only called for
+    non-native types. Returned value is serialized recursively.
+    """
+    if isinstance(value, BaseDocument):
+        return {
+            TYPE_KEY: TYPE_DB_MODEL,
+            'cls': _get_class_path(value),
+            'value': value.to_mongo()
+        }
+    elif isinstance(value, datetime.datetime):
+        if value.tzinfo:
+            value = date_utils.convert_to_utc(value)
+            has_tz = True
+        else:
+            has_tz = False
+
+        return {
+            TYPE_KEY: TYPE_DATETIME,
+            'value': value.strftime(DATETIME_FORMAT),
+            'tz': has_tz
+        }
+    elif isinstance(value, ObjectId):
+        return {
+            TYPE_KEY: TYPE_OBJECT_ID,
+            'value': str(value)
+        }
+    elif isinstance(value, (BaseAPI, TraceContext)):
+        return {
+            TYPE_KEY: TYPE_OBJECT,
+            'cls': _get_class_path(value),
+            'value': vars(value)
+        }
+    elif isinstance(value, (set, frozenset)):
+        return {
+            TYPE_KEY: TYPE_SET,
+            'value': list(value)
+        }
+
+    raise TypeError('Object of type "%s" is not serializable' % (type(value)))
+
+
+def _escape_value(value):
+    """
+    Escape dictionaries which contain the type tag key in the provided value.
+    """
+    if isinstance(value, dict):
+        if TYPE_KEY in value:
+            return {
+                TYPE_KEY: TYPE_ESCAPED_DICT,
+                'value': [[key, _escape_value(item)] for key, item in six.iteritems(value)]
+            }
+
+        return dict([(key, _escape_value(item)) for key, item in six.iteritems(value)])
+    elif isinstance(value, (list, tuple)):
+        return [_escape_value(item) for item in value]
+
+    return value
+
+
+class _ValueEncoder(object):
+    """
+    "default" hook which keeps track of the number of the type tags it has produced.
+    """
+
+    def __init__(self, escape=False):
+        self.escape = escape
+        self.tags_count = 0
+
+    def __call__(self, value):
+        result = _encode_value(value)
+        self.tags_count += 1
+
+        if self.escape:
+            result['value'] = _escape_value(result['value'])
+
+        return result
+
+
+def _encode(payload, dumps_func, type_key):
+    encoder = _ValueEncoder()
+    data = dumps_func(payload, encoder)
+
+    # Fast path - payload itself doesn't contain the type tag key so there is nothing to escape
+    if data.count(type_key) == encoder.tags_count:
+        return data
+
+    return dumps_func(_escape_value(payload), _ValueEncoder(escape=True))
+
+
+def _decode_value(value):
+    """
+    Rebuild an object encoded using ``_encode_value``.
+
+    Note: This function is used as an "object_hook" for json and msgpack so it's called bottom-up
+    for each decoded dictionary.
+    """
+    type_tag = value.get(TYPE_KEY, None)
+
+    if not type_tag:
+        return value
+
+    if type_tag == TYPE_DB_MODEL:
+        cls = _get_class(class_path=value['cls'], base_class=BaseDocument,
+                         allowed_module_prefixes=[ALLOWED_DB_MODEL_MODULE_PREFIX])
+        return cls._from_son(value['value'])
+    elif type_tag == TYPE_DATETIME:
+        result = datetime.datetime.strptime(value['value'], DATETIME_FORMAT)
+
+        if value.get('tz', False):
+            result = date_utils.add_utc_tz(result)
+
+        return result
+    elif type_tag == TYPE_OBJECT_ID:
+        return ObjectId(value['value'])
+    elif type_tag == TYPE_OBJECT:
+        cls = _get_class(class_path=value['cls'], base_class=(BaseAPI, TraceContext),
+                         allowed_module_prefixes=ALLOWED_OBJECT_MODULE_PREFIXES)
+
+        # Note: We bypass __init__ since the object attributes are restored as-is
+        result = cls.__new__(cls)
+        result.__dict__.update(value['value'])
+        return result
+    elif type_tag == TYPE_SET:
+        return set(value['value'])
+    elif type_tag == TYPE_ESCAPED_DICT:
+        return dict(value['value'])
+
+    raise ValueError('Unsupported type "%s"' % (type_tag))
+
+
+def _dumps_json(payload, default):
+    return json.dumps(payload, default=default, separators=(',', ':'))
+
+
+def _dumps_msgpack(payload, default):
+    return msgpack.packb(payload, default=default, use_bin_type=True)
+
+
+def encode_json(payload):
+    return _encode(payload, dumps_func=_dumps_json, type_key='"%s"' % (TYPE_KEY))
+
+
+def decode_json(data):
+    if isinstance(data, six.binary_type):
+        data = data.decode('utf-8')
+
+    return json.loads(data, object_hook=_decode_value)
+
+
+def encode_msgpack(payload):
+    return _encode(payload, dumps_func=_dumps_msgpack, type_key=TYPE_KEY.encode('utf-8'))
+
+
+def decode_msgpack(data):
+    return msgpack.unpackb(data, object_hook=_decode_value, raw=False)
+
+
+def register_serializers():
+    """
+    Register StackStorm serializers with kombu.
+    """
+    register(JSON_SERIALIZER, encode_json, decode_json, content_type=JSON_CONTENT_TYPE,
+             content_encoding='utf-8')
+
+    if msgpack:
+        register(MSGPACK_SERIALIZER, encode_msgpack, decode_msgpack,
+                 content_type=MSGPACK_CONTENT_TYPE, content_encoding='binary')
+
+
+def get_available_serializers():
+    """
+    Return names of all the serializers which are available in this environment.
+
+    :rtype: ``list`` of ``str``
+    """
+    result = [PICKLE_SERIALIZER, JSON_SERIALIZER]
+
+    if msgpack:
+        result.append(MSGPACK_SERIALIZER)
+
+    return result
+
+
+def get_serializer():
+    """
+    Return name of the serializer which should be used by the publishers.
+
+    :rtype: ``str``
+    """
+    serializer = cfg.CONF.messaging.serializer
+
+    if serializer not in get_available_serializers():
+        if serializer == MSGPACK_SERIALIZER:
+            msg = ('Serializer "%s" requires "msgpack" Python package to be installed' %
+                   (serializer))
+        else:
+            msg = ('Invalid serializer "%s". Valid serializers are: %s' %
+                   (serializer, ', '.join(get_available_serializers())))
+
+        raise ValueError(msg)
+
+    return serializer
+
+
+def get_accept_content():
+    """
+    Return a list of serializers which are accepted by the consumers.
+
+    :rtype: ``list`` of ``str``
+    """
+    return get_available_serializers()
+
+
+register_serializers()
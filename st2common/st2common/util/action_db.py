@@ -29,12 +29,14 @@ from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.persistence.action import Action
 from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.runner import RunnerType
+from st2common.util.secrets import get_secret_parameters
 
 LOG = logging.getLogger(__name__)
 
 
 __all__ = [
     'get_action_parameters_specs',
+    'get_action_secret_parameters',
     'get_runnertype_by_id',
     'get_runnertype_by_name',
     'get_action_by_id',
@@ -46,7 +48,7 @@ __all__ = [
 ]
 
 
-def get_action_parameters_specs(action_ref):
+def get_action_parameters_specs(action_ref, use_cache=False):
     """
     Retrieve parameters specifications schema for the provided action reference.
 
@@ -55,16 +57,25 @@ def get_action_parameters_specs(action_ref):
     :param action_ref: Action reference.
     :type action_ref: ``str``
 
+    :param use_cache: True to use the action metadata cache.
+    :type use_cache: ``bool``
+
     :rtype: ``dict``
     """
-    action_db = get_action_by_ref(ref=action_ref)
+    metadata_cache = _get_metadata_cache() if use_cache else None
+
+    if metadata_cache:
+        parameters, _ = metadata_cache.get_parameters(ref=action_ref)
+        return dict(parameters)
+
+    action_db = get_action_by_ref(ref=action_ref, use_cache=False)
 
     parameters = {}
     if not action_db:
         return parameters
 
     runner_type_name = action_db.runner_type['name']
-    runner_type_db = get_runnertype_by_name(runnertype_name=runner_type_name)
+    runner_type_db = get_runnertype_by_name(runnertype_name=runner_type_name, use_cache=False)
 
     # Runner type parameters should be added first before the action parameters.
     parameters.update(runner_type_db['runner_parameters'])
@@ -73,6 +84,28 @@ def get_action_parameters_specs(action_ref):
     return parameters
 
 
+def get_action_secret_parameters(action_ref, use_cache=False):
+    """
+    Retrieve names of the action and action runner parameters which are marked as secret.
+
+    :param action_ref: Action reference.
+    :type action_ref: ``str``
+
+    :param use_cache: True to use the action metadata cache.
+    :type use_cache: ``bool``
+
+    :rtype: ``list``
+    """
+    metadata_cache = _get_metadata_cache() if use_cache else None
+
+    if metadata_cache:
+        _, secret_parameters = metadata_cache.get_parameters(ref=action_ref)
+        return secret_parameters
+
+    parameters = get_action_parameters_specs(action_ref=action_ref, use_cache=False)
+    return get_secret_parameters(parameters=parameters)
+
+
 def get_runnertype_by_id(runnertype_id):
     """
         Get RunnerType by id.
@@ -90,11 +123,20 @@ def get_runnertype_by_id(runnertype_id):
     return runnertype
 
 
-def get_runnertype_by_name(runnertype_name):
+def get_runnertype_by_name(runnertype_name, use_cache=False):
     """
         Get an runnertype by name.
         On error, raise ST2ObjectNotFoundError.
+
+        Note: Object returned from the cache (use_cache=True) is shared and must not be modified.
+        Cache starts a watcher thread so it should only be used by the services which execute
+        actions.
     """
+    metadata_cache = _get_metadata_cache() if use_cache else None
+
+    if metadata_cache:
+        return metadata_cache.get_runner_type(name=runnertype_name)
+
     try:
         runnertypes = RunnerType.query(name=runnertype_name)
     except (ValueError, ValidationError) as e:
@@ -133,15 +175,26 @@ def get_action_by_id(action_id):
     return action
 
 
-def get_action_by_ref(ref):
+def get_action_by_ref(ref, use_cache=False):
     """
     Returns the action object from db given a string ref.
 
+    Note: Object returned from the cache is shared and must not be modified. Cache starts a
+    watcher thread so it should only be used by the services which execute actions.
+
     :param ref: Reference to the trigger type db object.
     :type ref: ``str``
 
+    :param use_cache: True to use the action metadata cache.
+    :type use_cache: ``bool``
+
     :rtype action: ``object``
     """
+    metadata_cache = _get_metadata_cache() if use_cache else None
+
+    if metadata_cache:
+        return metadata_cache.get_action(ref=ref)
+
     try:
         return Action.get_by_ref(ref)
     except ValueError as e:
@@ -305,3 +358,9 @@ def _get_position_arg_dict(action_parameters, action_db):
                 args_dict[pos] = param
     args_dict = OrderedDict(sorted(args_dict.items()))
     return args_dict
+
+
+def _get_metadata_cache():
+    # Note: Import is here to avoid circular import since the cache uses functions from this module
+    from st2common.services import action_metadata
+    return action_metadata.get_metadata_cache()
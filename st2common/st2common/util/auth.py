@@ -19,8 +19,8 @@ import os
 import random
 
 from st2common import log as logging
-from st2common.persistence.auth import Token, ApiKey
 from st2common.exceptions import auth as exceptions
+from st2common.services import auth_cache
 from st2common.util import date as date_utils
 from st2common.util import hash as hash_utils
 
@@ -45,7 +45,7 @@ def validate_token(token_string):
     :return: TokenDB object on success.
     :rtype: :class:`.TokenDB`
     """
-    token = Token.get(token_string)
+    token = auth_cache.get_token(token_string)
 
     if token.expiry <= date_utils.get_datetime_utc_now():
         # TODO: purge expired tokens
@@ -115,7 +115,7 @@ def validate_api_key(api_key):
     :return: TokenDB object on success.
     :rtype: :class:`.ApiKeyDB`
     """
-    api_key_db = ApiKey.get(api_key)
+    api_key_db = auth_cache.get_api_key(api_key)
 
     if not api_key_db.enabled:
         raise exceptions.ApiKeyDisabledError('API key is disabled.')
@@ -0,0 +1,146 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Simple in-process caches.
+"""
+
+import time
+from collections import OrderedDict
+
+__all__ = [
+    'TTLCache'
+]
+
+
+class TTLCache(object):
+    """
+    Bounded cache where each item expires after a configured number of seconds.
+
+    When the cache is full, the least recently used item is evicted. The cache keeps hit and miss
+    counters which can be used to judge the cache effectiveness.
+    """
+
+    def __init__(self, max_size, ttl):
+        """
+        :param max_size: Maximum number of items in the cache.
+        :type max_size: ``int``
+
+        :param ttl: Number of seconds after which an item expires. 0 means items never expire.
+        :type ttl: ``float``
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+        # key -> (expire timestamp, value)
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return self._get_item(key=key) is not None
+
+    def get(self, key, default=None):
+        item = self._get_item(key=key)
+
+        if item is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+
+        # Mark the item as the most recently used one
+        del self._items[key]
+        self._items[key] = item
+
+        return item[1]
+
+    def set(self, key, value, ttl=None):
+        """
+        :param ttl: Number of seconds after which this item expires. Defaults to the cache TTL.
+        :type ttl: ``float``
+        """
+        self._items.pop(key, None)
+
+        while self._items and len(self._items) >= self.max_size:
+            self._items.popitem(last=False)
+
+        ttl = self.ttl if ttl is None else ttl
+        expire_timestamp = (time.time() + ttl) if ttl else None
+        self._items[key] = (expire_timestamp, value)
+
+    def get_or_set(self, key, func):
+        """
+        Return the cached item or call the provided function and cache the returned value if the
+        item is not in the cache or it has expired.
+        """
+        item = self._get_item(key=key)
+
+        if item is not None:
+            self.hits += 1
+
+            del self._items[key]
+            self._items[key] = item
+
+            return item[1]
+
+        self.misses += 1
+
+        value = func()
+        self.set(key, value)
+        return value
+
+    def delete(self, key):
+        self._items.pop(key, None)
+
+    def delete_matching(self, func):
+        """
+        Remove all the items for which the provided function returns True when called with the
+        item key.
+        """
+        for key in [key for key in self._items.keys() if func(key)]:
+            del self._items[key]
+
+    def clear(self):
+        self._items.clear()
+
+    def get_stats(self):
+        """
+        :rtype: ``dict``
+        """
+        return {
+            'size': len(self._items),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def _get_item(self, key):
+        item = self._items.get(key, None)
+
+        if item is None:
+            return None
+
+        expire_timestamp = item[0]
+
+        if expire_timestamp is not None and expire_timestamp <= time.time():
+            del self._items[key]
+            return None
+
+        return item
@@ -20,11 +20,19 @@ File system related utility functions.
 import os
 import os.path
 import fnmatch
+import hashlib
+
+from st2common.util.cache import TTLCache
 
 __all__ = [
-    'get_file_list'
+    'get_file_list',
+    'get_content_hash'
 ]
 
+# Maps the stat signature of the hashed files to the content hash so the files are only read
+# again when they have changed
+_CONTENT_HASH_CACHE = TTLCache(max_size=500, ttl=3600)
+
 
 def get_file_list(directory, exclude_patterns=None):
     """
@@ -69,3 +77,57 @@ def get_file_list(directory, exclude_patterns=None):
                 result.append(file_path)
 
     return result
+
+
+def get_content_hash(paths):
+    """
+    Return SHA256 hash of the content of the provided files and directories.
+
+    Hash includes file names (relative to the provided paths), permission bits, sizes and file
+    contents so it changes when any of the files is added, removed, renamed, modified or made
+    executable.
+
+    :param paths: List of file and directory paths.
+    :type paths: ``list``
+
+    :rtype: ``str``
+    """
+    files = []
+
+    for path in paths:
+        base_path = os.path.dirname(os.path.normpath(path))
+
+        if os.path.isdir(path):
+            for (dirpath, dirnames, filenames) in os.walk(path):
+                dirnames.sort()
+
+                for filename in sorted(filenames):
+                    file_path = os.path.join(dirpath, filename)
+                    files.append((os.path.relpath(file_path, base_path), file_path))
+        else:
+            files.append((os.path.relpath(path, base_path), path))
+
+    signature = []
+
+    for name, file_path in files:
+        stat = os.stat(file_path)
+        signature.append((name, file_path, stat.st_size, stat.st_mtime, stat.st_mode))
+
+    signature = tuple(signature)
+    content_hash = _CONTENT_HASH_CACHE.get(signature)
+
+    if content_hash:
+        return content_hash
+
+    sha256 = hashlib.sha256()
+
+    for (name, file_path, size, _, mode) in signature:
+        sha256.update('%s\0%o\0%s\0' % (name, mode & 0o7777, size))
+
+        with open(file_path, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(65536), b''):
+                sha256.update(chunk)
+
+    content_hash = sha256.hexdigest()
+    _CONTENT_HASH_CACHE.set(signature, content_hash)
+    return content_hash
@@ -18,11 +18,16 @@ import re
 import six
 
 from st2common import log as logging
+from st2common.util.cache import TTLCache
 from st2common.util.compat import to_unicode
 
 
 __all__ = [
     'get_jinja_environment',
+    'get_shared_jinja_environment',
+    'get_template',
+    'render_template_string',
+    'get_template_cache_stats',
     'render_values',
     'is_jinja_expression'
 ]
@@ -40,6 +45,26 @@ JINJA_REGEX_PTRN = re.compile(JINJA_REGEX)
 JINJA_BLOCK_REGEX = '({%(.*)%})'
 JINJA_BLOCK_REGEX_PTRN = re.compile(JINJA_BLOCK_REGEX)
 
+# Line endings which are normalized by Jinja
+NEWLINE_REGEX_PTRN = re.compile(r'\r\n|\r|\n')
+
+# Other line boundaries recognized by unicode.splitlines() which are handled differently by
+# different Jinja versions
+OTHER_LINE_BOUNDARIES_REGEX_PTRN = re.compile(u'[\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+# Maximum number of compiled templates which are cached per process
+TEMPLATE_CACHE_MAX_SIZE = 2000
+
+# allow_undefined -> shared jinja2.Environment
+_SHARED_ENVIRONMENTS = {}
+
+# (template source, allow_undefined) -> compiled jinja2.Template. Least recently used templates are
+# evicted first.
+_TEMPLATE_CACHE = TTLCache(max_size=TEMPLATE_CACHE_MAX_SIZE, ttl=0)
+
+# Number of strings which have been returned as-is because they contain no Jinja syntax
+_PLAIN_STRING_RENDERS = [0]
+
 
 LOG = logging.getLogger(__name__)
 
@@ -120,6 +145,72 @@ def get_jinja_environment(allow_undefined=False, trim_blocks=True, lstrip_blocks
     return env
 
 
+def get_shared_jinja_environment(allow_undefined=False):
+    """
+    Return a process-wide jinja2.Environment which is shared by all the code which renders
+    templates.
+
+    Note: The returned environment must not be modified. Use get_jinja_environment() if a
+    customized environment is needed.
+    """
+    env = _SHARED_ENVIRONMENTS.get(allow_undefined, None)
+
+    if not env:
+        env = get_jinja_environment(allow_undefined=allow_undefined)
+        _SHARED_ENVIRONMENTS[allow_undefined] = env
+
+    return env
+
+
+def get_template(source, allow_undefined=False):
+    """
+    Return a compiled template for the provided source. Compiled templates are cached and
+    re-used.
+
+    :rtype: ``jinja2.Template``
+    """
+    key = (source, allow_undefined)
+    env = get_shared_jinja_environment(allow_undefined=allow_undefined)
+    return _TEMPLATE_CACHE.get_or_set(key, lambda: env.from_string(source))
+
+
+def render_template_string(source, context, allow_undefined=False):
+    """
+    Render the provided template string using a cached compiled template.
+
+    Strings which contain no Jinja syntax are not passed to Jinja at all.
+
+    :rtype: ``unicode``
+    """
+    if _is_plain_string(source):
+        _PLAIN_STRING_RENDERS[0] += 1
+
+        # Same line ending normalization as performed by Jinja which also removes a single
+        # trailing newline (keep_trailing_newline is disabled)
+        result = NEWLINE_REGEX_PTRN.sub(u'\n', to_unicode(source))
+        return result[:-1] if result.endswith(u'\n') else result
+
+    template = get_template(source=source, allow_undefined=allow_undefined)
+    return template.render(context)
+
+
+def get_template_cache_stats():
+    """
+    Return statistics which can be used to judge the template cache effectiveness.
+
+    :rtype: ``dict``
+    """
+    stats = _TEMPLATE_CACHE.get_stats()
+    stats['plain_strings'] = _PLAIN_STRING_RENDERS[0]
+    return stats
+
+
+def _is_plain_string(source):
+    # All the Jinja delimiters start with "{"
+    return (isinstance(source, six.string_types) and '{' not in source and
+            not OTHER_LINE_BOUNDARIES_REGEX_PTRN.search(source))
+
+
 def render_values(mapping=None, context=None, allow_undefined=False):
     """
     Render an incoming mapping using context provided in context using Jinja2. Returns a dict
@@ -144,7 +235,6 @@ def render_values(mapping=None, context=None, allow_undefined=False):
     super_context['__context'] = context
     super_context.update(context)
 
-    env = get_jinja_environment(allow_undefined=allow_undefined)
     rendered_mapping = {}
     for k, v in six.iteritems(mapping):
         # jinja2 works with string so transform list and dict to strings.
@@ -162,7 +252,8 @@ def render_values(mapping=None, context=None, allow_undefined=False):
 
         try:
             LOG.info('Rendering string %s. Super context=%s', v, super_context)
-            rendered_v = env.from_string(v).render(super_context)
+            rendered_v = render_template_string(v, context=super_context,
+                                                allow_undefined=allow_undefined)
         except Exception as e:
             # Attach key and value which failed the rendering
             e.key = k
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+# Note: simplejson ships C accelerated encoder and decoder and is used when it's available
 try:
     import simplejson as json
     from simplejson import JSONEncoder
@@ -25,10 +26,16 @@ import six
 
 __all__ = [
     'json_encode',
+    'json_encode_iter',
     'json_loads',
-    'try_loads'
+    'try_loads',
+
+    'JSON_BACKEND'
 ]
 
+# Name of the library which is used for JSON encoding and decoding
+JSON_BACKEND = json.__name__
+
 
 class GenericJSON(JSONEncoder):
     def default(self, obj):  # pylint: disable=method-hidden
@@ -38,10 +45,39 @@ class GenericJSON(JSONEncoder):
             return JSONEncoder.default(self, obj)
 
 
-def json_encode(obj, indent=4):
+# Note: C accelerated encoder is only used when no indentation is requested
+COMPACT_ENCODER = GenericJSON(separators=(',', ':'))
+
+
+def json_encode(obj, indent=None):
+    """
+    Serialize object to a JSON string.
+
+    By default, the output is compact. Pass ``indent`` to produce a pretty-printed document which is
+    larger and slower to produce.
+    """
+    if indent is None:
+        return COMPACT_ENCODER.encode(obj)
+
     return json.dumps(obj, cls=GenericJSON, indent=indent)
 
 
+def json_encode_iter(items):
+    """
+    Serialize iterable to a compact JSON array, one item at a time.
+
+    :rtype: ``generator`` of ``str``
+    """
+    yield '['
+
+    separator = ''
+    for item in items:
+        yield separator + COMPACT_ENCODER.encode(item)
+        separator = ','
+
+    yield ']'
+
+
 def load_file(path):
     with open(path, 'r') as fd:
         return json.load(fd)
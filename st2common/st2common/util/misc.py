@@ -22,6 +22,7 @@ import six
 __all__ = [
     'prefix_dict_keys',
     'compare_path_file_name',
+    'get_field_value',
     'lowercase_value'
 ]
 
@@ -148,3 +149,20 @@ def lowercase_value(value):
         result = value
 
     return result
+
+
+def get_field_value(instance, field_name):
+    """
+    Retrieve value of a (dot delimited) field from the provided object or dictionary.
+
+    None is returned if any of the fields on the path doesn't exist.
+    """
+    value = instance
+
+    for part in field_name.split('.'):
+        if isinstance(value, dict):
+            value = value.get(part, None)
+        else:
+            value = getattr(value, part, None)
+
+    return value
@@ -13,8 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
+"""
+Escaping of the dictionary keys which contain characters which are not allowed in MongoDB keys.
+
+Documents are translated in a single pass and only the dictionaries and lists which contain keys
+which need to be translated are copied. Sub-trees which don't contain any such keys are returned
+as-is which means the result can share objects with the provided value.
+"""
+
+from collections import OrderedDict
+
 import six
+from bson.son import SON
+
+__all__ = [
+    'escape_chars',
+    'unescape_chars'
+]
 
 # http://docs.mongodb.org/manual/faq/developers/#faq-dollar-sign-escaping
 UNESCAPED = ['.', '$']
@@ -30,49 +45,94 @@ RULE_CRITERIA_ESCAPE_TRANSLATION = dict(zip(RULE_CRITERIA_UNESCAPED,
 RULE_CRITERIA_UNESCAPE_TRANSLATION = dict(zip(RULE_CRITERIA_ESCAPED,
                                               RULE_CRITERIA_UNESCAPED))
 
+# Translations which are applied in a single pass
+_ESCAPE_ITEMS = list(ESCAPE_TRANSLATION.items())
+_UNESCAPE_ITEMS = (list(UNESCAPE_TRANSLATION.items()) +
+                   list(RULE_CRITERIA_UNESCAPE_TRANSLATION.items()))
 
-def _prep_work_items(d):
-    return [(k, v, d) for k, v in six.iteritems(d)]
 
+def _translate_key(key, translation_items):
+    """
+    Translate the provided key. The same object is returned if the key doesn't contain any of the
+    characters which need to be translated.
+    """
+    if not isinstance(key, six.string_types):
+        return key
 
-def _translate_chars(field, translation):
-    # Only translate the fields of a dict
-    if not isinstance(field, dict):
-        return field
+    for old, new in translation_items:
+        if old in key:
+            key = key.replace(old, new)
 
-    work_items = _prep_work_items(field)
+    return key
 
-    while len(work_items) > 0:
-        work_item = work_items.pop(0)
-        oldkey = work_item[0]
-        value = work_item[1]
-        work_field = work_item[2]
-        newkey = oldkey
 
-        for t_k, t_v in six.iteritems(translation):
-            newkey = newkey.replace(t_k, t_v)
+def _copy_empty(value):
+    # Preserve ordering of the ordered dictionaries
+    if isinstance(value, (OrderedDict, SON)):
+        return value.__class__()
 
-        if newkey != oldkey:
-            work_field[newkey] = value
-            del work_field[oldkey]
+    return {}
+
+
+def _translate_dict(field, translation_items):
+    result = None
+
+    for key, value in six.iteritems(field):
+        new_key = _translate_key(key, translation_items)
 
         if isinstance(value, dict):
-            work_items.extend(_prep_work_items(value))
+            new_value = _translate_dict(value, translation_items)
         elif isinstance(value, list):
-            for item in value:
-                if isinstance(item, dict):
-                    work_items.extend(_prep_work_items(item))
+            new_value = _translate_list(value, translation_items)
+        else:
+            new_value = value
+
+        if result is None and (new_key is not key or new_value is not value):
+            # First change in this dictionary, copy the items which have been processed so far
+            result = _copy_empty(field)
+
+            for processed_key, processed_value in six.iteritems(field):
+                if processed_key is key:
+                    break
+
+                result[processed_key] = processed_value
+
+        if result is not None:
+            result[new_key] = new_value
+
+    return field if result is None else result
+
+
+def _translate_list(field, translation_items):
+    result = None
+
+    for index, item in enumerate(field):
+        # Note: Only dictionaries which are direct list items are translated
+        if not isinstance(item, dict):
+            continue
+
+        new_item = _translate_dict(item, translation_items)
+
+        if new_item is not item:
+            if result is None:
+                result = list(field)
+
+            result[index] = new_item
+
+    return field if result is None else result
+
+
+def _translate_chars(field, translation_items):
+    # Only translate the fields of a dict
+    if not isinstance(field, dict):
+        return field
 
-    return field
+    return _translate_dict(field, translation_items)
 
 
 def escape_chars(field):
-    value = copy.deepcopy(field)
-    return _translate_chars(value, ESCAPE_TRANSLATION)
+    return _translate_chars(field, _ESCAPE_ITEMS)
 
 
 def unescape_chars(field):
-    value = copy.deepcopy(field)
-    translated = _translate_chars(value, UNESCAPE_TRANSLATION)
-    translated = _translate_chars(value, RULE_CRITERIA_UNESCAPE_TRANSLATION)
-    return translated
+    return _translate_chars(field, _UNESCAPE_ITEMS)
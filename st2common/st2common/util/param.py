@@ -29,10 +29,11 @@ from st2common.services.keyvalues import KeyValueLookup
 from st2common.util.casts import get_cast
 from st2common.util.compat import to_unicode
 from st2common.util import jinja as jinja_utils
+from st2common.util import templating as templating_utils
 
 
 LOG = logging.getLogger(__name__)
-ENV = jinja_utils.get_jinja_environment()
+ENV = jinja_utils.get_shared_jinja_environment()
 
 __all__ = [
     'render_live_params',
@@ -171,7 +172,8 @@ def _render(node, render_context):
 
         LOG.debug('Rendering node: %s with context: %s', node, render_context)
 
-        result = ENV.from_string(str(node['template'])).render(render_context)
+        result = jinja_utils.render_template_string(str(node['template']),
+                                                    context=render_context)
 
         LOG.debug('Render complete: %s', result)
 
@@ -184,6 +186,16 @@ def _render(node, render_context):
         return node['value']
 
 
+def _prefetch_datastore_values(G):
+    '''
+    Retrieve values of all the datastore keys referenced in the templates with a single query
+    '''
+    templates = [G.node[name]['template'] for name in G.nodes() if
+                 isinstance(G.node[name].get('template', None), six.string_types)]
+    templating_utils.prefetch_datastore_values(values=templates,
+                                               lookups=G.node[DATASTORE_PARENT_SCOPE]['value'])
+
+
 def _resolve_dependencies(G):
     '''
     Traverse the dependency graph starting from resolved nodes
@@ -228,6 +240,7 @@ def render_live_params(runner_parameters, action_parameters, params, action_cont
     [_process(G, name, value) for name, value in six.iteritems(params)]
     _process_defaults(G, [action_parameters, runner_parameters])
     _validate(G)
+    _prefetch_datastore_values(G)
 
     context = _resolve_dependencies(G)
     live_params = _cast_params_from(params, context, [action_parameters, runner_parameters])
@@ -249,6 +262,7 @@ def render_final_params(runner_parameters, action_parameters, params, action_con
     [G.add_node(name, value=value) for name, value in six.iteritems(params)]
     _process_defaults(G, [action_parameters, runner_parameters])
     _validate(G)
+    _prefetch_datastore_values(G)
 
     context = _resolve_dependencies(G)
     context = _cast_params_from(context, context, [action_parameters, runner_parameters])
@@ -38,7 +38,9 @@ __all__ = [
     'is_property_nullable',
     'is_attribute_type_array',
     'is_attribute_type_object',
-    'validate'
+    'validate',
+
+    'SchemaValidator'
 ]
 
 # https://github.com/json-schema/json-schema/blob/master/draft-04/schema
@@ -295,6 +297,43 @@ def validate(instance, schema, cls=None, use_default=True, allow_default_none=Fa
     return instance
 
 
+class SchemaValidator(object):
+    """
+    Validator for a particular schema.
+
+    The schema is prepared and checked once when the validator is instantiated so validating an
+    instance is cheaper than calling validate() with the same arguments, but it has the same
+    result.
+    """
+
+    def __init__(self, schema, cls=None, use_default=True, allow_default_none=False):
+        if use_default and allow_default_none:
+            schema = modify_schema_allow_default_none(schema=schema)
+
+        if cls is None:
+            cls = jsonschema.validators.validator_for(schema)
+
+        cls.check_schema(schema)
+
+        self.schema = schema
+        self.use_default = use_default
+        self._validator = cls(schema)
+
+    def validate(self, instance):
+        """
+        Validate the provided instance and return cleaned instance with default values assigned.
+        """
+        instance = copy.deepcopy(instance)
+
+        if (self.use_default and self.schema.get('type', None) == 'object' and
+                isinstance(instance, dict)):
+            instance = assign_default_values(instance=instance, schema=self.schema)
+
+        self._validator.validate(instance)
+
+        return instance
+
+
 VALIDATORS = {
     'draft4': jsonschema.Draft4Validator,
     'custom': CustomValidator
@@ -321,14 +360,21 @@ def validate_runner_parameter_attribute_override(action_ref, param_name, attr_na
     return True
 
 
-def get_schema_for_action_parameters(action_db):
+def get_schema_for_action_parameters(action_db, runnertype_db=None):
     """
     Dynamically construct JSON schema for the provided action from the parameters metadata.
 
     Note: This schema is used to validate parameters which are passed to the action.
+
+    :param runnertype_db: Optional runner type of the action. If not provided, it's retrieved
+                          from the database.
+    :type runnertype_db: :class:`RunnerTypeDB`
     """
-    from st2common.util.action_db import get_runnertype_by_name
-    runner_type = get_runnertype_by_name(action_db.runner_type['name'])
+    runner_type = runnertype_db
+
+    if not runner_type:
+        from st2common.util.action_db import get_runnertype_by_name
+        runner_type = get_runnertype_by_name(action_db.runner_type['name'])
 
     # Note: We need to perform a deep merge because user can only specify a single parameter
     # attribute when overriding it in an action metadata.
@@ -13,21 +13,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import time
+
 import pkg_resources
 
+from flex.core import validate
 import jinja2
+import six
 import yaml
 
 import st2common.constants.pack
 import st2common.constants.action
+from st2common import log as logging
 from st2common.rbac.types import PermissionType
 from st2common.util import isotime
 
 __all__ = [
     'load_spec',
+    'load_compiled_spec',
     'generate_spec'
 ]
 
+LOG = logging.getLogger(__name__)
+
 ARGUMENTS = {
     'DEFAULT_PACK_NAME': st2common.constants.pack.DEFAULT_PACK_NAME,
     'LIVEACTION_STATUSES': st2common.constants.action.LIVEACTION_STATUSES,
@@ -43,8 +57,123 @@ def load_spec(module_name, spec_file):
     return spec
 
 
+def load_compiled_spec(module_name, spec_file, cache_dir=None):
+    """
+    Load rendered, parsed and validated spec.
+
+    If ``cache_dir`` is provided, compiled spec is stored in this directory on the first use and
+    loaded from there on subsequent uses so the template doesn't need to be rendered, parsed and
+    validated again. Name of the cached file is derived from the content of the template and the
+    template arguments so a stale spec is never used.
+
+    :param cache_dir: Directory where the compiled spec is cached or None to disable the cache.
+    :type cache_dir: ``str``
+
+    :rtype: ``dict``
+    """
+    start_time = time.time()
+
+    spec_template = pkg_resources.resource_string(module_name, spec_file)
+
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, '%s.%s.marshal' % (spec_file,
+                                                                _get_spec_hash(spec_template)))
+        spec = _read_compiled_spec(cache_path=cache_path)
+
+        if spec is not None:
+            LOG.info('Loaded compiled API spec "%s" from "%s" in %.3fs.', spec_file, cache_path,
+                     time.time() - start_time)
+            return spec
+
+    timings = []
+
+    spec_string = jinja2.Template(spec_template).render(**ARGUMENTS)
+    timings.append(('render', time.time()))
+
+    spec = yaml.load(spec_string)
+    timings.append(('parse', time.time()))
+
+    validate(copy.deepcopy(spec))
+    timings.append(('validate', time.time()))
+
+    if cache_dir:
+        _write_compiled_spec(cache_path=cache_path, spec=spec)
+        timings.append(('cache write', time.time()))
+
+    phases = []
+    for (name, end_time) in timings:
+        phases.append('%s: %.3fs' % (name, end_time - start_time))
+        start_time = end_time
+
+    LOG.info('Loaded API spec "%s" (%s).', spec_file, ', '.join(phases))
+
+    return spec
+
+
 def generate_spec(module_name, spec_file):
     spec_template = pkg_resources.resource_string(module_name, spec_file)
     spec_string = jinja2.Template(spec_template).render(**ARGUMENTS)
 
     return spec_string
+
+
+def _get_spec_hash(spec_template):
+    """
+    Return hash of the spec template, template arguments and the serialization format.
+    """
+    arguments = []
+    for (name, value) in sorted(six.iteritems(ARGUMENTS)):
+        if isinstance(value, type):
+            # Only the class attributes which can be referenced in the template are relevant
+            value = sorted([(key, item) for (key, item) in six.iteritems(vars(value))
+                            if not key.startswith('_') and
+                            isinstance(item, six.string_types)])
+
+        arguments.append((name, value))
+
+    result = hashlib.sha256()
+    result.update(spec_template)
+    result.update(repr(arguments))
+    result.update('%s %s' % (sys.version, marshal.version))
+    return result.hexdigest()
+
+
+def _read_compiled_spec(cache_path):
+    if not os.path.isfile(cache_path):
+        return None
+
+    try:
+        with open(cache_path, 'rb') as fp:
+            spec = marshal.loads(fp.read())
+    except (IOError, OSError, EOFError, ValueError, TypeError) as e:
+        LOG.warning('Failed to read compiled API spec from "%s": %s', cache_path, str(e))
+        return None
+
+    if not isinstance(spec, dict):
+        LOG.warning('Compiled API spec "%s" is not valid, ignoring it.', cache_path)
+        return None
+
+    return spec
+
+
+def _write_compiled_spec(cache_path, spec):
+    cache_dir = os.path.dirname(cache_path)
+    temp_path = None
+
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+        # Note: Spec is written to a temporary file first so a different process never reads
+        # partially written spec
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix='.tmp-')
+
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(marshal.dumps(spec))
+
+        os.rename(temp_path, cache_path)
+    except (IOError, OSError, ValueError) as e:
+        LOG.warning('Failed to write compiled API spec to "%s": %s', cache_path, str(e))
+
+        if temp_path and os.path.isfile(temp_path):
+            os.unlink(temp_path)
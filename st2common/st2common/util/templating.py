@@ -15,7 +15,10 @@
 
 import six
 
-from st2common.util.jinja import get_jinja_environment
+from st2common.util.cache import TTLCache
+from st2common.util.jinja import get_shared_jinja_environment
+from st2common.util.jinja import is_jinja_expression
+from st2common.util.jinja import render_template_string
 from st2common.constants.keyvalue import DATASTORE_PARENT_SCOPE
 from st2common.constants.keyvalue import SYSTEM_SCOPE, FULL_SYSTEM_SCOPE
 from st2common.constants.keyvalue import USER_SCOPE, FULL_USER_SCOPE
@@ -25,9 +28,14 @@ from st2common.services.keyvalues import UserKeyValueLookup
 __all__ = [
     'render_template',
     'render_template_with_system_context',
-    'render_template_with_system_and_user_context'
+    'render_template_with_system_and_user_context',
+    'prefetch_datastore_values',
+    'get_datastore_key_references'
 ]
 
+# template string -> datastore keys referenced in the template
+_DATASTORE_REFERENCES = TTLCache(max_size=2000, ttl=0)
+
 
 def render_template(value, context=None):
     """
@@ -42,9 +50,7 @@ def render_template(value, context=None):
     assert isinstance(value, six.string_types)
     context = context or {}
 
-    env = get_jinja_environment(allow_undefined=False)  # nosec
-    template = env.from_string(value)
-    rendered = template.render(context)
+    rendered = render_template_string(value, context=context, allow_undefined=False)  # nosec
 
     return rendered
 
@@ -68,6 +74,7 @@ def render_template_with_system_context(value, context=None, prefix=None):
     context[DATASTORE_PARENT_SCOPE] = {
         SYSTEM_SCOPE: KeyValueLookup(prefix=prefix, scope=FULL_SYSTEM_SCOPE)
     }
+    prefetch_datastore_values(values=[value], lookups=context[DATASTORE_PARENT_SCOPE])
 
     rendered = render_template(value=value, context=context)
     return rendered
@@ -96,6 +103,96 @@ def render_template_with_system_and_user_context(value, user, context=None, pref
         SYSTEM_SCOPE: KeyValueLookup(prefix=prefix, scope=FULL_SYSTEM_SCOPE),
         USER_SCOPE: UserKeyValueLookup(prefix=prefix, user=user, scope=FULL_USER_SCOPE)
     }
+    prefetch_datastore_values(values=[value], lookups=context[DATASTORE_PARENT_SCOPE])
 
     rendered = render_template(value=value, context=context)
     return rendered
+
+
+def prefetch_datastore_values(values, lookups):
+    """
+    Retrieve values of all the datastore keys which are referenced in the provided templates
+    using a single query per scope.
+
+    :param values: Template strings.
+    :type values: ``list``
+
+    :param lookups: Scope (system, user) to datastore lookup map.
+    :type lookups: ``dict``
+    """
+    references = set()
+
+    for value in values:
+        references.update(get_datastore_key_references(value))
+
+    for scope, lookup in six.iteritems(lookups):
+        names = [name for reference_scope, name in references if reference_scope == scope]
+
+        # Only the datastore lookups support prefetching, other objects are left as-is
+        if names and hasattr(lookup, 'prefetch'):
+            lookup.prefetch(names=names)
+
+
+def get_datastore_key_references(value):
+    """
+    Return datastore keys which are referenced in the provided template (e.g.
+    ``{{ st2kv.system.key }}``).
+
+    Note: For nested lookups such as ``st2kv.system.a.b`` both "a" and "a.b" are returned since
+    both of them are looked up.
+
+    :return: List of (scope, key name) tuples.
+    :rtype: ``list``
+    """
+    if not is_jinja_expression(value):
+        return []
+
+    return _DATASTORE_REFERENCES.get_or_set(value, lambda: _get_datastore_key_references(value))
+
+
+def _get_datastore_key_references(value):
+    # Late import to avoid very expensive in-direct import when this function is not used
+    from jinja2 import nodes
+
+    try:
+        template_ast = get_shared_jinja_environment().parse(value)
+    except Exception:
+        # Invalid template, error is reported on render
+        return []
+
+    references = set()
+
+    for node in template_ast.find_all((nodes.Getattr, nodes.Getitem)):
+        path = _get_node_path(node=node, nodes=nodes)
+
+        if not path or len(path) < 3 or path[0] != DATASTORE_PARENT_SCOPE:
+            continue
+
+        if path[1] not in [SYSTEM_SCOPE, USER_SCOPE]:
+            continue
+
+        references.add((path[1], '.'.join(path[2:])))
+
+    return sorted(references)
+
+
+def _get_node_path(node, nodes):
+    """
+    Return attribute path (e.g. ['st2kv', 'system', 'key']) for the provided node or None if the
+    path can't be determined statically.
+    """
+    path = []
+
+    while True:
+        if isinstance(node, nodes.Name):
+            path.insert(0, node.name)
+            return path
+        elif isinstance(node, nodes.Getattr):
+            path.insert(0, node.attr)
+        elif (isinstance(node, nodes.Getitem) and isinstance(node.arg, nodes.Const) and
+                isinstance(node.arg.value, six.string_types)):
+            path.insert(0, node.arg.value)
+        else:
+            return None
+
+        node = node.node
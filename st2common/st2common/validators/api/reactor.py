@@ -22,9 +22,8 @@ from st2common import log as logging
 from st2common.exceptions.apivalidation import ValueValidationException
 from st2common.constants.triggers import SYSTEM_TRIGGER_TYPES
 from st2common.constants.triggers import CRON_TIMER_TRIGGER_REF
-from st2common.util import schema as util_schema
 import st2common.operators as criteria_operators
-from st2common.services import triggers
+from st2common.services import trigger_schemas
 
 __all__ = [
     'validate_criteria',
@@ -73,19 +72,6 @@ def validate_trigger_parameters(trigger_type_ref, parameters):
         return None
 
     is_system_trigger = trigger_type_ref in SYSTEM_TRIGGER_TYPES
-    if is_system_trigger:
-        # System trigger
-        parameters_schema = SYSTEM_TRIGGER_TYPES[trigger_type_ref]['parameters_schema']
-    else:
-        trigger_type_db = triggers.get_trigger_type_db(trigger_type_ref)
-        if not trigger_type_db:
-            # Trigger doesn't exist in the database
-            return None
-
-        parameters_schema = getattr(trigger_type_db, 'parameters_schema', {})
-        if not parameters_schema:
-            # Parameters schema not defined for the this trigger
-            return None
 
     # We only validate non-system triggers if config option is set (enabled)
     if not is_system_trigger and not cfg.CONF.system.validate_trigger_parameters:
@@ -93,9 +79,13 @@ def validate_trigger_parameters(trigger_type_ref, parameters):
                   'triggers is disabled, skipping validation.' % (trigger_type_ref))
         return None
 
-    cleaned = util_schema.validate(instance=parameters, schema=parameters_schema,
-                                   cls=util_schema.CustomValidator, use_default=True,
-                                   allow_default_none=True)
+    validator = trigger_schemas.get_parameters_validator(trigger_type_ref=trigger_type_ref)
+    if not validator:
+        # Trigger doesn't exist in the database or parameters schema is not defined for this
+        # trigger
+        return None
+
+    cleaned = validator.validate(instance=parameters)
 
     # Additional validation for CronTimer trigger
     # TODO: If we need to add more checks like this we should consider abstracting this out.
@@ -124,19 +114,6 @@ def validate_trigger_payload(trigger_type_ref, payload):
         return None
 
     is_system_trigger = trigger_type_ref in SYSTEM_TRIGGER_TYPES
-    if is_system_trigger:
-        # System trigger
-        payload_schema = SYSTEM_TRIGGER_TYPES[trigger_type_ref]['payload_schema']
-    else:
-        trigger_type_db = triggers.get_trigger_type_db(trigger_type_ref)
-        if not trigger_type_db:
-            # Trigger doesn't exist in the database
-            return None
-
-        payload_schema = getattr(trigger_type_db, 'payload_schema', {})
-        if not payload_schema:
-            # Payload schema not defined for the this trigger
-            return None
 
     # We only validate non-system triggers if config option is set (enabled)
     if not is_system_trigger and not cfg.CONF.system.validate_trigger_payload:
@@ -144,8 +121,11 @@ def validate_trigger_payload(trigger_type_ref, payload):
                   'triggers is disabled, skipping validation.' % (trigger_type_ref))
         return None
 
-    cleaned = util_schema.validate(instance=payload, schema=payload_schema,
-                                   cls=util_schema.CustomValidator, use_default=True,
-                                   allow_default_none=True)
+    validator = trigger_schemas.get_payload_validator(trigger_type_ref=trigger_type_ref)
+    if not validator:
+        # Trigger doesn't exist in the database or payload schema is not defined for this trigger
+        return None
+
+    cleaned = validator.validate(instance=payload)
 
     return cleaned
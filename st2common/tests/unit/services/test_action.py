@@ -288,6 +288,21 @@ class TestActionExecutionService(DbTestCase):
         self.assertEqual(isotime.format(ex.start_timestamp, usec=False),
                          isotime.format(req.start_timestamp, usec=False))
 
+    def test_req_notify_is_copied_from_action(self):
+        # Action returned by the metadata cache is shared by all the executions
+        cached_action_db = Action.get_by_ref(ACTION_REF)
+
+        with mock.patch.object(action_db, 'get_action_by_ref',
+                               mock.Mock(return_value=cached_action_db)) as get_action_by_ref:
+            req, _ = self._submit_request(action_ref=ACTION_REF)
+
+        get_action_by_ref.assert_any_call(ACTION_REF, use_cache=True)
+        self.assertFalse(req.notify is cached_action_db.notify)
+        self.assertEqual(req.notify.on_complete.routes, cached_action_db.notify.on_complete.routes)
+
+        req.notify.on_complete.routes.append('notify.email')
+        self.assertEqual(cached_action_db.notify.on_complete.routes, ['notify.slack'])
+
     def test_req_workflow_action(self):
         actiondb = self.actiondbs[ACTION_WORKFLOW['name']]
         req, ex = self._submit_request(action_ref=ACTION_WORKFLOW_REF)
@@ -0,0 +1,145 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import mock
+
+from st2common.models.db.action import ActionDB
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.models.db.runner import RunnerTypeDB
+from st2common.persistence.action import Action
+from st2common.persistence.runner import RunnerType
+from st2common.services import action_metadata
+from st2common.services.action_metadata import ActionMetadataCache
+from st2common.services.action_metadata import ActionMetadataCacheWatcher
+from st2common.transport import action as action_transport
+from st2common.transport.publishers import PoolPublisher
+from st2common.util import action_db as action_utils
+from st2tests.base import CleanDbTestCase
+
+
+class MockMessage(object):
+    def __init__(self, routing_key):
+        self.delivery_info = {'routing_key': routing_key}
+        self.ack = mock.Mock()
+
+
+@mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+class ActionMetadataCacheTestCase(CleanDbTestCase):
+    def setUp(self):
+        super(ActionMetadataCacheTestCase, self).setUp()
+
+        self.cache = ActionMetadataCache(max_size=100, ttl=60)
+        self.watcher = ActionMetadataCacheWatcher(metadata_cache=self.cache)
+
+        self.runner_type_db = RunnerType.add_or_update(RunnerTypeDB(
+            name='test-runner', runner_module='test_runner', enabled=True,
+            runner_parameters={'timeout': {'type': 'integer', 'default': 60},
+                               'token': {'type': 'string', 'secret': True}}))
+        self.action_db = Action.add_or_update(ActionDB(
+            pack='dummy_pack_1', name='action1', entry_point='', enabled=True,
+            runner_type={'name': 'test-runner'},
+            parameters={'password': {'type': 'string', 'secret': True},
+                        'cmd': {'type': 'string'}}))
+
+    def test_metadata_is_cached_until_action_changes(self):
+        get_action_by_ref = mock.Mock(wraps=action_utils.get_action_by_ref)
+
+        with mock.patch.object(action_utils, 'get_action_by_ref', get_action_by_ref):
+            for _ in range(3):
+                self.assertEqual(self.cache.get_action('dummy_pack_1.action1').id,
+                                 self.action_db.id)
+                parameters, secret_parameters = self.cache.get_parameters('dummy_pack_1.action1')
+
+            self.assertEqual(get_action_by_ref.call_count, 1)
+            self.assertEqual(sorted(parameters.keys()), ['cmd', 'password', 'timeout', 'token'])
+            self.assertEqual(sorted(secret_parameters), ['password', 'token'])
+
+            # Change events are published on the action exchange
+            self.action_db.parameters = {'cmd': {'type': 'string'}}
+            Action.add_or_update(self.action_db)
+            PoolPublisher.publish.assert_called_with(self.action_db,
+                                                     action_transport.ACTION_CUD_XCHG, 'update')
+
+            self.watcher.process_task(self.action_db, MockMessage('update'))
+            _, secret_parameters = self.cache.get_parameters('dummy_pack_1.action1')
+            self.assertEqual(secret_parameters, ['token'])
+            self.assertEqual(get_action_by_ref.call_count, 2)
+
+    def test_runner_type_change_invalidates_parameters(self):
+        self.cache.get_parameters('dummy_pack_1.action1')
+        self.assertEqual(self.cache.get_stats()['runner_types']['size'], 1)
+
+        self.runner_type_db.runner_parameters = {'timeout': {'type': 'integer'}}
+        RunnerType.add_or_update(self.runner_type_db)
+        PoolPublisher.publish.assert_called_with(self.runner_type_db,
+                                                 action_transport.RUNNER_TYPE_CUD_XCHG, 'update')
+
+        self.watcher.process_task(self.runner_type_db, MockMessage('update'))
+        self.assertEqual(self.cache.get_stats()['runner_types']['size'], 0)
+
+        _, secret_parameters = self.cache.get_parameters('dummy_pack_1.action1')
+        self.assertEqual(secret_parameters, ['password'])
+
+    def test_missing_action_is_cached_until_created(self):
+        self.cache.get_action('dummy_pack_1.action1')
+        self.assertEqual(self.cache.get_action('dummy_pack_1.new'), None)
+        self.assertEqual(self.cache.get_parameters('dummy_pack_1.new'), ({}, []))
+        self.assertTrue('dummy_pack_1.new' in self.cache.actions)
+
+        action_db = Action.add_or_update(ActionDB(pack='dummy_pack_1', name='new',
+                                                  entry_point='', enabled=True,
+                                                  runner_type={'name': 'test-runner'}))
+        self.watcher.process_task(action_db, MockMessage('create'))
+
+        # Only the created action is invalidated
+        self.assertFalse('dummy_pack_1.new' in self.cache.actions)
+        self.assertTrue('dummy_pack_1.action1' in self.cache.actions)
+        self.assertEqual(self.cache.get_action('dummy_pack_1.new').id, action_db.id)
+
+    def test_items_retrieved_during_invalidation_are_not_cached(self):
+        def get_action_by_ref(ref, use_cache=True):
+            self.cache.invalidate_action(ref=ref)
+            return self.action_db
+
+        with mock.patch.object(action_utils, 'get_action_by_ref', get_action_by_ref):
+            self.assertEqual(self.cache.get_action('dummy_pack_1.action1'), self.action_db)
+
+        self.assertFalse('dummy_pack_1.action1' in self.cache.actions)
+
+    def test_liveaction_mask_secrets_uses_cache(self):
+        liveaction_db = LiveActionDB(action='dummy_pack_1.action1', status='requested',
+                                     parameters={'password': 'secret', 'cmd': 'ls'})
+
+        with mock.patch.object(action_metadata, 'get_metadata_cache',
+                               mock.Mock(return_value=self.cache)):
+            with mock.patch.object(Action, 'get_by_ref', mock.Mock(wraps=Action.get_by_ref)):
+                for _ in range(3):
+                    result = liveaction_db.to_serializable_dict(mask_secrets=True)
+                    self.assertEqual(result['parameters'], {'password': '********',
+                                                            'cmd': 'ls'})
+
+                self.assertEqual(Action.get_by_ref.call_count, 1)
+
+    def test_cache_is_only_used_when_requested(self):
+        with mock.patch.object(action_metadata, 'get_metadata_cache',
+                               mock.Mock(return_value=self.cache)):
+            with mock.patch.object(Action, 'get_by_ref', mock.Mock(wraps=Action.get_by_ref)):
+                for _ in range(2):
+                    action_utils.get_action_by_ref('dummy_pack_1.action1')
+                self.assertEqual(Action.get_by_ref.call_count, 2)
+                self.assertEqual(self.cache.get_stats()['actions']['size'], 0)
+
+                for _ in range(2):
+                    action_utils.get_action_by_ref('dummy_pack_1.action1', use_cache=True)
+                self.assertEqual(Action.get_by_ref.call_count, 3)
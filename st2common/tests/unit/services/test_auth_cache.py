@@ -0,0 +1,114 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+import mock
+
+from st2common.exceptions.auth import TokenNotFoundError
+from st2common.models.db.auth import TokenDB, UserDB, ApiKeyDB
+from st2common.models.db.rbac import UserRoleAssignmentDB
+from st2common.persistence.auth import Token, User, ApiKey
+from st2common.services.auth_cache import AuthCache
+from st2common.services.auth_cache import AuthCacheWatcher
+from st2common.transport import auth as auth_transport
+from st2common.transport.publishers import PoolPublisher
+from st2common.util import date as date_utils
+from st2common.util import hash as hash_utils
+from st2tests.base import CleanDbTestCase
+
+
+class MockMessage(object):
+    def __init__(self, routing_key):
+        self.delivery_info = {'routing_key': routing_key}
+        self.ack = mock.Mock()
+
+
+@mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+class AuthCacheTestCase(CleanDbTestCase):
+    def setUp(self):
+        super(AuthCacheTestCase, self).setUp()
+
+        self.auth_cache = AuthCache(max_size=100, ttl=60)
+        self.watcher = AuthCacheWatcher(auth_cache=self.auth_cache)
+
+        expiry = date_utils.get_datetime_utc_now() + datetime.timedelta(seconds=300)
+        self.token_db = Token.add_or_update(TokenDB(user='stanley', token='token1',
+                                                    expiry=expiry))
+        self.user_db = User.add_or_update(UserDB(name='stanley'))
+
+    def test_token_is_cached_until_deleted(self):
+        with mock.patch.object(Token, 'get', mock.Mock(wraps=Token.get)) as get:
+            self.assertEqual(self.auth_cache.get_token('token1').user, 'stanley')
+            self.assertEqual(self.auth_cache.get_token('token1').user, 'stanley')
+            self.assertEqual(get.call_count, 1)
+
+            Token.delete(self.token_db)
+            payload = {'token_hash': hash_utils.hash('token1')}
+            PoolPublisher.publish.assert_called_with(payload, auth_transport.AUTH_CUD_XCHG,
+                                                     'token.delete')
+
+            self.watcher.process_task(payload, MockMessage('token.delete'))
+            self.assertRaises(TokenNotFoundError, self.auth_cache.get_token, 'token1')
+            self.assertEqual(get.call_count, 2)
+
+        self.assertEqual(self.auth_cache.get_stats()['tokens']['hits'], 1)
+        self.assertEqual(self.auth_cache.get_stats()['tokens']['misses'], 2)
+
+    def test_token_strings_are_not_published(self):
+        PoolPublisher.publish.reset_mock()
+
+        expiry = date_utils.get_datetime_utc_now() + datetime.timedelta(seconds=300)
+        token_db = Token.add_or_update(TokenDB(user='stanley', token='token2', expiry=expiry))
+        token_db.metadata = {'service': 'test'}
+        token_db = Token.add_or_update(token_db)
+        Token.delete(token_db)
+
+        self.assertEqual(PoolPublisher.publish.call_count, 1)
+        self.assertFalse('token2' in str(PoolPublisher.publish.call_args))
+
+    def test_api_key_is_cached_by_hash(self):
+        api_key_db = ApiKey.add_or_update(ApiKeyDB(user='stanley',
+                                                   key_hash=hash_utils.hash('apikey1')))
+
+        self.assertEqual(self.auth_cache.get_api_key('apikey1').id, api_key_db.id)
+        self.assertEqual(len(self.auth_cache.api_keys), 1)
+
+        self.watcher.process_task(api_key_db, MockMessage('api_key.update'))
+        self.assertEqual(len(self.auth_cache.api_keys), 0)
+
+    def test_user_permissions_are_invalidated_on_role_assignment_change(self):
+        resolver = mock.Mock()
+        resolver.user_has_permission.return_value = False
+
+        self.assertEqual(self.auth_cache.get_user_by_name('stanley').name, 'stanley')
+        self.assertFalse(self.auth_cache.user_has_permission(resolver, self.user_db, 'action_list'))
+        self.assertFalse(self.auth_cache.user_has_permission(resolver, self.user_db, 'action_list'))
+        self.assertEqual(resolver.user_has_permission.call_count, 1)
+
+        resolver.user_has_permission.return_value = True
+        assignment_db = UserRoleAssignmentDB(user='stanley', role='admin', source='test')
+        self.watcher.process_task(assignment_db, MockMessage('user_role_assignment.create'))
+
+        self.assertTrue(self.auth_cache.user_has_permission(resolver, self.user_db, 'action_list'))
+        self.assertEqual(resolver.user_has_permission.call_count, 2)
+
+        # Grant changes invalidate permissions of all the users, user is still cached
+        self.watcher.process_task(mock.Mock(), MockMessage('permission_grant.update'))
+        self.assertEqual(len(self.auth_cache.permissions), 0)
+        self.assertEqual(len(self.auth_cache.users), 1)
+
+        self.watcher.process_task(self.user_db, MockMessage('user.delete'))
+        self.assertEqual(len(self.auth_cache.users), 0)
@@ -0,0 +1,99 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest2
+
+from st2common.services.cache_watcher import CacheWatcher
+from st2common.services.rule_watcher import RuleWatcher
+from st2common.transport import action as action_transport
+from st2common.transport import publishers
+from st2common.transport import reactor
+
+
+class MockMessage(object):
+    def __init__(self, routing_key):
+        self.delivery_info = {'routing_key': routing_key}
+        self.ack = mock.Mock()
+
+
+class CacheWatcherTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(CacheWatcherTestCase, self).setUp()
+
+        self.invalidate_callback = mock.Mock()
+        self.clear_callback = mock.Mock()
+        self.watcher = CacheWatcher(
+            name='test cache',
+            exchanges=[action_transport.ACTION_CUD_XCHG, action_transport.RUNNER_TYPE_CUD_XCHG],
+            invalidate_callback=self.invalidate_callback, clear_callback=self.clear_callback,
+            routing_keys=['update', 'delete'], queue_suffix='test')
+
+    def test_exclusive_queue_per_exchange(self):
+        self.assertEqual(len(self.watcher._queues), 2)
+
+        for queue, exchange in zip(self.watcher._queues, [action_transport.ACTION_CUD_XCHG,
+                                                          action_transport.RUNNER_TYPE_CUD_XCHG]):
+            self.assertTrue(queue.name.startswith('%s.watch.test' % (exchange.name)))
+            self.assertTrue(queue.exclusive)
+            self.assertEqual(sorted([(item.exchange.name, item.routing_key)
+                                     for item in queue.bindings]),
+                             [(exchange.name, 'delete'), (exchange.name, 'update')])
+
+    def test_process_task(self):
+        message = MockMessage('update')
+        self.watcher.process_task('body', message)
+        self.invalidate_callback.assert_called_once_with('body', 'update')
+        self.assertEqual(message.ack.call_count, 1)
+
+        # Messages are acknowledged even if the invalidation fails
+        self.invalidate_callback.side_effect = ValueError('invalid')
+        message = MockMessage('delete')
+        self.watcher.process_task('body', message)
+        self.assertEqual(message.ack.call_count, 1)
+
+    def test_cache_is_cleared_on_reconnect(self):
+        with mock.patch('kombu.mixins.ConsumerMixin.on_consume_ready'):
+            self.watcher.on_consume_ready(connection=None, channel=None, consumers=[])
+        self.assertEqual(self.clear_callback.call_count, 1)
+
+        # Watcher keeps consuming if the cache can't be cleared
+        self.clear_callback.side_effect = ValueError('invalid')
+        with mock.patch('kombu.mixins.ConsumerMixin.on_consume_ready'):
+            self.watcher.on_consume_ready(connection=None, channel=None, consumers=[])
+        self.assertEqual(self.clear_callback.call_count, 2)
+
+
+class RuleWatcherTestCase(unittest2.TestCase):
+    def test_events_are_dispatched_to_handlers(self):
+        handlers = dict([(routing_key, mock.Mock()) for routing_key in
+                         [publishers.CREATE_RK, publishers.UPDATE_RK, publishers.DELETE_RK]])
+        watcher = RuleWatcher(create_handler=handlers[publishers.CREATE_RK],
+                              update_handler=handlers[publishers.UPDATE_RK],
+                              delete_handler=handlers[publishers.DELETE_RK])
+
+        queue = watcher._queues[0]
+        self.assertTrue(queue.name.startswith('%s.watch.rules' % (reactor.RULE_CUD_XCHG.name)))
+
+        for routing_key, handler in handlers.items():
+            message = MockMessage(routing_key)
+            watcher.process_task('rule', message)
+            handler.assert_called_once_with('rule')
+            self.assertEqual(message.ack.call_count, 1)
+
+        # Events without a handler are acknowledged and skipped
+        message = MockMessage('unknown')
+        watcher.process_task('rule', message)
+        self.assertEqual(message.ack.call_count, 1)
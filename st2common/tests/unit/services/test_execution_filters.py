@@ -0,0 +1,112 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import bson
+import mock
+
+from st2common.models.db.execution import ActionExecutionDB
+from st2common.persistence.execution import ActionExecution
+from st2common.persistence.execution import ActionExecutionFilterValue
+from st2common.services import execution_filters
+from st2tests.base import CleanDbTestCase
+
+
+class ExecutionFiltersTestCase(CleanDbTestCase):
+    def setUp(self):
+        super(ExecutionFiltersTestCase, self).setUp()
+        execution_filters._RECORDED_VALUES.clear()
+
+    def _create_execution(self, action_ref, status, user='stanley', rule_name=None):
+        execution_db = ActionExecutionDB(id=bson.ObjectId(), action={'ref': action_ref},
+                                         runner={'name': 'local-shell-cmd'},
+                                         liveaction={'id': str(bson.ObjectId())}, status=status,
+                                         context={'user': user})
+        if rule_name:
+            execution_db.rule = {'name': rule_name}
+
+        execution_db = ActionExecution.add_or_update(execution_db, publish=False,
+                                                     dispatch_trigger=False)
+        return execution_db
+
+    def test_existing_executions_are_indexed_on_first_use(self):
+        self._create_execution('core.local', 'succeeded', rule_name='rule1')
+        self._create_execution('core.remote', 'failed')
+
+        filters = execution_filters.get_filter_values()
+        self.assertEqual(sorted(filters['action']), ['core.local', 'core.remote'])
+        self.assertEqual(sorted(filters['status']), ['failed', 'succeeded'])
+        self.assertEqual(filters['user'], ['stanley'])
+        self.assertEqual(filters['runner'], ['local-shell-cmd'])
+        self.assertEqual([v for v in filters['rule'] if v is not None], ['rule1'])
+
+        # Index has been populated, distinct queries are not used anymore
+        with mock.patch.object(ActionExecution, 'distinct') as distinct:
+            filters = execution_filters.get_filter_values(types=['action', 'nonexistent'])
+            self.assertFalse(distinct.called)
+
+        self.assertEqual(list(filters.keys()), ['action'])
+        self.assertEqual(sorted(filters['action']), ['core.local', 'core.remote'])
+
+    def test_values_are_recorded_and_pruned(self):
+        execution_filters.rebuild_filter_values()
+        self.assertEqual(execution_filters.get_filter_values(types=['action'])['action'], [])
+
+        execution1_db = self._create_execution('core.local', 'succeeded')
+        execution2_db = self._create_execution('core.remote', 'succeeded', user='joe')
+        execution_filters.record_filter_values(execution1_db)
+        execution_filters.record_filter_values(execution2_db)
+
+        # Values which have already been recorded by this process are not stored again
+        with mock.patch.object(ActionExecutionFilterValue, 'add_value') as add_value:
+            execution_filters.record_filter_values(execution1_db)
+            self.assertFalse(add_value.called)
+
+        filters = execution_filters.get_filter_values()
+        self.assertEqual(sorted(filters['action']), ['core.local', 'core.remote'])
+        self.assertEqual(filters['status'], ['succeeded'])
+        self.assertEqual(sorted(filters['user']), ['joe', 'stanley'])
+
+        ActionExecution.delete(execution2_db, publish=False, dispatch_trigger=False)
+        removed_count = execution_filters.prune_filter_values()
+        self.assertEqual(removed_count, 2)
+
+        filters = execution_filters.get_filter_values()
+        self.assertEqual(filters['action'], ['core.local'])
+        self.assertEqual(filters['status'], ['succeeded'])
+        self.assertEqual(filters['user'], ['stanley'])
+
+        # Pruned values are stored again
+        execution_filters.record_filter_values(execution2_db)
+        filters = execution_filters.get_filter_values()
+        self.assertEqual(sorted(filters['action']), ['core.local', 'core.remote'])
+
+    def test_values_pruned_by_other_process_are_stored_again(self):
+        execution_filters.rebuild_filter_values()
+        execution_db = self._create_execution('core.local', 'succeeded')
+        execution_filters.record_filter_values(execution_db)
+
+        # Value is pruned by the garbage collector process which doesn't share the recorded values
+        ActionExecutionFilterValue.delete_by_query(name='action', value='core.local')
+        execution_filters.record_filter_values(execution_db)
+        self.assertEqual(execution_filters.get_filter_values(types=['action'])['action'], [])
+
+        now = time.time() + execution_filters.RECORDED_VALUES_TTL + 1
+        with mock.patch('time.time', mock.Mock(return_value=now)):
+            execution_filters.record_filter_values(execution_db)
+
+        self.assertEqual(execution_filters.get_filter_values(types=['action'])['action'],
+                         ['core.local'])
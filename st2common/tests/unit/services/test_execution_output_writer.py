@@ -0,0 +1,106 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import eventlet
+import mock
+
+from st2common.persistence.execution import ActionExecutionOutput
+from st2common.services.action import ExecutionOutputWriter
+from st2common.transport.publishers import PoolPublisher
+from st2tests.base import CleanDbTestCase
+
+MOCK_EXECUTION = mock.Mock()
+MOCK_EXECUTION.id = '598dbf0c0640fd54bffc688b'
+
+MOCK_ACTION = mock.Mock()
+MOCK_ACTION.ref = 'core.local'
+MOCK_ACTION.runner_type = {'name': 'local-shell-cmd'}
+
+
+@mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+class ExecutionOutputWriterTestCase(CleanDbTestCase):
+
+    def _get_writer(self, buffer_size=1024, flush_interval=60):
+        return ExecutionOutputWriter(execution_db=MOCK_EXECUTION, action_db=MOCK_ACTION,
+                                     buffer_size=buffer_size, flush_interval=flush_interval)
+
+    def test_lines_are_coalesced_into_chunks(self):
+        PoolPublisher.publish.reset_mock()
+        writer = self._get_writer()
+
+        writer.write(data='stdout line 1\n', output_type='stdout')
+        writer.write(data='stderr line 1\n', output_type='stderr')
+        writer.write(data='stdout line 2\n', output_type='stdout')
+
+        # Nothing is stored until the writer is flushed
+        self.assertEqual(len(ActionExecutionOutput.get_all()), 0)
+
+        output_dbs = writer.close()
+        self.assertEqual(len(output_dbs), 2)
+        self.assertEqual(PoolPublisher.publish.call_count, 2)
+
+        output_dbs = ActionExecutionOutput.query(output_type='stdout')
+        self.assertEqual(len(output_dbs), 1)
+        self.assertEqual(output_dbs[0].data, 'stdout line 1\nstdout line 2\n')
+        self.assertEqual(output_dbs[0].execution_id, MOCK_EXECUTION.id)
+        self.assertEqual(output_dbs[0].action_ref, 'core.local')
+        self.assertEqual(output_dbs[0].runner_ref, 'local-shell-cmd')
+
+        output_dbs = ActionExecutionOutput.query(output_type='stderr')
+        self.assertEqual(len(output_dbs), 1)
+        self.assertEqual(output_dbs[0].data, 'stderr line 1\n')
+
+    def test_chunk_is_flushed_when_buffer_is_full(self):
+        writer = self._get_writer(buffer_size=20)
+
+        writer.write(data='a' * 10, output_type='stdout')
+        self.assertEqual(len(ActionExecutionOutput.get_all()), 0)
+
+        writer.write(data='b' * 10, output_type='stdout')
+        output_dbs = ActionExecutionOutput.get_all()
+        self.assertEqual(len(output_dbs), 1)
+        self.assertEqual(output_dbs[0].data, 'a' * 10 + 'b' * 10)
+
+        writer.write(data='c' * 5, output_type='stdout')
+        writer.close()
+
+        output_dbs = ActionExecutionOutput.query(output_type='stdout', order_by=['timestamp'])
+        self.assertEqual(len(output_dbs), 2)
+        self.assertEqual(output_dbs[1].data, 'c' * 5)
+
+    def test_chunk_is_flushed_after_flush_interval(self):
+        writer = self._get_writer(flush_interval=0.1)
+
+        writer.write(data='line 1\n', output_type='stdout')
+        self.assertEqual(len(ActionExecutionOutput.get_all()), 0)
+
+        eventlet.sleep(0.3)
+
+        output_dbs = ActionExecutionOutput.get_all()
+        self.assertEqual(len(output_dbs), 1)
+        self.assertEqual(output_dbs[0].data, 'line 1\n')
+
+        writer.close()
+        self.assertEqual(len(ActionExecutionOutput.get_all()), 1)
+
+    def test_buffering_disabled(self):
+        writer = self._get_writer(buffer_size=0)
+
+        writer.write(data='line 1\n', output_type='stdout')
+        writer.write(data='line 2\n', output_type='stdout')
+        self.assertEqual(len(ActionExecutionOutput.get_all()), 2)
+
+        self.assertEqual(writer.close(), [])
+        self.assertEqual(len(ActionExecutionOutput.get_all()), 2)
@@ -0,0 +1,124 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import datetime
+import time
+
+import mock
+
+from st2common.constants.keyvalue import FULL_SYSTEM_SCOPE, FULL_USER_SCOPE
+from st2common.models.db.keyvalue import KeyValuePairDB
+from st2common.persistence.keyvalue import KeyValuePair
+from st2common.services import keyvalues
+from st2common.services.keyvalues import KeyValueLookup
+from st2common.services.keyvalues import KeyValuePairCache
+from st2common.services.keyvalues import KeyValuePairCacheWatcher
+from st2common.services.keyvalues import UserKeyValueLookup
+from st2common.transport import keyvalue as keyvalue_transport
+from st2common.transport.publishers import PoolPublisher
+from st2common.util import date as date_utils
+from st2common.util.templating import render_template_with_system_and_user_context
+from st2tests.base import CleanDbTestCase
+
+
+class MockMessage(object):
+    def __init__(self, routing_key):
+        self.delivery_info = {'routing_key': routing_key}
+        self.ack = mock.Mock()
+
+
+@mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+class KeyValuePairCacheTestCase(CleanDbTestCase):
+    def setUp(self):
+        super(KeyValuePairCacheTestCase, self).setUp()
+
+        self.value_cache = KeyValuePairCache(max_size=100, ttl=60)
+        self.watcher = KeyValuePairCacheWatcher(value_cache=self.value_cache)
+
+        self.kvp_db = KeyValuePair.add_or_update(KeyValuePairDB(name='k1', value='v1'))
+        KeyValuePair.add_or_update(KeyValuePairDB(name='k2', value='v2'))
+        KeyValuePair.add_or_update(KeyValuePairDB(name='stanley:k1', value='v3',
+                                                  scope=FULL_USER_SCOPE))
+
+    def test_value_is_cached_until_key_changes(self):
+        query = mock.Mock(wraps=KeyValuePair.query)
+
+        with mock.patch.object(KeyValuePair, 'query', query):
+            values = self.value_cache.get_values(scope=FULL_SYSTEM_SCOPE,
+                                                 names=['k1', 'k2', 'missing'])
+            self.assertEqual(values, {'k1': 'v1', 'k2': 'v2', 'missing': ''})
+
+            values = self.value_cache.get_values(scope=FULL_SYSTEM_SCOPE, names=['k1', 'missing'])
+            self.assertEqual(values, {'k1': 'v1', 'missing': ''})
+            self.assertEqual(query.call_count, 1)
+
+        # Change events are published on the key value pair exchange
+        self.kvp_db.value = 'v1-updated'
+        KeyValuePair.add_or_update(self.kvp_db)
+        PoolPublisher.publish.assert_any_call(self.kvp_db,
+                                              keyvalue_transport.KEY_VALUE_PAIR_CUD_XCHG,
+                                              'update')
+
+        self.watcher.process_task(self.kvp_db, MockMessage('update'))
+        self.assertFalse((FULL_SYSTEM_SCOPE, 'k1') in self.value_cache.values)
+        self.assertTrue((FULL_SYSTEM_SCOPE, 'k2') in self.value_cache.values)
+
+        values = self.value_cache.get_values(scope=FULL_SYSTEM_SCOPE, names=['k1'])
+        self.assertEqual(values, {'k1': 'v1-updated'})
+
+    def test_expiring_keys(self):
+        now = date_utils.get_datetime_utc_now()
+        KeyValuePair.add_or_update(KeyValuePairDB(
+            name='expiring', value='v', expire_timestamp=now + datetime.timedelta(seconds=10)))
+        KeyValuePair.add_or_update(KeyValuePairDB(
+            name='expired', value='v', expire_timestamp=now - datetime.timedelta(seconds=10)))
+
+        values = self.value_cache.get_values(scope=FULL_SYSTEM_SCOPE,
+                                             names=['expiring', 'expired'])
+        self.assertEqual(values, {'expiring': 'v', 'expired': 'v'})
+
+        # Key which has expired, but hasn't been removed yet is not cached
+        self.assertFalse((FULL_SYSTEM_SCOPE, 'expired') in self.value_cache.values)
+
+        # Key is only cached until it expires and not for the whole cache TTL
+        expire_timestamp = self.value_cache.values._items[(FULL_SYSTEM_SCOPE, 'expiring')][0]
+        self.assertTrue(expire_timestamp <= time.time() + 10)
+
+    def test_lookups_use_cache_and_prefetch(self):
+        with mock.patch.object(keyvalues, 'get_value_cache',
+                               mock.Mock(return_value=self.value_cache)):
+            lookup = KeyValueLookup(scope=FULL_SYSTEM_SCOPE)
+            lookup.prefetch(names=['k1', 'k2'])
+
+            with mock.patch.object(KeyValuePair, 'get_by_scope_and_name') as get_by_name:
+                self.assertEqual(str(lookup.k1), 'v1')
+                self.assertEqual(str(lookup.k2), 'v2')
+                self.assertEqual(str(KeyValueLookup(scope=FULL_SYSTEM_SCOPE).k1), 'v1')
+                self.assertFalse(get_by_name.called)
+
+            user_lookup = UserKeyValueLookup(user='stanley', scope=FULL_USER_SCOPE)
+            user_lookup.prefetch(names=['k1'])
+            self.assertEqual(str(user_lookup.k1), 'v3')
+
+            # All the keys referenced in a template are retrieved with a single query
+            self.value_cache.clear()
+            query = mock.Mock(wraps=KeyValuePair.query)
+
+            with mock.patch.object(KeyValuePair, 'query', query):
+                template = '{{ st2kv.system.k1 }} {{ st2kv.system.k2 }} {{ st2kv.user.k1 }}'
+                result = render_template_with_system_and_user_context(value=template,
+                                                                      user='stanley')
+
+            self.assertEqual(result, 'v1 v2 v3')
+            self.assertEqual(query.call_count, 1)
@@ -0,0 +1,110 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import eventlet
+import mock
+import unittest2
+
+from st2common.constants import action as action_constants
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.services.liveaction_watcher import LiveActionWatcher
+from st2common.services.liveaction_watcher import WAIT_END_STATES
+from st2common.services.liveaction_watcher import wait_for_completion
+from st2common.transport import liveaction as liveaction_transport
+from st2common.util import action_db as action_db_util
+
+LIVEACTION_ID = '5a1f4c4a0640fd1c7d35c7a1'
+
+
+class LiveActionWatcherTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(LiveActionWatcherTestCase, self).setUp()
+
+        self.liveaction_db = LiveActionDB(id=LIVEACTION_ID, action='core.local',
+                                          status=action_constants.LIVEACTION_STATUS_RUNNING)
+        self.watcher = LiveActionWatcher()
+
+    def _get_liveaction(self, status):
+        return LiveActionDB(id=LIVEACTION_ID, action='core.local', status=status)
+
+    def _complete(self, get_liveaction_by_id, delay):
+        eventlet.sleep(delay)
+
+        liveaction_db = self._get_liveaction(action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        get_liveaction_by_id.return_value = liveaction_db
+        self.watcher.process_task(liveaction_db, mock.Mock())
+
+    @mock.patch.object(action_db_util, 'get_liveaction_by_id')
+    def test_waiter_is_woken_up_on_status_update(self, get_liveaction_by_id):
+        get_liveaction_by_id.return_value = self.liveaction_db
+        eventlet.spawn(self._complete, get_liveaction_by_id, 0.1)
+
+        start = time.time()
+        liveaction_db = wait_for_completion(self.liveaction_db, watcher=self.watcher,
+                                            poll_interval=30)
+        self.assertTrue(time.time() - start < 5)
+
+        self.assertEqual(liveaction_db.status, action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        # Initial check after the watch has been registered + check after the wake up
+        self.assertEqual(get_liveaction_by_id.call_count, 2)
+        self.assertEqual(self.watcher._waiters, {})
+
+    @mock.patch.object(action_db_util, 'get_liveaction_by_id')
+    def test_completion_before_watch_is_registered(self, get_liveaction_by_id):
+        get_liveaction_by_id.return_value = self._get_liveaction(
+            action_constants.LIVEACTION_STATUS_FAILED)
+
+        liveaction_db = wait_for_completion(self.liveaction_db, watcher=self.watcher,
+                                            poll_interval=30)
+        self.assertEqual(liveaction_db.status, action_constants.LIVEACTION_STATUS_FAILED)
+        self.assertEqual(get_liveaction_by_id.call_count, 1)
+
+    @mock.patch.object(action_db_util, 'get_liveaction_by_id')
+    def test_database_is_polled_when_update_is_missed(self, get_liveaction_by_id):
+        get_liveaction_by_id.side_effect = [
+            self.liveaction_db,
+            self.liveaction_db,
+            self._get_liveaction(action_constants.LIVEACTION_STATUS_PAUSED)
+        ]
+
+        liveaction_db = wait_for_completion(self.liveaction_db, watcher=self.watcher,
+                                            poll_interval=0.05)
+        self.assertEqual(liveaction_db.status, action_constants.LIVEACTION_STATUS_PAUSED)
+        self.assertEqual(get_liveaction_by_id.call_count, 3)
+
+    def test_only_wait_end_states_are_consumed(self):
+        self.assertEqual(len(self.watcher._queues), 1)
+
+        queue = self.watcher._queues[0]
+        exchange = liveaction_transport.LIVEACTION_STATUS_MGMT_XCHG
+        self.assertTrue(queue.name.startswith('%s.watch.waiter' % (exchange.name)))
+        self.assertTrue(queue.exclusive)
+        self.assertEqual(sorted([item.routing_key for item in queue.bindings]),
+                         sorted(WAIT_END_STATES))
+
+    def test_updates_for_other_liveactions_are_ignored(self):
+        waiter = self.watcher.watch(LIVEACTION_ID)
+        message = mock.Mock()
+
+        other_liveaction_db = LiveActionDB(id='5a1f4c4a0640fd1c7d35c7a2', action='core.local',
+                                           status=action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        self.watcher.process_task(other_liveaction_db, message)
+        self.assertTrue(waiter.empty())
+        self.assertTrue(message.ack.called)
+
+        self.watcher.unwatch(LIVEACTION_ID, waiter)
+        self.assertEqual(self.watcher._waiters, {})
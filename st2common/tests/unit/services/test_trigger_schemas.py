@@ -0,0 +1,122 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+from jsonschema.exceptions import ValidationError
+from oslo_config import cfg
+
+from st2common.models.db.trigger import TriggerTypeDB
+from st2common.persistence.trigger import TriggerType
+from st2common.services import trigger_schemas
+from st2common.services import triggers
+from st2common.services.trigger_schemas import TriggerTypeSchemaRegistry
+from st2common.services.trigger_schemas import TriggerTypeSchemaWatcher
+from st2common.transport import reactor
+from st2common.transport.publishers import PoolPublisher
+from st2common.validators.api.reactor import validate_trigger_payload
+from st2tests.base import CleanDbTestCase
+
+PAYLOAD_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'count': {
+            'type': 'integer',
+            'required': True
+        },
+        'name': {
+            'type': 'string',
+            'default': 'test'
+        }
+    }
+}
+
+
+class MockMessage(object):
+    def __init__(self, routing_key):
+        self.delivery_info = {'routing_key': routing_key}
+        self.ack = mock.Mock()
+
+
+@mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+class TriggerTypeSchemaRegistryTestCase(CleanDbTestCase):
+    def setUp(self):
+        super(TriggerTypeSchemaRegistryTestCase, self).setUp()
+
+        self.registry = TriggerTypeSchemaRegistry(max_size=100, ttl=60)
+        self.watcher = TriggerTypeSchemaWatcher(schema_registry=self.registry)
+
+        self.trigger_type_db = TriggerType.add_or_update(
+            TriggerTypeDB(pack='dummy_pack_1', name='event', payload_schema=PAYLOAD_SCHEMA))
+
+        cfg.CONF.set_override(name='validate_trigger_payload', override=True, group='system')
+        self.addCleanup(cfg.CONF.clear_override, name='validate_trigger_payload',
+                        group='system')
+
+    def test_validator_is_cached_until_trigger_type_changes(self):
+        get_trigger_type_db = mock.Mock(wraps=triggers.get_trigger_type_db)
+
+        with mock.patch.object(triggers, 'get_trigger_type_db', get_trigger_type_db):
+            validator = self.registry.get_validator('dummy_pack_1.event', 'payload_schema')
+            self.assertEqual(validator.validate({'count': 1}), {'count': 1, 'name': 'test'})
+            self.assertRaises(ValidationError, validator.validate, {'count': 'a'})
+
+            validator = self.registry.get_validator('dummy_pack_1.event', 'payload_schema')
+            self.assertEqual(get_trigger_type_db.call_count, 1)
+
+            # Change events are published on the trigger type exchange
+            self.trigger_type_db.payload_schema = {}
+            TriggerType.add_or_update(self.trigger_type_db)
+            PoolPublisher.publish.assert_called_with(self.trigger_type_db,
+                                                     reactor.TRIGGER_TYPE_CUD_XCHG, 'update')
+
+            self.watcher.process_task(self.trigger_type_db, MockMessage('update'))
+            self.assertEqual(self.registry.get_validator('dummy_pack_1.event', 'payload_schema'),
+                             None)
+            self.assertEqual(get_trigger_type_db.call_count, 2)
+
+    def test_missing_trigger_type_is_cached_until_created(self):
+        self.assertEqual(self.registry.get_validator('dummy_pack_1.new', 'payload_schema'), None)
+        self.assertTrue(('dummy_pack_1.new', 'payload_schema') in self.registry.validators)
+
+        trigger_type_db = TriggerType.add_or_update(
+            TriggerTypeDB(pack='dummy_pack_1', name='new', payload_schema=PAYLOAD_SCHEMA))
+        self.watcher.process_task(trigger_type_db, MockMessage('create'))
+
+        # Only validators for the created trigger type are invalidated
+        self.assertFalse(('dummy_pack_1.new', 'payload_schema') in self.registry.validators)
+        self.assertTrue(self.registry.get_validator('dummy_pack_1.new', 'payload_schema'))
+
+    def test_validate_trigger_payload_uses_registry(self):
+        with mock.patch.object(trigger_schemas, 'get_schema_registry',
+                               mock.Mock(return_value=self.registry)):
+            for _ in range(3):
+                cleaned = validate_trigger_payload(trigger_type_ref='dummy_pack_1.event',
+                                                   payload={'count': 1})
+                self.assertEqual(cleaned, {'count': 1, 'name': 'test'})
+
+            self.assertRaises(ValidationError, validate_trigger_payload,
+                              trigger_type_ref='dummy_pack_1.event', payload={})
+
+            # System trigger schemas are compiled once as well
+            payload = {'action_ref': 'core.local', 'status': 'succeeded', 'execution_id': '1',
+                       'parameters': {}, 'result': {}, 'action_name': 'local',
+                       'start_timestamp': '', 'runner_ref': 'local-shell-cmd'}
+            validate_trigger_payload(trigger_type_ref='core.st2.generic.actiontrigger',
+                                     payload=payload)
+
+        stats = self.registry.get_stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hits'], 3)
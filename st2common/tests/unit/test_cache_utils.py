@@ -0,0 +1,93 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest2
+
+from st2common.util import cache as cache_utils
+from st2common.util.cache import TTLCache
+
+
+class TTLCacheTestCase(unittest2.TestCase):
+    def test_get_and_set(self):
+        cache = TTLCache(max_size=10, ttl=60)
+
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.get('a', 'default'), 'default')
+
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertTrue('a' in cache)
+
+        cache.delete('a')
+        self.assertFalse('a' in cache)
+        self.assertEqual(cache.get_stats(), {'size': 0, 'max_size': 10, 'hits': 1, 'misses': 2})
+
+    def test_least_recently_used_item_is_evicted(self):
+        cache = TTLCache(max_size=2, ttl=60)
+
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+        self.assertTrue('c' in cache)
+
+        cache.get_or_set('a', lambda: 4)
+        cache.set('d', 5)
+
+        self.assertTrue('a' in cache)
+        self.assertFalse('c' in cache)
+
+    @mock.patch.object(cache_utils.time, 'time', mock.Mock(return_value=100))
+    def test_items_expire(self):
+        cache = TTLCache(max_size=10, ttl=60)
+        cache.set('a', 1)
+
+        cache_utils.time.time.return_value = 159
+        self.assertEqual(cache.get('a'), 1)
+
+        cache_utils.time.time.return_value = 160
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(len(cache), 0)
+
+    def test_get_or_set(self):
+        cache = TTLCache(max_size=10, ttl=60)
+        func = mock.Mock(return_value='value')
+
+        self.assertEqual(cache.get_or_set('a', func), 'value')
+        self.assertEqual(cache.get_or_set('a', func), 'value')
+        self.assertEqual(func.call_count, 1)
+
+        # Exceptions are propagated and nothing is cached
+        func.side_effect = ValueError('not found')
+        self.assertRaises(ValueError, cache.get_or_set, 'b', func)
+        self.assertFalse('b' in cache)
+
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_delete_matching(self):
+        cache = TTLCache(max_size=10, ttl=0)
+        cache.set(('user1', 'action_list'), True)
+        cache.set(('user1', 'rule_list'), False)
+        cache.set(('user2', 'action_list'), True)
+
+        cache.delete_matching(lambda key: key[0] == 'user1')
+        self.assertEqual(len(cache), 1)
+        self.assertTrue(('user2', 'action_list') in cache)
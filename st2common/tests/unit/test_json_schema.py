@@ -369,3 +369,28 @@ class JSONSchemaTestCase(TestCase):
 
         array_type_property = TEST_SCHEMA_1['properties']['arg_optional_type_array']
         self.assertFalse(util_schema.is_attribute_type_object(array_type_property.get('type')))
+
+    def test_schema_validator(self):
+        validator = util_schema.SchemaValidator(schema=TEST_SCHEMA_2,
+                                                cls=util_schema.get_validator(),
+                                                use_default=True)
+
+        # Default value is assigned, provided instance is not modified
+        instance = {}
+        cleaned = validator.validate(instance)
+        self.assertEqual(cleaned, util_schema.validate(instance=instance, schema=TEST_SCHEMA_2,
+                                                       cls=util_schema.get_validator(),
+                                                       use_default=True))
+        self.assertEqual(instance, {})
+
+        validator = util_schema.SchemaValidator(schema=TEST_SCHEMA_1,
+                                                cls=util_schema.get_validator(),
+                                                use_default=True)
+        expected_msg = '\'arg_required_no_default\' is a required property'
+        self.assertRaisesRegexp(ValidationError, expected_msg, validator.validate, {})
+
+        # None is allowed for the attributes with default value of None
+        validator = util_schema.SchemaValidator(schema=TEST_SCHEMA_3,
+                                                cls=util_schema.get_validator(),
+                                                use_default=True, allow_default_none=True)
+        validator.validate({'arg_optional_default_none': None})
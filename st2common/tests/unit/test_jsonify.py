@@ -34,3 +34,22 @@ class JsonifyTests(unittest2.TestCase):
         d = '{"a": 1, "b": true}'
         expected = {'a': 1, 'b': True}
         self.assertDictEqual(jsonify.try_loads(d), expected)
+
+    def test_json_encode(self):
+        class Model(object):
+            def __json__(self):
+                return {'b': [1, 2]}
+
+        obj = {'a': Model()}
+        self.assertEqual(jsonify.json_encode(obj), '{"a":{"b":[1,2]}}')
+
+        result = jsonify.json_encode(obj, indent=4)
+        self.assertTrue(result.startswith('{\n    "a": {\n        "b": [\n'))
+        self.assertEqual(jsonify.json_loads({'a': result})['a'], {'a': {'b': [1, 2]}})
+
+    def test_json_encode_iter(self):
+        self.assertEqual(''.join(jsonify.json_encode_iter([])), '[]')
+
+        items = ({'id': index} for index in range(3))
+        chunks = list(jsonify.json_encode_iter(items))
+        self.assertEqual(chunks, ['[', '{"id":0}', ',{"id":1}', ',{"id":2}', ']'])
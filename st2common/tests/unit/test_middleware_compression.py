@@ -0,0 +1,88 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import types
+
+import six
+import unittest2
+from webob import Request
+
+from st2common.middleware.compression import GzipMiddleware
+from st2common.router import Response
+
+ITEMS = [{'id': index, 'name': 'item-%s' % (index)} for index in range(200)]
+
+
+def decompress(body):
+    return gzip.GzipFile(fileobj=six.BytesIO(body)).read()
+
+
+class GzipMiddlewareTestCase(unittest2.TestCase):
+    def _get_app(self, **response_kwargs):
+        def app(environ, start_response):
+            return Response(**response_kwargs)(environ, start_response)
+
+        return GzipMiddleware(app, min_size=100)
+
+    def _call(self, app, accept_encoding='gzip, deflate'):
+        req = Request.blank('/v1/executions')
+
+        if accept_encoding:
+            req.headers['Accept-Encoding'] = accept_encoding
+
+        return req.get_response(app)
+
+    def test_response_is_compressed(self):
+        resp = self._call(self._get_app(json=ITEMS))
+
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(resp.headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(resp.headers['Content-Length']), len(resp.body))
+        self.assertEqual(json.loads(decompress(resp.body)), ITEMS)
+
+    def test_streamed_response_is_compressed(self):
+        app = self._get_app(json_iter=iter(ITEMS))
+
+        environ = Request.blank('/v1/executions', headers={'Accept-Encoding': 'gzip'}).environ
+        headers = {}
+
+        def start_response(status, headerlist, exc_info=None):
+            headers.update(headerlist)
+
+        app_iter = app(environ, start_response)
+
+        self.assertTrue(isinstance(app_iter, types.GeneratorType))
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertFalse('Content-Length' in headers)
+        self.assertEqual(json.loads(decompress(b''.join(app_iter))), ITEMS)
+
+    def test_response_is_not_compressed(self):
+        # Client doesn't accept gzip
+        for accept_encoding in [None, 'deflate', 'gzip;q=0']:
+            resp = self._call(self._get_app(json=ITEMS), accept_encoding=accept_encoding)
+            self.assertFalse('Content-Encoding' in resp.headers)
+            self.assertEqual(json.loads(resp.body), ITEMS)
+
+        # Small response
+        resp = self._call(self._get_app(json={'id': 1}))
+        self.assertFalse('Content-Encoding' in resp.headers)
+        self.assertEqual(json.loads(resp.body), {'id': 1})
+
+        # Event stream
+        resp = self._call(self._get_app(body='data: %s\n\n' % ('a' * 200),
+                                        content_type='text/event-stream'))
+        self.assertFalse('Content-Encoding' in resp.headers)
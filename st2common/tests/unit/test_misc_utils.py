@@ -18,6 +18,7 @@ import unittest2
 from st2common.util.misc import rstrip_last_char
 from st2common.util.misc import strip_shell_chars
 from st2common.util.misc import lowercase_value
+from st2common.util.misc import get_field_value
 
 __all__ = [
     'MiscUtilTestCase'
@@ -70,3 +71,18 @@ class MiscUtilTestCase(unittest2.TestCase):
             'teste': 'teste'
         }
         self.assertEqual(expected_value, lowercase_value(value=value))
+
+    def test_get_field_value(self):
+        class Instance(object):
+            rule = {'name': 'rule1', 'ref': {'pack': 'core'}}
+            status = 'succeeded'
+
+        self.assertEqual(get_field_value(Instance(), 'status'), 'succeeded')
+        self.assertEqual(get_field_value(Instance(), 'rule.name'), 'rule1')
+        self.assertEqual(get_field_value(Instance(), 'rule.ref.pack'), 'core')
+        self.assertEqual(get_field_value({'rule': Instance.rule}, 'rule.ref.pack'), 'core')
+
+        # Missing fields on the path result in None
+        self.assertEqual(get_field_value(Instance(), 'trigger.name'), None)
+        self.assertEqual(get_field_value(Instance(), 'rule.ref.name'), None)
+        self.assertEqual(get_field_value(Instance(), 'status.name'), None)
@@ -15,6 +15,8 @@
 
 import unittest
 
+from bson.son import SON
+
 from st2common.util import mongoescape
 
 
@@ -89,3 +91,34 @@ class TestMongoEscape(unittest.TestCase):
 
         unescaped = mongoescape.unescape_chars(escaped)
         self.assertDictEqual(field, unescaped)
+
+    def test_value_without_special_characters_is_not_copied(self):
+        nested = {'k2': [{'l1': 1}, [1, 2]]}
+        field = {'k1': nested, 'k3': 'v3'}
+
+        self.assertTrue(mongoescape.escape_chars(field) is field)
+        self.assertTrue(mongoescape.unescape_chars(field) is field)
+
+        # Only the containers on the path to the changed key are copied
+        field['k4.k5'] = {'k6': 'v6'}
+        escaped = mongoescape.escape_chars(field)
+        self.assertFalse(escaped is field)
+        self.assertTrue(escaped['k1'] is nested)
+        self.assertTrue(escaped[u'k4\uff0ek5'] is field['k4.k5'])
+        self.assertIn('k4.k5', field)
+
+    def test_unescaping_both_translations_in_one_key(self):
+        escaped = {u'k1\uff0ek2\u2024k3\uff04': {u'k4\u2024k5': 'v1'}}
+        self.assertEqual(mongoescape.unescape_chars(escaped), {'k1.k2.k3$': {'k4.k5': 'v1'}})
+
+    def test_ordered_dict_type_and_key_order_is_preserved(self):
+        field = SON([('k1', 1), ('k2.k3', 2), ('k4', 3)])
+
+        escaped = mongoescape.escape_chars(field)
+        self.assertTrue(isinstance(escaped, SON))
+        self.assertEqual(list(escaped.keys()), ['k1', u'k2\uff0ek3', 'k4'])
+
+    def test_non_dict_values_are_returned_as_is(self):
+        field = [{'k1.k2': 'v1'}]
+        self.assertTrue(mongoescape.escape_chars(field) is field)
+        self.assertEqual(mongoescape.escape_chars('k1.k2'), 'k1.k2')
@@ -289,3 +289,23 @@ class OperatorTest(unittest2.TestCase):
         self.assertFalse(op('a', None), 'Should return False')
         self.assertFalse(op('a', 'abc'), 'Should return False')
         self.assertTrue(op('a', 'bcd'), 'Should return True')
+
+    def test_get_compiled_operator_regex(self):
+        op = operators.get_compiled_operator('regex', 'v1$')
+        self.assertTrue(op('foo v1', None), 'Failed regex.')
+        self.assertFalse(op('v1 foo', None), 'Passed regex.')
+
+        op = operators.get_compiled_operator('iregex', 'v1$')
+        self.assertTrue(op('foo V1', None), 'Failed iregex.')
+
+        op = operators.get_compiled_operator('matchregex', '.*bar.*')
+        self.assertTrue(op('foo\nbar\nbaz', None), 'Failed matchregex.')
+        self.assertFalse(op('foo\nbaz', None), 'Passed matchregex.')
+
+    def test_get_compiled_operator_non_regex(self):
+        op = operators.get_compiled_operator('equals', 'v1')
+        self.assertEqual(op, operators.get_operator('equals'))
+
+        # Invalid regex falls back to the regular operator function
+        op = operators.get_compiled_operator('regex', '[')
+        self.assertEqual(op, operators.get_operator('regex'))
@@ -0,0 +1,103 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest2
+from kombu import Exchange
+from kombu import Queue
+
+from st2common.transport.connection_retry_wrapper import ConnectionRetryWrapper
+from st2common.transport.publishers import PoolPublisher
+from st2common.transport.serializers import get_accept_content
+
+import st2tests.config as tests_config
+
+
+class PoolPublisherTestCase(unittest2.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(PoolPublisherTestCase, cls).setUpClass()
+        tests_config.parse_args()
+
+    def setUp(self):
+        super(PoolPublisherTestCase, self).setUp()
+
+        self.publisher = PoolPublisher(urls=['memory://'], pool_size=2)
+        self.exchange = Exchange('st2.test.publisher', type='topic')
+
+        with self.publisher.pool.acquire(block=True) as connection:
+            self.queue = Queue('st2.test.publisher.queue', exchange=self.exchange,
+                               routing_key='#', channel=connection.default_channel)
+            self.queue.declare()
+            self.queue.purge()
+
+    def _get_messages(self):
+        messages = []
+
+        with self.publisher.pool.acquire(block=True) as connection:
+            queue = self.queue.bind(connection.default_channel)
+
+            while True:
+                message = queue.get(no_ack=True, accept=get_accept_content())
+
+                if not message:
+                    break
+
+                messages.append(message.decode())
+
+        return messages
+
+    def test_channel_and_producer_are_reused(self):
+        producers = set([])
+        channels = set([])
+
+        for index in range(3):
+            self.publisher.publish({'index': index}, self.exchange, 'test')
+            producer = list(self.publisher._producers.values())[0]
+            producers.add(producer)
+            channels.add(producer.channel)
+
+        self.assertEqual(len(producers), 1)
+        self.assertEqual(len(channels), 1)
+        self.assertEqual(len(self.publisher._producers), 1)
+        self.assertEqual(self._get_messages(), [{'index': 0}, {'index': 1}, {'index': 2}])
+
+    def test_producer_is_recreated_for_new_channel(self):
+        with self.publisher.pool.acquire(block=True) as connection:
+            producer1 = self.publisher._get_producer(connection=connection,
+                                                     channel=connection.default_channel)
+            producer2 = self.publisher._get_producer(connection=connection,
+                                                     channel=connection.channel())
+
+        self.assertNotEqual(producer1, producer2)
+
+    def test_get_stats(self):
+        stats = self.publisher.get_stats()
+        self.assertEqual(stats['publish_count'], 0)
+        self.assertEqual(stats['publish_time_avg'], 0.0)
+
+        self.publisher.publish({'a': 1}, self.exchange, 'test')
+        self.publisher.publish({'a': 2}, self.exchange, 'test')
+
+        with mock.patch.object(ConnectionRetryWrapper, 'ensured',
+                               mock.Mock(side_effect=ValueError('fail'))):
+            self.assertRaises(ValueError, self.publisher.publish, {'a': 3}, self.exchange,
+                              'test')
+
+        stats = self.publisher.get_stats()
+        self.assertEqual(stats['publish_count'], 2)
+        self.assertEqual(stats['publish_errors'], 1)
+        self.assertTrue(stats['publish_time_max'] >= stats['publish_time_avg'] > 0)
+        self.assertTrue(stats['pool_wait_time_max'] >= stats['pool_wait_time_avg'] >= 0)
@@ -13,10 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import copy
+import json
+import tempfile
 from datetime import timedelta
 
 import bson
+import mock
 
 from st2common import log as logging
 from st2common.garbage_collection.executions import purge_executions
@@ -264,6 +268,117 @@ class TestPurgeExecutions(CleanDbTestCase):
         stderr_dbs = ActionExecutionOutput.query(output_type='stderr')
         self.assertEqual(len(stderr_dbs), 0)
 
+    def test_purge_executions_in_batches(self):
+        now = date_utils.get_datetime_utc_now()
+
+        self._insert_mock_executions(count=7, start_ts=now - timedelta(days=15),
+                                     end_ts=now - timedelta(days=14))
+        self.assertEqual(len(ActionExecution.get_all()), 7)
+        self.assertEqual(len(LiveAction.get_all()), 7)
+        self.assertEqual(len(ActionExecutionOutput.get_all()), 14)
+
+        with mock.patch.object(ActionExecution, 'delete_by_query',
+                               mock.Mock(side_effect=ActionExecution.delete_by_query)) as \
+                mock_delete:
+            stats = purge_executions(logger=LOG, timestamp=now - timedelta(days=10), batch_size=3)
+
+        # 7 executions are deleted in 3 batches
+        self.assertEqual(mock_delete.call_count, 3)
+        self.assertEqual(stats, {'executions': 7, 'liveactions': 7, 'execution_output': 14})
+
+        self.assertEqual(len(ActionExecution.get_all()), 0)
+        self.assertEqual(len(LiveAction.get_all()), 0)
+        self.assertEqual(len(ActionExecutionOutput.get_all()), 0)
+
+    @mock.patch('st2common.garbage_collection.executions.eventlet.sleep')
+    def test_purge_executions_rate_limit(self, mock_sleep):
+        now = date_utils.get_datetime_utc_now()
+        self._insert_mock_executions(count=4, start_ts=now - timedelta(days=15),
+                                     end_ts=now - timedelta(days=14))
+
+        purge_executions(logger=LOG, timestamp=now - timedelta(days=10), batch_size=2,
+                         rate_limit=1)
+
+        # Purge needs to sleep after each full batch so the rate limit is not exceeded
+        self.assertTrue(mock_sleep.call_count >= 2)
+        self.assertTrue(mock_sleep.call_args_list[0][0][0] > 1)
+        self.assertEqual(len(ActionExecution.get_all()), 0)
+
+    def test_purge_executions_resumes_from_checkpoint(self):
+        now = date_utils.get_datetime_utc_now()
+        timestamp = now - timedelta(days=10)
+        self._insert_mock_executions(count=5, start_ts=now - timedelta(days=15),
+                                     end_ts=now - timedelta(days=14))
+
+        execution_ids = sorted([execution_db.id for execution_db in ActionExecution.get_all()])
+
+        _, checkpoint_file = tempfile.mkstemp()
+        os.unlink(checkpoint_file)
+
+        # Simulate purge which was interrupted after the first batch of two executions
+        original_delete_by_query = ActionExecution.delete_by_query
+
+        def mock_delete_by_query(**filters):
+            if mock_delete.call_count > 1:
+                raise KeyboardInterrupt()
+            return original_delete_by_query(**filters)
+
+        with mock.patch.object(ActionExecution, 'delete_by_query',
+                               mock.Mock(side_effect=mock_delete_by_query)) as mock_delete:
+            self.assertRaises(KeyboardInterrupt, purge_executions, logger=LOG,
+                              timestamp=timestamp, batch_size=2, checkpoint_file=checkpoint_file)
+
+        with open(checkpoint_file, 'r') as fp:
+            checkpoint = json.load(fp)
+
+        self.assertEqual(checkpoint['phase'], 'executions')
+        self.assertEqual(checkpoint['last_id'], str(execution_ids[1]))
+        self.assertEqual(checkpoint['stats']['executions'], 2)
+        self.assertEqual(len(ActionExecution.get_all()), 3)
+
+        # Checkpoint created with different parameters should be ignored
+        with mock.patch.object(ActionExecution, 'query',
+                               mock.Mock(side_effect=ActionExecution.query)) as mock_query:
+            purge_executions(logger=LOG, timestamp=timestamp, batch_size=2,
+                             action_ref='core.localzzz', checkpoint_file=checkpoint_file)
+            self.assertFalse('id__gt' in mock_query.call_args_list[0][1])
+
+        self.assertTrue(os.path.exists(checkpoint_file))
+
+        # Purge with the same parameters resumes from the checkpoint
+        with mock.patch.object(ActionExecution, 'query',
+                               mock.Mock(side_effect=ActionExecution.query)) as mock_query:
+            stats = purge_executions(logger=LOG, timestamp=timestamp, batch_size=2,
+                                     checkpoint_file=checkpoint_file)
+            self.assertEqual(mock_query.call_args_list[0][1]['id__gt'], execution_ids[1])
+
+        self.assertEqual(stats['executions'], 5)
+        self.assertEqual(len(ActionExecution.get_all()), 0)
+        self.assertEqual(len(LiveAction.get_all()), 0)
+        self.assertEqual(len(ActionExecutionOutput.get_all()), 0)
+
+        # Checkpoint is removed once the purge completes
+        self.assertFalse(os.path.exists(checkpoint_file))
+
+    def _insert_mock_executions(self, count, start_ts, end_ts):
+        for index in range(0, count):
+            liveaction_model = copy.deepcopy(self.models['liveactions']['liveaction4.yaml'])
+            liveaction_model['id'] = bson.ObjectId()
+            liveaction_model['start_timestamp'] = start_ts
+            liveaction_model['end_timestamp'] = end_ts
+            liveaction_model['status'] = action_constants.LIVEACTION_STATUS_SUCCEEDED
+            liveaction_db = LiveAction.add_or_update(liveaction_model)
+
+            exec_model = copy.deepcopy(self.models['executions']['execution1.yaml'])
+            exec_model['start_timestamp'] = start_ts
+            exec_model['end_timestamp'] = end_ts
+            exec_model['status'] = action_constants.LIVEACTION_STATUS_SUCCEEDED
+            exec_model['id'] = bson.ObjectId()
+            exec_model['liveaction']['id'] = str(liveaction_db.id)
+            ActionExecution.add_or_update(exec_model)
+
+            self._insert_mock_stdout_and_stderr_objects_for_execution(exec_model['id'], count=1)
+
     def _insert_mock_stdout_and_stderr_objects_for_execution(self, execution_id, count=5):
         execution_id = str(execution_id)
 
@@ -100,3 +100,92 @@ class StagedQueueConsumerTest(DbTestCase):
         mock_message = mock.MagicMock()
         handler._queue_consumer.process(payload, mock_message)
         self.assertTrue(mock_message.ack.called)
+
+
+class FakeBatchedStagedMessageHandler(FakeStagedMessageHandler):
+
+    def get_queue_consumer(self, connection, queues):
+        return consumers.BatchedStagedQueueConsumer(connection=connection, queues=queues,
+                                                    handler=self, batch_size=3,
+                                                    flush_interval=0.1)
+
+
+def get_batched_staged_handler():
+    return FakeBatchedStagedMessageHandler(mock.MagicMock(), [FAKE_WORK_Q])
+
+
+class BatchedStagedQueueConsumerTest(DbTestCase):
+
+    @mock.patch.object(BufferedDispatcher, 'dispatch', mock.MagicMock())
+    @mock.patch.object(FakeBatchedStagedMessageHandler, 'pre_ack_process_batch',
+                       mock.MagicMock(side_effect=lambda messages: messages))
+    def test_process_flushes_full_batch(self):
+        handler = get_batched_staged_handler()
+        consumer = handler._queue_consumer
+
+        payloads = [FakeModelDB(), FakeModelDB(), FakeModelDB()]
+        mock_messages = [mock.MagicMock(), mock.MagicMock(), mock.MagicMock()]
+
+        consumer.process(payloads[0], mock_messages[0])
+        consumer.process(payloads[1], mock_messages[1])
+        self.assertFalse(FakeBatchedStagedMessageHandler.pre_ack_process_batch.called)
+        self.assertFalse(mock_messages[1].ack.called)
+
+        consumer.process(payloads[2], mock_messages[2])
+        FakeBatchedStagedMessageHandler.pre_ack_process_batch.assert_called_once_with(payloads)
+        BufferedDispatcher.dispatch.assert_called_once_with(consumer._process_batch, payloads)
+
+        # Whole batch is acked at once
+        mock_messages[2].ack.assert_called_once_with(multiple=True)
+        self.assertFalse(mock_messages[0].ack.called)
+        self.assertFalse(mock_messages[1].ack.called)
+
+    @mock.patch.object(BufferedDispatcher, 'dispatch', mock.MagicMock())
+    @mock.patch.object(FakeBatchedStagedMessageHandler, 'pre_ack_process_batch',
+                       mock.MagicMock(side_effect=lambda messages: messages))
+    @mock.patch('st2common.transport.consumers.time.time')
+    def test_on_iteration_flushes_partial_batch_after_interval(self, mock_time):
+        handler = get_batched_staged_handler()
+        consumer = handler._queue_consumer
+
+        payload = FakeModelDB()
+        mock_message = mock.MagicMock()
+
+        mock_time.return_value = 100
+        consumer.process(payload, mock_message)
+
+        mock_time.return_value = 100.05
+        consumer.on_iteration()
+        self.assertFalse(mock_message.ack.called)
+
+        mock_time.return_value = 100.2
+        consumer.on_iteration()
+        FakeBatchedStagedMessageHandler.pre_ack_process_batch.assert_called_once_with([payload])
+        mock_message.ack.assert_called_once_with(multiple=True)
+
+    @mock.patch.object(FakeBatchedStagedMessageHandler, 'pre_ack_process',
+                       mock.MagicMock(side_effect=Exception('fail')))
+    def test_flush_pre_ack_failure_still_acks_batch(self):
+        handler = get_batched_staged_handler()
+        consumer = handler._queue_consumer
+
+        mock_message = mock.MagicMock()
+        consumer.process(FakeModelDB(), mock.MagicMock())
+        consumer.process(100, mock_message)
+        consumer.flush()
+
+        self.assertEqual(FakeBatchedStagedMessageHandler.pre_ack_process.call_count, 1)
+        mock_message.ack.assert_called_once_with(multiple=True)
+        self.assertEqual(consumer._batch, [])
+
+    def test_connection_revived_drops_pending_batch(self):
+        handler = get_batched_staged_handler()
+        consumer = handler._queue_consumer
+
+        mock_message = mock.MagicMock()
+        consumer.process(FakeModelDB(), mock_message)
+        consumer.on_connection_revived()
+        consumer.flush()
+
+        self.assertEqual(consumer._batch, [])
+        self.assertFalse(mock_message.ack.called)
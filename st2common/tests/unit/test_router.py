@@ -0,0 +1,187 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import mock
+import unittest2
+from oslo_config import cfg
+from webob import exc, Request
+
+from st2common import router as router_module
+from st2common.router import Router
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+SPEC = {
+    'swagger': '2.0',
+    'info': {
+        'title': 'Test API',
+        'version': '1.0.0'
+    },
+    'paths': {
+        '/items': {
+            'post': {
+                'operationId': 'tests.unit.test_router:create_item',
+                'parameters': [
+                    {
+                        'name': 'item',
+                        'in': 'body',
+                        'schema': {
+                            '$ref': '#/definitions/Item'
+                        }
+                    }
+                ],
+                'responses': {
+                    '201': {
+                        'description': 'Created item',
+                        'schema': {
+                            '$ref': '#/definitions/Item'
+                        }
+                    }
+                }
+            },
+            'get': {
+                'operationId': 'tests.unit.test_router:get_all_items',
+                'responses': {
+                    '200': {
+                        'description': 'List of items',
+                        'schema': {
+                            'type': 'array',
+                            'items': {
+                                '$ref': '#/definitions/Item'
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    },
+    'definitions': {
+        'Item': {
+            'type': 'object',
+            'properties': {
+                'name': {
+                    'type': 'string'
+                }
+            },
+            'required': ['name']
+        }
+    }
+}
+
+RESPONSE = {}
+
+
+def create_item(item):
+    return router_module.Response(json=RESPONSE.get('body', {'name': item.name}), status=201)
+
+
+def get_all_items():
+    def get_items():
+        for item in RESPONSE['items']:
+            if isinstance(item, Exception):
+                raise item
+
+            yield item
+
+    return router_module.Response(json_iter=get_items())
+
+
+class RouterTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(RouterTestCase, self).setUp()
+        RESPONSE.clear()
+
+        self.router = Router(auth=False)
+        self.router.add_spec(SPEC, transforms={'^/items$': ['/items']})
+
+    def tearDown(self):
+        super(RouterTestCase, self).tearDown()
+        cfg.CONF.set_override(name='response_validation_sample_rate', override=100, group='api')
+
+    def _post(self, body):
+        req = Request.blank('/items', method='POST', body=json.dumps(body),
+                            content_type='application/json')
+        return self.router(req)
+
+    def test_validators_are_compiled_once(self):
+        with mock.patch.object(router_module, 'CustomValidator') as custom_validator:
+            resp = self._post({'name': 'item1'})
+
+        self.assertEqual(resp.status_int, 201)
+        self.assertFalse(custom_validator.called)
+
+        with self.assertRaises(exc.HTTPBadRequest):
+            self._post({'name': 1})
+
+        stats = self.router.get_validation_stats()['tests.unit.test_router:create_item']
+        self.assertEqual(stats['request']['count'], 2)
+        self.assertEqual(stats['response']['count'], 1)
+        self.assertTrue(stats['request']['time_max'] >= stats['request']['time_avg'])
+
+    def test_response_validation_sample_rate(self):
+        RESPONSE['body'] = {'invalid': True}
+
+        resp = self._post({'name': 'item1'})
+        self.assertEqual(resp.headers['Warning'], '199 OpenAPI "Response validation failed"')
+
+        cfg.CONF.set_override(name='response_validation_sample_rate', override=0, group='api')
+        resp = self._post({'name': 'item1'})
+        self.assertFalse('Warning' in resp.headers)
+
+        cfg.CONF.set_override(name='response_validation_sample_rate', override=50, group='api')
+
+        with mock.patch('random.random', mock.Mock(return_value=0.6)):
+            resp = self._post({'name': 'item1'})
+            self.assertFalse('Warning' in resp.headers)
+
+        with mock.patch('random.random', mock.Mock(return_value=0.4)):
+            resp = self._post({'name': 'item1'})
+            self.assertTrue('Warning' in resp.headers)
+
+        stats = self.router.get_validation_stats()['tests.unit.test_router:create_item']
+        self.assertEqual(stats['request']['count'], 4)
+        self.assertEqual(stats['response']['count'], 2)
+
+    def test_streamed_response_is_not_validated(self):
+        RESPONSE['items'] = [{'invalid': True}, {'name': 'item2'}]
+
+        with mock.patch.object(router_module.Router, '_validate',
+                               mock.Mock(wraps=self.router._validate)) as validate:
+            resp = self.router(Request.blank('/items'))
+
+        self.assertTrue(resp.streamed)
+        self.assertFalse('Warning' in resp.headers)
+        self.assertFalse(validate.called)
+        self.assertEqual(json.loads(b''.join(resp.app_iter)), RESPONSE['items'])
+
+    def test_streamed_response_errors(self):
+        # Errors raised before the first item is retrieved result in an error response
+        RESPONSE['items'] = [ValueError('query failed')]
+
+        with self.assertRaises(ValueError):
+            self.router(Request.blank('/items'))
+
+        # Errors raised after the response has been started abort the connection
+        RESPONSE['items'] = [{'name': 'item1'}, ValueError('conversion failed')]
+        resp = self.router(Request.blank('/items'))
+        self.assertEqual(resp.status_int, 200)
+
+        with mock.patch.object(router_module, 'LOG') as log:
+            with self.assertRaises(ValueError):
+                b''.join(resp.app_iter)
+
+        self.assertEqual(log.exception.call_count, 1)
@@ -0,0 +1,181 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+import unittest2
+
+from st2common.constants.action import ACTION_OUTPUT_RESULT_DELIMITER
+from st2common.runners.python_action_worker_pool import PythonActionWorkerPool
+from st2common.util.green.shell import TIMEOUT_EXIT_CODE
+from st2common.util.sandboxing import get_sandbox_python_path
+import st2tests.base as tests_base
+import st2tests.config as tests_config
+
+PASCAL_ROW_ACTION_PATH = os.path.join(tests_base.get_resources_path(), 'packs',
+                                      'pythonactions/actions/pascal_row.py')
+
+SLEEP_ACTION = """
+import os
+import sys
+import time
+
+from st2common.runners.base_action import Action
+
+
+class SleepAction(Action):
+    def run(self, seconds=0, exit_code=None):
+        sys.stdout.write('pid=%s env=%s' % (os.getpid(), os.environ.get('ST2_TEST_VAR', None)))
+
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+        time.sleep(seconds)
+        return seconds
+"""
+
+
+class PythonActionWorkerPoolTestCase(unittest2.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(PythonActionWorkerPoolTestCase, cls).setUpClass()
+        tests_config.parse_args()
+
+    def setUp(self):
+        super(PythonActionWorkerPoolTestCase, self).setUp()
+
+        self.env = os.environ.copy()
+        self.env['PYTHONPATH'] = get_sandbox_python_path(inherit_from_parent=True,
+                                                         inherit_parent_virtualenv=True)
+
+        self.actions_dir = tempfile.mkdtemp()
+        self.sleep_action_path = os.path.join(self.actions_dir, 'sleep_action.py')
+
+        with open(self.sleep_action_path, 'w') as fp:
+            fp.write(SLEEP_ACTION)
+
+        self.pool = PythonActionWorkerPool(size=1, max_runs=3, max_memory=0)
+
+    def tearDown(self):
+        super(PythonActionWorkerPoolTestCase, self).tearDown()
+        self.pool.shutdown()
+        shutil.rmtree(self.actions_dir)
+
+    def _acquire(self, entry_point=PASCAL_ROW_ACTION_PATH):
+        return self.pool.acquire(python_path=sys.executable, pack='pythonactions',
+                                 entry_point=entry_point, env=self.env)
+
+    def _get_result(self, stdout):
+        return json.loads(stdout.split(ACTION_OUTPUT_RESULT_DELIMITER)[1])['result']
+
+    def test_worker_is_reused_between_runs(self):
+        worker = self._acquire()
+        pid = worker.pid
+
+        exit_code, stdout, stderr, timed_out = worker.run(file_path=PASCAL_ROW_ACTION_PATH,
+                                                          parameters={'row_index': 4},
+                                                          timeout=30)
+        self.assertEqual(exit_code, 0)
+        self.assertFalse(timed_out)
+        self.assertEqual(self._get_result(stdout), [1, 4, 6, 4, 1])
+        self.assertTrue('test info log message' in stderr)
+        self.pool.release(worker)
+
+        worker = self._acquire()
+        self.assertEqual(worker.pid, pid)
+
+        exit_code, stdout, stderr, timed_out = worker.run(file_path=PASCAL_ROW_ACTION_PATH,
+                                                          parameters={'row_index': 'a'},
+                                                          log_level='error', timeout=30)
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(self._get_result(stdout), 'This is suppose to fail don\'t worry!!')
+
+        # Log handlers from the previous run shouldn't be preserved
+        self.assertFalse('test info log message' in stderr)
+        self.assertEqual(stderr.count('test error log message'), 1)
+        self.pool.release(worker)
+
+    def test_all_workers_busy(self):
+        worker = self._acquire()
+        self.assertTrue(worker is not None)
+        self.assertTrue(self._acquire() is None)
+
+        self.pool.release(worker)
+        new_worker = self._acquire()
+        self.assertEqual(new_worker.pid, worker.pid)
+        self.pool.release(new_worker)
+
+    def test_worker_is_recycled_after_max_runs(self):
+        worker = self._acquire(entry_point=self.sleep_action_path)
+        pid = worker.pid
+
+        for index in range(0, 3):
+            self.assertEqual(worker.pid, pid)
+            exit_code, stdout, _, _ = worker.run(file_path=self.sleep_action_path,
+                                                 env={'ST2_TEST_VAR': str(index)}, timeout=30)
+            self.assertEqual(exit_code, 0)
+            self.assertTrue('pid=%s env=%s' % (pid, index) in stdout)
+            self.pool.release(worker)
+            worker = self._acquire(entry_point=self.sleep_action_path)
+
+        # Worker has been replaced, environment variables shouldn't leak between runs
+        self.assertNotEqual(worker.pid, pid)
+        _, stdout, _, _ = worker.run(file_path=self.sleep_action_path, timeout=30)
+        self.assertTrue('pid=%s env=None' % (worker.pid) in stdout)
+        self.pool.release(worker)
+
+    def test_action_exit_code_is_propagated(self):
+        worker = self._acquire(entry_point=self.sleep_action_path)
+
+        exit_code, _, _, timed_out = worker.run(file_path=self.sleep_action_path,
+                                                parameters={'exit_code': 3}, timeout=30)
+        self.assertEqual(exit_code, 3)
+        self.assertFalse(timed_out)
+        self.assertTrue(worker.is_alive())
+        self.pool.release(worker)
+
+    def test_worker_is_killed_on_timeout(self):
+        worker = self._acquire(entry_point=self.sleep_action_path)
+
+        exit_code, _, _, timed_out = worker.run(file_path=self.sleep_action_path,
+                                                parameters={'seconds': 30}, timeout=1)
+        self.assertEqual(exit_code, TIMEOUT_EXIT_CODE)
+        self.assertTrue(timed_out)
+        self.assertFalse(worker.is_alive())
+
+        self.pool.release(worker)
+        new_worker = self._acquire(entry_point=self.sleep_action_path)
+        self.assertNotEqual(new_worker.pid, worker.pid)
+        self.assertTrue(new_worker.is_alive())
+        self.pool.release(new_worker)
+
+    def test_shutdown(self):
+        self.pool = PythonActionWorkerPool(size=2)
+        idle_worker = self._acquire()
+        busy_worker = self._acquire()
+        self.pool.release(idle_worker)
+
+        self.pool.shutdown()
+        self.assertFalse(idle_worker.is_alive())
+        self.assertTrue(busy_worker.is_alive())
+        self.assertTrue(self._acquire() is None)
+
+        # Busy workers are killed once the action completes
+        self.pool.release(busy_worker)
+        self.assertFalse(busy_worker.is_alive())
@@ -0,0 +1,73 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+
+import mock
+import unittest2
+
+from st2common.util import spec_loader
+
+
+class SpecLoaderTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(SpecLoaderTestCase, self).setUp()
+        self.cache_dir = os.path.join(tempfile.mkdtemp(), 'openapi')
+
+    def tearDown(self):
+        super(SpecLoaderTestCase, self).tearDown()
+        shutil.rmtree(os.path.dirname(self.cache_dir))
+
+    def test_compiled_spec_is_cached(self):
+        spec = spec_loader.load_compiled_spec('st2common', 'openapi.yaml.j2',
+                                              cache_dir=self.cache_dir)
+        self.assertEqual(spec, spec_loader.load_spec('st2common', 'openapi.yaml.j2'))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        # Template is not rendered, parsed and validated again
+        with mock.patch.object(spec_loader.yaml, 'load') as yaml_load:
+            with mock.patch.object(spec_loader, 'validate') as validate:
+                cached_spec = spec_loader.load_compiled_spec('st2common', 'openapi.yaml.j2',
+                                                             cache_dir=self.cache_dir)
+
+        self.assertFalse(yaml_load.called)
+        self.assertFalse(validate.called)
+        self.assertEqual(cached_spec, spec)
+
+    def test_cache_is_keyed_by_template_arguments(self):
+        spec_loader.load_compiled_spec('st2common', 'openapi.yaml.j2', cache_dir=self.cache_dir)
+
+        arguments = dict(spec_loader.ARGUMENTS)
+        arguments['DEFAULT_PACK_NAME'] = 'custom'
+
+        with mock.patch.object(spec_loader, 'ARGUMENTS', arguments):
+            spec = spec_loader.load_compiled_spec('st2common', 'openapi.yaml.j2',
+                                                  cache_dir=self.cache_dir)
+
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        self.assertEqual(spec['info']['title'], 'StackStorm API')
+
+    def test_invalid_cached_spec_is_ignored(self):
+        spec = spec_loader.load_compiled_spec('st2common', 'openapi.yaml.j2',
+                                              cache_dir=self.cache_dir)
+
+        cache_path = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        with open(cache_path, 'wb') as fp:
+            fp.write('invalid')
+
+        self.assertEqual(spec_loader.load_compiled_spec('st2common', 'openapi.yaml.j2',
+                                                        cache_dir=self.cache_dir), spec)
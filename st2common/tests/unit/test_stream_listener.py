@@ -0,0 +1,115 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest2
+from oslo_config import cfg
+
+from st2common.models.api.execution import ActionExecutionAPI
+from st2common.models.api.execution import ActionExecutionOutputAPI
+from st2common.stream import listener as listener_module
+from st2common.stream.listener import BaseListener
+from st2common.stream.listener import StreamEvent
+from st2common.stream.listener import SubscriptionIndex
+import st2tests.config as tests_config
+
+EXECUTION_ID = '598dbf0c0640fd54bffc688b'
+
+
+class SubscriptionIndexTestCase(unittest2.TestCase):
+    def test_match(self):
+        index = SubscriptionIndex()
+
+        all_events = object()
+        executions = object()
+        action_ref = object()
+        execution_id = object()
+
+        index.add(all_events)
+        index.add(executions, events=['st2.execution__*'])
+        index.add(action_ref, events=['st2.execution__update'], action_refs=['core.local'])
+        index.add(execution_id, execution_ids=[EXECUTION_ID])
+        self.assertEqual(len(index), 4)
+
+        self.assertEqual(index.match('st2.execution__create', action_ref='core.local'),
+                         set([all_events, executions]))
+        self.assertEqual(index.match('st2.execution__update', action_ref='core.local'),
+                         set([all_events, executions, action_ref]))
+        self.assertEqual(index.match('st2.execution__update', action_ref='core.remote',
+                                     execution_id=EXECUTION_ID),
+                         set([all_events, executions, execution_id]))
+        self.assertEqual(index.match('st2.announcement__chatops'), set([all_events]))
+
+        index.remove(all_events)
+        index.remove(execution_id)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.match('st2.announcement__chatops'), set([]))
+        self.assertEqual(index.match('st2.execution__update', action_ref='core.local',
+                                     execution_id=EXECUTION_ID),
+                         set([executions, action_ref]))
+
+
+class StreamEventTestCase(unittest2.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(StreamEventTestCase, cls).setUpClass()
+        tests_config.parse_args()
+
+    def test_event_behaves_as_tuple(self):
+        event = StreamEvent('st2.announcement__chatops', {'a': 1})
+        event_name, body = event
+
+        self.assertEqual(event_name, 'st2.announcement__chatops')
+        self.assertEqual(body, {'a': 1})
+        self.assertEqual(event.frame, 'event: st2.announcement__chatops\ndata: {"a":1}\n\n')
+
+    def test_event_is_encoded_once_for_all_subscribers(self):
+        listener = BaseListener(connection=None)
+        execution_api = ActionExecutionAPI(id=EXECUTION_ID, action={'ref': 'core.local'})
+        output_api = ActionExecutionOutputAPI(execution_id=EXECUTION_ID, action_ref='core.local',
+                                              output_type='stdout', data='line 1\n')
+
+        gens = [listener.generator(), listener.generator(), listener.generator(),
+                listener.generator(action_refs=['core.remote'])]
+
+        # Start the generators and consume the initial heartbeat
+        for gen in gens:
+            self.assertEqual(next(gen), '')
+
+        self.assertEqual(len(listener.subscriptions), 4)
+
+        with mock.patch.object(listener_module, 'json_encode',
+                               mock.Mock(wraps=listener_module.json_encode)) as json_encode:
+            listener.emit('st2.execution__update', execution_api)
+            listener.emit('st2.execution.output__create', output_api)
+
+            frames = set()
+            for gen in gens[:3]:
+                frames.add(next(gen).frame)
+                self.assertEqual(next(gen).body, output_api)
+
+            self.assertEqual(len(frames), 1)
+            self.assertEqual(json_encode.call_count, 1)
+
+        # Subscriber which filters on a different action ref doesn't receive the events, only
+        # the heartbeat
+        cfg.CONF.set_override(name='heartbeat', group='stream', override=0.01)
+        self.assertEqual(next(gens[3]), None)
+        cfg.CONF.clear_override(name='heartbeat', group='stream')
+
+        for gen in gens:
+            gen.close()
+
+        self.assertEqual(len(listener.subscriptions), 0)
@@ -0,0 +1,148 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest2
+
+from bson.objectid import ObjectId
+from kombu.serialization import dumps
+from kombu.serialization import loads
+from kombu.serialization import prepare_accept_content
+from oslo_config import cfg
+
+from st2common.constants.trace import TRACE_CONTEXT
+from st2common.models.api.action import LiveActionAPI
+from st2common.models.api.trace import TraceContext
+from st2common.models.db.execution import ActionExecutionDB
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.transport import serializers
+from st2common.util import date as date_utils
+
+import st2tests.config as tests_config
+
+
+class MessageSerializersTestCase(unittest2.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(MessageSerializersTestCase, cls).setUpClass()
+        tests_config.parse_args()
+
+    def setUp(self):
+        super(MessageSerializersTestCase, self).setUp()
+
+        now = date_utils.get_datetime_utc_now()
+        self.liveaction_db = LiveActionDB(id=ObjectId(), status='running', action='core.local',
+                                          parameters={'cmd': 'ls', 'key.with.dots': 1},
+                                          context={'user': 'stanley'}, start_timestamp=now)
+        self.execution_db = ActionExecutionDB(id=ObjectId(), status='running',
+                                              action={'ref': 'core.local'},
+                                              runner={'name': 'local-shell-cmd'},
+                                              liveaction={'id': str(self.liveaction_db.id)},
+                                              parameters={'cmd': 'ls'},
+                                              result={'stdout': 'a' * 100},
+                                              start_timestamp=now)
+
+    def tearDown(self):
+        super(MessageSerializersTestCase, self).tearDown()
+        cfg.CONF.clear_override('serializer', group='messaging')
+
+    def _round_trip(self, payload, serializer):
+        content_type, content_encoding, data = dumps(payload, serializer=serializer)
+        accept = prepare_accept_content(serializers.get_accept_content())
+        return loads(data, content_type, content_encoding, accept=accept)
+
+    def _get_serializers(self):
+        result = [serializers.JSON_SERIALIZER]
+
+        if serializers.msgpack:
+            result.append(serializers.MSGPACK_SERIALIZER)
+
+        return result
+
+    def test_db_model_round_trip(self):
+        for serializer in self._get_serializers():
+            for model_db in [self.liveaction_db, self.execution_db]:
+                result = self._round_trip(model_db, serializer=serializer)
+
+                self.assertEqual(type(result), type(model_db))
+                self.assertEqual(result.id, model_db.id)
+                self.assertEqual(result.to_mongo(), model_db.to_mongo())
+
+            result = self._round_trip(self.liveaction_db, serializer=serializer)
+            self.assertEqual(result.parameters, {'cmd': 'ls', 'key.with.dots': 1})
+            self.assertEqual(result.start_timestamp, self.liveaction_db.start_timestamp)
+
+    def test_dict_with_nested_objects_round_trip(self):
+        now = date_utils.get_datetime_utc_now()
+        payload = {
+            'trigger': 'core.st2.webhook',
+            'payload': {'time': now, 'tags': set(['a']), 'id': ObjectId()},
+            TRACE_CONTEXT: TraceContext(trace_tag='tag1')
+        }
+
+        for serializer in self._get_serializers():
+            result = self._round_trip(payload, serializer=serializer)
+
+            self.assertEqual(result['trigger'], payload['trigger'])
+            self.assertEqual(result['payload'], payload['payload'])
+            self.assertTrue(isinstance(result[TRACE_CONTEXT], TraceContext))
+            self.assertEqual(result[TRACE_CONTEXT].trace_tag, 'tag1')
+
+    def test_api_model_round_trip(self):
+        liveaction_api = LiveActionAPI(action='core.local', parameters={'cmd': 'ls'})
+
+        for serializer in self._get_serializers():
+            result = self._round_trip(liveaction_api, serializer=serializer)
+
+            self.assertTrue(isinstance(result, LiveActionAPI))
+            self.assertEqual(vars(result), vars(liveaction_api))
+
+    def test_user_dicts_with_type_key_round_trip(self):
+        user_payload = {
+            serializers.TYPE_KEY: 'db',
+            'cls': 'subprocess.Popen',
+            'value': {serializers.TYPE_KEY: 'datetime', 'value': 'invalid'},
+            'items': [{serializers.TYPE_KEY: 'oid', 'value': '1'}]
+        }
+        self.liveaction_db.parameters = {'payload': user_payload}
+        payload = {'trigger': 'core.st2.webhook', 'payload': user_payload,
+                   'liveaction': self.liveaction_db}
+
+        for serializer in self._get_serializers():
+            result = self._round_trip(payload, serializer=serializer)
+
+            self.assertEqual(result['payload'], user_payload)
+            self.assertEqual(result['liveaction'].parameters, {'payload': user_payload})
+            self.assertEqual(result['liveaction'].id, self.liveaction_db.id)
+
+    def test_json_payload_is_smaller_than_pickle(self):
+        _, _, json_data = dumps(self.execution_db, serializer=serializers.JSON_SERIALIZER)
+        _, _, pickle_data = dumps(self.execution_db, serializer=serializers.PICKLE_SERIALIZER)
+        self.assertTrue(len(json_data) < len(pickle_data))
+
+    def test_decode_refuses_unknown_classes(self):
+        data = ('{"__st2_type__":"obj","cls":"subprocess.Popen","value":{}}')
+        self.assertRaises(ValueError, serializers.decode_json, data)
+
+        data = ('{"__st2_type__":"db","cls":"st2common.models.api.base.BaseAPI","value":{}}')
+        self.assertRaises(ValueError, serializers.decode_json, data)
+
+    def test_get_serializer(self):
+        self.assertEqual(serializers.get_serializer(), serializers.PICKLE_SERIALIZER)
+
+        cfg.CONF.set_override('serializer', 'st2-json', group='messaging')
+        self.assertEqual(serializers.get_serializer(), serializers.JSON_SERIALIZER)
+
+        cfg.CONF.set_override('serializer', 'invalid', group='messaging')
+        self.assertRaises(ValueError, serializers.get_serializer)
@@ -15,10 +15,13 @@
 
 import os
 import os.path
+import shutil
+import tempfile
 
 import unittest2
 
 from st2common.util.file_system import get_file_list
+from st2common.util.file_system import get_content_hash
 
 CURRENT_DIR = os.path.dirname(__file__)
 ST2TESTS_DIR = os.path.join(CURRENT_DIR, '../../../st2tests/st2tests')
@@ -48,3 +51,45 @@ class FileSystemUtilsTestCase(unittest2.TestCase):
         ]
         result = get_file_list(directory=directory, exclude_patterns=['*.pyc', '*.yaml'])
         self.assertItemsEqual(expected, result)
+
+    def test_get_content_hash(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+
+        script_path = os.path.join(temp_dir, 'script.sh')
+        libs_path = os.path.join(temp_dir, 'lib')
+        os.makedirs(os.path.join(libs_path, 'sub'))
+
+        with open(script_path, 'w') as fp:
+            fp.write('echo 1')
+
+        with open(os.path.join(libs_path, 'sub', 'util.sh'), 'w') as fp:
+            fp.write('util')
+
+        content_hash = get_content_hash(paths=[script_path, libs_path])
+        self.assertEqual(len(content_hash), 64)
+        self.assertEqual(get_content_hash(paths=[script_path, libs_path]), content_hash)
+
+        # Hash doesn't depend on the location of the files
+        other_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other_dir)
+        shutil.copytree(libs_path, os.path.join(other_dir, 'lib'))
+        shutil.copy(script_path, os.path.join(other_dir, 'script.sh'))
+        other_paths = [os.path.join(other_dir, 'script.sh'), os.path.join(other_dir, 'lib')]
+        self.assertEqual(get_content_hash(paths=other_paths), content_hash)
+
+        # Content, mode and new files change the hash
+        with open(os.path.join(libs_path, 'sub', 'util.sh'), 'w') as fp:
+            fp.write('util2')
+
+        content_hash_2 = get_content_hash(paths=[script_path, libs_path])
+        self.assertNotEqual(content_hash_2, content_hash)
+
+        os.chmod(script_path, 0o755)
+        content_hash_3 = get_content_hash(paths=[script_path, libs_path])
+        self.assertNotEqual(content_hash_3, content_hash_2)
+
+        with open(os.path.join(libs_path, 'new.sh'), 'w') as fp:
+            fp.write('')
+
+        self.assertNotEqual(get_content_hash(paths=[script_path, libs_path]), content_hash_3)
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
 import unittest2
 
 from st2common.util import jinja as jinja_utils
@@ -60,6 +61,50 @@ class JinjaUtilsRenderTestCase(unittest2.TestCase):
 
         self.assertEqual(actual, expected)
 
+    def test_render_template_string_uses_cached_template(self):
+        jinja_utils._TEMPLATE_CACHE.clear()
+        env = jinja_utils.get_shared_jinja_environment()
+        self.assertEqual(env, jinja_utils.get_shared_jinja_environment())
+
+        with mock.patch.object(env, 'from_string', wraps=env.from_string) as from_string:
+            for value in ['v1', 'v2']:
+                actual = jinja_utils.render_template_string('{{a}}', context={'a': value})
+                self.assertEqual(actual, value)
+
+        self.assertEqual(from_string.call_count, 1)
+        self.assertEqual(jinja_utils.get_template_cache_stats()['hits'], 1)
+
+        # Undefined variables are handled based on the environment
+        self.assertEqual(jinja_utils.render_template_string('{{b}}', context={},
+                                                            allow_undefined=True), '')
+        self.assertRaises(Exception, jinja_utils.render_template_string, '{{b}}', context={})
+
+    def test_render_template_string_plain_string(self):
+        env = jinja_utils.get_shared_jinja_environment()
+        values = ['plain', 'trailing newline\n', 'windows\r\nline\r\n', 'mac\rline\r',
+                  u'unicode ćšž', 'two newlines\n\n', '\n', '']
+
+        with mock.patch.object(env, 'from_string') as from_string:
+            plain_strings = jinja_utils.get_template_cache_stats()['plain_strings']
+            actual = [jinja_utils.render_template_string(value, context={}) for value in values]
+
+            self.assertFalse(from_string.called)
+            self.assertEqual(jinja_utils.get_template_cache_stats()['plain_strings'],
+                             plain_strings + len(values))
+
+        # Result is the same as when rendered using Jinja
+        expected = [env.from_string(value).render({}) for value in values]
+        self.assertEqual(actual, expected)
+
+        # Other line boundaries are left to Jinja
+        values = [u'form\x0cfeed\n', u'line \u2028 separator', u'next\x85line']
+
+        with mock.patch.object(env, 'from_string', mock.Mock(wraps=env.from_string)):
+            actual = [jinja_utils.render_template_string(value, context={}) for value in values]
+            self.assertEqual(env.from_string.call_count, len(values))
+
+        self.assertEqual(actual, [env.from_string(value).render({}) for value in values])
+
     def test_convert_str_to_raw(self):
         jinja_expr = '{{foobar}}'
         expected_raw_block = '{% raw %}{{foobar}}{% endraw %}'
@@ -17,6 +17,7 @@ from st2tests.base import CleanDbTestCase
 from st2common.constants.keyvalue import FULL_USER_SCOPE
 from st2common.models.db.keyvalue import KeyValuePairDB
 from st2common.persistence.keyvalue import KeyValuePair
+from st2common.util.templating import get_datastore_key_references
 from st2common.util.templating import render_template_with_system_and_user_context
 
 
@@ -63,3 +64,13 @@ class TemplatingUtilsTestCase(CleanDbTestCase):
 
         result = render_template_with_system_and_user_context(value=template, user=user)
         self.assertEqual(result, 'valuejoe1')
+
+    def test_get_datastore_key_references(self):
+        template = ('{{ st2kv.system.key1 }} {{ st2kv.system.a.b | upper }} '
+                    '{% if st2kv.user["key2"] %}{{ st2kv.system[name] }}{% endif %} {{ other.x }}')
+        references = get_datastore_key_references(template)
+        self.assertEqual(references, [('system', 'a'), ('system', 'a.b'), ('system', 'key1'),
+                                      ('user', 'key2')])
+
+        self.assertEqual(get_datastore_key_references('plain'), [])
+        self.assertEqual(get_datastore_key_references('{{ invalid'), [])
@@ -25,5 +25,5 @@ class JsonConverter(object):
     def convert(self, items_list):
         if not isinstance(items_list, list):
             raise ValueError('Items to be converted should be a list.')
-        json_doc = json_encode(items_list)
+        json_doc = json_encode(items_list, indent=4)
         return json_doc
@@ -48,7 +48,10 @@ def _register_cli_opts():
         cfg.StrOpt('trigger-instance', default=None,
                    help='Path to the file containing trigger instance definition'),
         cfg.StrOpt('trigger-instance-id', default=None,
-                   help='Id of the Trigger Instance to use for validation.')
+                   help='Id of the Trigger Instance to use for validation.'),
+        cfg.BoolOpt('shared-predicates', default=False,
+                    help='Evaluate criteria using shared predicates (same as the rules engine '
+                         'with rulesengine.enable_shared_predicates option set).')
     ]
     _do_register_cli_opts(cli_opts)
 
@@ -61,7 +64,8 @@ def main():
         tester = RuleTester(rule_file_path=cfg.CONF.rule,
                             rule_ref=cfg.CONF.rule_ref,
                             trigger_instance_file_path=cfg.CONF.trigger_instance,
-                            trigger_instance_id=cfg.CONF.trigger_instance_id)
+                            trigger_instance_id=cfg.CONF.trigger_instance_id,
+                            shared_predicates=cfg.CONF.shared_predicates)
         matches = tester.evaluate()
     finally:
         common_teardown()
@@ -124,6 +124,50 @@ class SensorService(object):
         self._logger.debug('Dispatching trigger %s with payload %s.', trigger, payload)
         self._dispatcher.dispatch(trigger, payload=payload, trace_context=trace_context)
 
+    def dispatch_many(self, trigger, payloads, trace_tag=None):
+        """
+        Method which dispatches multiple instances of the same trigger.
+
+        This method should be used instead of calling ``dispatch`` in a loop when a sensor
+        dispatches many trigger instances at once since the trigger instances are published in
+        batches.
+
+        :param trigger: Full name / reference of the trigger.
+        :type trigger: ``str``
+
+        :param payloads: Trigger payloads.
+        :type payloads: ``list`` of ``dict``
+
+        :param trace_tag: Tracer to track the triggerinstances.
+        :type trace_tags: ``str``
+        """
+        trace_context = TraceContext(trace_tag=trace_tag) if trace_tag else None
+
+        valid_payloads = []
+
+        for payload in payloads:
+            try:
+                validate_trigger_payload(trigger_type_ref=trigger, payload=payload)
+            except (ValidationError, Exception) as e:
+                self._logger.warn('Failed to validate payload (%s) for trigger "%s": %s' %
+                                  (str(payload), trigger, str(e)))
+
+                # If validation is disabled, still dispatch a trigger even if it failed validation
+                if cfg.CONF.system.validate_trigger_payload:
+                    self._logger.warn('Trigger payload validation failed and validation is '
+                                      'enabled, not dispatching a trigger "%s" (%s)' %
+                                      (trigger, str(payload)))
+                    continue
+
+            valid_payloads.append(payload)
+
+        if not valid_payloads:
+            return None
+
+        self._logger.debug('Dispatching %s instances of trigger %s.', len(valid_payloads), trigger)
+        self._dispatcher.dispatch_many(trigger, payloads=valid_payloads,
+                                       trace_context=trace_context)
+
     ##################################
     # Methods for datastore management
     ##################################
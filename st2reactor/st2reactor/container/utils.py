@@ -37,6 +37,69 @@ def create_trigger_instance(trigger, payload, occurrence_time, raise_on_no_trigg
     :param payload: Trigger payload.
     :type payload: ``dict``
     """
+    trigger_instance = create_trigger_instance_db(trigger=trigger, payload=payload,
+                                                  occurrence_time=occurrence_time,
+                                                  raise_on_no_trigger=raise_on_no_trigger)
+
+    if not trigger_instance:
+        return None
+
+    return TriggerInstance.add_or_update(trigger_instance)
+
+
+def create_trigger_instance_db(trigger, payload, occurrence_time, raise_on_no_trigger=False,
+                               trigger_db=None):
+    """
+    Same as ``create_trigger_instance``, but the returned trigger instance object is not persisted
+    in the database.
+
+    :param trigger_db: Optional already retrieved TriggerDB object for the provided trigger.
+    :type trigger_db: :class:`TriggerDB`
+
+    :rtype: :class:`TriggerInstanceDB`
+    """
+    if not trigger_db:
+        trigger_db = get_trigger_db(trigger=trigger)
+
+    if not trigger_db:
+        LOG.debug('No trigger in db for %s', trigger)
+        if raise_on_no_trigger:
+            raise StackStormDBObjectNotFoundError('Trigger not found for %s', trigger)
+        return None
+
+    trigger_ref = trigger_db.get_reference().ref
+
+    trigger_instance = TriggerInstanceDB()
+    trigger_instance.trigger = trigger_ref
+    trigger_instance.payload = payload
+    trigger_instance.occurrence_time = occurrence_time
+    trigger_instance.status = TRIGGER_INSTANCE_PENDING
+    return trigger_instance
+
+
+def create_trigger_instances(trigger_instances):
+    """
+    Persist multiple trigger instance objects using a single bulk insert.
+
+    :param trigger_instances: Trigger instance objects created using
+                              ``create_trigger_instance_db``.
+    :type trigger_instances: ``list`` of :class:`TriggerInstanceDB`
+
+    :rtype: ``list`` of :class:`TriggerInstanceDB`
+    """
+    return TriggerInstance.insert_many(trigger_instances)
+
+
+def get_trigger_db(trigger):
+    """
+    Retrieve TriggerDB object for the provided trigger reference or dictionary with trigger
+    query filters.
+
+    :param trigger: Trigger reference or dictionary with trigger query filters.
+    :type trigger: ``str`` or ``dict``
+
+    :rtype: :class:`TriggerDB`
+    """
     # TODO: This is nasty, this should take a unique reference and not a dict
     if isinstance(trigger, six.string_types):
         trigger_db = TriggerService.get_trigger_db_by_ref(trigger)
@@ -64,22 +127,16 @@ def create_trigger_instance(trigger, payload, occurrence_time, raise_on_no_trigg
             trigger_db = TriggerService.get_trigger_db_given_type_and_params(type=trigger_type,
                                                                              parameters=parameters)
 
-    if not trigger_db:
-        LOG.debug('No trigger in db for %s', trigger)
-        if raise_on_no_trigger:
-            raise StackStormDBObjectNotFoundError('Trigger not found for %s', trigger)
-        return None
-
-    trigger_ref = trigger_db.get_reference().ref
-
-    trigger_instance = TriggerInstanceDB()
-    trigger_instance.trigger = trigger_ref
-    trigger_instance.payload = payload
-    trigger_instance.occurrence_time = occurrence_time
-    trigger_instance.status = TRIGGER_INSTANCE_PENDING
-    return TriggerInstance.add_or_update(trigger_instance)
+    return trigger_db
 
 
 def update_trigger_instance_status(trigger_instance, status):
     trigger_instance.status = status
     return TriggerInstance.add_or_update(trigger_instance)
+
+
+def update_trigger_instances_status(trigger_instances, status):
+    """
+    Update status of multiple trigger instances using a single query.
+    """
+    return TriggerInstance.update_status_many(trigger_instances, status)
@@ -64,6 +64,8 @@ class GarbageCollectorService(object):
         self._action_executions_output_ttl = cfg.CONF.garbagecollector.action_executions_output_ttl
         self._trigger_instances_ttl = cfg.CONF.garbagecollector.trigger_instances_ttl
         self._purge_inquiries = cfg.CONF.garbagecollector.purge_inquiries
+        self._purge_batch_size = cfg.CONF.garbagecollector.purge_batch_size
+        self._purge_rate_limit = cfg.CONF.garbagecollector.purge_rate_limit
 
         self._validate_ttl_values()
 
@@ -179,7 +181,9 @@ class GarbageCollectorService(object):
         assert timestamp < utc_now
 
         try:
-            purge_executions(logger=LOG, timestamp=timestamp)
+            purge_executions(logger=LOG, timestamp=timestamp,
+                             batch_size=self._purge_batch_size,
+                             rate_limit=self._purge_rate_limit)
         except Exception as e:
             LOG.exception('Failed to delete executions: %s' % (str(e)))
 
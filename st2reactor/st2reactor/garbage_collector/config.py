@@ -19,6 +19,7 @@ import st2common.config as common_config
 from st2common.constants.system import VERSION_STRING
 from st2common.constants.garbage_collection import DEFAULT_COLLECTION_INTERVAL
 from st2common.constants.garbage_collection import DEFAULT_SLEEP_DELAY
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
 common_config.register_opts()
 
 CONF = cfg.CONF
@@ -77,5 +78,15 @@ def _register_garbage_collector_opts():
     ]
     CONF.register_opts(inquiry_opts, group='garbagecollector')
 
+    purge_opts = [
+        cfg.IntOpt('purge_batch_size', default=DEFAULT_PURGE_BATCH_SIZE,
+                   help=('Number of action executions and live actions which are deleted in a '
+                         'single batch.')),
+        cfg.FloatOpt('purge_rate_limit', default=0,
+                     help=('Maximum number of action executions and live actions which are '
+                           'deleted per second. 0 means no limit.'))
+    ]
+    CONF.register_opts(purge_opts, group='garbagecollector')
+
 
 register_opts()
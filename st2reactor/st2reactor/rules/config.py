@@ -40,11 +40,25 @@ def _register_common_opts():
 
 
 def _register_rules_engine_opts():
-    logging_opts = [
+    rules_engine_opts = [
         cfg.StrOpt('logging', default='conf/logging.rulesengine.conf',
-                   help='Location of the logging configuration file.')
+                   help='Location of the logging configuration file.'),
+        cfg.BoolOpt('enable_rules_index', default=True,
+                    help='True to keep an in-process index of compiled rules which is updated '
+                         'using rule CUD events instead of querying the database for each '
+                         'trigger instance.'),
+        cfg.BoolOpt('enable_shared_predicates', default=False,
+                    help='True to merge criteria of all the rules on a trigger and evaluate each '
+                         'distinct criterion (key, operator, pattern) only once per trigger '
+                         'instance.'),
+        cfg.IntOpt('batch_size', default=1,
+                   help='Maximum number of trigger instances which are consumed, persisted and '
+                        'acknowledged as a single batch. 1 means batching is disabled.'),
+        cfg.FloatOpt('batch_flush_interval', default=0.1,
+                     help='Maximum time in seconds a partially filled batch of trigger instances '
+                          'waits before being flushed.')
     ]
-    CONF.register_opts(logging_opts, group='rulesengine')
+    CONF.register_opts(rules_engine_opts, group='rulesengine')
 
     timer_opts = [
         cfg.StrOpt('local_timezone', default='America/Los_Angeles',
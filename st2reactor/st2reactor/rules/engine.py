@@ -23,6 +23,19 @@ LOG = logging.getLogger('st2reactor.rules.RulesEngine')
 
 
 class RulesEngine(object):
+    def __init__(self, rules_index=None, shared_predicates=False):
+        """
+        :param rules_index: Optional index of compiled rules. If not provided, rules are retrieved
+                            from the database for each trigger instance.
+        :type rules_index: :class:`RulesIndex`
+
+        :param shared_predicates: True to evaluate each distinct criterion only once for all the
+                                  rules on a trigger.
+        :type shared_predicates: ``bool``
+        """
+        self._rules_index = rules_index
+        self._shared_predicates = shared_predicates
+
     def handle_trigger_instance(self, trigger_instance):
         # Find matching rules for trigger instance.
         matching_rules = self.get_matching_rules_for_trigger(trigger_instance)
@@ -45,7 +58,16 @@ class RulesEngine(object):
             LOG.error('No matching trigger found in db for trigger instance %s.', trigger_instance)
             return None
 
-        rules = get_rules_given_trigger(trigger=trigger)
+        predicates = None
+        if self._rules_index:
+            compiled_rules = self._rules_index.get_rules_for_trigger(trigger_ref=trigger)
+            rules = [compiled_rule.rule for compiled_rule in compiled_rules]
+
+            if self._shared_predicates:
+                predicates = self._rules_index.get_shared_predicates(trigger_ref=trigger)
+        else:
+            compiled_rules = None
+            rules = get_rules_given_trigger(trigger=trigger)
 
         LOG.info('Found %d rules defined for trigger %s', len(rules),
                  trigger_db.get_reference().ref)
@@ -54,7 +76,10 @@ class RulesEngine(object):
             return rules
 
         matcher = RulesMatcher(trigger_instance=trigger_instance,
-                               trigger=trigger_db, rules=rules)
+                               trigger=trigger_db, rules=rules,
+                               compiled_rules=compiled_rules,
+                               shared_predicates=self._shared_predicates,
+                               predicates=predicates)
 
         matching_rules = matcher.get_matching_rules()
         LOG.info('Matched %s rule(s) for trigger_instance %s (trigger=%s)', len(matching_rules),
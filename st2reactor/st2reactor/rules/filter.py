@@ -23,14 +23,26 @@ import st2common.operators as criteria_operators
 from st2common.constants.rules import TRIGGER_PAYLOAD_PREFIX, RULE_TYPE_BACKSTOP, MATCH_CRITERIA
 from st2common.constants.keyvalue import SYSTEM_SCOPES
 from st2common.services.keyvalues import KeyValueLookup
+from st2common.util.jinja import is_jinja_expression
 from st2common.util.templating import render_template_with_system_context
 
+__all__ = [
+    'RuleFilter',
+    'SecondPassRuleFilter',
+
+    'CompiledCriterion',
+    'CompiledRule',
+    'PayloadLookup'
+]
 
 LOG = logging.getLogger('st2reactor.ruleenforcement.filter')
 
+MATCH_CRITERIA_PTRN = re.compile(MATCH_CRITERIA)
+
 
 class RuleFilter(object):
-    def __init__(self, trigger_instance, trigger, rule, extra_info=False):
+    def __init__(self, trigger_instance, trigger, rule, extra_info=False, compiled_rule=None,
+                 payload_lookup=None, predicate_results=None):
         """
         :param trigger_instance: TriggerInstance DB object.
         :type trigger_instance: :class:`TriggerInstanceDB``
@@ -40,11 +52,27 @@ class RuleFilter(object):
 
         :param rule: Rule DB object.
         :type rule: :class:`RuleDB`
+
+        :param compiled_rule: Pre-compiled version of the rule. If not provided, rule is compiled
+                              on instantiation.
+        :type compiled_rule: :class:`CompiledRule`
+
+        :param payload_lookup: Lookup for the trigger instance payload which can be shared
+                               between multiple filters for the same trigger instance.
+        :type payload_lookup: :class:`PayloadLookup`
+
+        :param predicate_results: Criteria results shared between multiple filters for the same
+                                  trigger instance. If provided, each distinct criterion is only
+                                  evaluated once.
+        :type predicate_results: :class:`PredicateResults`
         """
         self.trigger_instance = trigger_instance
         self.trigger = trigger
         self.rule = rule
         self.extra_info = extra_info
+        self.compiled_rule = compiled_rule or CompiledRule(rule=rule)
+        self._payload_lookup = payload_lookup
+        self._predicate_results = predicate_results
 
         # Base context used with a logger
         self._base_logger_context = {
@@ -73,24 +101,22 @@ class RuleFilter(object):
         if criteria and not self.trigger_instance.payload:
             return False
 
-        payload_lookup = PayloadLookup(self.trigger_instance.payload)
+        payload_lookup = self._payload_lookup or PayloadLookup(self.trigger_instance.payload)
 
         LOG.debug('Trigger payload: %s', self.trigger_instance.payload,
                   extra=self._base_logger_context)
 
-        for criterion_k in criteria.keys():
-            criterion_v = criteria[criterion_k]
+        for compiled_criterion in self.compiled_rule.criteria:
             is_rule_applicable, payload_value, criterion_pattern = self._check_criterion(
-                criterion_k,
-                criterion_v,
+                compiled_criterion,
                 payload_lookup
             )
             if not is_rule_applicable:
                 if self.extra_info:
                     criteria_extra_info = '\n'.join([
-                        '  key: %s' % criterion_k,
+                        '  key: %s' % compiled_criterion.key,
                         '  pattern: %s' % criterion_pattern,
-                        '  type: %s' % criterion_v['type'],
+                        '  type: %s' % compiled_criterion.operator,
                         '  payload: %s' % payload_value
                     ])
                     LOG.info('Validation for rule %s failed on criteria -\n%s', self.rule.ref,
@@ -104,27 +130,38 @@ class RuleFilter(object):
 
         return is_rule_applicable
 
-    def _check_criterion(self, criterion_k, criterion_v, payload_lookup):
-        if 'type' not in criterion_v:
+    def _check_criterion(self, compiled_criterion, payload_lookup):
+        if self._predicate_results is not None:
+            return self._predicate_results.get_result(criterion=compiled_criterion,
+                                                      payload_lookup=payload_lookup,
+                                                      evaluate_func=self._evaluate_criterion)
+
+        return self._evaluate_criterion(compiled_criterion, payload_lookup)
+
+    def _evaluate_criterion(self, compiled_criterion, payload_lookup):
+        if not compiled_criterion.has_operator:
             # Comparison operator type not specified, can't perform a comparison
             return (False, None, None)
 
-        criteria_operator = criterion_v['type']
-        criteria_pattern = criterion_v.get('pattern', None)
+        criterion_k = compiled_criterion.key
+        criteria_pattern = compiled_criterion.pattern
 
-        # Render the pattern (it can contain a jinja expressions)
-        try:
-            criteria_pattern = self._render_criteria_pattern(
-                criteria_pattern=criteria_pattern,
-                criteria_context=payload_lookup.context
-            )
-        except Exception:
-            LOG.exception('Failed to render pattern value "%s" for key "%s"' %
-                          (criteria_pattern, criterion_k), extra=self._base_logger_context)
-            return (False, None, None)
+        # Render the pattern (it can contain a jinja expressions). Static patterns don't need to
+        # be rendered.
+        if not compiled_criterion.is_static_pattern:
+            try:
+                criteria_pattern = self._render_criteria_pattern(
+                    criteria_pattern=criteria_pattern,
+                    criteria_context=payload_lookup.context,
+                    compiled_criterion=compiled_criterion
+                )
+            except Exception:
+                LOG.exception('Failed to render pattern value "%s" for key "%s"' %
+                              (criteria_pattern, criterion_k), extra=self._base_logger_context)
+                return (False, None, None)
 
         try:
-            matches = payload_lookup.get_value(criterion_k)
+            matches = payload_lookup.get_value_for_expression(compiled_criterion.get_expression())
             # pick value if only 1 matches else will end up being an array match.
             if matches:
                 payload_value = matches[0] if len(matches) > 0 else matches
@@ -135,7 +172,7 @@ class RuleFilter(object):
                           extra=self._base_logger_context)
             return (False, None, None)
 
-        op_func = criteria_operators.get_operator(criteria_operator)
+        op_func = compiled_criterion.get_operator()
 
         try:
             result = op_func(value=payload_value, criteria_pattern=criteria_pattern)
@@ -146,7 +183,8 @@ class RuleFilter(object):
 
         return result, payload_value, criteria_pattern
 
-    def _render_criteria_pattern(self, criteria_pattern, criteria_context):
+    def _render_criteria_pattern(self, criteria_pattern, criteria_context,
+                                 compiled_criterion=None):
         # Note: Here we want to use strict comparison to None to make sure that
         # other falsy values such as integer 0 are handled correctly.
         if criteria_pattern is None:
@@ -167,12 +205,13 @@ class RuleFilter(object):
 
         # Check if jinja variable is in criteria_pattern and if so lets ensure
         # the proper type is applied to it using to_complex jinja filter
-        if len(re.findall(MATCH_CRITERIA, criteria_pattern)) > 0:
+        if compiled_criterion and compiled_criterion.pattern == criteria_pattern:
+            complex_criteria_pattern = compiled_criterion.complex_pattern
+        else:
+            complex_criteria_pattern = get_complex_criteria_pattern(criteria_pattern)
+
+        if complex_criteria_pattern:
             LOG.debug("Rendering Complex")
-            complex_criteria_pattern = re.sub(
-                MATCH_CRITERIA, r'\1\2 | to_complex\3',
-                criteria_pattern
-            )
 
             try:
                 criteria_rendered = render_template_with_system_context(
@@ -203,7 +242,8 @@ class SecondPassRuleFilter(RuleFilter):
     Special filter that handles all second pass rules. For not these are only
     backstop rules i.e. those that can match when no other rule has matched.
     """
-    def __init__(self, trigger_instance, trigger, rule, first_pass_matched):
+    def __init__(self, trigger_instance, trigger, rule, first_pass_matched, compiled_rule=None,
+                 payload_lookup=None, predicate_results=None):
         """
         :param trigger_instance: TriggerInstance DB object.
         :type trigger_instance: :class:`TriggerInstanceDB``
@@ -217,7 +257,10 @@ class SecondPassRuleFilter(RuleFilter):
         :param first_pass_matched: Rules that matched in the first pass.
         :type first_pass_matched: `list`
         """
-        super(SecondPassRuleFilter, self).__init__(trigger_instance, trigger, rule)
+        super(SecondPassRuleFilter, self).__init__(trigger_instance, trigger, rule,
+                                                   compiled_rule=compiled_rule,
+                                                   payload_lookup=payload_lookup,
+                                                   predicate_results=predicate_results)
         self.first_pass_matched = first_pass_matched
 
     def filter(self):
@@ -242,7 +285,132 @@ class PayloadLookup(object):
 
     def get_value(self, lookup_key):
         expr = parse(lookup_key)
+        return self.get_value_for_expression(expr)
+
+    def get_value_for_expression(self, expr):
         matches = [match.value for match in expr.find(self.context)]
         if not matches:
             return None
         return matches
+
+
+class CompiledCriterion(object):
+    """
+    Rule criterion with all the parts which only depend on the rule definition (jsonpath
+    expression for the key, operator function and static pattern) prepared up front so they can
+    be re-used for every trigger instance which is matched against the rule.
+    """
+
+    def __init__(self, key, criterion):
+        self.key = key
+        self.has_operator = 'type' in criterion
+        self.operator = criterion.get('type', None)
+        self.pattern = criterion.get('pattern', None)
+        self.is_static_pattern = is_static_criteria_pattern(self.pattern)
+        self.complex_pattern = (get_complex_criteria_pattern(self.pattern)
+                                if not self.is_static_pattern else None)
+        self.predicate_key = self._get_predicate_key()
+
+        self._expression = None
+        self._op_func = None
+
+        # Note: Errors are intentionally not stored here. They are raised and handled (logged)
+        # each time the criterion is evaluated, same as with a non-compiled criterion.
+        try:
+            self.get_expression()
+        except Exception:
+            pass
+
+        try:
+            self.get_operator()
+        except Exception:
+            pass
+
+    def get_expression(self):
+        if self._expression is None:
+            self._expression = parse(self.key)
+
+        return self._expression
+
+    def get_operator(self):
+        if self._op_func is None:
+            if self.is_static_pattern:
+                self._op_func = criteria_operators.get_compiled_operator(self.operator,
+                                                                         self.pattern)
+            else:
+                self._op_func = criteria_operators.get_operator(self.operator)
+
+        return self._op_func
+
+    def _get_predicate_key(self):
+        """
+        Return a key which identifies criteria which always evaluate to the same result for the
+        same trigger instance (same key, operator and pattern).
+
+        :rtype: ``tuple`` or ``None``
+        """
+        if not self.has_operator or not isinstance(self.operator, six.string_types):
+            return None
+
+        try:
+            pattern_key = json.dumps(self.pattern, sort_keys=True)
+        except (TypeError, ValueError):
+            # Pattern can't be compared to other patterns, this criterion is not shared
+            return None
+
+        # Aliases (e.g. eq and equals) map to the same operator function
+        operator = criteria_operators.get_allowed_operators().get(self.operator.lower(),
+                                                                  self.operator)
+        return (self.key, operator, pattern_key)
+
+
+class CompiledRule(object):
+    """
+    Rule with pre-compiled criteria.
+    """
+
+    def __init__(self, rule):
+        """
+        :param rule: Rule DB object.
+        :type rule: :class:`RuleDB`
+        """
+        self.rule = rule
+
+        criteria = rule.criteria or {}
+        self.criteria = [CompiledCriterion(key=criterion_k, criterion=criterion_v)
+                         for criterion_k, criterion_v in six.iteritems(criteria)]
+
+    @property
+    def is_backstop(self):
+        return self.rule.type['ref'] == RULE_TYPE_BACKSTOP
+
+
+def get_complex_criteria_pattern(criteria_pattern):
+    """
+    Return the criteria pattern with the to_complex filter applied to all the Jinja variables so
+    the rendered values retain their type.
+
+    :return: Pattern or None if the pattern contains no Jinja variables.
+    :rtype: ``str``
+    """
+    if not MATCH_CRITERIA_PTRN.search(criteria_pattern):
+        return None
+
+    return MATCH_CRITERIA_PTRN.sub(r'\1\2 | to_complex\3', criteria_pattern)
+
+
+def is_static_criteria_pattern(criteria_pattern):
+    """
+    Return True if the provided criteria pattern doesn't need to be rendered using Jinja.
+
+    :rtype: ``bool``
+    """
+    if not isinstance(criteria_pattern, six.string_types):
+        # Only string values are rendered
+        return True
+
+    if is_jinja_expression(criteria_pattern) or '{#' in criteria_pattern:
+        return False
+
+    # Jinja strips a single trailing newline so such strings can't be used as-is
+    return not criteria_pattern.endswith('\n')
@@ -0,0 +1,170 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+
+from st2common import log as logging
+from st2common.services.rules import get_rules_with_trigger_ref
+from st2common.services.rule_watcher import RuleWatcher
+from st2reactor.rules.filter import CompiledRule
+from st2reactor.rules.predicates import SharedPredicates
+
+__all__ = [
+    'RulesIndex'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class RulesIndex(object):
+    """
+    In-process index of compiled enabled rules keyed by trigger reference.
+
+    Rules for a particular trigger are retrieved from the database and compiled the first time
+    they are needed. After that, the index is updated incrementally using rule CUD events from the
+    message bus so matching a trigger instance doesn't require a database query.
+    """
+
+    def __init__(self, queue_suffix='rulesengine'):
+        # Maps trigger ref to an ordered dict of rule id -> CompiledRule
+        self._rules_by_trigger_ref = {}
+
+        # Maps rule id to the trigger ref under which the rule is indexed
+        self._trigger_ref_by_rule_id = {}
+
+        # Maps trigger ref to the SharedPredicates for the indexed rules
+        self._predicates_by_trigger_ref = {}
+
+        # Incremented each time a rule for a particular trigger ref changes. Used to detect
+        # changes which happen while the rules for a trigger are being loaded from the database.
+        self._versions = {}
+
+        self._watcher = RuleWatcher(create_handler=self.add_or_update_rule,
+                                    update_handler=self.add_or_update_rule,
+                                    delete_handler=self.remove_rule,
+                                    connect_handler=self.clear,
+                                    queue_suffix=queue_suffix)
+
+    def start(self):
+        self._watcher.start()
+
+    def stop(self):
+        self._watcher.stop()
+
+    def get_rules_for_trigger(self, trigger_ref):
+        """
+        Return compiled enabled rules for the provided trigger.
+
+        :param trigger_ref: Reference to the trigger.
+        :type trigger_ref: ``str``
+
+        :rtype: ``list`` of :class:`CompiledRule`
+        """
+        compiled_rules = self._rules_by_trigger_ref.get(trigger_ref, None)
+
+        if compiled_rules is None:
+            compiled_rules = self._load_rules_for_trigger(trigger_ref=trigger_ref)
+
+        return list(compiled_rules.values())
+
+    def get_shared_predicates(self, trigger_ref):
+        """
+        Return shared predicates structure for the compiled rules of the provided trigger.
+
+        :rtype: :class:`SharedPredicates`
+        """
+        predicates = self._predicates_by_trigger_ref.get(trigger_ref, None)
+
+        if predicates is None:
+            compiled_rules = self.get_rules_for_trigger(trigger_ref=trigger_ref)
+            predicates = SharedPredicates(compiled_rules=compiled_rules)
+
+            if trigger_ref in self._rules_by_trigger_ref:
+                self._predicates_by_trigger_ref[trigger_ref] = predicates
+
+        return predicates
+
+    def add_or_update_rule(self, rule_db):
+        rule_id = str(rule_db.id)
+
+        self.remove_rule(rule_db)
+
+        if not rule_db.enabled:
+            return
+
+        self._bump_version(rule_db.trigger)
+        compiled_rules = self._rules_by_trigger_ref.get(rule_db.trigger, None)
+
+        # Rules for this trigger haven't been loaded yet, they will be retrieved from the
+        # database when needed
+        if compiled_rules is None:
+            return
+
+        LOG.debug('Adding rule "%s" to the index (trigger=%s).', rule_db.ref, rule_db.trigger)
+        compiled_rules[rule_id] = CompiledRule(rule=rule_db)
+        self._trigger_ref_by_rule_id[rule_id] = rule_db.trigger
+
+    def remove_rule(self, rule_db):
+        rule_id = str(rule_db.id)
+        trigger_ref = self._trigger_ref_by_rule_id.pop(rule_id, rule_db.trigger)
+
+        self._bump_version(trigger_ref)
+        compiled_rules = self._rules_by_trigger_ref.get(trigger_ref, None)
+
+        if compiled_rules and compiled_rules.pop(rule_id, None):
+            LOG.debug('Removed rule "%s" from the index (trigger=%s).', rule_db.ref, trigger_ref)
+
+    def clear(self):
+        """
+        Drop all the indexed rules. Rules will be re-loaded from the database on next use.
+        """
+        LOG.debug('Clearing rules index.')
+
+        for trigger_ref in list(self._rules_by_trigger_ref.keys()):
+            self._bump_version(trigger_ref)
+
+        self._rules_by_trigger_ref = {}
+        self._trigger_ref_by_rule_id = {}
+        self._predicates_by_trigger_ref = {}
+
+    def _load_rules_for_trigger(self, trigger_ref):
+        version = self._versions.get(trigger_ref, 0)
+
+        rule_dbs = get_rules_with_trigger_ref(trigger_ref=trigger_ref, enabled=True) or []
+
+        compiled_rules = OrderedDict()
+        for rule_db in rule_dbs:
+            compiled_rules[str(rule_db.id)] = CompiledRule(rule=rule_db)
+
+        # Rules for this trigger changed while they were being loaded, don't cache potentially
+        # stale result
+        if self._versions.get(trigger_ref, 0) != version:
+            LOG.debug('Rules for trigger "%s" changed during load, not caching them.',
+                      trigger_ref)
+            return compiled_rules
+
+        self._rules_by_trigger_ref[trigger_ref] = compiled_rules
+        for rule_id in compiled_rules.keys():
+            self._trigger_ref_by_rule_id[rule_id] = trigger_ref
+
+        LOG.debug('Loaded %s rule(s) for trigger "%s" into the index.', len(compiled_rules),
+                  trigger_ref)
+        return compiled_rules
+
+    def _bump_version(self, trigger_ref):
+        self._versions[trigger_ref] = self._versions.get(trigger_ref, 0) + 1
+
+        # Shared predicates are re-built on next use
+        self._predicates_by_trigger_ref.pop(trigger_ref, None)
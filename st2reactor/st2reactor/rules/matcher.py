@@ -15,32 +15,67 @@
 
 from st2common import log as logging
 from st2common.constants.rules import RULE_TYPE_BACKSTOP
-from st2reactor.rules.filter import RuleFilter, SecondPassRuleFilter
+from st2reactor.rules.filter import RuleFilter, SecondPassRuleFilter, PayloadLookup
+from st2reactor.rules.filter import CompiledRule
+from st2reactor.rules.predicates import SharedPredicates, PredicateResults
 
 LOG = logging.getLogger('st2reactor.rules.RulesMatcher')
 
 
 class RulesMatcher(object):
-    def __init__(self, trigger_instance, trigger, rules, extra_info=False):
+    def __init__(self, trigger_instance, trigger, rules, extra_info=False, compiled_rules=None,
+                 shared_predicates=False, predicates=None):
+        """
+        :param compiled_rules: Optional pre-compiled versions of the provided rules. Rules without
+                               a corresponding compiled rule are compiled on the fly.
+        :type compiled_rules: ``list`` of :class:`CompiledRule`
+
+        :param shared_predicates: True to evaluate each distinct criterion (key, operator,
+                                  pattern) only once for all the rules instead of evaluating
+                                  criteria of each rule independently.
+        :type shared_predicates: ``bool``
+
+        :param predicates: Optional pre-built discrimination structure for the provided rules
+                           which is used when shared_predicates is True. If not provided, it's
+                           built on the fly.
+        :type predicates: :class:`SharedPredicates`
+        """
         self.trigger_instance = trigger_instance
         self.trigger = trigger
         self.rules = rules
         self.extra_info = extra_info
+        self.shared_predicates = shared_predicates
+
+        # Maps rule id to the pre-compiled rule
+        self._compiled_rules = dict([(compiled_rule.rule.id, compiled_rule)
+                                     for compiled_rule in compiled_rules or []])
+        self._predicates = predicates
 
     def get_matching_rules(self):
         first_pass, second_pass = self._split_rules_into_passes()
+
+        # Payload lookup is shared by all the rule filters for this trigger instance
+        payload_lookup = PayloadLookup(self.trigger_instance.payload)
+        predicate_results = self._get_predicate_results()
+
         # first pass
         rule_filters = [RuleFilter(trigger_instance=self.trigger_instance,
                                    trigger=self.trigger,
                                    rule=rule,
-                                   extra_info=self.extra_info)
+                                   extra_info=self.extra_info,
+                                   compiled_rule=self._get_compiled_rule(rule),
+                                   payload_lookup=payload_lookup,
+                                   predicate_results=predicate_results)
                         for rule in first_pass]
         matched_rules = [rule_filter.rule for rule_filter in rule_filters if rule_filter.filter()]
         LOG.debug('[1st_pass] %d rule(s) found to enforce for %s.', len(matched_rules),
                   self.trigger['name'])
         # second pass
         rule_filters = [SecondPassRuleFilter(self.trigger_instance, self.trigger, rule,
-                                             matched_rules)
+                                             matched_rules,
+                                             compiled_rule=self._get_compiled_rule(rule),
+                                             payload_lookup=payload_lookup,
+                                             predicate_results=predicate_results)
                         for rule in second_pass]
         matched_in_second_pass = [rule_filter.rule for rule_filter in rule_filters
                                   if rule_filter.filter()]
@@ -49,8 +84,29 @@ class RulesMatcher(object):
         matched_rules.extend(matched_in_second_pass)
         LOG.info('%d rule(s) found to enforce for %s.', len(matched_rules),
                  self.trigger['name'])
+
+        if predicate_results:
+            LOG.debug('%d distinct predicate(s) evaluated for %s.',
+                      predicate_results.evaluated_count, self.trigger['name'])
+
         return matched_rules
 
+    def _get_predicate_results(self):
+        if not self.shared_predicates:
+            return None
+
+        predicates = self._predicates
+        if predicates is None:
+            compiled_rules = [self._get_compiled_rule(rule) or CompiledRule(rule=rule)
+                              for rule in self.rules]
+            # Make sure the same compiled rules are also used by the filters
+            self._compiled_rules.update(dict([(compiled_rule.rule.id, compiled_rule)
+                                              for compiled_rule in compiled_rules
+                                              if compiled_rule.rule.id is not None]))
+            predicates = SharedPredicates(compiled_rules=compiled_rules)
+
+        return PredicateResults(shared_predicates=predicates)
+
     def _split_rules_into_passes(self):
         """
         Splits the rules in the Matcher into first_pass and second_pass collections.
@@ -66,5 +122,11 @@ class RulesMatcher(object):
                 second_pass.append(rule)
         return first_pass, second_pass
 
+    def _get_compiled_rule(self, rule):
+        if not self._compiled_rules or rule.id is None:
+            return None
+
+        return self._compiled_rules.get(rule.id, None)
+
     def _is_first_pass_rule(self, rule):
         return rule.type['ref'] != RULE_TYPE_BACKSTOP
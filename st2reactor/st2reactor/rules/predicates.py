@@ -0,0 +1,202 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from st2common import log as logging
+import st2common.operators as criteria_operators
+
+__all__ = [
+    'SharedPredicates',
+    'PredicateResults'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Operators which can be evaluated for all the patterns on a particular key at once using a hash
+# table lookup. Maps operator function to a flag which indicates if the result is negated.
+EQUALS_OPERATORS = {
+    criteria_operators.equals: False,
+    criteria_operators.nequals: True
+}
+
+INSIDE_OPERATORS = {
+    criteria_operators.inside: False,
+    criteria_operators.ninside: True
+}
+
+
+class SharedPredicates(object):
+    """
+    Discrimination structure which merges criteria of all the rules on a particular trigger.
+
+    Static equality (``equals`` / ``nequals``) and membership (``inside`` / ``ninside``)
+    criteria which test the same payload key are merged into hash tables so all of them can be
+    evaluated using a single payload lookup and a single hash table lookup, regardless of the
+    number of rules which use them.
+    """
+
+    def __init__(self, compiled_rules):
+        """
+        :param compiled_rules: Compiled rules for a particular trigger.
+        :type compiled_rules: ``list`` of :class:`CompiledRule`
+        """
+        # Maps criteria key to a compiled criterion which is used for the payload lookup
+        self._lookup_criteria = {}
+
+        # Maps criteria key to a table of pattern (or pattern item) -> set of predicate keys
+        self._equals_tables = {}
+        self._inside_tables = {}
+
+        # Maps criteria key to a list of (predicate key, pattern, negate, table) tuples
+        self._indexed_predicates = {}
+
+        # Predicate keys which can be evaluated using the tables above
+        self._indexed_predicate_keys = set()
+
+        for compiled_rule in compiled_rules:
+            for criterion in compiled_rule.criteria:
+                self._add_criterion(criterion)
+
+    @property
+    def indexed_predicates_count(self):
+        return len(self._indexed_predicate_keys)
+
+    def is_indexed(self, predicate_key):
+        return predicate_key in self._indexed_predicate_keys
+
+    def evaluate_key(self, key, payload_lookup):
+        """
+        Evaluate all the indexed predicates for the provided criteria key.
+
+        :return: Dictionary mapping predicate key to a (result, payload_value, pattern) tuple or
+                 ``None`` if the predicates can't be evaluated using a hash table lookup (e.g.
+                 payload value is not hashable). In that case, each predicate needs to be
+                 evaluated on its own.
+        :rtype: ``dict`` or ``None``
+        """
+        criterion = self._lookup_criteria.get(key, None)
+        if not criterion:
+            return None
+
+        try:
+            matches = payload_lookup.get_value_for_expression(criterion.get_expression())
+            payload_value = matches[0] if matches else None
+            hash(payload_value)
+        except Exception:
+            # Errors are handled and logged when predicates are evaluated on their own
+            return None
+
+        results = {}
+        for predicate_key, pattern, negate, table in self._indexed_predicates[key]:
+            result = predicate_key in table.get(payload_value, ())
+            if negate:
+                result = not result
+            results[predicate_key] = (result, payload_value, pattern)
+
+        return results
+
+    def _add_criterion(self, criterion):
+        predicate_key = criterion.predicate_key
+
+        if predicate_key is None or predicate_key in self._indexed_predicate_keys:
+            return
+
+        if not criterion.is_static_pattern or criterion.pattern is None:
+            return
+
+        operator = predicate_key[1]
+
+        if operator in EQUALS_OPERATORS:
+            items = [criterion.pattern]
+            tables = self._equals_tables
+            negate = EQUALS_OPERATORS[operator]
+        elif operator in INSIDE_OPERATORS and isinstance(criterion.pattern, (list, tuple)):
+            items = criterion.pattern
+            tables = self._inside_tables
+            negate = INSIDE_OPERATORS[operator]
+        else:
+            return
+
+        try:
+            criterion.get_expression()
+            for item in items:
+                hash(item)
+        except Exception:
+            return
+
+        key = criterion.key
+        table = tables.setdefault(key, {})
+        for item in items:
+            table.setdefault(item, set()).add(predicate_key)
+
+        self._lookup_criteria.setdefault(key, criterion)
+        self._indexed_predicates.setdefault(key, []).append((predicate_key, criterion.pattern,
+                                                             negate, table))
+        self._indexed_predicate_keys.add(predicate_key)
+
+
+class PredicateResults(object):
+    """
+    Results of the criteria evaluated for a single trigger instance. Each distinct predicate
+    (key, operator, pattern) is only evaluated once and the result is shared by all the rules.
+    """
+
+    def __init__(self, shared_predicates=None):
+        """
+        :param shared_predicates: Optional discrimination structure for the rules which are
+                                  matched.
+        :type shared_predicates: :class:`SharedPredicates`
+        """
+        self._shared_predicates = shared_predicates
+        self._results = {}
+        self._evaluated_keys = set()
+
+        # Number of predicates which were evaluated on their own
+        self.evaluated_count = 0
+
+    def get_result(self, criterion, payload_lookup, evaluate_func):
+        """
+        Return result for the provided criterion, evaluating it if needed.
+
+        :param evaluate_func: Function which evaluates a single criterion and returns a
+                              (result, payload_value, pattern) tuple.
+        :type evaluate_func: ``callable``
+
+        :rtype: ``tuple``
+        """
+        predicate_key = criterion.predicate_key
+
+        if predicate_key is None:
+            self.evaluated_count += 1
+            return evaluate_func(criterion, payload_lookup)
+
+        if predicate_key in self._results:
+            return self._results[predicate_key]
+
+        shared_predicates = self._shared_predicates
+        if (shared_predicates and shared_predicates.is_indexed(predicate_key) and
+                criterion.key not in self._evaluated_keys):
+            self._evaluated_keys.add(criterion.key)
+            results = shared_predicates.evaluate_key(key=criterion.key,
+                                                     payload_lookup=payload_lookup)
+            if results:
+                self._results.update(results)
+
+            if predicate_key in self._results:
+                return self._results[predicate_key]
+
+        self.evaluated_count += 1
+        result = evaluate_func(criterion, payload_lookup)
+        self._results[predicate_key] = result
+        return result
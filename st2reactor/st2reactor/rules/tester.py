@@ -38,18 +38,23 @@ LOG = logging.getLogger(__name__)
 
 class RuleTester(object):
     def __init__(self, rule_file_path=None, rule_ref=None, trigger_instance_file_path=None,
-                 trigger_instance_id=None):
+                 trigger_instance_id=None, shared_predicates=False):
         """
         :param rule_file_path: Path to the file containing rule definition.
         :type rule_file_path: ``str``
 
         :param trigger_instance_file_path: Path to the file containg trigger instance definition.
         :type trigger_instance_file_path: ``str``
+
+        :param shared_predicates: True to use shared predicate evaluation (same as the rules
+                                  engine when ``enable_shared_predicates`` is set).
+        :type shared_predicates: ``bool``
         """
         self._rule_file_path = rule_file_path
         self._rule_ref = rule_ref
         self._trigger_instance_file_path = trigger_instance_file_path
         self._trigger_instance_id = trigger_instance_id
+        self._shared_predicates = shared_predicates
         self._meta_loader = MetaLoader()
 
     def evaluate(self):
@@ -72,7 +77,8 @@ class RuleTester(object):
 
         # Check if rule matches criteria.
         matcher = RulesMatcher(trigger_instance=trigger_instance_db, trigger=trigger_db,
-                               rules=[rule_db], extra_info=True)
+                               rules=[rule_db], extra_info=True,
+                               shared_predicates=self._shared_predicates)
         matching_rules = matcher.get_matching_rules()
 
         # Rule does not match so early exit.
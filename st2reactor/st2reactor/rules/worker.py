@@ -13,7 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import six
 from kombu import Connection
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.constants.trace import TRACE_CONTEXT, TRACE_ID
@@ -21,9 +23,12 @@ from st2common.constants import triggers as trigger_constants
 from st2common.util import date as date_utils
 from st2common.services import trace as trace_service
 from st2common.transport import consumers
+from st2common.transport.reactor import BATCH_PAYLOADS_KEY
+from st2common.transport.reactor import get_trigger_instance_messages
 from st2common.transport import utils as transport_utils
 import st2reactor.container.utils as container_utils
 from st2reactor.rules.engine import RulesEngine
+from st2reactor.rules.index import RulesIndex
 from st2common.transport.queues import RULESENGINE_WORK_QUEUE
 
 
@@ -35,13 +40,48 @@ class TriggerInstanceDispatcher(consumers.StagedMessageHandler):
 
     def __init__(self, connection, queues):
         super(TriggerInstanceDispatcher, self).__init__(connection, queues)
-        self.rules_engine = RulesEngine()
+
+        if cfg.CONF.rulesengine.enable_rules_index:
+            self.rules_index = RulesIndex()
+        else:
+            self.rules_index = None
+
+        self.rules_engine = RulesEngine(
+            rules_index=self.rules_index,
+            shared_predicates=cfg.CONF.rulesengine.enable_shared_predicates)
+
+    def start(self, wait=False):
+        if self.rules_index:
+            self.rules_index.start()
+
+        super(TriggerInstanceDispatcher, self).start(wait=wait)
+
+    def shutdown(self):
+        super(TriggerInstanceDispatcher, self).shutdown()
+
+        if self.rules_index:
+            self.rules_index.stop()
+
+    def get_queue_consumer(self, connection, queues):
+        batch_size = cfg.CONF.rulesengine.batch_size
+
+        if batch_size > 1:
+            return consumers.BatchedStagedQueueConsumer(
+                connection=connection, queues=queues, handler=self, batch_size=batch_size,
+                flush_interval=cfg.CONF.rulesengine.batch_flush_interval)
+
+        return super(TriggerInstanceDispatcher, self).get_queue_consumer(connection=connection,
+                                                                         queues=queues)
 
     def pre_ack_process(self, message):
         '''
         TriggerInstance from message is create prior to acknowledging the message. This
         gets us a way to not acknowledge messages.
         '''
+        if BATCH_PAYLOADS_KEY in message:
+            # Batch message which contains multiple trigger instances
+            return {'responses': self.pre_ack_process_batch([message])}
+
         trigger = message['trigger']
         payload = message['payload']
 
@@ -56,6 +96,8 @@ class TriggerInstanceDispatcher(consumers.StagedMessageHandler):
         return self._compose_pre_ack_process_response(trigger_instance, message)
 
     def process(self, pre_ack_response):
+        if 'responses' in pre_ack_response:
+            return self.process_batch(pre_ack_response['responses'])
 
         trigger_instance, message = self._decompose_pre_ack_process_response(pre_ack_response)
         if not trigger_instance:
@@ -93,6 +135,107 @@ class TriggerInstanceDispatcher(consumers.StagedMessageHandler):
             LOG.exception('Failed to handle trigger_instance %s.', trigger_instance)
             return
 
+    def pre_ack_process_batch(self, messages):
+        """
+        Create TriggerInstance objects for all the messages in a batch using a single bulk
+        insert.
+        """
+        now = date_utils.get_datetime_utc_now()
+
+        # Trigger lookups are cached for the duration of a batch since many messages in a batch
+        # usually reference the same trigger
+        trigger_dbs = {}
+
+        trigger_instances = []
+        batch_messages = []
+
+        # Batch messages published using TriggerDispatcher.dispatch_many contain multiple trigger
+        # instances
+        messages = [trigger_instance_message for message in messages
+                    for trigger_instance_message in get_trigger_instance_messages(message)]
+
+        for message in messages:
+            try:
+                trigger = message['trigger']
+                payload = message['payload']
+
+                cache_key = trigger if isinstance(trigger, six.string_types) else None
+
+                if cache_key and cache_key in trigger_dbs:
+                    trigger_db = trigger_dbs[cache_key]
+                else:
+                    trigger_db = container_utils.get_trigger_db(trigger=trigger)
+
+                    if cache_key:
+                        trigger_dbs[cache_key] = trigger_db
+
+                trigger_instance = container_utils.create_trigger_instance_db(
+                    trigger,
+                    payload or {},
+                    now,
+                    raise_on_no_trigger=True,
+                    trigger_db=trigger_db)
+            except:
+                LOG.exception('Failed to create trigger_instance for message: %s', message)
+                continue
+
+            trigger_instances.append(trigger_instance)
+            batch_messages.append(message)
+
+        trigger_instances = container_utils.create_trigger_instances(trigger_instances)
+
+        return [self._compose_pre_ack_process_response(trigger_instance_db, message)
+                for trigger_instance_db, message in zip(trigger_instances, batch_messages)]
+
+    def process_batch(self, pre_ack_responses):
+        trigger_instances = []
+        trace_contexts = []
+
+        for pre_ack_response in pre_ack_responses:
+            trigger_instance, message = self._decompose_pre_ack_process_response(pre_ack_response)
+            if not trigger_instance:
+                LOG.error('No trigger_instance provided for processing.')
+                continue
+
+            trace_context = message.get(TRACE_CONTEXT, None)
+            if not trace_context:
+                trace_context = {
+                    TRACE_ID: 'trigger_instance-%s' % str(trigger_instance.id)
+                }
+
+            trigger_instances.append(trigger_instance)
+            trace_contexts.append(trace_context)
+
+        try:
+            trace_service.add_or_update_given_trace_contexts_for_trigger_instances(
+                trace_contexts=trace_contexts,
+                trigger_instances=trigger_instances)
+            container_utils.update_trigger_instances_status(
+                trigger_instances, trigger_constants.TRIGGER_INSTANCE_PROCESSING)
+        except:
+            container_utils.update_trigger_instances_status(
+                trigger_instances, trigger_constants.TRIGGER_INSTANCE_PROCESSING_FAILED)
+            LOG.exception('Failed to handle batch of %s trigger_instances.',
+                          len(trigger_instances))
+            return
+
+        processed = []
+        failed = []
+
+        for trigger_instance in trigger_instances:
+            try:
+                self.rules_engine.handle_trigger_instance(trigger_instance)
+            except:
+                LOG.exception('Failed to handle trigger_instance %s.', trigger_instance)
+                failed.append(trigger_instance)
+            else:
+                processed.append(trigger_instance)
+
+        container_utils.update_trigger_instances_status(
+            processed, trigger_constants.TRIGGER_INSTANCE_PROCESSED)
+        container_utils.update_trigger_instances_status(
+            failed, trigger_constants.TRIGGER_INSTANCE_PROCESSING_FAILED)
+
     @staticmethod
     def _compose_pre_ack_process_response(trigger_instance, message):
         """
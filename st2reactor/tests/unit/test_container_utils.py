@@ -16,8 +16,14 @@
 import mock
 
 from st2common.transport.publishers import PoolPublisher
+from st2common.constants.triggers import TRIGGER_INSTANCE_PENDING
+from st2common.constants.triggers import TRIGGER_INSTANCE_PROCESSED
 from st2reactor.container.utils import create_trigger_instance
+from st2reactor.container.utils import create_trigger_instance_db
+from st2reactor.container.utils import create_trigger_instances
+from st2reactor.container.utils import update_trigger_instances_status
 from st2common.persistence.trigger import Trigger
+from st2common.persistence.trigger import TriggerInstance
 from st2common.models.db.trigger import TriggerDB
 from st2tests.base import CleanDbTestCase
 
@@ -76,3 +82,28 @@ class ContainerUtilsTest(CleanDbTestCase):
         trigger_instance_db = create_trigger_instance(trigger=trigger, payload=payload,
                                                       occurrence_time=occurrence_time)
         self.assertEqual(trigger_instance_db, None)
+
+    def test_create_trigger_instances_bulk(self):
+        trigger_instance_dbs = []
+        for index in range(0, 3):
+            trigger_instance_db = create_trigger_instance_db(trigger='pack1.name1',
+                                                             payload={'index': index},
+                                                             occurrence_time=None)
+            self.assertTrue(trigger_instance_db.id is None)
+            trigger_instance_dbs.append(trigger_instance_db)
+
+        self.assertEqual(len(TriggerInstance.get_all()), 0)
+
+        trigger_instance_dbs = create_trigger_instances(trigger_instance_dbs)
+        self.assertEqual(len(TriggerInstance.get_all()), 3)
+
+        for trigger_instance_db in trigger_instance_dbs:
+            trigger_instance_db = TriggerInstance.get_by_id(trigger_instance_db.id)
+            self.assertEqual(trigger_instance_db.trigger, 'pack1.name1')
+            self.assertEqual(trigger_instance_db.status, TRIGGER_INSTANCE_PENDING)
+
+        update_trigger_instances_status(trigger_instance_dbs, TRIGGER_INSTANCE_PROCESSED)
+
+        for trigger_instance_db in trigger_instance_dbs:
+            trigger_instance_db = TriggerInstance.get_by_id(trigger_instance_db.id)
+            self.assertEqual(trigger_instance_db.status, TRIGGER_INSTANCE_PROCESSED)
@@ -22,6 +22,8 @@ from st2common.models.db.rule import RuleDB, ActionExecutionSpecDB
 from st2common.models.db.trigger import TriggerDB, TriggerInstanceDB
 from st2common.util import reference
 from st2common.util import date as date_utils
+from st2reactor.rules import filter as filter_module
+from st2reactor.rules.filter import CompiledRule
 from st2reactor.rules.filter import RuleFilter
 from st2tests import DbTestCase
 
@@ -192,6 +194,21 @@ class FilterTest(DbTestCase):
         f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule)
         self.assertTrue(f.filter(), 'equals check should have passed.')
 
+    def test_criteria_pattern_is_precompiled(self):
+        rule = MOCK_RULE_1
+        rule.criteria = {'trigger.int': {'type': 'equals', 'pattern': '{{ trigger.int }}'}}
+        compiled_rule = CompiledRule(rule=rule)
+        compiled_criterion = compiled_rule.criteria[0]
+        self.assertEqual(compiled_criterion.complex_pattern, '{{trigger.int  | to_complex}}')
+
+        with mock.patch.object(filter_module, 'get_complex_criteria_pattern') as get_pattern:
+            for _ in range(2):
+                f = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule,
+                               compiled_rule=compiled_rule)
+                self.assertTrue(f.filter(), 'equals check should have passed.')
+
+            self.assertFalse(get_pattern.called)
+
     def test_exists(self):
         rule = MOCK_RULE_1
         rule.criteria = {'trigger.float': {'type': 'exists'}}
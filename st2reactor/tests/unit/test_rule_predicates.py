@@ -0,0 +1,117 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bson
+import mock
+import unittest2
+
+from st2common.models.db.rule import RuleDB, ActionExecutionSpecDB
+from st2common.models.db.trigger import TriggerDB, TriggerInstanceDB
+from st2reactor.rules.filter import CompiledRule, PayloadLookup
+from st2reactor.rules.matcher import RulesMatcher
+from st2reactor.rules.predicates import SharedPredicates, PredicateResults
+
+MOCK_TRIGGER = TriggerDB(pack='dummy_pack_1', name='trigger-test.name', type='system.test')
+
+
+def get_rule_db(name, criteria):
+    return RuleDB(id=bson.ObjectId(), pack='wolfpack', name=name,
+                  trigger=MOCK_TRIGGER.get_reference().ref, criteria=criteria,
+                  action=ActionExecutionSpecDB(ref='somepack.someaction'))
+
+
+def get_trigger_instance_db(payload):
+    return TriggerInstanceDB(trigger=MOCK_TRIGGER.get_reference().ref, payload=payload)
+
+
+class SharedPredicatesTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(SharedPredicatesTestCase, self).setUp()
+
+        self.rules = []
+        for index in range(0, 20):
+            self.rules.append(get_rule_db('equals%s' % (index), {
+                'trigger.repository': {'type': 'equals', 'pattern': 'repo%s' % (index)},
+                'trigger.branch': {'type': 'eq', 'pattern': 'master'}
+            }))
+
+        self.rules.append(get_rule_db('nequals', {
+            'trigger.repository': {'type': 'nequals', 'pattern': 'repo1'}
+        }))
+        self.rules.append(get_rule_db('inside', {
+            'trigger.repository': {'type': 'inside', 'pattern': ['repo2', 'repo3']}
+        }))
+        self.rules.append(get_rule_db('ninside', {
+            'trigger.repository': {'type': 'nin', 'pattern': ['repo2', 'repo3']}
+        }))
+        self.rules.append(get_rule_db('inside_string', {
+            'trigger.repository': {'type': 'inside', 'pattern': 'repo2 repo3'}
+        }))
+        self.rules.append(get_rule_db('regex', {
+            'trigger.repository': {'type': 'regex', 'pattern': '^repo1'}
+        }))
+        self.rules.append(get_rule_db('template', {
+            'trigger.branch': {'type': 'equals', 'pattern': '{{trigger.repository}}'}
+        }))
+        self.rules.append(get_rule_db('missing_key', {
+            'trigger.missing': {'type': 'equals', 'pattern': 'repo1'}
+        }))
+        self.rules.append(get_rule_db('int', {
+            'trigger.count': {'type': 'equals', 'pattern': 1}
+        }))
+
+    def _get_matching_rule_names(self, payload, shared_predicates):
+        trigger_instance = get_trigger_instance_db(payload)
+        matcher = RulesMatcher(trigger_instance=trigger_instance, trigger=MOCK_TRIGGER,
+                               rules=self.rules, shared_predicates=shared_predicates)
+        return sorted([rule.name for rule in matcher.get_matching_rules()])
+
+    def test_shared_predicates_match_same_rules(self):
+        payloads = [
+            {'repository': 'repo1', 'branch': 'master', 'count': 1},
+            {'repository': 'repo2', 'branch': 'master', 'count': 1.0},
+            {'repository': 'repo3', 'branch': 'repo3', 'count': True},
+            {'repository': 'repo19', 'branch': 'dev', 'count': '1'},
+            {'repository': ['repo1'], 'branch': 'master'},
+            {'repository': None, 'branch': None},
+            {'branch': 'master'}
+        ]
+
+        for payload in payloads:
+            expected = self._get_matching_rule_names(payload, shared_predicates=False)
+            actual = self._get_matching_rule_names(payload, shared_predicates=True)
+            self.assertEqual(actual, expected, 'Mismatch for payload %s' % (payload))
+
+    def test_indexed_predicates_are_evaluated_once_per_key(self):
+        compiled_rules = [CompiledRule(rule=rule) for rule in self.rules]
+        predicates = SharedPredicates(compiled_rules=compiled_rules)
+
+        # 20 equals + nequals + inside + ninside on trigger.repository, 1 shared equals on
+        # trigger.branch, 1 equals on trigger.missing and 1 on trigger.count
+        self.assertEqual(predicates.indexed_predicates_count, 26)
+
+        payload_lookup = PayloadLookup({'repository': 'repo5', 'branch': 'master', 'count': 1})
+        predicate_results = PredicateResults(shared_predicates=predicates)
+        evaluate_func = mock.Mock(return_value=(False, None, None))
+
+        for compiled_rule in compiled_rules:
+            for criterion in compiled_rule.criteria:
+                predicate_results.get_result(criterion=criterion, payload_lookup=payload_lookup,
+                                             evaluate_func=evaluate_func)
+
+        # Only inside with a string pattern, regex and template criteria are evaluated on their
+        # own
+        self.assertEqual(evaluate_func.call_count, 3)
+        self.assertEqual(predicate_results.evaluated_count, 3)
@@ -0,0 +1,97 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bson
+import mock
+import unittest2
+
+from st2common.models.db.rule import RuleDB, ActionExecutionSpecDB
+from st2reactor.rules import index as index_module
+from st2reactor.rules.index import RulesIndex
+
+TRIGGER_REF_1 = 'dummy_pack_1.st2.test.trigger1'
+TRIGGER_REF_2 = 'dummy_pack_1.st2.test.trigger2'
+
+
+def get_rule_db(name, trigger, enabled=True, criteria=None):
+    return RuleDB(id=bson.ObjectId(), pack='wolfpack', name=name, trigger=trigger,
+                  criteria=criteria or {}, enabled=enabled,
+                  action=ActionExecutionSpecDB(ref='somepack.someaction'))
+
+
+class RulesIndexTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(RulesIndexTestCase, self).setUp()
+
+        self.rule_1 = get_rule_db('rule1', TRIGGER_REF_1, criteria={
+            'trigger.k1': {'type': 'equals', 'pattern': 'v1'},
+            'trigger.k2': {'type': 'regex', 'pattern': '^foo'}
+        })
+        self.rule_2 = get_rule_db('rule2', TRIGGER_REF_1)
+
+    @mock.patch.object(index_module, 'get_rules_with_trigger_ref')
+    def test_rules_are_loaded_once_and_compiled(self, mock_get_rules):
+        mock_get_rules.return_value = [self.rule_1, self.rule_2]
+
+        rules_index = RulesIndex()
+        compiled_rules = rules_index.get_rules_for_trigger(TRIGGER_REF_1)
+        self.assertEqual([compiled_rule.rule for compiled_rule in compiled_rules],
+                         [self.rule_1, self.rule_2])
+        self.assertEqual(len(compiled_rules[0].criteria), 2)
+
+        rules_index.get_rules_for_trigger(TRIGGER_REF_1)
+        self.assertEqual(mock_get_rules.call_count, 1)
+
+    @mock.patch.object(index_module, 'get_rules_with_trigger_ref')
+    def test_incremental_updates(self, mock_get_rules):
+        mock_get_rules.return_value = [self.rule_1]
+
+        rules_index = RulesIndex()
+        rules_index.get_rules_for_trigger(TRIGGER_REF_1)
+
+        # Create
+        rules_index.add_or_update_rule(self.rule_2)
+        rules = [c.rule for c in rules_index.get_rules_for_trigger(TRIGGER_REF_1)]
+        self.assertEqual(rules, [self.rule_1, self.rule_2])
+
+        # Disable
+        self.rule_2.enabled = False
+        rules_index.add_or_update_rule(self.rule_2)
+        rules = [c.rule for c in rules_index.get_rules_for_trigger(TRIGGER_REF_1)]
+        self.assertEqual(rules, [self.rule_1])
+
+        # Trigger changed
+        self.rule_1.trigger = TRIGGER_REF_2
+        rules_index.add_or_update_rule(self.rule_1)
+        self.assertEqual(rules_index.get_rules_for_trigger(TRIGGER_REF_1), [])
+
+        # Delete
+        mock_get_rules.return_value = [self.rule_1]
+        rules = [c.rule for c in rules_index.get_rules_for_trigger(TRIGGER_REF_2)]
+        self.assertEqual(rules, [self.rule_1])
+
+        rules_index.remove_rule(self.rule_1)
+        self.assertEqual(rules_index.get_rules_for_trigger(TRIGGER_REF_2), [])
+        self.assertEqual(mock_get_rules.call_count, 2)
+
+    @mock.patch.object(index_module, 'get_rules_with_trigger_ref')
+    def test_clear(self, mock_get_rules):
+        mock_get_rules.return_value = [self.rule_1]
+
+        rules_index = RulesIndex()
+        rules_index.get_rules_for_trigger(TRIGGER_REF_1)
+        rules_index.clear()
+        rules_index.get_rules_for_trigger(TRIGGER_REF_1)
+        self.assertEqual(mock_get_rules.call_count, 2)
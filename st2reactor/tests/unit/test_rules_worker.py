@@ -0,0 +1,94 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from st2common.constants.trace import TRACE_CONTEXT
+from st2common.models.api.trace import TraceContext
+from st2common.models.db.trigger import TriggerDB, TriggerTypeDB
+from st2common.persistence.trigger import TriggerType, Trigger, TriggerInstance
+from st2common.transport.publishers import PoolPublisher
+from st2common.transport.reactor import TriggerDispatcher
+from st2reactor.rules import config as rules_config
+from st2reactor.rules.worker import TriggerInstanceDispatcher
+from st2tests.base import CleanDbTestCase
+
+__all__ = [
+    'TriggerInstanceDispatcherTestCase'
+]
+
+
+@mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+class TriggerInstanceDispatcherTestCase(CleanDbTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TriggerInstanceDispatcherTestCase, cls).setUpClass()
+        rules_config._register_rules_engine_opts()
+
+    def setUp(self):
+        super(TriggerInstanceDispatcherTestCase, self).setUp()
+
+        TriggerType.add_or_update(TriggerTypeDB(pack='dummy_pack_1', name='event'))
+        Trigger.add_or_update(TriggerDB(pack='dummy_pack_1', name='event',
+                                        type='dummy_pack_1.event'))
+
+        self.dispatcher = TriggerInstanceDispatcher(mock.Mock(), [])
+        self.dispatcher.rules_engine = mock.Mock()
+
+    def _get_published_messages(self, payloads, trace_context=None):
+        trigger_dispatcher = TriggerDispatcher()
+        trigger_dispatcher.MAX_BATCH_SIZE = 2
+
+        with mock.patch.object(trigger_dispatcher._publisher, 'publish_trigger') as publish:
+            trigger_dispatcher.dispatch_many('dummy_pack_1.event', payloads=payloads,
+                                             trace_context=trace_context)
+
+        return [call[1]['payload'] for call in publish.call_args_list]
+
+    def test_dispatch_many_publishes_batch_messages(self):
+        messages = self._get_published_messages(payloads=[{'a': 1}, {'a': 2}, {'a': 3}])
+
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[0]['payloads'], [{'a': 1}, {'a': 2}])
+        self.assertEqual(messages[1]['payloads'], [{'a': 3}])
+
+    def test_batch_message_is_processed(self):
+        trace_context = TraceContext(trace_tag='tag1')
+        messages = self._get_published_messages(payloads=[{'a': 1}, {'a': 2}],
+                                                trace_context=trace_context)
+        self.assertEqual(len(messages), 1)
+
+        response = self.dispatcher.pre_ack_process(messages[0])
+
+        # Trigger instances are stored before the message is acknowledged
+        trigger_instances = TriggerInstance.get_all()
+        self.assertEqual(sorted([t.payload['a'] for t in trigger_instances]), [1, 2])
+        self.assertEqual(len(response['responses']), 2)
+        self.assertEqual(response['responses'][0]['message'][TRACE_CONTEXT], trace_context)
+
+        self.dispatcher.process(response)
+        self.assertEqual(self.dispatcher.rules_engine.handle_trigger_instance.call_count, 2)
+
+    def test_batch_messages_are_expanded_in_batched_consumer(self):
+        messages = self._get_published_messages(payloads=[{'a': 1}, {'a': 2}, {'a': 3}])
+        messages.append({'trigger': 'dummy_pack_1.event', 'payload': {'a': 4},
+                         TRACE_CONTEXT: None})
+
+        responses = self.dispatcher.pre_ack_process_batch(messages)
+        self.assertEqual(len(responses), 4)
+        self.assertEqual(TriggerInstance.count(), 4)
+
+        self.dispatcher.process_batch(responses)
+        self.assertEqual(self.dispatcher.rules_engine.handle_trigger_instance.call_count, 4)
@@ -201,3 +201,30 @@ class SensorServiceTestCase(unittest2.TestCase):
 
         self.sensor_service.dispatch('not-in-database-ref', {})
         self.assertEqual(self._dispatched_count, 1)
+
+    @mock.patch('st2common.services.triggers.get_trigger_type_db',
+                mock.MagicMock(return_value=TriggerTypeMock(TEST_SCHEMA)))
+    def test_dispatch_many(self):
+        payloads = [
+            {'name': 'John Doe', 'age': 25},
+            {'name': 'John Doe', 'hobby': 'programming'},
+            {'name': 'Jane Doe'}
+        ]
+
+        # Invalid payload is still dispatched when validation is disabled
+        cfg.CONF.system.validate_trigger_payload = False
+        self.sensor_service.dispatch_many('trigger-name', payloads, trace_tag='tag1')
+        self.assertEqual(self._dispatched_count, 0)
+
+        call_args = self.sensor_service._dispatcher.dispatch_many.call_args
+        self.assertEqual(call_args[0], ('trigger-name', ))
+        self.assertEqual(call_args[1]['payloads'], payloads)
+        self.assertEqual(call_args[1]['trace_context'].trace_tag, 'tag1')
+
+        # Invalid payload is skipped when validation is enabled
+        cfg.CONF.system.validate_trigger_payload = True
+        self.sensor_service.dispatch_many('trigger-name', payloads)
+
+        call_args = self.sensor_service._dispatcher.dispatch_many.call_args
+        self.assertEqual(call_args[1]['payloads'], [payloads[0], payloads[2]])
+        self.assertEqual(call_args[1]['trace_context'], None)
@@ -53,6 +53,20 @@ class RuleTesterTestCase(CleanDbTestCase):
         matching = tester.evaluate()
         self.assertTrue(matching)
 
+    def test_matching_trigger_from_file_shared_predicates(self):
+        FixturesLoader().save_fixtures_to_db(fixtures_pack=FIXTURES_PACK,
+                                             fixtures_dict=TEST_MODELS_ACTIONS)
+        rule_file_path = os.path.join(BASE_PATH, '../fixtures/rule.yaml')
+
+        for trigger_instance_file, expected in [('trigger_instance_1.yaml', True),
+                                                ('trigger_instance_2.yaml', False)]:
+            trigger_instance_file_path = os.path.join(BASE_PATH, '../fixtures/',
+                                                      trigger_instance_file)
+            tester = RuleTester(rule_file_path=rule_file_path,
+                                trigger_instance_file_path=trigger_instance_file_path,
+                                shared_predicates=True)
+            self.assertEqual(tester.evaluate(), expected)
+
     def test_non_matching_trigger_from_file(self):
         rule_file_path = os.path.join(BASE_PATH, '../fixtures/rule.yaml')
         trigger_instance_file_path = os.path.join(BASE_PATH, '../fixtures/trigger_instance_2.yaml')
@@ -63,11 +63,12 @@ def setup_app(config={}):
 
     router = Router(debug=cfg.CONF.stream.debug, auth=cfg.CONF.auth.enable)
 
-    spec = spec_loader.load_spec('st2common', 'openapi.yaml.j2')
+    spec = spec_loader.load_compiled_spec('st2common', 'openapi.yaml.j2',
+                                          cache_dir=cfg.CONF.api.spec_cache_dir)
     transforms = {
         '^/stream/v1/': ['/', '/v1/']
     }
-    router.add_spec(spec, transforms=transforms)
+    router.add_spec(spec, transforms=transforms, validate_spec=False)
 
     app = router.as_wsgi
 
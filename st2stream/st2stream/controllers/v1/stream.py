@@ -17,7 +17,6 @@ import six
 
 from st2common import log as logging
 from st2common.router import Response
-from st2common.util.jsonify import json_encode
 from st2common.stream.listener import get_listener
 
 __all__ = [
@@ -40,16 +39,13 @@ DEFAULT_EVENTS_WHITELIST = [
 
 
 def format(gen):
-    message = '''event: %s\ndata: %s\n\n'''
-
     for pack in gen:
         if not pack:
             # Note: gunicorn wsgi handler expect bytes, not unicode
             yield six.binary_type('\n')
         else:
-            (event, body) = pack
-            # Note: gunicorn wsgi handler expect bytes, not unicode
-            yield six.binary_type(message % (event, json_encode(body, indent=None)))
+            # Note: Frame is encoded once and shared by all the clients which receive this event
+            yield pack.frame
 
 
 class StreamController(object):
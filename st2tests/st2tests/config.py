@@ -76,23 +76,33 @@ def _override_common_opts():
     CONF.set_override(name='system_runners_base_path', override=runners_base_path, group='content')
     CONF.set_override(name='runners_base_paths', override=runners_base_path, group='content')
     CONF.set_override(name='api_url', override='http://127.0.0.1', group='auth')
+    CONF.set_override(name='enable_cache', override=False, group='auth')
+    CONF.set_override(name='cache_trigger_type_schemas', override=False, group='system')
+    CONF.set_override(name='cache_action_metadata', override=False, group='system')
     CONF.set_override(name='mask_secrets', override=True, group='log')
     CONF.set_override(name='url', override='zake://', group='coordination')
     CONF.set_override(name='lock_timeout', override=1, group='coordination')
+    CONF.set_override(name='concurrency_slots_reconcile_interval', override=0,
+                      group='scheduler')
     CONF.set_override(name='jitter_interval', override=0, group='mistral')
     CONF.set_override(name='query_interval', override=0.1, group='resultstracker')
     CONF.set_override(name='stream_output', override=False, group='actionrunner')
+    CONF.set_override(name='stream_output_buffer_size', override=0, group='actionrunner')
+    CONF.set_override(name='completion_notifications', override=False, group='actionrunner')
+    CONF.set_override(name='use_connection_pool', override=False, group='ssh_runner')
 
 
 def _override_api_opts():
     CONF.set_override(name='allow_origin', override=['http://127.0.0.1:3000', 'http://dev'],
                       group='api')
+    CONF.set_override(name='spec_cache_dir', override='', group='api')
 
 
 def _override_keyvalue_opts():
     CONF.set_override(name='encryption_key_path',
                       override='st2tests/conf/st2_kvstore_tests.crypto.key.json',
                       group='keyvalue')
+    CONF.set_override(name='enable_cache', override=False, group='keyvalue')
 
 
 def _register_common_opts():
@@ -123,7 +133,11 @@ def _register_api_opts():
         cfg.IntOpt('max_page_size', default=100,
                    help=('Maximum limit (page size) argument which can be specified by the user '
                          'in a query string. If a larger value is provided, it will default to  '
-                         'this value.'))
+                         'this value.')),
+        cfg.BoolOpt('gzip', default=True,
+                    help='True to gzip compress JSON responses if the client accepts it.'),
+        cfg.IntOpt('gzip_min_size', default=1024,
+                   help='Minimum size (in bytes) of the response body which is compressed.')
     ]
     _register_opts(api_opts, group='api')
 
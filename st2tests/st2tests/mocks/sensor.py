@@ -72,3 +72,7 @@ class MockSensorService(SensorService):
             'trace_context': trace_context
         }
         self.dispatched_triggers.append(item)
+
+    def dispatch_many(self, trigger, payloads, trace_tag=None):
+        for payload in payloads:
+            self.dispatch(trigger=trigger, payload=payload, trace_tag=trace_tag)
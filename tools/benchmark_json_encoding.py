@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A utility script which compares the size and the encoding time of the API response body for
+execution listings using the previous (pretty-printed), compact and streamed encoding with and
+without gzip compression.
+
+Usage:
+
+    python tools/benchmark_json_encoding.py --iterations 20 --count 100 --result-size 100
+"""
+
+from __future__ import print_function
+
+import time
+import zlib
+import argparse
+
+from st2common.util import jsonify
+from st2common.middleware.compression import GZIP_WBITS
+
+
+def get_executions(count, result_size):
+    """
+    Return a list of execution API objects shaped like the ones returned by /v1/executions.
+    """
+    executions = []
+
+    for index in range(0, count):
+        executions.append({
+            'id': '5a4b2e1c9c2e3b0e8d%06d' % (index),
+            'action': {
+                'ref': 'core.remote',
+                'name': 'remote',
+                'pack': 'core',
+                'runner_type': 'remote-shell-cmd',
+                'parameters': {'cmd': {'type': 'string', 'required': True}}
+            },
+            'runner': {'name': 'remote-shell-cmd', 'runner_module': 'remote_command_runner'},
+            'liveaction': {'action': 'core.remote', 'parameters': {'cmd': 'uptime'}},
+            'parameters': {'cmd': 'uptime', 'hosts': 'host1,host2'},
+            'status': 'succeeded',
+            'start_timestamp': '2017-09-21T10:00:00.000000Z',
+            'end_timestamp': '2017-09-21T10:00:01.000000Z',
+            'context': {'user': 'stanley'},
+            'log': [{'status': 'requested', 'timestamp': '2017-09-21T10:00:00.000000Z'},
+                    {'status': 'succeeded', 'timestamp': '2017-09-21T10:00:01.000000Z'}],
+            'result': {
+                'host%s' % (host): {
+                    'succeeded': True,
+                    'failed': False,
+                    'return_code': 0,
+                    'stdout': 'line %s of the output' % (host),
+                    'stderr': ''
+                } for host in range(0, result_size)
+            }
+        })
+
+    return executions
+
+
+def encode_pretty(executions):
+    return jsonify.json_encode(executions, indent=4)
+
+
+def encode_compact(executions):
+    return jsonify.json_encode(executions)
+
+
+def encode_streamed(executions):
+    return ''.join(jsonify.json_encode_iter(iter(executions)))
+
+
+def gzip_compress(body):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def benchmark(func, value, iterations):
+    start = time.time()
+    for _ in range(0, iterations):
+        func(value)
+    return (time.time() - start) / iterations
+
+
+def main(iterations, count, result_size):
+    executions = get_executions(count=count, result_size=result_size)
+
+    print('JSON backend: %s, iterations: %s, executions: %s, result size: %s' %
+          (jsonify.JSON_BACKEND, iterations, count, result_size))
+    print('')
+    print('%-20s %12s %12s %12s %12s' % ('encoding', 'bytes', 'gzip bytes', 'encode (ms)',
+                                         'gzip (ms)'))
+
+    for name, func in [('pretty (previous)', encode_pretty),
+                       ('compact', encode_compact),
+                       ('compact (streamed)', encode_streamed)]:
+        body = func(executions)
+        compressed = gzip_compress(body)
+
+        encode_duration = benchmark(func=func, value=executions, iterations=iterations)
+        gzip_duration = benchmark(func=gzip_compress, value=body, iterations=iterations)
+
+        print('%-20s %12s %12s %12.2f %12.2f' % (name, len(body), len(compressed),
+                                                 encode_duration * 1000, gzip_duration * 1000))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='API response JSON encoding benchmark')
+    parser.add_argument('--iterations', type=int, default=20,
+                        help='Number of iterations for each encoding.')
+    parser.add_argument('--count', type=int, default=100,
+                        help='Number of executions in the listing.')
+    parser.add_argument('--result-size', type=int, default=100,
+                        help='Number of hosts in the result of each execution.')
+    args = parser.parse_args()
+
+    main(iterations=args.iterations, count=args.count, result_size=args.result_size)
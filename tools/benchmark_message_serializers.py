@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A utility script which compares payload size and encode / decode time of the message bus
+serializers for typical messages (LiveActionDB, ActionExecutionDB and trigger instance dispatch
+payloads).
+
+Usage:
+
+    python tools/benchmark_message_serializers.py --iterations 5000 --result-size 4096
+"""
+
+from __future__ import print_function
+
+import time
+import argparse
+
+from bson.objectid import ObjectId
+from kombu.serialization import dumps
+from kombu.serialization import loads
+from kombu.serialization import prepare_accept_content
+
+from st2common.constants.trace import TRACE_CONTEXT
+from st2common.models.api.trace import TraceContext
+from st2common.models.db.execution import ActionExecutionDB
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.transport import serializers
+from st2common.util import date as date_utils
+
+
+def get_messages(result_size):
+    now = date_utils.get_datetime_utc_now()
+    parameters = {'cmd': 'echo "hello world"', 'hosts': 'localhost', 'timeout': 60}
+    context = {'user': 'stanley', 'trace_context': {'trace_tag': 'st2.webhook'}}
+    result = {
+        'failed': False,
+        'succeeded': True,
+        'return_code': 0,
+        'stdout': 'a' * result_size,
+        'stderr': ''
+    }
+
+    liveaction_db = LiveActionDB(id=ObjectId(), status='succeeded', action='core.local',
+                                 parameters=parameters, context=context, result=result,
+                                 start_timestamp=now, end_timestamp=now)
+    execution_db = ActionExecutionDB(id=ObjectId(), status='succeeded',
+                                     action={'ref': 'core.local', 'name': 'local',
+                                             'pack': 'core', 'runner_type': 'local-shell-cmd'},
+                                     runner={'name': 'local-shell-cmd', 'enabled': True},
+                                     liveaction={'id': str(liveaction_db.id)},
+                                     parameters=parameters, context=context, result=result,
+                                     start_timestamp=now, end_timestamp=now)
+    trigger_instance = {
+        'trigger': 'core.st2.webhook',
+        'payload': {'headers': {'Content-Type': 'application/json'}, 'body': parameters},
+        TRACE_CONTEXT: TraceContext(trace_tag='webhook-1')
+    }
+
+    return [
+        ('LiveActionDB', liveaction_db),
+        ('ActionExecutionDB', execution_db),
+        ('trigger instance', trigger_instance)
+    ]
+
+
+def benchmark(serializer, payload, iterations):
+    accept = prepare_accept_content(serializers.get_accept_content())
+
+    start = time.time()
+    for _ in range(0, iterations):
+        content_type, content_encoding, data = dumps(payload, serializer=serializer)
+    encode_duration = time.time() - start
+
+    start = time.time()
+    for _ in range(0, iterations):
+        loads(data, content_type, content_encoding, accept=accept)
+    decode_duration = time.time() - start
+
+    return len(data), encode_duration, decode_duration
+
+
+def main(iterations, result_size):
+    print('Iterations: %s, result size: %s bytes' % (iterations, result_size))
+
+    for name, payload in get_messages(result_size=result_size):
+        print('')
+        print('%s:' % (name))
+        print('%-15s %10s %12s %12s' % ('serializer', 'size (B)', 'encode (us)', 'decode (us)'))
+
+        for serializer in serializers.get_available_serializers():
+            size, encode_duration, decode_duration = benchmark(serializer=serializer,
+                                                               payload=payload,
+                                                               iterations=iterations)
+            print('%-15s %10d %12.2f %12.2f' % (serializer, size,
+                                                (encode_duration / iterations) * 1000000,
+                                                (decode_duration / iterations) * 1000000))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Message bus serializers benchmark')
+    parser.add_argument('--iterations', type=int, default=2000,
+                        help='Number of encode / decode iterations for each message.')
+    parser.add_argument('--result-size', type=int, default=1024,
+                        help='Size of the execution stdout in bytes.')
+    args = parser.parse_args()
+
+    main(iterations=args.iterations, result_size=args.result_size)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A utility script which compares the speed of the previous (deep copy + one pass per translation
+table) and the current (single pass, copy on change) MongoDB key escaping implementations using
+typical action execution result shapes.
+
+Usage:
+
+    python tools/benchmark_mongoescape.py --iterations 20 --size 1000
+"""
+
+from __future__ import print_function
+
+import copy
+import time
+import argparse
+
+import six
+
+from st2common.util import mongoescape
+
+
+def legacy_translate_chars(field, translation):
+    if not isinstance(field, dict):
+        return field
+
+    work_items = [(k, v, field) for k, v in six.iteritems(field)]
+
+    while len(work_items) > 0:
+        oldkey, value, work_field = work_items.pop(0)
+        newkey = oldkey
+
+        for t_k, t_v in six.iteritems(translation):
+            newkey = newkey.replace(t_k, t_v)
+
+        if newkey != oldkey:
+            work_field[newkey] = value
+            del work_field[oldkey]
+
+        if isinstance(value, dict):
+            work_items.extend([(k, v, value) for k, v in six.iteritems(value)])
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    work_items.extend([(k, v, item) for k, v in six.iteritems(item)])
+
+    return field
+
+
+def legacy_escape_chars(field):
+    value = copy.deepcopy(field)
+    return legacy_translate_chars(value, mongoescape.ESCAPE_TRANSLATION)
+
+
+def legacy_unescape_chars(field):
+    value = copy.deepcopy(field)
+    translated = legacy_translate_chars(value, mongoescape.UNESCAPE_TRANSLATION)
+    translated = legacy_translate_chars(value, mongoescape.RULE_CRITERIA_UNESCAPE_TRANSLATION)
+    return translated
+
+
+def get_results(size):
+    """
+    Return execution results of different shapes. Size roughly corresponds to the number of
+    leaf values in the result.
+    """
+    # Remote command ran on many hosts
+    remote_result = {}
+    for index in range(0, size):
+        remote_result['host-%s.example.com' % (index)] = {
+            'succeeded': True,
+            'failed': False,
+            'return_code': 0,
+            'stdout': 'a' * 100,
+            'stderr': ''
+        }
+
+    # Python action which returns a wide list of records
+    python_result = {
+        'exit_code': 0,
+        'stdout': '',
+        'stderr': '',
+        'result': [{'id': index, 'name': 'item-%s' % (index), 'tags': ['a', 'b'],
+                    'metadata': {'created': '2017-01-01', 'owner': 'stanley'}}
+                   for index in range(0, size)]
+    }
+
+    # Deeply nested workflow result without any keys which need escaping
+    nested_result = {'tasks': []}
+    for index in range(0, size // 10 or 1):
+        nested_result['tasks'].append({
+            'name': 'task-%s' % (index),
+            'result': {'stdout': {'items': [{'key': value, 'value': value}
+                                            for value in range(0, 10)]}}
+        })
+
+    return [
+        ('remote (dots in keys)', remote_result),
+        ('python (wide list)', python_result),
+        ('workflow (nested)', nested_result)
+    ]
+
+
+def benchmark(func, value, iterations):
+    start = time.time()
+    for _ in range(0, iterations):
+        func(value)
+    return (time.time() - start) / iterations
+
+
+def main(iterations, size):
+    print('Iterations: %s, size: %s' % (iterations, size))
+    print('')
+    print('%-25s %-10s %12s %12s' % ('result', 'operation', 'legacy (ms)', 'current (ms)'))
+
+    for name, result in get_results(size=size):
+        escaped = mongoescape.escape_chars(result)
+
+        for operation, legacy_func, func, value in [
+                ('escape', legacy_escape_chars, mongoescape.escape_chars, result),
+                ('unescape', legacy_unescape_chars, mongoescape.unescape_chars, escaped)]:
+            assert legacy_func(value) == func(value)
+
+            legacy_duration = benchmark(func=legacy_func, value=value, iterations=iterations)
+            duration = benchmark(func=func, value=value, iterations=iterations)
+            print('%-25s %-10s %12.2f %12.2f' % (name, operation, legacy_duration * 1000,
+                                                 duration * 1000))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MongoDB key escaping benchmark')
+    parser.add_argument('--iterations', type=int, default=20,
+                        help='Number of iterations for each result.')
+    parser.add_argument('--size', type=int, default=1000,
+                        help='Number of items in the results.')
+    args = parser.parse_args()
+
+    main(iterations=args.iterations, size=args.size)
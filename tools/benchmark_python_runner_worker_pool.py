@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A utility script which compares Python runner action throughput (actions/s) when each action
+runs in a new wrapper process and when actions run inside a pool of warm worker processes.
+
+Usage:
+
+    python tools/benchmark_python_runner_worker_pool.py --count 200 --concurrency 4
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import eventlet
+from eventlet.green import subprocess
+
+from st2common import config
+from st2common.runners.python_action_worker_pool import PythonActionWorkerPool
+from st2common.runners.python_action_worker_pool import WRAPPER_SCRIPT_PATH
+from st2common.util.green.shell import run_command
+from st2common.util.sandboxing import get_sandbox_python_path
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ACTION_PATH = os.path.join(BASE_DIR, '../st2tests/st2tests/resources/packs/pythonactions/'
+                                     'actions/pascal_row.py')
+ACTION_PATH = os.path.abspath(ACTION_PATH)
+PACK = 'pythonactions'
+PARAMETERS = {'row_index': 10}
+
+
+def get_env():
+    env = os.environ.copy()
+    env['PYTHONPATH'] = get_sandbox_python_path(inherit_from_parent=True,
+                                                inherit_parent_virtualenv=True)
+    return env
+
+
+def run_cold(env):
+    args = [
+        sys.executable,
+        '-u',
+        WRAPPER_SCRIPT_PATH,
+        '--pack=%s' % (PACK),
+        '--file-path=%s' % (ACTION_PATH),
+        '--parameters=%s' % (json.dumps(PARAMETERS)),
+        '--parent-args=[]'
+    ]
+    exit_code, _, _, _ = run_command(cmd=args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                     env=env, timeout=60)
+    assert exit_code == 0
+
+
+def run_warm(env, pool):
+    worker = pool.acquire(python_path=sys.executable, pack=PACK, entry_point=ACTION_PATH,
+                          env=env)
+    assert worker is not None
+
+    try:
+        exit_code, _, _, _ = worker.run(file_path=ACTION_PATH, parameters=PARAMETERS,
+                                        timeout=60)
+    finally:
+        pool.release(worker)
+
+    assert exit_code == 0
+
+
+def benchmark(func, count, concurrency):
+    green_pool = eventlet.GreenPool(concurrency)
+
+    start = time.time()
+    for _ in range(0, count):
+        green_pool.spawn_n(func)
+    green_pool.waitall()
+    duration = time.time() - start
+
+    return duration
+
+
+def main(count, concurrency):
+    config.parse_args(args=[])
+    env = get_env()
+
+    worker_pool = PythonActionWorkerPool(size=concurrency)
+
+    # Start the workers before the measurement
+    workers = [worker_pool.acquire(python_path=sys.executable, pack=PACK, entry_point=ACTION_PATH,
+                                   env=env) for _ in range(0, concurrency)]
+    for worker in workers:
+        worker.run(file_path=ACTION_PATH, parameters=PARAMETERS, timeout=60)
+        worker_pool.release(worker)
+
+    print('Actions: %s, concurrency: %s' % (count, concurrency))
+    print('')
+    print('%-25s %12s %12s' % ('mode', 'duration (s)', 'actions/s'))
+
+    duration = benchmark(func=lambda: run_cold(env=env), count=count, concurrency=concurrency)
+    print('%-25s %12.2f %12.2f' % ('new process per action', duration, count / duration))
+
+    duration = benchmark(func=lambda: run_warm(env=env, pool=worker_pool), count=count,
+                         concurrency=concurrency)
+    print('%-25s %12.2f %12.2f' % ('worker pool', duration, count / duration))
+
+    worker_pool.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Python runner worker pool benchmark')
+    parser.add_argument('--count', type=int, default=100,
+                        help='Number of actions to run in each mode.')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Number of actions which run concurrently.')
+    args = parser.parse_args()
+
+    main(count=args.count, concurrency=args.concurrency)
@@ -27,6 +27,7 @@ from kombu import Connection, Exchange, Queue
 
 from st2common import config
 from st2common.transport import utils as transport_utils
+from st2common.transport.serializers import get_accept_content
 
 
 class QueueConsumer(ConsumerMixin):
@@ -36,7 +37,7 @@ class QueueConsumer(ConsumerMixin):
 
     def get_consumers(self, Consumer, channel):
         return [Consumer(queues=[self.queue],
-                         accept=['pickle'],
+                         accept=get_accept_content(),
                          callbacks=[self.process_task])]
 
     def process_task(self, body, message):